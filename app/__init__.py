@@ -6,9 +6,12 @@ from flask_marshmallow import Marshmallow
 from flask_jwt_extended import JWTManager
 from dotenv import load_dotenv
 import os
+import sqlite3
 from flask import jsonify
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
-from app.errors import AppError, NotFoundError, ValidationError, AuthError, ConflictError
+from app.errors import AppError, NotFoundError, ValidationError, AuthError, ConflictError, TooManyRequestsError
 from werkzeug.exceptions import NotFound, MethodNotAllowed, InternalServerError
 
 load_dotenv()
@@ -18,6 +21,19 @@ migrate = Migrate()
 ma = Marshmallow()
 jwt = JWTManager()
 
+
+@event.listens_for(Engine, "connect")
+def activar_foreign_keys_sqlite(dbapi_connection, connection_record):
+    """
+    SQLite no aplica las foreign keys (ni sus ON DELETE CASCADE / SET NULL)
+    salvo que se activen en cada conexión. Los borrados de clubes y canchas
+    dependen de esas cascadas (ver passive_deletes en los modelos).
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 def create_app():
     app = Flask(__name__)
     from .config import Config 
@@ -40,6 +56,13 @@ def create_app():
     
     ma.init_app(app)
 
+    from app.auth.blocklist import token_blocklist
+
+    @jwt.token_in_blocklist_loader
+    def token_revocado(jwt_header, jwt_payload):
+        """Rechaza los tokens revocados por logout (búsqueda en memoria, ver app/auth/blocklist.py)."""
+        return token_blocklist.contiene(jwt_payload["jti"])
+
     @app.errorhandler(AppError)
     def handle_app_error(error):
         """Manejador genérico para nuestros errores personalizados."""
@@ -66,6 +89,13 @@ def create_app():
     def handle_auth_error(error):
         """Manejador para errores de autenticación (401)."""
         return jsonify(error.to_dict()), error.status_code
+
+    @app.errorhandler(TooManyRequestsError)
+    def handle_too_many_requests(error):
+        """Manejador para límites de solicitudes (429), con el header Retry-After."""
+        response = jsonify({**error.to_dict(), "retry_after": error.retry_after})
+        response.headers["Retry-After"] = str(error.retry_after)
+        return response, error.status_code
     
     # --- Manejadores para errores nativos de Flask/Werkzeug ---
     
@@ -96,6 +126,9 @@ def create_app():
     
     from app.api.reserva import bp_reserva
     app.register_blueprint(bp_reserva)
+
+    from app.api.espera import bp_espera
+    app.register_blueprint(bp_espera)
     
     from app.api.user import bp_user
     app.register_blueprint(bp_user)
@@ -114,5 +147,8 @@ def create_app():
     
     from app.api.reportes import bp_reportes
     app.register_blueprint(bp_reportes)
+
+    from app.commands import register_commands
+    register_commands(app)
     
     return app
\ No newline at end of file
@@ -1,6 +1,8 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services.auth_service import AuthService
+from app.errors import AppError
+from app.auth.rate_limit import limitar_login
 
 bp_auth = Blueprint("auth", __name__, url_prefix="/api/v1/auth")
 
@@ -8,6 +10,7 @@ auth_service = AuthService()
 
 
 @bp_auth.post('/login')
+@limitar_login
 def login():
     """
     Endpoint de inicio de sesión.
@@ -31,6 +34,9 @@ def login():
                 "club_nombre": "Club Ejemplo"
             }
         }
+
+    Response (429): se superó el límite de intentos por IP o por email;
+    el header Retry-After indica los segundos a esperar.
     """
     data = request.get_json()
     
@@ -47,6 +53,9 @@ def login():
     except ValueError as e:
         return jsonify({"error": str(e)}), 401
     
+    except AppError:
+        raise  # Lo formatea el manejador global (ej: 503 si el hashing está saturado)
+    
     except Exception as e:
         return jsonify({
             "error": "Error al iniciar sesión",
@@ -89,6 +98,9 @@ def get_current_user():
     """
     Obtiene la información del usuario autenticado actual.
     
+    Los datos salen de la caché de autorización (no del token), así un
+    cambio de rol o una baja se ve acá sin esperar a que venza el token.
+    
     Headers:
         Authorization: Bearer <access_token>
     
@@ -103,18 +115,17 @@ def get_current_user():
     """
     try:
         # Obtener ID del usuario desde el token (viene como string)
-        current_user_id_str = get_jwt_identity()
+        user = auth_service.get_datos_autorizacion(int(get_jwt_identity()))
         
-        # Obtener claims adicionales del token
-        claims = get_jwt()
+        if not user or not user["activo"]:
+            return jsonify({"error": "Usuario no encontrado o inactivo"}), 401
         
-        # Convertir ID a int para retornar
         return jsonify({
-            "id": int(current_user_id_str),
-            "nombre": claims.get('nombre'),
-            "email": claims.get('email'),
-            "rol": claims.get('rol'),
-            "club_id": claims.get('club_id')
+            "id": user["id"],
+            "nombre": user["nombre"],
+            "email": user["email"],
+            "rol": user["rol"],
+            "club_id": user["club_id"]
         }), 200
     
     except Exception as e:
@@ -128,22 +139,28 @@ def get_current_user():
 @jwt_required()
 def logout():
     """
-    Cierra la sesión del usuario.
-    
-    Nota: En JWT stateless, el logout se maneja en el frontend
-    eliminando el token. Este endpoint existe para compatibilidad
-    y podría implementar una blacklist de tokens en el futuro.
+    Cierra la sesión del usuario revocando el access token (por su jti).
+    Si se envía el refresh token, también se revoca.
     
     Headers:
         Authorization: Bearer <access_token>
     
+    Body (JSON, opcional):
+        {
+            "refresh_token": "eyJ0eXAiOiJKV1QiLCJ..."
+        }
+    
     Response (200):
         {
             "message": "Sesión cerrada exitosamente"
         }
     """
-    # TODO: Implementar blacklist de tokens si es necesario
-    # Por ahora, el cliente simplemente elimina el token
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        auth_service.logout(get_jwt(), data.get('refresh_token'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
     return jsonify({
         "message": "Sesión cerrada exitosamente"
@@ -4,7 +4,7 @@ from app import db
 from app.auth.decorators import role_required
 from app.services.cancha_service import CanchaService
 from app.schemas.cancha_schema import cancha_schema, canchas_schema
-from app.schemas.timeslot_schema import timeslots_schema
+from app.schemas.timeslot_schema import timeslots_sin_cancha_schema
 
 bp_cancha = Blueprint("cancha", __name__, url_prefix="/api/v1/canchas")
 cancha_service = CanchaService(db)
@@ -56,9 +56,28 @@ def delete_cancha(id_cancha):
     cancha_service.delete(id_cancha)
     return jsonify({"message": "Cancha eliminada exitosamente"}), 200 
 
-# Obtener los timeslots de una cancha
+# Obtener los timeslots de una cancha (filtrados por rango y estado, paginados por cursor)
 @bp_cancha.get("/<int:id_cancha>/timeslots")
 def get_timeslots_cancha(id_cancha):
-    cancha = cancha_service.get_by_id(id_cancha)
-    timeslots = cancha.timeslots
-    return jsonify(timeslots_schema.dump(timeslots)), 200
\ No newline at end of file
+    """
+    Query params opcionales:
+    - desde: YYYY-MM-DD o YYYY-MM-DDTHH:MM (por defecto, hoy)
+    - hasta: YYYY-MM-DD (día incluido) o YYYY-MM-DDTHH:MM
+    - estado: DISPONIBLE, RESERVADO, BLOQUEADO, ...
+    - limit: timeslots por página (por defecto 100, máximo 500)
+    - cursor: 'next_cursor' de la respuesta anterior
+    """
+    resultado = cancha_service.get_timeslots(
+        id_cancha,
+        desde=request.args.get('desde'),
+        hasta=request.args.get('hasta'),
+        estado=request.args.get('estado'),
+        cursor=request.args.get('cursor'),
+        limite=request.args.get('limit', type=int)
+    )
+    return jsonify({
+        "cancha": cancha_schema.dump(resultado["cancha"]),
+        "data": timeslots_sin_cancha_schema.dump(resultado["data"]),
+        "limit": resultado["limit"],
+        "next_cursor": resultado["next_cursor"]
+    }), 200
\ No newline at end of file
@@ -2,13 +2,20 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt
 from app import db
 from app.services.club_service import ClubService
+from app.services.precio_service import PrecioService
+from app.services.reconciliacion_service import ReconciliacionService
 from app.schemas.club_schema import club_schema, clubes_schema
 from app.schemas.cancha_schema import canchas_schema
+from app.schemas.regla_precio_schema import regla_precio_schema, reglas_precio_schema
 from app.auth.decorators import role_required
+from app.errors import ValidationError
+from datetime import datetime
 
 bp_club = Blueprint("club", __name__, url_prefix="/api/v1/clubes")
 
 club_service = ClubService(db)
+precio_service = PrecioService(db)
+reconciliacion_service = ReconciliacionService(db)
 
 # Listar todos los clubes (PÚBLICO - no requiere autenticación)
 @bp_club.get('/')
@@ -53,3 +60,134 @@ def listar_canchas_club(id):
     canchas = club.canchas
     return jsonify(canchas_schema.dump(canchas))
 
+
+# --- Reglas de precio por franja horaria ---
+
+# Listar las reglas de precio de un club (PÚBLICO)
+@bp_club.get('/<int:id>/reglas-precio')
+def listar_reglas_precio(id):
+    return jsonify(reglas_precio_schema.dump(precio_service.get_reglas(id))), 200
+
+# Crear una regla de precio (PROTEGIDO - admin y encargado)
+@bp_club.post('/<int:id>/reglas-precio')
+@jwt_required()
+@role_required(['admin', 'encargado'])
+def crear_regla_precio(id):
+    """
+    Body (JSON):
+        {
+            "hora_desde": "18:00",
+            "hora_hasta": "23:00",       (opcional, por defecto hasta el fin del día)
+            "precio": 18000,
+            "cancha_id": 3,              (opcional, por defecto todas las canchas del club)
+            "dia": "SAB",                (opcional, por defecto todos los días)
+            "fecha_desde": "2025-12-01", (opcional)
+            "fecha_hasta": "2026-02-28", (opcional)
+            "prioridad": 0               (opcional, gana la mayor)
+        }
+
+    Se aplica a los timeslots que se generen desde ahora. Para los ya
+    generados: POST /api/v1/clubes/<id>/reglas-precio/aplicar.
+    """
+    regla = precio_service.create_regla(id, request.get_json())
+    return jsonify(regla_precio_schema.dump(regla)), 201
+
+# Eliminar una regla de precio (PROTEGIDO - admin y encargado)
+@bp_club.delete('/<int:id>/reglas-precio/<int:regla_id>')
+@jwt_required()
+@role_required(['admin', 'encargado'])
+def eliminar_regla_precio(id, regla_id):
+    precio_service.delete_regla(id, regla_id)
+    return jsonify({"message": "Regla de precio eliminada exitosamente"}), 200
+
+# Recalcular el precio de los turnos libres futuros (PROTEGIDO - admin y encargado)
+@bp_club.post('/<int:id>/reglas-precio/aplicar')
+@jwt_required()
+@role_required(['admin', 'encargado'])
+def aplicar_reglas_precio(id):
+    """
+    Actualiza los timeslots DISPONIBLE futuros del club con el precio por hora
+    de su cancha y las reglas vigentes: un UPDATE de base y uno por regla.
+    Los turnos reservados conservan su precio.
+
+    Response (200):
+        {
+            "club_id": 1,
+            "desde": "2025-11-15T10:32",
+            "timeslots_afectados": 1180,
+            "reglas": [{"regla_id": 1, "actualizados": 420}, {"regla_id": 2, "actualizados": 48}]
+        }
+    """
+    club_service.get_by_id(id)
+    return jsonify(precio_service.repreciar(id)), 200
+
+
+# --- Horarios y reconciliación de timeslots ---
+
+# Reemplazar el horario semanal del club (PROTEGIDO - admin y encargado)
+@bp_club.put('/<int:id>/horarios')
+@jwt_required()
+@role_required(['admin', 'encargado'])
+def actualizar_horarios_club(id):
+    """
+    Body (JSON):
+        {
+            "horarios": [{"dia": "lunes", "abre": "08:00", "cierra": "21:00"}, ...],
+            "excedentes": "eliminar",   (opcional: "eliminar" o "bloquear")
+            "dry_run": false            (opcional: true solo informa qué cambiaría)
+        }
+
+    Los días que no figuran quedan cerrados. Los timeslots futuros ya
+    generados se alinean con el nuevo horario: se crean los turnos que faltan,
+    se eliminan (o bloquean) los libres que quedan afuera, se liberan los
+    que una reconciliación anterior bloqueó y vuelven a estar en horario, y
+    los reservados fuera de horario se conservan y se informan en 'conflictos'.
+
+    Response (200):
+        {
+            "club_id": 1, "desde": "2025-11-15T10:32", "hasta": "2026-02-12",
+            "excedentes": "eliminar", "dry_run": false,
+            "insertados": 0, "eliminados": 312, "bloqueados": 0, "desbloqueados": 0, "sin_cambios": 4680, "omitidos": 0,
+            "conflictos": [{"timeslot_id": 812, "cancha_id": 2, "inicio": "2025-11-20T21:00",
+                            "fin": "2025-11-20T22:00", "estado": "RESERVADO", "reserva_id": 55}],
+            "horarios": [{"dia": "LUN", "abre": "08:00", "cierra": "21:00"}, ...]
+        }
+    """
+    data = request.get_json() or {}
+    resultado = club_service.actualizar_horarios(
+        id, data.get('horarios'),
+        excedentes=data.get('excedentes', 'eliminar'),
+        dry_run=bool(data.get('dry_run', False))
+    )
+    return jsonify(resultado), 200
+
+# Reconciliar los timeslots generados con el horario y los cierres vigentes (PROTEGIDO - admin y encargado)
+@bp_club.post('/<int:id>/horarios/reconciliar')
+@jwt_required()
+@role_required(['admin', 'encargado'])
+def reconciliar_timeslots_club(id):
+    """
+    Body (JSON, opcional):
+        {
+            "desde": "2025-12-01",      (opcional, por defecto ahora)
+            "hasta": "2026-02-28",      (opcional, por defecto el último día generado)
+            "excedentes": "eliminar",   (opcional: "eliminar" o "bloquear")
+            "dry_run": false
+        }
+
+    Misma respuesta que PUT /api/v1/clubes/<id>/horarios, sin 'horarios'.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        desde = datetime.strptime(data['desde'], '%Y-%m-%d') if data.get('desde') else None
+        hasta = datetime.strptime(data['hasta'], '%Y-%m-%d').date() if data.get('hasta') else None
+    except (TypeError, ValueError):
+        raise ValidationError("Formato de fecha inválido. Use YYYY-MM-DD")
+    if desde is not None:
+        desde = max(desde, datetime.now())  # Los turnos pasados no se tocan
+    resultado = reconciliacion_service.reconciliar(
+        id, desde=desde, hasta=hasta,
+        excedentes=data.get('excedentes', 'eliminar'),
+        dry_run=bool(data.get('dry_run', False))
+    )
+    return jsonify(resultado), 200
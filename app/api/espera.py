@@ -0,0 +1,100 @@
+from flask import Blueprint, Response, jsonify, request
+import queue
+from flask_jwt_extended import jwt_required
+from app import db
+from app.auth.decorators import role_required
+from app.config import Config
+from app.services.espera_service import EsperaService, esperas_broker, canal_espera, evento_espera
+from app.schemas.espera_schema import espera_schema, esperas_schema, espera_publica_schema
+from app.pubsub import formatear_sse
+
+bp_espera = Blueprint("espera", __name__, url_prefix="/api/v1/esperas")
+
+espera_service = EsperaService(db)
+
+
+# Anotarse en la lista de espera
+@bp_espera.post("/")
+def create():
+    """
+    Anota a un cliente para un turno que hoy está ocupado.
+
+    Body (JSON):
+        {
+            "club_id": 1,
+            "cancha_id": 3,                  (opcional, por defecto cualquier cancha del club)
+            "desde": "2025-11-15T18:00",
+            "hasta": "2025-11-15T22:00",     (hasta 24 horas después de 'desde')
+            "cliente_nombre": "Ana",
+            "cliente_email": "ana@mail.com",
+            "cliente_telefono": "1122334455", (opcional)
+            "fuente": "WEB",
+            "auto_reservar": true            (opcional: reservar apenas se libere)
+        }
+
+    Cuando se cancela una reserva, cada turno liberado se ofrece a la espera
+    más antigua cuya ventana lo contiene: queda ASIGNADA (con su reserva) o
+    NOTIFICADA. El cambio se publica en GET /api/v1/esperas/<id>/stream.
+
+    Response (201): La espera creada
+    """
+    espera = espera_service.create(request.json)
+    return jsonify(espera_schema.dump(espera)), 201
+
+# Consultar el estado de una espera
+@bp_espera.get("/<int:id>")
+def get_by_id(id):
+    espera = espera_service.get_by_id(id)
+    return jsonify(espera_publica_schema.dump(espera)), 200
+
+# Avisos de la espera en vivo (Server-Sent Events)
+@bp_espera.get("/<int:id>/stream")
+def stream(id):
+    """
+    Mantiene la conexión abierta y envía un evento 'espera' cuando la espera
+    es atendida (turno asignado o liberado). El primer evento es su estado actual.
+
+    Se suscribe antes de leer la espera: si se atiende en el medio, el aviso
+    llega por la cola en lugar de perderse.
+    """
+    canal = canal_espera(id)
+    cola = esperas_broker.suscribir(canal)
+    try:
+        frame_inicial = formatear_sse("espera", evento_espera(espera_service.get_by_id(id)))
+    except Exception:
+        esperas_broker.desuscribir(canal, cola)
+        raise
+
+    def eventos():
+        try:
+            yield "retry: 5000\n\n" + frame_inicial
+            while True:
+                try:
+                    yield cola.get(timeout=Config.SSE_KEEPALIVE)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            esperas_broker.desuscribir(canal, cola)
+
+    return Response(
+        eventos(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Salir de la lista de espera
+@bp_espera.delete("/<int:id>")
+def cancelar(id):
+    """
+    Query Parameters:
+        email (str): Email con el que se anotó - REQUERIDO
+    """
+    espera_service.cancelar(id, request.args.get('email', ''))
+    return jsonify({"message": "Espera cancelada exitosamente"}), 200
+
+# Esperas pendientes de un club
+@bp_espera.get("/club/<int:club_id>")
+@jwt_required()
+@role_required(['admin', 'encargado'])
+def get_by_club(club_id):
+    return jsonify(esperas_schema.dump(espera_service.get_pendientes_por_club(club_id))), 200
@@ -14,13 +14,22 @@ def reservas_por_cliente():
     """Endpoint que devuelve las reservas agrupadas por cliente.
 
     Query params opcionales:
-    - q: búsqueda por nombre o email (contiene)
+    - q: búsqueda por prefijo de nombre o email, sin distinguir acentos
     - cliente_email: búsqueda exacta por email
+    - page: página de clientes (int, desde 1)
+    - per_page: clientes por página (int, máximo 200)
     """
     q = request.args.get('q')
     cliente_email = request.args.get('cliente_email')
+    page = request.args.get('page', type=int)
+    per_page = request.args.get('per_page', type=int)
 
-    resultado = reporte_service.get_reservas_por_cliente(q=q, cliente_email=cliente_email)
+    resultado = reporte_service.get_reservas_por_cliente(
+        q=q,
+        cliente_email=cliente_email,
+        page=page,
+        per_page=per_page
+    )
 
     return jsonify(resultado), 200
 
@@ -81,3 +90,11 @@ def utilizacion_mensual():
 
     resultado = reporte_service.get_utilizacion_mensual(cancha_id=cancha_id, fecha_inicio=fecha_inicio, fecha_fin=fecha_fin)
     return jsonify(resultado), 200
+
+
+@bp_reportes.get('/cache')
+@jwt_required()
+@role_required(['admin'])
+def estadisticas_cache():
+    """Endpoint que devuelve las estadísticas de la caché de reportes (hits, misses, desalojos)."""
+    return jsonify(reporte_service.get_cache_stats()), 200
@@ -2,12 +2,17 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
 from app import db
 from app.services.reserva_service import ReservaService
+from app.services.serie_reserva_service import SerieReservaService
 from app.schemas.reserva_schema import reserva_schema, reservas_schema
+from app.schemas.serie_reserva_schema import serie_reserva_schema
 from app.auth.decorators import role_required
+from app.errors import ValidationError
+from datetime import datetime
 
 bp_reserva = Blueprint("reserva", __name__, url_prefix="/api/v1/reservas")
 
 reserva_service = ReservaService()
+serie_service = SerieReservaService(db)
 
 # Obtener todas las reservas
 @bp_reserva.get("/")
@@ -67,3 +72,98 @@ def delete(id):
 
 
 
+
+# Reservar el mejor bloque de turnos consecutivos
+@bp_reserva.post("/bloque")
+def reservar_bloque():
+    """
+    Busca bloques de turnos libres consecutivos en una misma cancha y reserva
+    el que empieza antes (a igual hora, el más barato). Si otro cliente toma
+    el bloque mientras tanto, se reserva el siguiente candidato.
+
+    Body (JSON):
+        {
+            "club_id": 1,
+            "fecha_desde": "2025-11-15",
+            "fecha_hasta": "2025-11-16",     (opcional)
+            "horas": 2,
+            "hora_desde": "18:00",           (opcional)
+            "hora_hasta": "23:00",           (opcional)
+            "deporte": "Pádel",              (opcional)
+            "techado": true,                 (opcional)
+            "iluminacion": true,             (opcional)
+            "cancha_ids": [1, 2],            (opcional)
+            "cliente_nombre": "Ana",
+            "cliente_email": "ana@mail.com",
+            "cliente_telefono": "1122334455",
+            "fuente": "WEB"
+        }
+
+    Response (201): La reserva creada
+    Response (409): No hay bloques libres o fueron tomados por otras reservas
+    """
+    data = request.json
+    reserva = reserva_service.reservar_mejor_bloque(data)
+    return jsonify(reserva_schema.dump(reserva)), 201
+
+
+# --- Reservas recurrentes (series semanales) ---
+
+@bp_reserva.post("/series")
+@jwt_required()
+@role_required(['admin', 'encargado'])
+def create_serie():
+    """
+    Reserva la misma cancha todas las semanas (ej: martes 21:00) entre dos fechas.
+    Cada ocurrencia es una reserva común.
+
+    Body (JSON):
+        {
+            "cancha_id": 1,
+            "dia": "MAR",
+            "hora_inicio": "21:00",
+            "horas": 1,                      (opcional, turnos seguidos por ocurrencia)
+            "fecha_desde": "2025-03-01",
+            "fecha_hasta": "2025-11-30",
+            "cliente_nombre": "Los del martes",
+            "cliente_email": "martes@mail.com",
+            "cliente_telefono": "1122334455", (opcional)
+            "fuente": "PRESENCIAL",
+            "omitir_conflictos": false       (opcional)
+        }
+
+    Response (201):
+        {"serie": {...}, "ocurrencias": [{"reserva_id", "fecha", "inicio", "fin", "estado", "precio_total"}],
+         "conflictos": [{"fecha": "2025-05-20", "turnos": ["21:00"]}]}
+    Response (409): Hay ocurrencias con turnos ocupados; el detalle está en "detalle.conflictos".
+        Con "omitir_conflictos": true se reservan las demás y se informan en "conflictos".
+    """
+    data = request.json
+    resultado = serie_service.create(data)
+    return jsonify({**resultado, "serie": serie_reserva_schema.dump(resultado["serie"])}), 201
+
+@bp_reserva.get("/series/<int:id>")
+@jwt_required()
+@role_required(['admin', 'encargado'])
+def get_serie(id):
+    resultado = serie_service.get_detalle(id)
+    return jsonify({**resultado, "serie": serie_reserva_schema.dump(resultado["serie"])}), 200
+
+@bp_reserva.delete("/series/<int:id>")
+@jwt_required()
+@role_required(['admin', 'encargado'])
+def cancelar_serie(id):
+    """
+    Cancela de una vez las ocurrencias restantes de la serie y libera sus turnos.
+    Las ocurrencias pagadas se conservan.
+
+    Query Parameters:
+        desde (str): Cancelar las ocurrencias desde esta fecha YYYY-MM-DD (por defecto, ahora)
+    """
+    desde = request.args.get('desde')
+    if desde:
+        try:
+            desde = datetime.strptime(desde, '%Y-%m-%d')
+        except ValueError:
+            raise ValidationError("'desde' debe tener formato YYYY-MM-DD")
+    return jsonify(serie_service.cancelar(id, desde)), 200
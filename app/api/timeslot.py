@@ -1,11 +1,16 @@
 from flask import Blueprint, jsonify, request
 from app import db
 from app.services.timeslot_service import TimeslotService
+from app.services.mapa_disponibilidad_service import MapaDisponibilidadService
+from app.services.disponibilidad_service import DisponibilidadService
+from app.errors import ValidationError
 from datetime import datetime
 
 bp_timeslot = Blueprint("timeslot", __name__, url_prefix="/api/v1/timeslots")
 
 timeslot_service = TimeslotService(db)
+mapa_service = MapaDisponibilidadService(db)
+disponibilidad_service = DisponibilidadService(db)
 
 
 @bp_timeslot.get('/disponibilidad')
@@ -83,6 +88,94 @@ def get_disponibilidad():
         }), 500
 
 
+@bp_timeslot.get('/canchas-libres')
+def get_canchas_libres():
+    """
+    Canchas con turnos libres en una franja horaria, para uno o varios clubes.
+    Se resuelve con las máscaras de bits por (cancha, día), sin recorrer timeslots.
+    
+    Query Parameters:
+        club_id (str): ID del club, o varios separados por coma (ej: 1,2,3) - REQUERIDO
+        fecha (str): Fecha en formato YYYY-MM-DD - REQUERIDO
+        desde (str): Hora HH:MM - REQUERIDO
+        hasta (str): Hora HH:MM (00:00 = fin del día) - REQUERIDO
+    
+    Response (200):
+        {
+            "fecha": "2025-10-20",
+            "desde": "18:00",
+            "hasta": "22:00",
+            "turnos_en_franja": ["18:00", "19:00", "20:00", "21:00"],
+            "turnos_con_alguna_cancha_libre": ["18:00", "20:00", "21:00"],
+            "libres_por_turno": {"18:00": 2, "20:00": 1, "21:00": 3},
+            "total_libres_toda_la_franja": 1,
+            "canchas": [
+                {
+                    "cancha_id": 3,
+                    "club_id": 1,
+                    "turnos_libres": ["18:00", "20:00", "21:00"],
+                    "libre_toda_la_franja": false
+                }
+            ]
+        }
+    """
+    try:
+        club_ids = [int(c) for c in request.args.get('club_id', '').split(',') if c.strip()]
+        fecha = datetime.strptime(request.args.get('fecha', ''), '%Y-%m-%d').date()
+        desde = datetime.strptime(request.args.get('desde', ''), '%H:%M').time()
+        hasta = datetime.strptime(request.args.get('hasta', ''), '%H:%M').time()
+    except ValueError:
+        raise ValidationError("Parámetros requeridos: club_id (uno o varios separados por coma), "
+                              "fecha (YYYY-MM-DD), desde y hasta (HH:MM)")
+    if not club_ids:
+        raise ValidationError("El parámetro 'club_id' es requerido")
+    
+    return jsonify(mapa_service.canchas_libres(club_ids, fecha, desde, hasta)), 200
+
+
+@bp_timeslot.get('/bloques-libres')
+def get_bloques_libres():
+    """
+    Bloques de turnos libres consecutivos en una misma cancha (ej: 2 horas seguidas).
+    
+    Query Parameters:
+        club_id (int): ID del club - REQUERIDO
+        fecha_desde (str): Fecha YYYY-MM-DD - REQUERIDO
+        fecha_hasta (str): Fecha YYYY-MM-DD (por defecto fecha_desde, hasta 31 días)
+        horas (int): Duración del bloque en horas - REQUERIDO
+        hora_desde, hora_hasta (str): Franja diaria HH:MM en la que debe caer el bloque
+        deporte (str), techado (bool), iluminacion (bool): Filtros de cancha
+        cancha_id (str): ID de cancha, o varios separados por coma
+        limit (int): Cantidad máxima de bloques (por defecto 20, máximo 200)
+    
+    Response (200):
+        {
+            "club_id": 1,
+            "fecha_desde": "2025-11-15",
+            "fecha_hasta": "2025-11-15",
+            "horas": 2,
+            "total": 1,
+            "bloques": [
+                {
+                    "cancha_id": 3,
+                    "nombre": "Cancha 3",
+                    "inicio": "2025-11-15T18:00",
+                    "fin": "2025-11-15T20:00",
+                    "precio_total": 30000.0,
+                    "slots": [
+                        {"cancha_id": 3, "inicio": "2025-11-15T18:00", "timeslot_id": 120},
+                        {"cancha_id": 3, "inicio": "2025-11-15T19:00", "timeslot_id": 121}
+                    ]
+                }
+            ]
+        }
+    
+    Los bloques se ordenan por inicio y, a igual hora, por precio. 'slots' se puede
+    enviar tal cual a POST /api/v1/reservas/.
+    """
+    return jsonify(disponibilidad_service.bloques_libres(request.args)), 200
+
+
 @bp_timeslot.post('/generar')
 def generar_timeslots():
     """
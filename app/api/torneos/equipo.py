@@ -5,6 +5,7 @@ from app import db
 from app.auth.decorators import role_required
 from app.services.torneos.equipo_service import EquipoService
 from app.schemas.torneos.equipo_schema import equipo_schema, equipos_schema
+from app.schemas.torneos.partido_schema import partidos_schema
 
 bp_equipo = Blueprint("equipo", __name__, url_prefix="/api/v1/equipos")
 equipo_service = EquipoService(db)
@@ -25,6 +26,19 @@ def get_equipo(equipo_id):
     equipo = equipo_service.get_by_id(equipo_id)
     return jsonify(equipo_schema.dump(equipo)), 200
 
+# Historial de partidos de un equipo (paginado)
+@bp_equipo.get("/<int:equipo_id>/partidos")
+def get_partidos_equipo(equipo_id):
+    page = request.args.get('page', type=int)
+    per_page = request.args.get('per_page', type=int)
+    resultado = equipo_service.get_partidos(equipo_id, page, per_page)
+    return jsonify({
+        "data": partidos_schema.dump(resultado["data"]),
+        "page": resultado["page"],
+        "per_page": resultado["per_page"],
+        "total": resultado["total"]
+    }), 200
+
 # Crear un nuevo equipo
 @jwt_required()
 @role_required(["admin", "org_torneo"])
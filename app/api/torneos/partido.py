@@ -55,4 +55,12 @@ def registrar_resultado(id):
         "message": "Resultado registrado exitosamente"
     }), 200
 
-
+# Registrar varios resultados a la vez (por ejemplo, una fecha completa)
+@bp_partido.patch('/resultados')
+def registrar_resultados():
+    data = request.get_json()
+    partidos = partido_service.registrar_resultados(data)
+    return jsonify({
+        "data": partidos_schema.dump(partidos),
+        "message": f"{len(partidos)} resultados registrados exitosamente"
+    }), 200
@@ -1,12 +1,16 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
+import queue
 from flask_jwt_extended import jwt_required
 from app import db
 from app.auth.decorators import role_required
-from app.services.torneos.torneo_service import TorneoService
+from app.services.torneos.torneo_service import TorneoService, parse_expand
+from app.services.torneos.posicion_service import posiciones_broker, canal_torneo
+from app.config import Config
 from app.services.torneos.equipo_service import EquipoService
-from app.schemas.torneos.torneo_schema import torneo_schema, torneos_schema
+from app.schemas.torneos.torneo_schema import torneo_schema, torneo_schema_para
 from app.schemas.torneos.equipo_schema import equipo_schema, equipos_schema
 from app.schemas.torneos.tabla_schema import tabla_posiciones_schema
+from app.schemas.torneos.partido_schema import partidos_schema
 
 bp_torneo = Blueprint("torneo", __name__, url_prefix="/api/v1/torneos")
 torneo_service = TorneoService(db)
@@ -15,28 +19,31 @@ equipo_service = EquipoService(db)
 # Obtener todos los torneos
 @bp_torneo.get("/")
 def get_torneos():
-    torneos = torneo_service.get_all()
+    expand = parse_expand(request.args.get('expand'))
+    torneos = torneo_service.get_all(expand)
     return jsonify({
             "status": "success",
-            "data": torneos_schema.dump(torneos)
+            "data": torneo_schema_para(expand, many=True).dump(torneos)
         }), 200
 
 # Obtener torneo por id
 @bp_torneo.get("/<int:id_torneo>")
 def get_torneo_detalle(id_torneo):
-    torneo = torneo_service.get_by_id(id_torneo)
+    expand = parse_expand(request.args.get('expand'))
+    torneo = torneo_service.get_by_id(id_torneo, expand)
     return jsonify({
             "status": "success",
-            "data": torneo_schema.dump(torneo)
+            "data": torneo_schema_para(expand, detalle=True).dump(torneo)
         }), 200
 
 # Obtener torneos activos
 @bp_torneo.get("/activos")
 def get_torneos_activos():
-    torneos = torneo_service.get_torneos_activos()
+    expand = parse_expand(request.args.get('expand'))
+    torneos = torneo_service.get_torneos_activos(expand)
     return jsonify({
             "status": "success",
-            "data": torneos_schema.dump(torneos)
+            "data": torneo_schema_para(expand, many=True).dump(torneos)
         }), 200
 
 # Obtener torneos por rango de fechas
@@ -44,10 +51,11 @@ def get_torneos_activos():
 def get_torneos_por_fecha():
     fecha_inicio = request.args.get('fecha_inicio')
     fecha_fin = request.args.get('fecha_fin')
-    torneos = torneo_service.get_torneos_por_fecha(fecha_inicio, fecha_fin)
+    expand = parse_expand(request.args.get('expand'))
+    torneos = torneo_service.get_torneos_por_fecha(fecha_inicio, fecha_fin, expand)
     return jsonify({
             "status": "success",
-            "data": torneos_schema.dump(torneos),
+            "data": torneo_schema_para(expand, many=True).dump(torneos),
             "filtros": {
                 "fecha_inicio": fecha_inicio,
                 "fecha_fin": fecha_fin
@@ -57,10 +65,11 @@ def get_torneos_por_fecha():
 # Obtener torneos por club
 @bp_torneo.get("/club/<int:club_id>")
 def get_torneos_por_club(club_id):
-    torneos = torneo_service.get_by_club(club_id)
+    expand = parse_expand(request.args.get('expand'))
+    torneos = torneo_service.get_by_club(club_id, expand)
     return jsonify({
             "status": "success",
-            "data": torneos_schema.dump(torneos)
+            "data": torneo_schema_para(expand, many=True).dump(torneos)
         }), 200
 
 # Obtener equipos de un torneo
@@ -85,6 +94,45 @@ def get_tabla_de_posiciones(id_torneo):
             "data": tabla_posiciones_schema.dump(tabla_data)
         }), 200
 
+# Tabla de posiciones en vivo (Server-Sent Events)
+@bp_torneo.get("/<int:id_torneo>/posiciones/stream")
+def stream_tabla_de_posiciones(id_torneo):
+    """
+    Mantiene la conexión abierta y envía eventos 'posiciones' (tabla completa)
+    y 'resultado' (partido actualizado) cada vez que se registra un resultado.
+    El primer evento es la tabla actual.
+
+    El generador no usa la base ni el contexto del request, así la sesión
+    se libera al terminar la vista y no queda una conexión por espectador.
+
+    Se suscribe antes de leer la tabla: un resultado publicado en el medio
+    llega por la cola en lugar de perderse.
+    """
+    canal = canal_torneo(id_torneo)
+    cola = posiciones_broker.suscribir(canal)
+    try:
+        frame_inicial = torneo_service.get_frame_posiciones(id_torneo)
+    except Exception:
+        posiciones_broker.desuscribir(canal, cola)
+        raise
+
+    def eventos():
+        try:
+            yield "retry: 5000\n\n" + frame_inicial
+            while True:
+                try:
+                    yield cola.get(timeout=Config.SSE_KEEPALIVE)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            posiciones_broker.desuscribir(canal, cola)
+
+    return Response(
+        eventos(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Crear un nuevo torneo
 @bp_torneo.post("/")
 @jwt_required()
@@ -135,6 +183,40 @@ def agregar_equipo_torneo(id_torneo):
             "data": torneo_schema.dump(torneo)
         }), 200
 
+# Generar el fixture de un torneo
+@bp_torneo.post("/<int:id_torneo>/fixture")
+@jwt_required()
+@role_required(["admin", "org_torneo"])
+def generar_fixture_torneo(id_torneo):
+    resultado = torneo_service.generar_fixture(id_torneo, request.get_json(silent=True))
+    creados = resultado["partidos_creados"]
+    return jsonify({
+            "status": "success",
+            "message": f"Fixture generado: {creados} partidos creados" if creados else "El fixture ya estaba generado",
+            "data": {
+                "formato": resultado["formato"],
+                "ronda": resultado["ronda"],
+                "partidos_creados": creados,
+                "partidos": partidos_schema.dump(resultado["partidos"])
+            }
+        }), 201 if creados else 200
+
+# Programar los partidos del torneo en turnos disponibles del club
+@bp_torneo.post("/<int:id_torneo>/programacion")
+@jwt_required()
+@role_required(["admin", "org_torneo"])
+def programar_partidos_torneo(id_torneo):
+    resultado = torneo_service.programar_partidos(id_torneo, request.get_json(silent=True))
+    return jsonify({
+            "status": "success",
+            "message": f"{resultado['partidos_programados']} partidos programados",
+            "data": {
+                "partidos_programados": resultado["partidos_programados"],
+                "sin_programar": resultado["sin_programar"],
+                "partidos": partidos_schema.dump(resultado["partidos"])
+            }
+        }), 200
+
 # Eliminar un torneo
 @bp_torneo.delete("/<int:id_torneo>")
 @jwt_required()
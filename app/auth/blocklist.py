@@ -0,0 +1,120 @@
+"""
+Lista de JWT revocados (logout), consultada en cada request protegido.
+
+La fuente de verdad es la tabla 'token_revocado'. Cada proceso guarda en
+memoria los jti revocados que aún no vencieron y recarga ese conjunto cada
+JWT_BLOCKLIST_REFRESCO segundos, así la verificación es una búsqueda en un
+set y no una consulta. Una revocación hecha en este proceso se ve al
+instante; una hecha en otro worker, a más tardar en el próximo refresco.
+
+La recarga corre dentro de la verificación del JWT, así que no escribe en la
+base y si falla no rechaza el request: se sigue con el conjunto anterior
+hasta el próximo intento. Los vencidos se borran aparte, con
+'flask purgar-tokens-revocados'.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app
+
+from app import db
+from app.config import Config
+from app.errors import AppError
+from app.repositories.token_revocado_repo import TokenRevocadoRepository
+
+
+class Blocklist:
+    """Conjunto en memoria de jti revocados, recargado periódicamente desde la base."""
+
+    def __init__(self, refresco=15):
+        """
+        Args:
+            refresco (float): Segundos entre recargas desde la base
+        """
+        self.refresco = refresco
+        self.repo = TokenRevocadoRepository()
+        self._jtis = {}  # jti -> vencimiento (datetime UTC naive)
+        self._recientes = {}  # revocados en este proceso que quizás la recarga todavía no ve
+        self._proximo_refresco = 0.0
+        self._lock = threading.Lock()
+
+    def contiene(self, jti):
+        """Indica si el token fue revocado. Recarga desde la base si toca."""
+        if time.monotonic() >= self._proximo_refresco:
+            self.refrescar()
+        return jti in self._jtis
+
+    def revocar(self, payload):
+        """
+        Revoca el token descripto por 'payload' (los claims decodificados).
+        No hace commit: lo hace el servicio que llama.
+        """
+        expira_en = datetime.fromtimestamp(payload["exp"], tz=timezone.utc).replace(tzinfo=None)
+        user_id = payload.get("sub")
+        self.repo.revocar(
+            jti=payload["jti"],
+            tipo=payload.get("type", "access"),
+            user_id=int(user_id) if user_id is not None and str(user_id).isdigit() else None,
+            expira_en=expira_en
+        )
+        self._recientes[payload["jti"]] = expira_en
+        self._jtis[payload["jti"]] = expira_en
+
+    def refrescar(self, forzar=False):
+        """
+        Recarga los jti vigentes desde la base. Un solo hilo por vez; los
+        demás siguen con el conjunto anterior en lugar de esperar.
+
+        Si la consulta falla (base bloqueada, conexión caída) se registra, se
+        conserva el conjunto anterior y se reintenta en el próximo refresco,
+        no en cada request.
+        """
+        if not self._lock.acquire(blocking=forzar):
+            return
+        try:
+            ahora = time.monotonic()
+            if not forzar and ahora < self._proximo_refresco:
+                return
+            self._proximo_refresco = ahora + self.refresco
+            try:
+                vigentes = dict(self.repo.get_vigentes())
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.warning(f"No se pudo recargar la lista de tokens revocados: {e}")
+                return
+            # Lo revocado acá mientras corría la consulta se conserva hasta verlo en la base
+            utc_ahora = datetime.utcnow()
+            self._recientes = {jti: exp for jti, exp in list(self._recientes.items())
+                               if jti not in vigentes and exp > utc_ahora}
+            vigentes.update(self._recientes)
+            # Se reemplaza el dict entero: los lectores nunca ven uno a medio cargar
+            self._jtis = vigentes
+        finally:
+            self._lock.release()
+
+    def purgar(self, lote=5000):
+        """
+        Borra los tokens vencidos de la base y de memoria, de a 'lote' filas,
+        cada lote en su propia transacción. Devuelve las filas borradas.
+
+        Raises:
+            AppError: Si falla un lote (los anteriores quedan confirmados)
+        """
+        ahora = datetime.utcnow()
+        borrados = 0
+        while True:
+            try:
+                borrados_lote = self.repo.purgar_lote_vencidos(ahora, lote)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                raise AppError(f"Error al purgar los tokens revocados: {str(e)}")
+            borrados += borrados_lote
+            if borrados_lote < lote:
+                break
+        self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > ahora}
+        return borrados
+
+
+token_blocklist = Blocklist(refresco=Config.JWT_BLOCKLIST_REFRESCO)
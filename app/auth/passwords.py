@@ -0,0 +1,107 @@
+"""
+Hash y verificación de contraseñas en un pool de hilos acotado.
+
+scrypt y pbkdf2 (hashlib) liberan el GIL mientras calculan, así que el pool
+aprovecha los núcleos disponibles y, sobre todo, limita cuántos hashes se
+calculan a la vez: en una ráfaga de logins el resto de los requests sigue
+atendiéndose y el exceso se rechaza rápido con 503 en lugar de encolarse
+sin límite.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash
+from app.config import Config
+from app.errors import ServiceUnavailableError
+
+
+class PasswordHasher:
+    """
+    Calcula y verifica hashes con parámetros de costo configurables.
+    """
+
+    def __init__(self, method, workers, max_pendientes, timeout):
+        """
+        Args:
+            method (str): Método de werkzeug con sus parámetros, ej: 'scrypt:32768:8:1'
+            workers (int): Hilos que calculan hashes en paralelo
+            max_pendientes (int): Cálculos que pueden esperar turno antes de rechazar con 503
+            timeout (float): Segundos máximos de espera por un resultado
+        """
+        self.method = method
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="password-hash")
+        self._cupos = threading.BoundedSemaphore(max(workers, 1) + max(max_pendientes, 0))
+        self._hash_referencia = None
+
+    def reconfigurar(self, method):
+        """Cambia el método/costo de hash (los hashes existentes se actualizan al hacer login)."""
+        self.method = method
+        self._hash_referencia = None
+
+    def _ejecutar(self, fn, *args):
+        """Corre 'fn' en el pool respetando el límite de trabajos en curso."""
+        if not self._cupos.acquire(blocking=False):
+            raise ServiceUnavailableError("Demasiados inicios de sesión simultáneos, reintentar en unos segundos")
+        try:
+            futuro = self._pool.submit(fn, *args)
+        except Exception:
+            self._cupos.release()
+            raise
+        futuro.add_done_callback(lambda _f: self._cupos.release())
+        try:
+            return futuro.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise ServiceUnavailableError("El servidor está ocupado, reintentar en unos segundos")
+
+    def hash(self, password):
+        """Genera el hash de una contraseña con el método configurado."""
+        return self._ejecutar(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """Verifica una contraseña contra su hash (con los parámetros guardados en el hash)."""
+        return self._ejecutar(check_password_hash, password_hash, password)
+
+    def _referencia(self):
+        """Hash de referencia con los parámetros actuales (se calcula una sola vez)."""
+        if self._hash_referencia is None:
+            self._hash_referencia = self.hash("")
+        return self._hash_referencia
+
+    def needs_rehash(self, password_hash):
+        """
+        Indica si el hash se generó con parámetros distintos a los configurados
+        (método, costo), en cuyo caso conviene regenerarlo en el próximo login.
+        """
+        return password_hash.split("$", 1)[0] != self._referencia().split("$", 1)[0]
+
+    def verify_dummy(self, password):
+        """
+        Hace una verificación de costo equivalente contra un hash de relleno.
+        Se usa cuando el usuario no existe, para que el tiempo de respuesta
+        no revele qué emails están registrados.
+        """
+        self.verify(self._referencia(), password)
+        return False
+
+
+password_hasher = PasswordHasher(
+    method=Config.PASSWORD_HASH_METHOD,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_pendientes=Config.PASSWORD_HASH_MAX_PENDIENTES,
+    timeout=Config.PASSWORD_HASH_TIMEOUT
+)
+
+
+def hash_password(password):
+    """Genera el hash de una contraseña (ver PasswordHasher.hash)."""
+    return password_hasher.hash(password)
+
+
+def verify_password(password_hash, password):
+    """Verifica una contraseña contra su hash (ver PasswordHasher.verify)."""
+    return password_hasher.verify(password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """Indica si el hash usa parámetros viejos (ver PasswordHasher.needs_rehash)."""
+    return password_hasher.needs_rehash(password_hash)
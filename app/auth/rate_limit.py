@@ -0,0 +1,196 @@
+"""
+Límite de solicitudes con token buckets y backends intercambiables.
+
+Cada clave (ej: "ip:1.2.3.4" o "email:ana@x.com") tiene un balde con
+'capacidad' fichas que se recarga a 'tasa' fichas por segundo. Cada intento
+consume una ficha de cada uno de sus baldes, todas o ninguna: si a alguno le
+faltan, se rechaza sin descontar de los demás e informa cuándo reintentar.
+
+Backends:
+- MemoriaBackend: diccionario en memoria, para un solo proceso.
+- SQLiteBackend: archivo SQLite compartido, para varios workers en un mismo host.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request
+
+from app.config import Config
+from app.errors import TooManyRequestsError
+
+
+def _recargar(fichas, ultimo, ahora, capacidad, tasa):
+    """Aplica la recarga transcurrida desde 'ultimo' y devuelve las fichas del balde."""
+    return min(capacidad, fichas + max(ahora - ultimo, 0) * tasa)
+
+
+def _consumir_todos(fichas, tasas, costo):
+    """
+    Consume 'costo' fichas de cada balde solo si todos las tienen.
+
+    Args:
+        fichas (list[float]): Fichas de cada balde, ya recargadas
+        tasas (list[float]): Recarga por segundo de cada balde
+
+    Returns:
+        tuple[list[float], bool, float]: Fichas a guardar, si se permitió y
+            segundos hasta poder reintentar (el mayor entre los baldes sin fichas)
+    """
+    esperas = [(costo - f) / tasa for f, tasa in zip(fichas, tasas) if f < costo]
+    if esperas:
+        return fichas, False, max(esperas)
+    return [f - costo for f in fichas], True, 0.0
+
+
+class MemoriaBackend:
+    """Baldes en memoria del proceso, acotados en cantidad de claves (LRU)."""
+
+    def __init__(self, max_claves=100_000):
+        self.max_claves = max_claves
+        self._baldes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consumir(self, baldes, costo=1):
+        """
+        Args:
+            baldes (list[tuple[str, int, float]]): (clave, capacidad, tasa por segundo)
+
+        Returns:
+            tuple[bool, float]: Si se permitió y segundos hasta poder reintentar
+        """
+        ahora = time.monotonic()
+        with self._lock:
+            fichas = []
+            for clave, capacidad, tasa in baldes:
+                guardadas, ultimo = self._baldes.pop(clave, (capacidad, ahora))
+                fichas.append(_recargar(guardadas, ultimo, ahora, capacidad, tasa))
+            fichas, permitido, espera = _consumir_todos(fichas, [b[2] for b in baldes], costo)
+            for (clave, _capacidad, _tasa), restantes in zip(baldes, fichas):
+                self._baldes[clave] = (restantes, ahora)
+            while len(self._baldes) > self.max_claves:
+                self._baldes.popitem(last=False)
+            return permitido, espera
+
+    def reiniciar(self):
+        with self._lock:
+            self._baldes.clear()
+
+
+class SQLiteBackend:
+    """
+    Baldes en un archivo SQLite compartido entre procesos.
+    Cada consumo es una transacción BEGIN IMMEDIATE, así dos workers no
+    pueden leer y escribir los mismos baldes a la vez.
+    """
+
+    def __init__(self, path, purgar_cada=1000):
+        self.path = path
+        self.purgar_cada = purgar_cada
+        self._local = threading.local()
+        self._operaciones = 0
+        directorio = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directorio, exist_ok=True)
+        with self._conexion() as con:
+            con.execute("CREATE TABLE IF NOT EXISTS balde (clave TEXT PRIMARY KEY, fichas REAL NOT NULL, ultimo REAL NOT NULL)")
+
+    def _conexion(self):
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            con.execute("PRAGMA journal_mode=WAL")
+            self._local.con = con
+        return con
+
+    def consumir(self, baldes, costo=1):
+        """Igual que MemoriaBackend.consumir, en una sola transacción."""
+        ahora = time.time()
+        con = self._conexion()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            fichas = []
+            for clave, capacidad, tasa in baldes:
+                fila = con.execute("SELECT fichas, ultimo FROM balde WHERE clave = ?", (clave,)).fetchone()
+                guardadas, ultimo = fila if fila else (capacidad, ahora)
+                fichas.append(_recargar(guardadas, ultimo, ahora, capacidad, tasa))
+            fichas, permitido, espera = _consumir_todos(fichas, [b[2] for b in baldes], costo)
+            con.executemany(
+                "INSERT INTO balde (clave, fichas, ultimo) VALUES (?, ?, ?) "
+                "ON CONFLICT(clave) DO UPDATE SET fichas = excluded.fichas, ultimo = excluded.ultimo",
+                [(clave, restantes, ahora) for (clave, _capacidad, _tasa), restantes in zip(baldes, fichas)]
+            )
+            self._operaciones += 1
+            if self._operaciones % self.purgar_cada == 0:
+                # Un balde que lleva una hora sin uso ya está lleno: no hace falta guardarlo
+                con.execute("DELETE FROM balde WHERE ultimo < ?", (ahora - 3600,))
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        return permitido, espera
+
+    def reiniciar(self):
+        self._conexion().execute("DELETE FROM balde")
+
+
+class RateLimiter:
+    """Aplica uno o más límites (capacidad, recarga por minuto) sobre un backend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def verificar(self, limites):
+        """
+        Consume una ficha de cada balde y lanza 429 si alguno está vacío; en
+        ese caso no descuenta de ninguno (un email bloqueado no gasta el cupo de la IP).
+
+        Args:
+            limites (list[tuple[str, int, float]]): (clave, capacidad, recarga_por_minuto)
+
+        Raises:
+            TooManyRequestsError: Con el mayor tiempo de espera entre los baldes agotados
+        """
+        permitido, espera = self.backend.consumir(
+            [(clave, capacidad, por_minuto / 60.0) for clave, capacidad, por_minuto in limites]
+        )
+        if not permitido:
+            raise TooManyRequestsError(
+                "Demasiados intentos de inicio de sesión. Reintentar más tarde.",
+                retry_after=max(1, math.ceil(espera))
+            )
+
+
+def crear_backend(nombre):
+    """Crea el backend configurado ('memoria' o 'sqlite')."""
+    if nombre == "sqlite":
+        return SQLiteBackend(Config.LOGIN_RATE_LIMIT_SQLITE_PATH)
+    if nombre == "memoria":
+        return MemoriaBackend()
+    raise ValueError(f"Backend de rate limit desconocido: {nombre}")
+
+
+login_limiter = RateLimiter(crear_backend(Config.LOGIN_RATE_LIMIT_BACKEND))
+
+
+def limitar_login(fn):
+    """
+    Decorador para el endpoint de login: limita por IP y por email antes de
+    que se haga cualquier verificación de contraseña.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if Config.LOGIN_RATE_LIMIT_ENABLED:
+            limites = [("ip:" + (request.remote_addr or "desconocida"),
+                        Config.LOGIN_RATE_IP_CAPACIDAD, Config.LOGIN_RATE_IP_POR_MINUTO)]
+            data = request.get_json(silent=True) or {}
+            email = data.get("email")
+            if isinstance(email, str) and email.strip():
+                limites.append(("email:" + email.strip().lower(),
+                                Config.LOGIN_RATE_EMAIL_CAPACIDAD, Config.LOGIN_RATE_EMAIL_POR_MINUTO))
+            login_limiter.verificar(limites)
+        return fn(*args, **kwargs)
+    return wrapper
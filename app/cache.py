@@ -0,0 +1,123 @@
+"""
+Caché en memoria con expiración por tiempo (TTL) y desalojo LRU.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Caché acotada en cantidad de entradas, segura para múltiples hilos.
+
+    Cada entrada puede llevar un 'tag' arbitrario que luego se usa para
+    invalidar selectivamente (por ejemplo, el rango de fechas que cubre).
+    """
+
+    def __init__(self, max_entries=256, ttl=60):
+        """
+        Args:
+            max_entries (int): Cantidad máxima de entradas antes de desalojar la menos usada
+            ttl (float): Segundos de validez de cada entrada
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key, default=None):
+        """Devuelve el valor cacheado para 'key' o 'default' si no existe o expiró."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self._misses += 1
+                return default
+
+            value, expires_at, _tag = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key, value, tag=None):
+        """Guarda un valor, desalojando la entrada menos usada si se supera el límite."""
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl, tag)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_set(self, key, factory, tag=None):
+        """
+        Devuelve el valor cacheado o lo calcula con 'factory' y lo guarda.
+
+        El cálculo se hace fuera del lock para no serializar consultas lentas.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value, tag=tag)
+        return value
+
+    def delete(self, key):
+        """
+        Elimina una entrada por su clave, sin recorrer la caché.
+
+        Returns:
+            bool: True si la entrada existía
+        """
+        with self._lock:
+            if self._data.pop(key, _MISSING) is _MISSING:
+                return False
+            self._invalidations += 1
+            return True
+
+    def invalidate(self, predicate=None):
+        """
+        Elimina las entradas cuyo tag cumple 'predicate' (todas si es None).
+
+        Returns:
+            int: Cantidad de entradas eliminadas
+        """
+        with self._lock:
+            if predicate is None:
+                keys = list(self._data.keys())
+            else:
+                keys = [k for k, (_v, _exp, tag) in self._data.items() if predicate(tag)]
+            for key in keys:
+                del self._data[key]
+            self._invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """Vacía la caché y reinicia las estadísticas."""
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = self._invalidations = 0
+
+    def stats(self):
+        """Devuelve estadísticas de uso para ajustar tamaño y TTL."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entradas": len(self._data),
+                "max_entradas": self.max_entries,
+                "ttl_segundos": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / total, 4) if total else 0.0,
+                "desalojos": self._evictions,
+                "invalidaciones": self._invalidations,
+            }
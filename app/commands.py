@@ -0,0 +1,105 @@
+"""
+Comandos de mantenimiento para la CLI de Flask (flask <comando>).
+"""
+import click
+
+
+def register_commands(app):
+    """Registra los comandos de mantenimiento en la aplicación."""
+
+    @app.cli.command("recalcular-posiciones")
+    @click.option("--torneo-id", type=int, default=None, help="Recalcular solo este torneo (por defecto, todos).")
+    def recalcular_posiciones(torneo_id):
+        """Reconstruye la tabla de posiciones persistida a partir de los partidos."""
+        from app import db
+        from app.models.torneo import Torneo
+        from app.services.torneos.torneo_service import TorneoService
+
+        torneo_service = TorneoService(db)
+        torneo_ids = [torneo_id] if torneo_id else [t.id for t in Torneo.query.all()]
+
+        for tid in torneo_ids:
+            equipos = torneo_service.recalcular_tabla_posiciones(tid)
+            click.echo(f"Torneo {tid}: {equipos} equipos con posiciones recalculadas")
+
+    @app.cli.command("anular-empates-sin-jugar")
+    @click.option("--torneo-id", type=int, default=None, help="Solo este torneo (por defecto, todos).")
+    @click.option("--dry-run", is_flag=True, help="Solo listar los partidos que se anularían.")
+    def anular_empates_sin_jugar(torneo_id, dry_run):
+        """
+        Deja sin resultado los 0-0 sin ganador que no se modificaron desde su
+        creación (el resultado por defecto de antes de que los goles admitieran
+        NULL) y reconstruye la tabla de posiciones de esos torneos.
+
+        Un empate real registrado sobre el 0-0 por defecto no cambia la fila y
+        cae en el mismo criterio: revisar la lista con --dry-run antes de aplicarlo.
+        """
+        from app import db
+        from app.models.partido import Partido
+        from app.services.torneos.torneo_service import TorneoService
+
+        query = Partido.query.filter(
+            Partido.goles_equipo1 == 0, Partido.goles_equipo2 == 0,
+            Partido.ganador_id.is_(None), Partido.updated_at == Partido.created_at
+        )
+        if torneo_id:
+            query = query.filter(Partido.torneo_id == torneo_id)
+        partidos = query.order_by(Partido.torneo_id, Partido.id).all()
+
+        por_torneo = {}
+        for partido in partidos:
+            por_torneo.setdefault(partido.torneo_id, []).append(partido.id)
+        for tid, ids in por_torneo.items():
+            click.echo(f"Torneo {tid}: {len(ids)} partidos 0-0 sin modificar ({', '.join(map(str, ids))})")
+        if dry_run or not partidos:
+            click.echo(f"{len(partidos)} partidos {'se anularían' if dry_run else 'para anular'}")
+            return
+
+        for partido in partidos:
+            partido.goles_equipo1 = None
+            partido.goles_equipo2 = None
+        db.session.commit()
+
+        torneo_service = TorneoService(db)
+        for tid in por_torneo:
+            torneo_service.recalcular_tabla_posiciones(tid)
+        click.echo(f"Se anularon {len(partidos)} partidos y se recalcularon {len(por_torneo)} tablas de posiciones")
+
+    @app.cli.command("purgar-tokens-revocados")
+    def purgar_tokens_revocados():
+        """Borra de la lista de revocados los tokens que ya vencieron."""
+        from app.auth.blocklist import token_blocklist
+
+        borrados = token_blocklist.purgar()
+        click.echo(f"Se borraron {borrados} tokens revocados vencidos")
+
+    @app.cli.command("recalcular-disponibilidad")
+    @click.option("--desde", "fecha_desde", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+                  help="Recalcular solo desde esta fecha (YYYY-MM-DD).")
+    def recalcular_disponibilidad(fecha_desde):
+        """Reconstruye las máscaras de disponibilidad por cancha y día desde los timeslots."""
+        from app import db
+        from app.services.mapa_disponibilidad_service import MapaDisponibilidadService
+
+        filas = MapaDisponibilidadService(db).reconstruir(fecha_desde.date() if fecha_desde else None)
+        click.echo(f"Se recalcularon {filas} días de cancha")
+
+    @app.cli.command("podar-historial")
+    @click.option("--club-id", type=int, default=None, help="Podar solo este club (por defecto, todos).")
+    @click.option("--lote", type=click.IntRange(min=1), default=None, help="Filas por transacción (por defecto RETENCION_LOTE).")
+    @click.option("--pausa", type=click.FloatRange(min=0), default=None, help="Segundos entre lotes (por defecto RETENCION_PAUSA).")
+    @click.option("--dry-run", is_flag=True, help="Solo informar cuánto se borraría y archivaría.")
+    def podar_historial(club_id, lote, pausa, dry_run):
+        """Borra los turnos libres pasados y archiva las reservas pasadas según la retención de cada club."""
+        from app import db
+        from app.services.retencion_service import RetencionService
+
+        for r in RetencionService(db).podar(club_id, lote=lote, pausa=pausa, dry_run=dry_run):
+            if dry_run:
+                click.echo(f"Club {r['club_id']}: se borrarían {r['timeslots_eliminados']} turnos libres "
+                           f"anteriores al {r['libres_antes']} y se archivarían {r['reservas_archivadas']} "
+                           f"reservas anteriores al {r['reservas_antes']}")
+            else:
+                click.echo(f"Club {r['club_id']}: {r['timeslots_eliminados']} turnos libres borrados, "
+                           f"{r['reservas_archivadas']} reservas ({r['timeslots_archivados']} turnos) "
+                           f"archivadas en {r['lotes']} lotes")
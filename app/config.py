@@ -10,4 +10,57 @@ class Config:
     # Configuración JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'tu-secret-key-super-segura-cambiala-en-produccion')
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 hora en segundos
-    JWT_REFRESH_TOKEN_EXPIRES = 2592000  # 30 días en segundos
\ No newline at end of file
+    JWT_REFRESH_TOKEN_EXPIRES = 2592000  # 30 días en segundos
+
+    # Caché de reportes
+    REPORTES_CACHE_TTL = int(os.getenv('REPORTES_CACHE_TTL', 60))  # segundos
+    REPORTES_CACHE_MAX_ENTRIES = int(os.getenv('REPORTES_CACHE_MAX_ENTRIES', 256))
+
+    # 'materializada': una fila de timeslot por turno, generadas de antemano (90 días).
+    # 'virtual': los turnos libres se calculan desde horarios, cierres y bloqueos;
+    # solo se guardan los reservados/retenidos (ver app/services/disponibilidad_service.py).
+    DISPONIBILIDAD_MODO = os.getenv('DISPONIBILIDAD_MODO', 'materializada')
+
+    # Caché de datos de autorización por usuario (rol, club, activo) para refresh y /me.
+    # El TTL es el tiempo máximo que tarda en aplicarse un cambio hecho fuera de UserService.
+    AUTH_CLAIMS_CACHE_TTL = int(os.getenv('AUTH_CLAIMS_CACHE_TTL', 30))  # segundos
+    AUTH_CLAIMS_CACHE_MAX_ENTRIES = int(os.getenv('AUTH_CLAIMS_CACHE_MAX_ENTRIES', 10000))
+
+    # Tokens revocados por logout: cada proceso los tiene en memoria y los recarga
+    # cada JWT_BLOCKLIST_REFRESCO segundos (demora máxima entre workers). Los vencidos
+    # se borran con 'flask purgar-tokens-revocados' (ej: desde cron).
+    JWT_BLOCKLIST_REFRESCO = float(os.getenv('JWT_BLOCKLIST_REFRESCO', 15))  # segundos
+
+    # Tabla de posiciones: 'persistida' (incremental) o 'agregada' (consulta sobre partidos)
+    TABLA_POSICIONES_MODO = os.getenv('TABLA_POSICIONES_MODO', 'persistida')
+
+    # Server-Sent Events (tabla de posiciones en vivo)
+    SSE_KEEPALIVE = int(os.getenv('SSE_KEEPALIVE', 15))  # segundos entre comentarios de keep-alive
+    SSE_MAX_PENDIENTES = int(os.getenv('SSE_MAX_PENDIENTES', 50))  # mensajes en cola por espectador
+    SSE_FRAME_TTL = float(os.getenv('SSE_FRAME_TTL', 5))  # segundos que se reutiliza la tabla guardada para el primer evento
+
+    # Hash de contraseñas (método de werkzeug: 'scrypt:N:r:p' o 'pbkdf2:sha256:iteraciones').
+    # Si se cambia, los hashes viejos se actualizan solos en el siguiente login.
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_MAX_PENDIENTES = int(os.getenv('PASSWORD_HASH_MAX_PENDIENTES', 32))  # en espera, además de los que se están calculando
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))  # segundos
+
+    # Límite de intentos de login (token buckets por IP y por email).
+    # Backend 'memoria' (un solo proceso) o 'sqlite' (archivo compartido entre workers).
+    LOGIN_RATE_LIMIT_ENABLED = os.getenv('LOGIN_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    LOGIN_RATE_LIMIT_BACKEND = os.getenv('LOGIN_RATE_LIMIT_BACKEND', 'memoria')
+    LOGIN_RATE_LIMIT_SQLITE_PATH = os.getenv('LOGIN_RATE_LIMIT_SQLITE_PATH',
+        os.path.join(basedir, '..', 'instance/rate_limit.db'))
+    LOGIN_RATE_IP_CAPACIDAD = int(os.getenv('LOGIN_RATE_IP_CAPACIDAD', 20))  # ráfaga máxima por IP
+    LOGIN_RATE_IP_POR_MINUTO = float(os.getenv('LOGIN_RATE_IP_POR_MINUTO', 10))  # recarga sostenida por IP
+    LOGIN_RATE_EMAIL_CAPACIDAD = int(os.getenv('LOGIN_RATE_EMAIL_CAPACIDAD', 5))
+    LOGIN_RATE_EMAIL_POR_MINUTO = float(os.getenv('LOGIN_RATE_EMAIL_POR_MINUTO', 2))
+
+    # Retención (flask podar-historial): los turnos libres pasados se borran y las
+    # reservas pasadas se mueven a las tablas de archivo después de estos días.
+    # Cada club puede cambiarlos (club.retencion_libres_dias / retencion_reservas_dias).
+    RETENCION_LIBRES_DIAS = int(os.getenv('RETENCION_LIBRES_DIAS', 7))
+    RETENCION_RESERVAS_DIAS = int(os.getenv('RETENCION_RESERVAS_DIAS', 365))
+    RETENCION_LOTE = int(os.getenv('RETENCION_LOTE', 500))  # filas por transacción
+    RETENCION_PAUSA = float(os.getenv('RETENCION_PAUSA', 0.05))  # segundos entre lotes
@@ -28,6 +28,27 @@ class AuthError(AppError):
         super().__init__(message, 401)
 
 class ConflictError(AppError):
-    """Se lanza cuando hay un conflicto con el estado actual (409), ej: email duplicado."""
-    def __init__(self, message="Conflicto con recurso existente"):
-        super().__init__(message, 409)
\ No newline at end of file
+    """
+    Se lanza cuando hay un conflicto con el estado actual (409), ej: email duplicado.
+    'detalle' (opcional) se agrega a la respuesta, ej: los turnos en conflicto.
+    """
+    def __init__(self, message="Conflicto con recurso existente", detalle=None):
+        super().__init__(message, 409)
+        self.detalle = detalle
+
+    def to_dict(self):
+        respuesta = super().to_dict()
+        if self.detalle is not None:
+            respuesta["detalle"] = self.detalle
+        return respuesta
+
+class ServiceUnavailableError(AppError):
+    """Se lanza cuando el servicio está saturado y conviene reintentar más tarde (503)."""
+    def __init__(self, message="Servicio temporalmente no disponible"):
+        super().__init__(message, 503)
+
+class TooManyRequestsError(AppError):
+    """Se lanza cuando se supera un límite de solicitudes (429); indica cuándo reintentar."""
+    def __init__(self, message="Demasiadas solicitudes", retry_after=1):
+        super().__init__(message, 429)
+        self.retry_after = retry_after
@@ -3,10 +3,21 @@ from .cancha import Cancha
 from .club import Club
 from .direccion import Direccion
 from .timeslot import Timeslot
+from .cliente import Cliente
 from .reserva import Reserva
 from .reserva_timeslot import ReservaTimeslot
 from .torneo import Torneo
 from .equipo import Equipo
 from .partido import Partido
+from .posicion import Posicion
+from .token_revocado import TokenRevocado
+from .club_cierre import ClubCierre
+from .cancha_bloqueo import CanchaBloqueo
+from .disponibilidad_dia import DisponibilidadDia
+from .serie_reserva import SerieReserva
+from .espera_turno import EsperaTurno
+from .regla_precio import ReglaPrecio
+from .reserva_archivada import ReservaArchivada
+from .timeslot_archivado import TimeslotArchivado
 
-__all__ = ["db", "Cancha", "Club", "Direccion", "Timeslot", "Reserva", "ReservaTimeslot", "Torneo", "Equipo", "Partido"]
+__all__ = ["db", "Cancha", "Club", "Direccion", "Timeslot", "Cliente", "Reserva", "ReservaTimeslot", "Torneo", "Equipo", "Partido", "Posicion", "TokenRevocado", "ClubCierre", "CanchaBloqueo", "DisponibilidadDia", "SerieReserva", "EsperaTurno", "ReglaPrecio", "ReservaArchivada", "TimeslotArchivado"]
@@ -5,7 +5,7 @@ class Cancha(db.Model):
     __tablename__ = 'cancha'
     
     id = db.Column(db.Integer, primary_key=True)
-    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id', ondelete='CASCADE'), nullable=False)
     nombre = db.Column(db.String(100), nullable=False)
     deporte = db.Column(db.String(50), nullable=False)
     superficie = db.Column(db.Float, nullable=False)
@@ -16,5 +16,5 @@ class Cancha(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    timeslots = db.relationship('Timeslot', backref='cancha', lazy=True, cascade='all, delete-orphan')
+    timeslots = db.relationship('Timeslot', backref='cancha', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
 
@@ -4,16 +4,19 @@ from datetime import datetime
 
 class CanchaBloqueo(db.Model):
     __tablename__ = "cancha_bloqueo"
+    __table_args__ = (
+        db.Index("ix_cancha_bloqueo_cancha_id_inicio", "cancha_id", "inicio"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    cancha_id = db.Column(db.Integer, db.ForeignKey("canchas.id"), nullable=False)
+    cancha_id = db.Column(db.Integer, db.ForeignKey("cancha.id", ondelete="CASCADE"), nullable=False)
     inicio = db.Column(db.DateTime, nullable=False)
     fin = db.Column(db.DateTime, nullable=False)
     motivo = db.Column(db.String(160))
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    cancha = db.relationship("Cancha", backref="bloqueos")
+    cancha = db.relationship("Cancha", backref=db.backref("bloqueos", cascade="all, delete-orphan", passive_deletes=True))
 
     def __repr__(self):
         return f"<CanchaBloqueo cancha={self.cancha_id} {self.inicio}->{self.fin}>"
@@ -0,0 +1,18 @@
+from . import db
+from datetime import datetime
+
+
+class Cliente(db.Model):
+    __tablename__ = "cliente"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    email = db.Column(db.String(120), unique=True, nullable=False)  # Normalizado: minúsculas y sin espacios
+    nombre = db.Column(db.String(120), nullable=False)
+    telefono = db.Column(db.String(30))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    reservas = db.relationship("Reserva", back_populates="cliente", lazy=True)
+
+    def __repr__(self):
+        return f"<Cliente {self.email}>"
@@ -9,10 +9,14 @@ class Club(db.Model):
     cuit = db.Column(db.String(13), nullable=False)
     telefono = db.Column(db.String(20), nullable=False)
     direccion_id = db.Column(db.Integer, db.ForeignKey('direccion.id'), nullable=False)
+    # Días que se conservan los turnos libres pasados y las reservas pasadas
+    # antes de borrarlos/archivarlos (None = RETENCION_*_DIAS de la config)
+    retencion_libres_dias = db.Column(db.Integer, nullable=True)
+    retencion_reservas_dias = db.Column(db.Integer, nullable=True)
     direccion = db.relationship("Direccion", back_populates="clubes", lazy=True)
-    canchas = db.relationship("Cancha", backref="club", lazy=True, cascade="all, delete-orphan")
-    torneos = db.relationship("Torneo", backref="club", lazy=True, cascade="all, delete-orphan")
-    horarios = db.relationship('ClubHorario', back_populates='club', lazy=True, cascade="all, delete-orphan")
+    canchas = db.relationship("Cancha", backref="club", lazy=True, cascade="all, delete-orphan", passive_deletes=True)
+    torneos = db.relationship("Torneo", backref="club", lazy=True, cascade="all, delete-orphan", passive_deletes=True)
+    horarios = db.relationship('ClubHorario', back_populates='club', lazy=True, cascade="all, delete-orphan", passive_deletes=True)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -20,5 +24,6 @@ class Club(db.Model):
         "User", 
         back_populates="club", 
         lazy=True, 
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
@@ -4,9 +4,12 @@ from datetime import date, datetime
 
 class ClubCierre(db.Model):
     __tablename__ = "club_cierre"
+    __table_args__ = (
+        db.UniqueConstraint("club_id", "fecha", name="uq_club_cierre_fecha"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    club_id = db.Column(db.Integer, db.ForeignKey("club.id"), nullable=False)
+    club_id = db.Column(db.Integer, db.ForeignKey("club.id", ondelete="CASCADE"), nullable=False)
     fecha = db.Column(db.Date, nullable=False)
     abre = db.Column(db.Time)
     cierra = db.Column(db.Time)
@@ -15,7 +18,7 @@ class ClubCierre(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    club = db.relationship("Club", backref="cierres")
+    club = db.relationship("Club", backref=db.backref("cierres", cascade="all, delete-orphan", passive_deletes=True))
 
     def __repr__(self):
         return f"<ClubCierre {self.fecha} cerrado={self.cerrado}>"
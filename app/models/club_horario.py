@@ -7,7 +7,7 @@ class ClubHorario(db.Model):
     __tablename__ = "club_horario"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    club_id = db.Column(db.Integer, db.ForeignKey("club.id"), nullable=False)
+    club_id = db.Column(db.Integer, db.ForeignKey("club.id", ondelete="CASCADE"), nullable=False)
     dia = db.Column(db.Enum(DiaSemana, name="dia_semana", native_enum=False), nullable=False)
     abre = db.Column(db.Time, nullable=False)
     cierra = db.Column(db.Time, nullable=False)
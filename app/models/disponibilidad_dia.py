@@ -0,0 +1,33 @@
+from . import db
+
+# Cada bit representa un turno que empieza en ese múltiplo de minutos desde las
+# 00:00 (48 bits por día con 30 minutos; entra en un entero de 64 bits).
+GRANULARIDAD_MINUTOS = 30
+
+
+def bit_turno(inicio):
+    """Máscara con el bit del turno que empieza en 'inicio'."""
+    return 1 << ((inicio.hour * 60 + inicio.minute) // GRANULARIDAD_MINUTOS)
+
+
+class DisponibilidadDia(db.Model):
+    """
+    Turnos DISPONIBLE de una cancha en un día, codificados como máscara de bits.
+    Se mantiene junto con los cambios de estado de los timeslots y permite
+    responder consultas sobre muchas canchas con operaciones AND/OR.
+    """
+    __tablename__ = "disponibilidad_dia"
+    __table_args__ = (
+        db.UniqueConstraint("cancha_id", "fecha", name="uq_disponibilidad_dia_cancha_fecha"),
+        db.Index("ix_disponibilidad_dia_fecha", "fecha"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    cancha_id = db.Column(db.Integer, db.ForeignKey("cancha.id", ondelete="CASCADE"), nullable=False)
+    fecha = db.Column(db.Date, nullable=False)
+    libres = db.Column(db.BigInteger, nullable=False, default=0)
+
+    cancha = db.relationship("Cancha", backref=db.backref("disponibilidad_dias", cascade="all, delete-orphan", passive_deletes=True))
+
+    def __repr__(self):
+        return f"<DisponibilidadDia cancha={self.cancha_id} {self.fecha} {self.libres:#x}>"
@@ -9,6 +9,18 @@ class ReservaEstado(Enum):
     PAGADO = "PAGADO"
 
 
+class SerieEstado(Enum):
+    ACTIVA = "ACTIVA"
+    CANCELADA = "CANCELADA"
+
+
+class EsperaEstado(Enum):
+    PENDIENTE = "PENDIENTE"
+    NOTIFICADA = "NOTIFICADA"
+    ASIGNADA = "ASIGNADA"
+    CANCELADA = "CANCELADA"
+
+
 class FuenteReserva(Enum):
     WEB = "WEB"
     PRESENCIAL = "PRESENCIAL"
@@ -22,6 +34,12 @@ class TorneoEstado(Enum):
     CANCELADO = "CANCELADO"
 
 
+class FormatoFixture(Enum):
+    TODOS_CONTRA_TODOS = "TODOS_CONTRA_TODOS"
+    IDA_Y_VUELTA = "IDA_Y_VUELTA"
+    ELIMINACION = "ELIMINACION"
+
+
 class DiaSemana(Enum):
     LUN = "LUN"
     MAR = "MAR"
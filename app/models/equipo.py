@@ -1,11 +1,12 @@
 from . import db
 from datetime import datetime
+from sqlalchemy.orm import query_expression
 
 class Equipo(db.Model):
     __tablename__ = "equipo"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    torneo_id = db.Column(db.Integer, db.ForeignKey("torneo.id"), nullable=False)
+    torneo_id = db.Column(db.Integer, db.ForeignKey("torneo.id", ondelete="CASCADE"), nullable=False, index=True)
     nombre = db.Column(db.String(120), nullable=False)
     representante = db.Column(db.String(120))
     telefono = db.Column(db.String(30))
@@ -14,10 +15,17 @@ class Equipo(db.Model):
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    torneo = db.relationship("Torneo", backref="equipos")
-    partidos_local = db.relationship("Partido", foreign_keys="Partido.equipo1_id", back_populates="equipo1")
-    partidos_visitante = db.relationship("Partido", foreign_keys="Partido.equipo2_id", back_populates="equipo2")
-    partidos_ganador = db.relationship("Partido", foreign_keys="Partido.ganador_id", back_populates="ganador")
+    torneo = db.relationship("Torneo", backref=db.backref("equipos", cascade="all, delete-orphan", passive_deletes=True))
+    # Al borrar un equipo la base elimina sus partidos (CASCADE) y limpia el ganador (SET NULL)
+    partidos_local = db.relationship("Partido", foreign_keys="Partido.equipo1_id", back_populates="equipo1", passive_deletes=True)
+    partidos_visitante = db.relationship("Partido", foreign_keys="Partido.equipo2_id", back_populates="equipo2", passive_deletes=True)
+    partidos_ganador = db.relationship("Partido", foreign_keys="Partido.ganador_id", back_populates="ganador", passive_deletes=True)
+
+    # Cantidades de partidos: las completa EquipoRepository con with_expression()
+    # (None si el equipo se cargó sin ellas)
+    total_partidos_local = query_expression()
+    total_partidos_visitante = query_expression()
+    total_partidos_ganador = query_expression()
 
     def __repr__(self):
         return f"<Equipo {self.nombre}>"
\ No newline at end of file
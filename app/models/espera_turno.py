@@ -0,0 +1,48 @@
+from . import db
+from datetime import datetime
+from .enums import EsperaEstado, FuenteReserva
+
+# Largo máximo de la ventana de una espera. Acota el rango del índice
+# (club_id, estado, desde) que se recorre al buscar a quién ofrecer un turno.
+MAX_VENTANA_ESPERA_HORAS = 24
+
+
+class EsperaTurno(db.Model):
+    """
+    Lista de espera: un cliente quiere un turno de una cancha (o de cualquier
+    cancha del club si cancha_id es None) que empiece y termine dentro de
+    [desde, hasta]. Cuando se libera un turno así, se le reserva
+    (auto_reservar) o se le avisa.
+    """
+    __tablename__ = "espera_turno"
+    __table_args__ = (
+        db.Index("ix_espera_turno_club_estado_desde", "club_id", "estado", "desde"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    club_id = db.Column(db.Integer, db.ForeignKey("club.id", ondelete="CASCADE"), nullable=False)
+    cancha_id = db.Column(db.Integer, db.ForeignKey("cancha.id", ondelete="CASCADE"), nullable=True)
+    desde = db.Column(db.DateTime, nullable=False)
+    hasta = db.Column(db.DateTime, nullable=False)
+    cliente_id = db.Column(db.Integer, db.ForeignKey("cliente.id"), index=True)
+    cliente_nombre = db.Column(db.String(120), nullable=False)
+    cliente_telefono = db.Column(db.String(30))
+    cliente_email = db.Column(db.String(120), nullable=False)
+    fuente = db.Column(db.Enum(FuenteReserva, name="fuente_reserva", native_enum=False), nullable=False)
+    auto_reservar = db.Column(db.Boolean, nullable=False, default=False)
+    estado = db.Column(db.Enum(EsperaEstado, name="espera_estado", native_enum=False), nullable=False, default=EsperaEstado.PENDIENTE)
+    # Turno ofrecido (NOTIFICADA) o reservado (ASIGNADA)
+    timeslot_id = db.Column(db.Integer, db.ForeignKey("timeslot.id", ondelete="SET NULL"), nullable=True)
+    reserva_id = db.Column(db.Integer, db.ForeignKey("reserva.id", ondelete="SET NULL"), nullable=True)
+    atendida_en = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    club = db.relationship("Club", backref=db.backref("esperas", cascade="all, delete-orphan", passive_deletes=True))
+    cancha = db.relationship("Cancha", backref=db.backref("esperas", cascade="all, delete-orphan", passive_deletes=True))
+    cliente = db.relationship("Cliente")
+    timeslot = db.relationship("Timeslot")
+    reserva = db.relationship("Reserva")
+
+    def __repr__(self):
+        return f"<EsperaTurno {self.id} {self.desde}-{self.hasta} {self.estado.value}>"
@@ -3,14 +3,20 @@ from datetime import datetime
 
 class Partido(db.Model):
     __tablename__ = "partido"
+    __table_args__ = (
+        # Evita duplicar el fixture si se genera dos veces en paralelo
+        db.UniqueConstraint("torneo_id", "ronda", "equipo1_id", "equipo2_id", name="uq_partido_fixture"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    torneo_id = db.Column(db.Integer, db.ForeignKey("torneo.id"), nullable=False)
-    equipo1_id = db.Column(db.Integer, db.ForeignKey("equipo.id"), nullable=False)
-    equipo2_id = db.Column(db.Integer, db.ForeignKey("equipo.id"), nullable=False)
-    goles_equipo1 = db.Column(db.Integer, nullable=False, default=0)
-    goles_equipo2 = db.Column(db.Integer, nullable=False, default=0)
-    ganador_id = db.Column(db.Integer, db.ForeignKey("equipo.id"))
+    torneo_id = db.Column(db.Integer, db.ForeignKey("torneo.id", ondelete="CASCADE"), nullable=False)
+    equipo1_id = db.Column(db.Integer, db.ForeignKey("equipo.id", ondelete="CASCADE"), nullable=False, index=True)
+    equipo2_id = db.Column(db.Integer, db.ForeignKey("equipo.id", ondelete="CASCADE"), nullable=False, index=True)
+    goles_equipo1 = db.Column(db.Integer)  # None mientras no se registre el resultado
+    goles_equipo2 = db.Column(db.Integer)
+    ganador_id = db.Column(db.Integer, db.ForeignKey("equipo.id", ondelete="SET NULL"), index=True)
+    ronda = db.Column(db.Integer)  # Solo para partidos generados por fixture
+    timeslot_id = db.Column(db.Integer, db.ForeignKey("timeslot.id", ondelete="SET NULL"), unique=True)  # Turno asignado al programar
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -19,6 +25,7 @@ class Partido(db.Model):
     equipo2 = db.relationship("Equipo", foreign_keys=[equipo2_id], back_populates="partidos_visitante")
     torneo = db.relationship("Torneo", back_populates="partidos")
     ganador = db.relationship("Equipo", foreign_keys=[ganador_id], back_populates="partidos_ganador")
+    timeslot = db.relationship("Timeslot")
 
     def __repr__(self):
         return f"<Partido {self.equipo1.nombre} {self.goles_equipo1}-{self.goles_equipo2} {self.equipo2.nombre}>"
\ No newline at end of file
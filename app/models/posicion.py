@@ -0,0 +1,27 @@
+from . import db
+from datetime import datetime
+
+
+class Posicion(db.Model):
+    """
+    Fila persistida de la tabla de posiciones de un torneo (una por equipo).
+    Se actualiza de forma incremental al registrar resultados.
+    """
+    __tablename__ = "posicion"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    torneo_id = db.Column(db.Integer, db.ForeignKey("torneo.id", ondelete="CASCADE"), nullable=False, index=True)
+    equipo_id = db.Column(db.Integer, db.ForeignKey("equipo.id", ondelete="CASCADE"), nullable=False, unique=True)
+    pj = db.Column(db.Integer, nullable=False, default=0)  # Partidos Jugados
+    pg = db.Column(db.Integer, nullable=False, default=0)  # Partidos Ganados
+    pe = db.Column(db.Integer, nullable=False, default=0)  # Partidos Empatados
+    pp = db.Column(db.Integer, nullable=False, default=0)  # Partidos Perdidos
+    gf = db.Column(db.Integer, nullable=False, default=0)  # Goles a Favor
+    gc = db.Column(db.Integer, nullable=False, default=0)  # Goles en Contra
+    puntos = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    equipo = db.relationship("Equipo", backref=db.backref("posicion", uselist=False, cascade="all, delete-orphan", passive_deletes=True))
+
+    def __repr__(self):
+        return f"<Posicion equipo={self.equipo_id} {self.puntos} pts>"
@@ -0,0 +1,34 @@
+from . import db
+from datetime import datetime
+from .enums import DiaSemana
+
+
+class ReglaPrecio(db.Model):
+    """
+    Precio de los turnos de un club (o de una cancha) que empiezan en una
+    franja horaria, opcionalmente limitada a un día de la semana y a un rango
+    de fechas. Sin regla aplicable, el turno vale cancha.precio_hora.
+
+    Si varias reglas aplican gana la de mayor prioridad; a igual prioridad, la
+    de una cancha sobre la de todo el club y luego la más nueva.
+    """
+    __tablename__ = "regla_precio"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    club_id = db.Column(db.Integer, db.ForeignKey("club.id", ondelete="CASCADE"), nullable=False, index=True)
+    cancha_id = db.Column(db.Integer, db.ForeignKey("cancha.id", ondelete="CASCADE"), nullable=True)  # None: todas las canchas del club
+    dia = db.Column(db.Enum(DiaSemana, name="dia_semana", native_enum=False), nullable=True)  # None: todos los días
+    hora_desde = db.Column(db.Time, nullable=False)
+    hora_hasta = db.Column(db.Time, nullable=True)  # None: hasta el fin del día
+    fecha_desde = db.Column(db.Date, nullable=True)
+    fecha_hasta = db.Column(db.Date, nullable=True)
+    precio = db.Column(db.Numeric(10, 2), nullable=False)
+    prioridad = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    club = db.relationship("Club", backref=db.backref("reglas_precio", cascade="all, delete-orphan", passive_deletes=True))
+    cancha = db.relationship("Cancha", backref=db.backref("reglas_precio", cascade="all, delete-orphan", passive_deletes=True))
+
+    def __repr__(self):
+        return f"<ReglaPrecio {self.id} {self.hora_desde}-{self.hora_hasta} ${self.precio}>"
@@ -1,5 +1,6 @@
 from . import db
 from datetime import datetime
+from sqlalchemy import DDL, event
 from .enums import ReservaEstado, FuenteReserva
 
 
@@ -7,7 +8,10 @@ class Reserva(db.Model):
     __tablename__ = "reserva"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    cancha_id = db.Column(db.Integer, db.ForeignKey("cancha.id"), nullable=False)
+    cancha_id = db.Column(db.Integer, db.ForeignKey("cancha.id", ondelete="RESTRICT"), nullable=False)  # El historial de reservas no se borra con la cancha
+    cliente_id = db.Column(db.Integer, db.ForeignKey("cliente.id"), index=True)
+    serie_id = db.Column(db.Integer, db.ForeignKey("serie_reserva.id", ondelete="SET NULL"), index=True)  # Si es una ocurrencia de una reserva recurrente
+    # Datos de contacto tal como se informaron en esta reserva (el cliente guarda los últimos)
     cliente_nombre = db.Column(db.String(120), nullable=False)
     cliente_telefono = db.Column(db.String(30))
     cliente_email = db.Column(db.String(120), nullable=False)
@@ -18,8 +22,69 @@ class Reserva(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    cancha = db.relationship("Cancha", backref="reservas")
-    timeslots = db.relationship("ReservaTimeslot", backref="reserva", cascade="all, delete-orphan")
+    cancha = db.relationship("Cancha", backref=db.backref("reservas", passive_deletes="all"))
+    cliente = db.relationship("Cliente", back_populates="reservas")
+    serie = db.relationship("SerieReserva", back_populates="reservas")
+    timeslots = db.relationship("ReservaTimeslot", backref="reserva", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Reserva {self.id} {self.estado.value}>"
+
+
+# Índice de búsqueda de clientes (nombre + email), sin acentos y por prefijo.
+# SQLite: tabla virtual FTS5 sincronizada por triggers.
+# PostgreSQL: índice GIN de trigramas sobre la expresión normalizada.
+# Se crea junto con la tabla en db.create_all(); ver también la migración correspondiente.
+BUSQUEDA_CLIENTE_SQLITE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS reserva_busqueda USING fts5(
+        cliente_nombre, cliente_email,
+        content='reserva', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reserva_busqueda_ai AFTER INSERT ON reserva BEGIN
+        INSERT INTO reserva_busqueda(rowid, cliente_nombre, cliente_email)
+        VALUES (new.id, new.cliente_nombre, new.cliente_email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reserva_busqueda_ad AFTER DELETE ON reserva BEGIN
+        INSERT INTO reserva_busqueda(reserva_busqueda, rowid, cliente_nombre, cliente_email)
+        VALUES ('delete', old.id, old.cliente_nombre, old.cliente_email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reserva_busqueda_au AFTER UPDATE OF cliente_nombre, cliente_email ON reserva BEGIN
+        INSERT INTO reserva_busqueda(reserva_busqueda, rowid, cliente_nombre, cliente_email)
+        VALUES ('delete', old.id, old.cliente_nombre, old.cliente_email);
+        INSERT INTO reserva_busqueda(rowid, cliente_nombre, cliente_email)
+        VALUES (new.id, new.cliente_nombre, new.cliente_email);
+    END
+    """,
+]
+
+BUSQUEDA_CLIENTE_POSTGRES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    # unaccent() no es IMMUTABLE, por eso se envuelve para poder indexar la expresión
+    """
+    CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent', $1) $$
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_reserva_cliente_trgm ON reserva
+    USING gin (f_unaccent(lower(cliente_nombre || ' ' || cliente_email)) gin_trgm_ops)
+    """,
+]
+
+for _sql in BUSQUEDA_CLIENTE_SQLITE:
+    event.listen(Reserva.__table__, "after_create", DDL(_sql).execute_if(dialect="sqlite"))
+for _sql in BUSQUEDA_CLIENTE_POSTGRES:
+    event.listen(Reserva.__table__, "after_create", DDL(_sql).execute_if(dialect="postgresql"))
+event.listen(
+    Reserva.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS reserva_busqueda").execute_if(dialect="sqlite")
+)
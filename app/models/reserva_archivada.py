@@ -0,0 +1,36 @@
+from . import db
+from datetime import datetime
+from .enums import ReservaEstado, FuenteReserva
+
+
+class ReservaArchivada(db.Model):
+    """
+    Reserva pasada movida fuera de la tabla 'reserva' por la retención (ver
+    app/services/retencion_service.py). Conserva los mismos datos, el id
+    original en 'reserva_id' y sus turnos en TimeslotArchivado, para que los
+    reportes la sigan contando.
+    """
+    __tablename__ = "reserva_archivada"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    reserva_id = db.Column(db.Integer, nullable=False, index=True)  # id que tenía en 'reserva'
+    cancha_id = db.Column(db.Integer, db.ForeignKey("cancha.id", ondelete="RESTRICT"), nullable=False, index=True)
+    cliente_id = db.Column(db.Integer, db.ForeignKey("cliente.id"), index=True)
+    serie_id = db.Column(db.Integer)  # Sin foreign key: la serie puede borrarse después
+    cliente_nombre = db.Column(db.String(120), nullable=False)
+    cliente_telefono = db.Column(db.String(30))
+    cliente_email = db.Column(db.String(120), nullable=False)
+    estado = db.Column(db.Enum(ReservaEstado, name="reserva_estado", native_enum=False), nullable=False)
+    fuente = db.Column(db.Enum(FuenteReserva, name="fuente_reserva", native_enum=False), nullable=False)
+    servicios = db.Column(db.String(255))
+    precio_total = db.Column(db.Numeric(10, 2))
+    created_at = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False)
+    archivada_en = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    cancha = db.relationship("Cancha", backref=db.backref("reservas_archivadas", passive_deletes="all"))
+    cliente = db.relationship("Cliente")
+    timeslots = db.relationship("TimeslotArchivado", back_populates="reserva", cascade="all, delete-orphan", passive_deletes=True)
+
+    def __repr__(self):
+        return f"<ReservaArchivada {self.reserva_id} {self.estado.value}>"
@@ -6,8 +6,8 @@ class ReservaTimeslot(db.Model):
     __tablename__ = "reserva_timeslot"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    reserva_id = db.Column(db.Integer, db.ForeignKey("reserva.id"), nullable=False, index=True)
-    timeslot_id = db.Column(db.Integer, db.ForeignKey("timeslot.id"), nullable=False, unique=True)
+    reserva_id = db.Column(db.Integer, db.ForeignKey("reserva.id", ondelete="CASCADE"), nullable=False, index=True)
+    timeslot_id = db.Column(db.Integer, db.ForeignKey("timeslot.id", ondelete="CASCADE"), nullable=False, unique=True)
 
     # backrefs created on Reserva and Timeslot
 
@@ -0,0 +1,35 @@
+from . import db
+from datetime import datetime
+from .enums import DiaSemana, FuenteReserva, SerieEstado
+
+
+class SerieReserva(db.Model):
+    """
+    Reserva recurrente: la misma cancha, el mismo día de la semana y horario
+    entre dos fechas. Cada ocurrencia es una Reserva común que apunta a la serie.
+    """
+    __tablename__ = "serie_reserva"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    cancha_id = db.Column(db.Integer, db.ForeignKey("cancha.id", ondelete="CASCADE"), nullable=False, index=True)
+    cliente_id = db.Column(db.Integer, db.ForeignKey("cliente.id"), index=True)
+    cliente_nombre = db.Column(db.String(120), nullable=False)
+    cliente_telefono = db.Column(db.String(30))
+    cliente_email = db.Column(db.String(120), nullable=False)
+    fuente = db.Column(db.Enum(FuenteReserva, name="fuente_reserva", native_enum=False), nullable=False)
+    servicios = db.Column(db.String(255))
+    dia = db.Column(db.Enum(DiaSemana, name="dia_semana", native_enum=False), nullable=False)
+    hora_inicio = db.Column(db.Time, nullable=False)
+    horas = db.Column(db.Integer, nullable=False, default=1)
+    fecha_desde = db.Column(db.Date, nullable=False)
+    fecha_hasta = db.Column(db.Date, nullable=False)
+    estado = db.Column(db.Enum(SerieEstado, name="serie_estado", native_enum=False), nullable=False, default=SerieEstado.ACTIVA)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    cancha = db.relationship("Cancha", backref=db.backref("series_reserva", cascade="all, delete-orphan", passive_deletes=True))
+    cliente = db.relationship("Cliente")
+    reservas = db.relationship("Reserva", back_populates="serie", passive_deletes=True)
+
+    def __repr__(self):
+        return f"<SerieReserva {self.id} {self.dia.value} {self.hora_inicio} {self.estado.value}>"
@@ -5,13 +5,21 @@ from .enums import TimeslotEstado
 
 class Timeslot(db.Model):
     __tablename__ = "timeslot"
+    __table_args__ = (
+        # Listados por cancha y rango de fechas (ordenados por inicio). Único: con
+        # disponibilidad virtual dos reservas simultáneas no pueden crear el mismo turno
+        db.Index("ix_timeslot_cancha_id_inicio", "cancha_id", "inicio", unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    cancha_id = db.Column(db.Integer, db.ForeignKey("cancha.id"), nullable=False)
+    cancha_id = db.Column(db.Integer, db.ForeignKey("cancha.id", ondelete="CASCADE"), nullable=False)
     inicio = db.Column(db.DateTime, nullable=False)
     fin = db.Column(db.DateTime, nullable=False)
     estado = db.Column(db.Enum(TimeslotEstado, name="timeslot_estado", native_enum=False), nullable=False, default=TimeslotEstado.DISPONIBLE)
     precio = db.Column(db.Numeric(10, 2))
+    # BLOQUEADO por la reconciliación por quedar fuera del horario del club:
+    # vuelve a DISPONIBLE si el horario se amplía
+    fuera_de_horario = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
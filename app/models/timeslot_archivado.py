@@ -0,0 +1,24 @@
+from . import db
+from .enums import TimeslotEstado
+
+
+class TimeslotArchivado(db.Model):
+    """Turno de una reserva archivada, con los datos que tenía en 'timeslot'."""
+    __tablename__ = "timeslot_archivado"
+    __table_args__ = (
+        db.Index("ix_timeslot_archivado_cancha_id_inicio", "cancha_id", "inicio"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    timeslot_id = db.Column(db.Integer, nullable=False)  # id que tenía en 'timeslot'
+    reserva_archivada_id = db.Column(db.Integer, db.ForeignKey("reserva_archivada.id", ondelete="CASCADE"), nullable=False, index=True)
+    cancha_id = db.Column(db.Integer, db.ForeignKey("cancha.id", ondelete="RESTRICT"), nullable=False)
+    inicio = db.Column(db.DateTime, nullable=False)
+    fin = db.Column(db.DateTime, nullable=False)
+    estado = db.Column(db.Enum(TimeslotEstado, name="timeslot_estado", native_enum=False), nullable=False)
+    precio = db.Column(db.Numeric(10, 2))
+
+    reserva = db.relationship("ReservaArchivada", back_populates="timeslots")
+
+    def __repr__(self):
+        return f"<TimeslotArchivado cancha={self.cancha_id} {self.inicio}-{self.fin} {self.estado.value}>"
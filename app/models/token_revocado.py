@@ -0,0 +1,20 @@
+from . import db
+from datetime import datetime
+
+
+class TokenRevocado(db.Model):
+    """
+    JWT revocado antes de su vencimiento (logout), identificado por su 'jti'.
+    La fila deja de hacer falta cuando el token vence, y ahí se purga.
+    """
+    __tablename__ = "token_revocado"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    jti = db.Column(db.String(36), nullable=False, unique=True)
+    tipo = db.Column(db.String(10), nullable=False)  # 'access' o 'refresh'
+    user_id = db.Column(db.Integer, nullable=True)
+    expira_en = db.Column(db.DateTime, nullable=False, index=True)  # UTC, el 'exp' del token
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TokenRevocado {self.tipo} {self.jti}>"
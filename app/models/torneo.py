@@ -1,12 +1,12 @@
 from . import db
 from datetime import datetime
-from .enums import TorneoEstado
+from .enums import TorneoEstado, FormatoFixture
 
 class Torneo(db.Model):
     __tablename__ = "torneo"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    club_id = db.Column(db.Integer, db.ForeignKey("club.id"), nullable=False)
+    club_id = db.Column(db.Integer, db.ForeignKey("club.id", ondelete="CASCADE"), nullable=False)
     nombre = db.Column(db.String(120), nullable=False)
     categoria = db.Column(db.String(80))
     estado = db.Column(db.Enum(TorneoEstado, name="torneo_estado", native_enum=False), 
@@ -14,11 +14,12 @@ class Torneo(db.Model):
     fecha_inicio = db.Column(db.Date)
     fecha_fin = db.Column(db.Date)
     reglamento = db.Column(db.Text)
+    formato = db.Column(db.Enum(FormatoFixture, name="formato_fixture", native_enum=False))  # Se fija al generar el fixture
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    partidos = db.relationship("Partido", back_populates="torneo", cascade="all, delete-orphan")
+    partidos = db.relationship("Partido", back_populates="torneo", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Torneo {self.nombre} ({self.estado.value})>"
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Broker publicación/suscripción en memoria para Server-Sent Events (SSE).
+
+Cada canal (por ejemplo "torneo:5") tiene su propio conjunto de suscriptores.
+El mensaje se serializa una sola vez al publicar y el mismo texto se reparte
+a todas las colas, así cientos de espectadores comparten un único cálculo.
+
+Es un broker de un solo proceso: con varios workers cada uno tiene el suyo.
+"""
+import json
+import queue
+import threading
+import time
+
+
+def formatear_sse(evento, datos):
+    """Arma un frame SSE ('event:' + 'data:') con los datos en JSON."""
+    return f"event: {evento}\ndata: {json.dumps(datos, default=str)}\n\n"
+
+
+class Broker:
+    """
+    Canales de mensajes con colas acotadas por suscriptor.
+
+    Si un suscriptor lento llena su cola se descarta su mensaje más viejo:
+    los eventos son instantáneas (la tabla completa), así que solo importa el último.
+    """
+
+    def __init__(self, max_pendientes=50):
+        """
+        Args:
+            max_pendientes (int): Mensajes que puede acumular cada suscriptor
+        """
+        self.max_pendientes = max_pendientes
+        self._canales = {}
+        self._ultimos = {}
+        self._lock = threading.Lock()
+
+    def suscribir(self, canal):
+        """Registra un suscriptor y devuelve la cola de la que debe leer."""
+        cola = queue.Queue(maxsize=self.max_pendientes)
+        with self._lock:
+            self._canales.setdefault(canal, set()).add(cola)
+        return cola
+
+    def desuscribir(self, canal, cola):
+        """Quita un suscriptor; el canal se elimina cuando queda vacío."""
+        with self._lock:
+            suscriptores = self._canales.get(canal)
+            if suscriptores is not None:
+                suscriptores.discard(cola)
+                if not suscriptores:
+                    del self._canales[canal]
+
+    def suscriptores(self, canal):
+        """Cantidad de suscriptores activos en un canal."""
+        with self._lock:
+            return len(self._canales.get(canal, ()))
+
+    def recordar(self, canal, evento, datos):
+        """
+        Guarda el último valor de un evento sin repartirlo (para quien se suscriba después).
+
+        Returns:
+            str: Frame SSE serializado
+        """
+        frame = formatear_sse(evento, datos)
+        with self._lock:
+            self._ultimos[(canal, evento)] = (frame, time.monotonic())
+        return frame
+
+    def publicar(self, canal, evento, datos, recordar=True):
+        """
+        Serializa el evento una vez y lo entrega a todos los suscriptores del canal.
+        También queda guardado como último valor del evento para quien se suscriba después.
+
+        Args:
+            recordar (bool): False si nadie lee el último valor (el frame no se guarda)
+
+        Returns:
+            int: Cantidad de suscriptores que lo recibieron
+        """
+        frame = self.recordar(canal, evento, datos) if recordar else formatear_sse(evento, datos)
+        with self._lock:
+            suscriptores = list(self._canales.get(canal, ()))
+
+        for cola in suscriptores:
+            try:
+                cola.put_nowait(frame)
+            except queue.Full:
+                try:
+                    cola.get_nowait()
+                except queue.Empty:
+                    pass
+                cola.put_nowait(frame)
+        return len(suscriptores)
+
+    def ultimo(self, canal, evento, max_edad=None):
+        """
+        Devuelve el último frame publicado para (canal, evento) o None.
+
+        Args:
+            max_edad (float, optional): Segundos de vigencia; un frame más viejo
+                se descarta (otro worker pudo haber cambiado los datos)
+        """
+        with self._lock:
+            guardado = self._ultimos.get((canal, evento))
+            if guardado is None:
+                return None
+            frame, guardado_en = guardado
+            if max_edad is not None and time.monotonic() - guardado_en > max_edad:
+                del self._ultimos[(canal, evento)]
+                return None
+            return frame
+
+    def olvidar(self, canal):
+        """Descarta los últimos valores guardados de un canal (ej: al eliminar el torneo)."""
+        with self._lock:
+            for clave in [k for k in self._ultimos if k[0] == canal]:
+                del self._ultimos[clave]
@@ -0,0 +1,41 @@
+from sqlalchemy.exc import IntegrityError
+
+from app.models.cliente import Cliente
+from app import db
+
+
+def normalizar_email(email):
+    """Normaliza un email para usarlo como identidad del cliente."""
+    return email.strip().lower() if email else email
+
+
+class ClienteRepository:
+    def __init__(self):
+        pass
+
+    def get_by_id(self, id):
+        return db.session.get(Cliente, id)
+
+    def get_by_email(self, email):
+        return Cliente.query.filter_by(email=normalizar_email(email)).first()
+
+    def find_or_create_cliente(self, email, nombre, telefono=None):
+        """
+        Busca el cliente por email normalizado o lo crea.
+        Si ya existe, actualiza nombre y teléfono con los últimos datos informados.
+
+        El alta va en un savepoint: si otra transacción creó el mismo cliente
+        al mismo tiempo, el email único la rechaza y se usa el ya existente.
+        """
+        cliente = self.get_by_email(email)
+        if not cliente:
+            try:
+                with db.session.begin_nested():
+                    cliente = Cliente(email=normalizar_email(email), nombre=nombre, telefono=telefono)
+                    db.session.add(cliente)
+                return cliente
+            except IntegrityError:
+                cliente = self.get_by_email(email)
+        cliente.nombre = nombre or cliente.nombre
+        cliente.telefono = telefono or cliente.telefono
+        return cliente
@@ -0,0 +1,107 @@
+from collections import defaultdict
+
+from sqlalchemy.exc import IntegrityError
+
+from app.models.cancha import Cancha
+from app.models.disponibilidad_dia import DisponibilidadDia, bit_turno
+from app.models.enums import TimeslotEstado
+from app.models.timeslot import Timeslot
+from app import db
+
+
+class DisponibilidadDiaRepository:
+    def __init__(self):
+        pass
+
+    def actualizar(self, turnos):
+        """
+        Refleja en las máscaras el estado actual de los turnos.
+
+        Solo toca los bits de esos turnos con un UPDATE atómico por (cancha, día)
+        ("libres = libres & ~tocados | nuevos"), así dos operaciones sobre
+        turnos distintos del mismo día no se pisan.
+
+        Args:
+            turnos (iterable[tuple[int, datetime, bool]]): (cancha_id, inicio, libre)
+        """
+        grupos = defaultdict(lambda: [0, 0])  # (cancha_id, fecha) -> [tocados, libres]
+        for cancha_id, inicio, libre in turnos:
+            bit = bit_turno(inicio)
+            grupo = grupos[(cancha_id, inicio.date())]
+            grupo[0] |= bit
+            if libre:
+                grupo[1] |= bit
+
+        tabla = DisponibilidadDia.__table__
+        for (cancha_id, fecha), (tocados, libres) in grupos.items():
+            actualizar = tabla.update().where(
+                tabla.c.cancha_id == cancha_id, tabla.c.fecha == fecha
+            ).values(libres=tabla.c.libres.op('&')(~tocados).op('|')(libres))
+            if db.session.execute(actualizar).rowcount:
+                continue
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(tabla.insert().values(cancha_id=cancha_id, fecha=fecha, libres=libres))
+            except IntegrityError:
+                # Otra transacción creó la fila al mismo tiempo
+                db.session.execute(actualizar)
+
+    def actualizar_timeslots(self, timeslots):
+        """Como actualizar(), a partir de instancias de Timeslot (estado sin asignar = DISPONIBLE)."""
+        self.actualizar(
+            (ts.cancha_id, ts.inicio, ts.estado in (None, TimeslotEstado.DISPONIBLE))
+            for ts in timeslots
+        )
+
+    def get_mascaras(self, fecha, club_ids=None, cancha_ids=None):
+        """
+        Devuelve {cancha_id: máscara} de las canchas activas de los clubes (o
+        de las canchas indicadas) en una fecha. Sin fila, la máscara es 0.
+        """
+        query = db.session.query(Cancha.id, Cancha.club_id, DisponibilidadDia.libres)\
+            .outerjoin(DisponibilidadDia, (DisponibilidadDia.cancha_id == Cancha.id) & (DisponibilidadDia.fecha == fecha))\
+            .filter(Cancha.activa.is_(True))
+        if club_ids:
+            query = query.filter(Cancha.club_id.in_(club_ids))
+        if cancha_ids:
+            query = query.filter(Cancha.id.in_(cancha_ids))
+        return {cancha_id: (club_id, libres or 0) for cancha_id, club_id, libres in query.all()}
+
+    def reconstruir(self, fecha_desde=None):
+        """
+        Recalcula todas las máscaras desde los timeslots (desde una fecha, si se indica).
+
+        Returns:
+            int: Cantidad de filas (cancha, día) escritas
+        """
+        mascaras = defaultdict(int)
+        query = db.session.query(Timeslot.cancha_id, Timeslot.inicio, Timeslot.estado)
+        borrar = db.session.query(DisponibilidadDia)
+        if fecha_desde:
+            query = query.filter(Timeslot.inicio >= fecha_desde)
+            borrar = borrar.filter(DisponibilidadDia.fecha >= fecha_desde)
+        for cancha_id, inicio, estado in query.yield_per(5000):
+            clave = (cancha_id, inicio.date())
+            mascaras[clave] |= bit_turno(inicio) if estado == TimeslotEstado.DISPONIBLE else 0
+
+        borrar.delete(synchronize_session=False)
+        if mascaras:
+            db.session.execute(DisponibilidadDia.__table__.insert(), [
+                {"cancha_id": cancha_id, "fecha": fecha, "libres": libres}
+                for (cancha_id, fecha), libres in mascaras.items()
+            ])
+        return len(mascaras)
+
+    def eliminar_anteriores(self, cancha_ids, fecha):
+        """
+        Borra las máscaras de las canchas anteriores a una fecha (las de días
+        ya podados no tienen turnos libres: sin fila, la máscara es 0).
+
+        Returns:
+            int: Cantidad de filas borradas
+        """
+        if not cancha_ids:
+            return 0
+        return db.session.query(DisponibilidadDia)\
+            .filter(DisponibilidadDia.cancha_id.in_(cancha_ids), DisponibilidadDia.fecha < fecha)\
+            .delete(synchronize_session=False)
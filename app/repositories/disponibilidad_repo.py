@@ -0,0 +1,74 @@
+from app.models.cancha import Cancha
+from app.models.cancha_bloqueo import CanchaBloqueo
+from app.models.club_cierre import ClubCierre
+from app.models.club_horario import ClubHorario
+from app.models.timeslot import Timeslot
+from app import db
+
+
+class DisponibilidadRepository:
+    """Lecturas de las reglas de las que se deriva la disponibilidad virtual."""
+
+    def __init__(self):
+        pass
+
+    def get_canchas(self, club_id, cancha_ids=None, solo_activas=False):
+        query = Cancha.query.filter(Cancha.club_id == club_id)
+        if cancha_ids:
+            query = query.filter(Cancha.id.in_(cancha_ids))
+        if solo_activas:
+            query = query.filter(Cancha.activa.is_(True))
+        return query.order_by(Cancha.id).all()
+
+    def get_canchas_por_ids(self, cancha_ids):
+        if not cancha_ids:
+            return []
+        return Cancha.query.filter(Cancha.id.in_(list(cancha_ids))).all()
+
+    def get_horarios_activos(self, club_id):
+        return ClubHorario.query.filter(
+            ClubHorario.club_id == club_id,
+            ClubHorario.activo.is_(True)
+        ).all()
+
+    def get_cierres(self, club_id, fecha_desde, fecha_hasta):
+        """Cierres y horarios especiales del club entre dos fechas (inclusive)."""
+        return ClubCierre.query.filter(
+            ClubCierre.club_id == club_id,
+            ClubCierre.fecha >= fecha_desde,
+            ClubCierre.fecha <= fecha_hasta
+        ).all()
+
+    def get_bloqueos(self, cancha_ids, desde, hasta):
+        """Bloqueos de las canchas que se solapan con [desde, hasta)."""
+        if not cancha_ids:
+            return []
+        return CanchaBloqueo.query.filter(
+            CanchaBloqueo.cancha_id.in_(cancha_ids),
+            CanchaBloqueo.inicio < hasta,
+            CanchaBloqueo.fin > desde
+        ).all()
+
+    def get_timeslots_persistidos(self, cancha_ids, desde, hasta):
+        """Timeslots guardados de las canchas con inicio en [desde, hasta)."""
+        if not cancha_ids:
+            return []
+        return Timeslot.query.filter(
+            Timeslot.cancha_id.in_(cancha_ids),
+            Timeslot.inicio >= desde,
+            Timeslot.inicio < hasta
+        ).all()
+
+    def get_timeslots_para_reservar(self, claves):
+        """
+        Timeslots guardados para las claves (cancha_id, inicio), bloqueados para actualizar.
+
+        Returns:
+            dict[tuple[int, datetime], Timeslot]
+        """
+        if not claves:
+            return {}
+        timeslots = Timeslot.query.filter(
+            db.tuple_(Timeslot.cancha_id, Timeslot.inicio).in_(list(claves))
+        ).with_for_update().all()
+        return {(ts.cancha_id, ts.inicio): ts for ts in timeslots}
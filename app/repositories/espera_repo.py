@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from app.models.espera_turno import EsperaTurno, MAX_VENTANA_ESPERA_HORAS
+from app.models.enums import EsperaEstado
+from app import db
+
+
+class EsperaRepository:
+    def __init__(self):
+        pass
+
+    def get_by_id(self, id):
+        return db.session.get(EsperaTurno, id)
+
+    def create(self, espera):
+        db.session.add(espera)
+        return espera
+
+    def get_pendientes_por_club(self, club_id, desde: datetime = None):
+        query = EsperaTurno.query.filter(
+            EsperaTurno.club_id == club_id,
+            EsperaTurno.estado == EsperaEstado.PENDIENTE
+        )
+        if desde is not None:
+            query = query.filter(EsperaTurno.hasta > desde)
+        return query.order_by(EsperaTurno.desde, EsperaTurno.id).all()
+
+    def get_primera_para_turno(self, club_id: int, cancha_id: int, inicio: datetime, fin: datetime):
+        """
+        Obtiene la espera PENDIENTE más antigua (por orden de llegada) que admite
+        el turno [inicio, fin) de la cancha, bloqueada para actualizar.
+
+        Como ninguna ventana supera MAX_VENTANA_ESPERA_HORAS, las candidatas
+        tienen 'desde' en [fin - MAX_VENTANA_ESPERA_HORAS, inicio]: un rango
+        acotado del índice (club_id, estado, desde).
+        """
+        return (
+            EsperaTurno.query
+            .filter(
+                EsperaTurno.club_id == club_id,
+                EsperaTurno.estado == EsperaEstado.PENDIENTE,
+                EsperaTurno.desde >= fin - timedelta(hours=MAX_VENTANA_ESPERA_HORAS),
+                EsperaTurno.desde <= inicio,
+                EsperaTurno.hasta >= fin,
+                db.or_(EsperaTurno.cancha_id.is_(None), EsperaTurno.cancha_id == cancha_id)
+            )
+            .order_by(EsperaTurno.created_at, EsperaTurno.id)
+            .with_for_update()
+            .first()
+        )
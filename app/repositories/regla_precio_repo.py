@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+from app.models.regla_precio import ReglaPrecio
+from app.models.timeslot import Timeslot
+from app.models.cancha import Cancha
+from app.models.enums import DiaSemana, TimeslotEstado
+from app import db
+
+# DiaSemana -> número de día de strftime('%w') / extract(dow): domingo = 0
+NUMERO_DIA = {DiaSemana.DOM: 0, DiaSemana.LUN: 1, DiaSemana.MAR: 2, DiaSemana.MIE: 3,
+              DiaSemana.JUE: 4, DiaSemana.VIE: 5, DiaSemana.SAB: 6}
+
+
+class ReglaPrecioRepository:
+    def __init__(self):
+        pass
+
+    def get_by_id(self, id):
+        return db.session.get(ReglaPrecio, id)
+
+    def get_by_club(self, club_id):
+        return ReglaPrecio.query.filter_by(club_id=club_id).order_by(ReglaPrecio.id).all()
+
+    def get_by_clubes(self, club_ids):
+        if not club_ids:
+            return []
+        return ReglaPrecio.query.filter(ReglaPrecio.club_id.in_(list(club_ids))).all()
+
+    def create(self, regla):
+        db.session.add(regla)
+        return regla
+
+    def delete(self, regla):
+        db.session.delete(regla)
+
+    def _hora(self, columna):
+        if db.session.get_bind().dialect.name == 'sqlite':
+            return db.func.strftime('%H:%M:%S', columna)
+        return db.func.to_char(columna, 'HH24:MI:SS')
+
+    def _dia(self, columna, dia):
+        if db.session.get_bind().dialect.name == 'sqlite':
+            return db.func.strftime('%w', columna) == str(NUMERO_DIA[dia])
+        return db.extract('dow', columna) == NUMERO_DIA[dia]
+
+    def _filtro_base(self, club_id, desde, cancha_ids):
+        """Timeslots DISPONIBLE del club (o de algunas canchas) con inicio desde 'desde'."""
+        filtro = [
+            Timeslot.estado == TimeslotEstado.DISPONIBLE,
+            Timeslot.inicio >= desde,
+            Timeslot.cancha_id.in_(db.select(Cancha.id).where(Cancha.club_id == club_id).scalar_subquery())
+        ]
+        if cancha_ids:
+            filtro.append(Timeslot.cancha_id.in_(cancha_ids))
+        return filtro
+
+    def reprecio_base(self, club_id: int, desde: datetime, cancha_ids=None) -> int:
+        """
+        Vuelve al precio por hora de su cancha el precio de los timeslots
+        DISPONIBLE futuros, en un solo UPDATE.
+
+        Returns:
+            int: Cantidad de timeslots actualizados
+        """
+        precio_cancha = db.select(Cancha.precio_hora).where(Cancha.id == Timeslot.cancha_id).scalar_subquery()
+        return (
+            db.session.query(Timeslot)
+            .filter(*self._filtro_base(club_id, desde, cancha_ids))
+            .update({Timeslot.precio: precio_cancha, Timeslot.updated_at: datetime.utcnow()},
+                    synchronize_session=False)
+        )
+
+    def reprecio_regla(self, regla: ReglaPrecio, desde: datetime, cancha_ids=None) -> int:
+        """
+        Aplica una regla a los timeslots DISPONIBLE futuros que cubre, en un
+        solo UPDATE (franja horaria, día de la semana y fechas en el WHERE).
+
+        Returns:
+            int: Cantidad de timeslots actualizados
+        """
+        filtro = self._filtro_base(regla.club_id, desde, cancha_ids)
+        if regla.cancha_id is not None:
+            filtro.append(Timeslot.cancha_id == regla.cancha_id)
+        if regla.dia is not None:
+            filtro.append(self._dia(Timeslot.inicio, regla.dia))
+        filtro.append(self._hora(Timeslot.inicio) >= regla.hora_desde.strftime('%H:%M:%S'))
+        if regla.hora_hasta is not None:
+            filtro.append(self._hora(Timeslot.inicio) < regla.hora_hasta.strftime('%H:%M:%S'))
+        if regla.fecha_desde is not None:
+            filtro.append(Timeslot.inicio >= datetime.combine(regla.fecha_desde, datetime.min.time()))
+        if regla.fecha_hasta is not None:
+            filtro.append(Timeslot.inicio < datetime.combine(regla.fecha_hasta + timedelta(days=1), datetime.min.time()))
+        return (
+            db.session.query(Timeslot)
+            .filter(*filtro)
+            .update({Timeslot.precio: regla.precio, Timeslot.updated_at: datetime.utcnow()},
+                    synchronize_session=False)
+        )
@@ -1,18 +1,35 @@
+import re
+import unicodedata
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from calendar import monthrange
-from sqlalchemy import func
+from sqlalchemy import func, text, union_all
+from sqlalchemy.orm import contains_eager
 
 from app import db
+from app.models.cliente import Cliente
 from app.models.reserva import Reserva
+from app.models.reserva_archivada import ReservaArchivada
 from app.models.timeslot import Timeslot
+from app.models.timeslot_archivado import TimeslotArchivado
 from app.models.cancha import Cancha
+from app.repositories.cliente_repo import normalizar_email
+
+
+def _normalizar_busqueda(texto: str) -> str:
+    """Pasa a minúsculas y quita acentos (José -> jose) para comparar como el índice."""
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
 
 
 class ReporteRepository:
     """
     Repositorio para obtener datos de reportes desde la base de datos.
     Contiene queries especializadas para análisis y reportes.
+    
+    Las reservas pasadas que la retención movió a 'reserva_archivada' (y sus
+    turnos a 'timeslot_archivado') se suman a los agregados y se devuelven
+    en los listados junto con las vigentes.
     """
     
     def __init__(self):
@@ -24,23 +41,153 @@ class ReporteRepository:
         
         Args:
             cliente_email: Email exacto del cliente
-            q: Búsqueda libre por nombre o email (contiene)
+            q: Búsqueda libre por nombre o email (prefijo, sin acentos)
+            
+        Returns:
+            Lista de reservas (con su cliente ya cargado) ordenadas por email
+            del cliente y fecha de creación
+        """
+        query = Reserva.query.join(Reserva.cliente).options(contains_eager(Reserva.cliente))
+        
+        if cliente_email:
+            query = query.filter(Cliente.email == normalizar_email(cliente_email))
+        elif q:
+            query = query.filter(self._filtro_busqueda_cliente(q))
+        
+        return query.order_by(Cliente.email, Reserva.created_at).all()
+    
+    def get_reservas_archivadas_filtradas(self, cliente_email: Optional[str] = None, q: Optional[str] = None):
+        """
+        Como get_reservas_filtradas(), sobre las reservas archivadas.
+        
+        Returns:
+            Lista de ReservaArchivada ordenadas por email del cliente y fecha de creación
+        """
+        query = ReservaArchivada.query.join(ReservaArchivada.cliente)\
+                                      .options(contains_eager(ReservaArchivada.cliente))
+        
+        if cliente_email:
+            query = query.filter(Cliente.email == normalizar_email(cliente_email))
+        elif q:
+            query = query.filter(self._filtro_busqueda_archivo(q))
+        
+        return query.order_by(Cliente.email, ReservaArchivada.created_at).all()
+    
+    def _filtro_busqueda_archivo(self, q: str):
+        """
+        Condición de búsqueda libre sobre las reservas archivadas: ILIKE sobre
+        nombre y email (el archivo no tiene índice de búsqueda y se consulta poco).
+        """
+        like = f"%{q}%"
+        return (ReservaArchivada.cliente_email.ilike(like)) | (ReservaArchivada.cliente_nombre.ilike(like))
+    
+    def _filtro_busqueda_cliente(self, q: str):
+        """
+        Construye la condición de búsqueda libre por nombre o email del cliente.
+        
+        Usa el índice de búsqueda del motor (ver app/models/reserva.py):
+        - SQLite: MATCH sobre la tabla FTS5 'reserva_busqueda', cada palabra
+          como prefijo ("jos per" encuentra "José Pérez").
+        - PostgreSQL: ILIKE sobre la expresión sin acentos indexada con trigramas.
+        - Otros motores: ILIKE sobre las columnas (sin índice).
+        
+        Args:
+            q: Texto ingresado en el buscador
+            
+        Returns:
+            Expresión booleana de SQLAlchemy aplicable a Reserva
+        """
+        dialecto = db.session.get_bind().dialect.name
+        normalizado = _normalizar_busqueda(q)
+        
+        if dialecto == "sqlite":
+            palabras = re.findall(r"\w+", normalizado)
+            if palabras:
+                expresion = " ".join(f'"{p}"*' for p in palabras)
+                return Reserva.id.in_(
+                    text("SELECT rowid FROM reserva_busqueda WHERE reserva_busqueda MATCH :expresion")
+                    .bindparams(expresion=expresion)
+                )
+        elif dialecto == "postgresql":
+            documento = func.f_unaccent(func.lower(Reserva.cliente_nombre + " " + Reserva.cliente_email))
+            return documento.ilike(f"%{normalizado}%")
+        
+        like = f"%{q}%"
+        return (Reserva.cliente_email.ilike(like)) | (Reserva.cliente_nombre.ilike(like))
+    
+    def get_clientes_paginados(
+        self,
+        cliente_email: Optional[str] = None,
+        q: Optional[str] = None,
+        page: int = 1,
+        per_page: int = 50
+    ) -> Tuple[List[Cliente], int]:
+        """
+        Obtiene una página de clientes que cumplen el filtro.
+        
+        Args:
+            cliente_email: Email exacto del cliente
+            q: Búsqueda libre por nombre o email (prefijo, sin acentos)
+            page: Número de página (desde 1)
+            per_page: Cantidad de clientes por página
             
         Returns:
-            Lista de reservas ordenadas por email y fecha de creación
+            Tupla (lista de Cliente ordenada por email, total de clientes)
         """
-        query = Reserva.query
+        query = Cliente.query
         
         if cliente_email:
-            query = query.filter(Reserva.cliente_email == cliente_email)
+            query = query.filter(Cliente.email == normalizar_email(cliente_email))
         elif q:
-            like = f"%{q}%"
             query = query.filter(
-                (Reserva.cliente_email.ilike(like)) |
-                (Reserva.cliente_nombre.ilike(like))
+                Cliente.id.in_(
+                    db.session.query(Reserva.cliente_id).filter(self._filtro_busqueda_cliente(q))
+                ) | Cliente.id.in_(
+                    db.session.query(ReservaArchivada.cliente_id).filter(self._filtro_busqueda_archivo(q))
+                )
             )
         
-        return query.order_by(Reserva.cliente_email, Reserva.created_at).all()
+        total = query.count()
+        clientes = query.order_by(Cliente.email)\
+                        .limit(per_page)\
+                        .offset((page - 1) * per_page)\
+                        .all()
+        
+        return clientes, total
+    
+    def get_reservas_de_clientes(self, cliente_ids: List[int]):
+        """
+        Obtiene las reservas de un conjunto de clientes usando el índice de 'cliente_id'.
+        
+        Args:
+            cliente_ids: IDs de los clientes
+            
+        Returns:
+            Lista de reservas ordenadas por cliente y fecha de creación
+        """
+        if not cliente_ids:
+            return []
+        
+        return Reserva.query.filter(Reserva.cliente_id.in_(cliente_ids))\
+                            .order_by(Reserva.cliente_id, Reserva.created_at)\
+                            .all()
+    
+    def get_reservas_archivadas_de_clientes(self, cliente_ids: List[int]):
+        """
+        Obtiene las reservas archivadas de un conjunto de clientes.
+        
+        Args:
+            cliente_ids: IDs de los clientes
+            
+        Returns:
+            Lista de ReservaArchivada ordenadas por cliente y fecha de creación
+        """
+        if not cliente_ids:
+            return []
+        
+        return ReservaArchivada.query.filter(ReservaArchivada.cliente_id.in_(cliente_ids))\
+                                     .order_by(ReservaArchivada.cliente_id, ReservaArchivada.created_at)\
+                                     .all()
     
     def get_reservas_por_cancha(
         self, 
@@ -71,6 +218,30 @@ class ReporteRepository:
         
         return query.order_by(Reserva.cancha_id, Timeslot.inicio).all()
     
+    def get_reservas_archivadas_por_cancha(
+        self,
+        cancha_id: Optional[int] = None,
+        start_dt: Optional[datetime] = None,
+        end_dt: Optional[datetime] = None
+    ):
+        """
+        Como get_reservas_por_cancha(), sobre las reservas archivadas.
+        
+        Returns:
+            Lista de ReservaArchivada ordenadas por cancha e inicio de sus turnos
+        """
+        query = ReservaArchivada.query.join(ReservaArchivada.timeslots)
+        
+        if cancha_id:
+            query = query.filter(ReservaArchivada.cancha_id == cancha_id)
+        
+        if start_dt:
+            query = query.filter(TimeslotArchivado.inicio >= start_dt)
+        if end_dt:
+            query = query.filter(TimeslotArchivado.inicio <= end_dt)
+        
+        return query.order_by(ReservaArchivada.cancha_id, TimeslotArchivado.inicio).all()
+    
     def get_canchas_mas_utilizadas_query(
         self,
         start_dt: Optional[datetime] = None,
@@ -88,20 +259,36 @@ class ReporteRepository:
         Returns:
             Lista de tuplas (cancha_id, reservas_count, total_ingresos)
         """
-        q = db.session.query(
-            Reserva.cancha_id.label('cancha_id'),
-            func.count(func.distinct(Reserva.id)).label('reservas_count'),
-            func.coalesce(func.sum(Reserva.precio_total), 0).label('total_ingresos')
-        ).join(Reserva.timeslots).join(Timeslot)
+        def _por_cancha(modelo, timeslot, inicio):
+            q = db.session.query(
+                modelo.cancha_id.label('cancha_id'),
+                func.count(func.distinct(modelo.id)).label('reservas_count'),
+                func.coalesce(func.sum(modelo.precio_total), 0).label('total_ingresos')
+            ).join(modelo.timeslots)
+            if timeslot is not None:
+                q = q.join(timeslot)
+            
+            if start_dt:
+                q = q.filter(inicio >= start_dt)
+            if end_dt:
+                q = q.filter(inicio <= end_dt)
+            
+            return q.group_by(modelo.cancha_id)
         
-        if start_dt:
-            q = q.filter(Timeslot.inicio >= start_dt)
-        if end_dt:
-            q = q.filter(Timeslot.inicio <= end_dt)
+        # Vigentes y archivadas se agregan por separado y se suman por cancha
+        partes = union_all(
+            _por_cancha(Reserva, Timeslot, Timeslot.inicio).statement,
+            _por_cancha(ReservaArchivada, None, TimeslotArchivado.inicio).statement
+        ).subquery()
+        reservas_count = func.sum(partes.c.reservas_count)
         
-        q = q.group_by(Reserva.cancha_id)\
-             .order_by(func.count(func.distinct(Reserva.id)).desc())\
-             .limit(limit)
+        q = db.session.query(
+            partes.c.cancha_id.label('cancha_id'),
+            reservas_count.label('reservas_count'),
+            func.sum(partes.c.total_ingresos).label('total_ingresos')
+        ).group_by(partes.c.cancha_id)\
+         .order_by(reservas_count.desc())\
+         .limit(limit)
         
         return q.all()
     
@@ -122,13 +309,17 @@ class ReporteRepository:
         """
         q_total = db.session.query(func.count(func.distinct(Reserva.id)))
         q_total = q_total.join(Reserva.timeslots).join(Timeslot)
+        q_archivo = db.session.query(func.count(func.distinct(ReservaArchivada.id)))
+        q_archivo = q_archivo.join(ReservaArchivada.timeslots)
         
         if start_dt:
             q_total = q_total.filter(Timeslot.inicio >= start_dt)
+            q_archivo = q_archivo.filter(TimeslotArchivado.inicio >= start_dt)
         if end_dt:
             q_total = q_total.filter(Timeslot.inicio <= end_dt)
+            q_archivo = q_archivo.filter(TimeslotArchivado.inicio <= end_dt)
         
-        return int(q_total.scalar() or 0)
+        return int(q_total.scalar() or 0) + int(q_archivo.scalar() or 0)
     
     def get_utilizacion_mensual_query(
         self,
@@ -147,26 +338,38 @@ class ReporteRepository:
         Returns:
             Lista de tuplas (cancha_id, month, count)
         """
-        base_q = db.session.query(
-            Reserva.cancha_id.label('cancha_id'),
-            func.strftime('%Y-%m', Timeslot.inicio).label('month'),
-            func.count(func.distinct(Reserva.id)).label('count')
-        ).join(Reserva.timeslots).join(Timeslot)
-        
-        if cancha_id:
-            base_q = base_q.filter(Reserva.cancha_id == cancha_id)
-        if start_date:
-            base_q = base_q.filter(
-                Timeslot.inicio >= datetime.combine(start_date, datetime.min.time())
-            )
-        if end_date:
-            base_q = base_q.filter(
-                Timeslot.inicio <= datetime.combine(end_date, datetime.max.time())
-            )
+        def _por_mes(modelo, timeslot, inicio):
+            base_q = db.session.query(
+                modelo.cancha_id.label('cancha_id'),
+                func.strftime('%Y-%m', inicio).label('month'),
+                func.count(func.distinct(modelo.id)).label('count')
+            ).join(modelo.timeslots)
+            if timeslot is not None:
+                base_q = base_q.join(timeslot)
+            
+            if cancha_id:
+                base_q = base_q.filter(modelo.cancha_id == cancha_id)
+            if start_date:
+                base_q = base_q.filter(
+                    inicio >= datetime.combine(start_date, datetime.min.time())
+                )
+            if end_date:
+                base_q = base_q.filter(
+                    inicio <= datetime.combine(end_date, datetime.max.time())
+                )
+            
+            return base_q.group_by(modelo.cancha_id, 'month')
         
-        base_q = base_q.group_by(Reserva.cancha_id, 'month')
+        partes = union_all(
+            _por_mes(Reserva, Timeslot, Timeslot.inicio).statement,
+            _por_mes(ReservaArchivada, None, TimeslotArchivado.inicio).statement
+        ).subquery()
         
-        return base_q.all()
+        return db.session.query(
+            partes.c.cancha_id.label('cancha_id'),
+            partes.c.month.label('month'),
+            func.sum(partes.c.count).label('count')
+        ).group_by(partes.c.cancha_id, partes.c.month).all()
     
     def get_cancha_by_id(self, cancha_id: int):
         """
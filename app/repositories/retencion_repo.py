@@ -0,0 +1,145 @@
+from sqlalchemy import insert, select
+
+from app.models.cancha import Cancha
+from app.models.enums import TimeslotEstado
+from app.models.partido import Partido
+from app.models.reserva import Reserva
+from app.models.reserva_archivada import ReservaArchivada
+from app.models.reserva_timeslot import ReservaTimeslot
+from app.models.timeslot import Timeslot
+from app.models.timeslot_archivado import TimeslotArchivado
+from app import db
+
+# Columnas que se copian tal cual de 'reserva' a 'reserva_archivada' y de 'timeslot' a 'timeslot_archivado'
+COLUMNAS_RESERVA = ("cancha_id", "cliente_id", "serie_id", "cliente_nombre", "cliente_telefono", "cliente_email",
+                    "estado", "fuente", "servicios", "precio_total", "created_at", "updated_at")
+COLUMNAS_TIMESLOT = ("cancha_id", "inicio", "fin", "estado", "precio")
+
+
+def _filtro_podables(antes):
+    """Timeslots que empezaron antes de 'antes' y nunca se reservaron ni se asignaron a un partido."""
+    return (
+        Timeslot.inicio < antes,
+        Timeslot.estado.notin_((TimeslotEstado.RESERVADO, TimeslotEstado.PAGADO)),
+        ~db.session.query(ReservaTimeslot.id).filter(ReservaTimeslot.timeslot_id == Timeslot.id).exists(),
+        ~db.session.query(Partido.id).filter(Partido.timeslot_id == Timeslot.id).exists(),
+    )
+
+
+def _filtro_archivables(antes):
+    """
+    Reservas cuyos turnos empezaron todos antes de 'antes' (las canceladas,
+    que ya no tienen turnos, por su fecha de creación).
+    """
+    turnos = db.session.query(ReservaTimeslot.id).filter(ReservaTimeslot.reserva_id == Reserva.id)
+    return (
+        ~turnos.join(Timeslot, Timeslot.id == ReservaTimeslot.timeslot_id).filter(Timeslot.inicio >= antes).exists(),
+        turnos.exists() | (Reserva.created_at < antes),
+    )
+
+
+class RetencionRepository:
+    """
+    Consultas y escrituras en bloque de la retención: borrado de turnos
+    libres pasados y archivo de reservas pasadas, de a lotes.
+    """
+
+    def __init__(self):
+        pass
+
+    def get_cancha_ids(self, club_id):
+        """IDs de todas las canchas del club (activas o no)."""
+        return [cancha_id for cancha_id, in db.session.query(Cancha.id).filter(Cancha.club_id == club_id).all()]
+
+    def get_timeslots_podables(self, cancha_id, antes, despues_de=None, limite=500):
+        """
+        Obtiene (id, inicio) de hasta 'limite' timeslots podables de una cancha,
+        ordenados por inicio a partir de 'despues_de' (recorrido por el índice
+        (cancha_id, inicio), sin volver a leer los que se saltearon).
+        """
+        query = db.session.query(Timeslot.id, Timeslot.inicio).filter(Timeslot.cancha_id == cancha_id, *_filtro_podables(antes))
+        if despues_de is not None:
+            query = query.filter(Timeslot.inicio > despues_de)
+        return query.order_by(Timeslot.inicio).limit(limite).all()
+
+    def contar_timeslots_podables(self, cancha_ids, antes):
+        """Cantidad de timeslots podables de las canchas."""
+        if not cancha_ids:
+            return 0
+        return db.session.query(Timeslot.id).filter(Timeslot.cancha_id.in_(cancha_ids), *_filtro_podables(antes)).count()
+
+    def eliminar_timeslots(self, timeslot_ids, antes):
+        """
+        Borra en un solo DELETE los timeslots indicados que sigan siendo
+        podables (una reserva hecha mientras tanto los excluye).
+
+        Returns:
+            int: Cantidad de timeslots borrados
+        """
+        if not timeslot_ids:
+            return 0
+        return db.session.query(Timeslot)\
+            .filter(Timeslot.id.in_(timeslot_ids), *_filtro_podables(antes))\
+            .delete(synchronize_session=False)
+
+    def get_reservas_archivables(self, cancha_ids, antes, despues_de_id=0, limite=500):
+        """IDs de hasta 'limite' reservas archivables de las canchas, en orden de id a partir de 'despues_de_id'."""
+        if not cancha_ids:
+            return []
+        return [reserva_id for reserva_id, in (
+            db.session.query(Reserva.id)
+            .filter(Reserva.cancha_id.in_(cancha_ids), Reserva.id > despues_de_id, *_filtro_archivables(antes))
+            .order_by(Reserva.id)
+            .limit(limite)
+            .all()
+        )]
+
+    def contar_reservas_archivables(self, cancha_ids, antes):
+        """Cantidad de reservas archivables de las canchas."""
+        if not cancha_ids:
+            return 0
+        return db.session.query(Reserva.id).filter(Reserva.cancha_id.in_(cancha_ids), *_filtro_archivables(antes)).count()
+
+    def archivar_reservas(self, reserva_ids):
+        """
+        Copia las reservas y sus timeslots a las tablas de archivo y los borra
+        de 'reserva', 'reserva_timeslot' y 'timeslot'. Son unas pocas
+        sentencias por lote, sin instanciar modelos.
+
+        Returns:
+            tuple[int, int]: (reservas archivadas, timeslots archivados)
+        """
+        if not reserva_ids:
+            return 0, 0
+        reserva = Reserva.__table__
+        reservas = db.session.execute(
+            select(reserva.c.id, *(reserva.c[col] for col in COLUMNAS_RESERVA)).where(reserva.c.id.in_(reserva_ids))
+        ).mappings().all()
+        if not reservas:
+            return 0, 0
+        archivadas = dict(
+            (reserva_id, _id) for _id, reserva_id in db.session.execute(
+                insert(ReservaArchivada).returning(ReservaArchivada.id, ReservaArchivada.reserva_id),
+                [dict({col: fila[col] for col in COLUMNAS_RESERVA}, reserva_id=fila["id"]) for fila in reservas]
+            )
+        )
+
+        timeslot = Timeslot.__table__
+        turnos = db.session.execute(
+            select(timeslot.c.id, ReservaTimeslot.reserva_id, *(timeslot.c[col] for col in COLUMNAS_TIMESLOT))
+            .join(ReservaTimeslot, ReservaTimeslot.timeslot_id == timeslot.c.id)
+            .where(ReservaTimeslot.reserva_id.in_(archivadas))
+        ).mappings().all()
+        if turnos:
+            db.session.execute(insert(TimeslotArchivado), [
+                dict({col: turno[col] for col in COLUMNAS_TIMESLOT},
+                     timeslot_id=turno["id"], reserva_archivada_id=archivadas[turno["reserva_id"]])
+                for turno in turnos
+            ])
+
+        db.session.query(ReservaTimeslot).filter(ReservaTimeslot.reserva_id.in_(archivadas))\
+            .delete(synchronize_session=False)
+        db.session.query(Timeslot).filter(Timeslot.id.in_([turno["id"] for turno in turnos]))\
+            .delete(synchronize_session=False)
+        db.session.query(Reserva).filter(Reserva.id.in_(archivadas)).delete(synchronize_session=False)
+        return len(archivadas), len(turnos)
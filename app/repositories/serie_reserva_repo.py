@@ -0,0 +1,41 @@
+from app.models.serie_reserva import SerieReserva
+from app.models.reserva import Reserva
+from app.models.reserva_timeslot import ReservaTimeslot
+from app.models.timeslot import Timeslot
+from app.models.enums import ReservaEstado
+from app import db
+
+
+class SerieReservaRepository:
+    def __init__(self):
+        pass
+
+    def get_by_id(self, id):
+        return db.session.get(SerieReserva, id)
+
+    def create(self, serie):
+        db.session.add(serie)
+        return serie
+
+    def get_turnos_de_ocurrencias(self, serie_id):
+        """
+        Obtiene, en una sola consulta, los turnos vinculados a cada ocurrencia
+        de la serie: (reserva_id, estado, precio_total, timeslot_id, inicio, fin),
+        ordenados por inicio.
+        """
+        return (
+            db.session.query(Reserva.id, Reserva.estado, Reserva.precio_total,
+                             Timeslot.id, Timeslot.inicio, Timeslot.fin)
+            .join(ReservaTimeslot, ReservaTimeslot.reserva_id == Reserva.id)
+            .join(Timeslot, Timeslot.id == ReservaTimeslot.timeslot_id)
+            .filter(Reserva.serie_id == serie_id)
+            .order_by(Timeslot.inicio)
+            .all()
+        )
+
+    def contar_canceladas(self, serie_id):
+        """Cantidad de ocurrencias canceladas de la serie (ya no tienen turnos vinculados)."""
+        return Reserva.query.filter(
+            Reserva.serie_id == serie_id,
+            Reserva.estado == ReservaEstado.CANCELADA
+        ).count()
@@ -1,10 +1,19 @@
+from sqlalchemy import insert
+
 from app.models.timeslot import Timeslot 
+from app.models.cancha import Cancha
+from app.models.enums import TimeslotEstado
+from app.models.espera_turno import EsperaTurno
+from app.models.partido import Partido
+from app.models.reserva_timeslot import ReservaTimeslot
+from app.repositories.disponibilidad_dia_repo import DisponibilidadDiaRepository
 from app import db
 from datetime import date, datetime
 
 class TimeslotRepository: 
     def __init__(self, db): 
         self.db = db
+        self.mapa_repo = DisponibilidadDiaRepository()
     
     def existen_en_fecha(self, cancha_id: int, fecha: date) -> bool: 
         """Verifica si ya existen timeslots para una cancha en una fecha dada.""" 
@@ -45,8 +54,190 @@ class TimeslotRepository:
         )
 
     def guardar_bulk(self, timeslots: list):
-        """Guarda una lista de timeslots en la base de datos."""
+        """Guarda una lista de timeslots en la base de datos (y sus bits de disponibilidad)."""
         if not timeslots:
             return
         
-        self.db.session.add_all(timeslots)
\ No newline at end of file
+        self.db.session.add_all(timeslots)
+        self.mapa_repo.actualizar_timeslots(timeslots)
+
+    def insertar_bulk(self, filas: list) -> int:
+        """
+        Inserta timeslots DISPONIBLE en un solo INSERT de varias filas (sin
+        crear instancias) y prende sus bits de disponibilidad.
+
+        Args:
+            filas (list[dict]): cancha_id, inicio, fin y precio de cada timeslot
+
+        Returns:
+            int: Cantidad de timeslots insertados
+        """
+        if not filas:
+            return 0
+        self.db.session.execute(
+            insert(Timeslot),
+            [dict(fila, estado=TimeslotEstado.DISPONIBLE) for fila in filas]
+        )
+        self.mapa_repo.actualizar((fila["cancha_id"], fila["inicio"], True) for fila in filas)
+        return len(filas)
+
+    def get_disponibles_por_club(self, club_id: int, desde: datetime, hasta: datetime, cancha_ids=None):
+        """
+        Obtiene (id, inicio) de los timeslots DISPONIBLE de las canchas activas
+        de un club en un rango, ordenados por inicio.
+        """
+        query = (
+            self.db.session.query(Timeslot.id, Timeslot.inicio)
+            .join(Cancha, Cancha.id == Timeslot.cancha_id)
+            .filter(
+                Cancha.club_id == club_id,
+                Cancha.activa.is_(True),
+                Timeslot.estado == TimeslotEstado.DISPONIBLE,
+                Timeslot.inicio >= desde,
+                Timeslot.inicio < hasta
+            )
+        )
+        if cancha_ids:
+            query = query.filter(Timeslot.cancha_id.in_(cancha_ids))
+        return query.order_by(Timeslot.inicio, Timeslot.cancha_id).all()
+
+    def cambiar_estado_bulk(self, timeslot_ids: list, estado_actual: TimeslotEstado, nuevo_estado: TimeslotEstado,
+                            fuera_de_horario: bool = None) -> int:
+        """
+        Cambia el estado de varios timeslots en un solo UPDATE, solo si siguen
+        en 'estado_actual'.
+
+        Args:
+            fuera_de_horario (bool, optional): Si se indica, solo cambia los que
+                tengan la marca contraria y la invierte (bloqueos de la reconciliación)
+
+        Returns:
+            int: Cantidad de timeslots actualizados
+        """
+        if not timeslot_ids:
+            return 0
+        filtro = (Timeslot.id.in_(timeslot_ids), Timeslot.estado == estado_actual)
+        valores = {Timeslot.estado: nuevo_estado, Timeslot.updated_at: datetime.utcnow()}
+        if fuera_de_horario is not None:
+            filtro += (Timeslot.fuera_de_horario.is_(not fuera_de_horario),)
+            valores[Timeslot.fuera_de_horario] = fuera_de_horario
+        turnos = self.db.session.query(Timeslot.cancha_id, Timeslot.inicio).filter(*filtro).all()
+        actualizados = (
+            self.db.session.query(Timeslot)
+            .filter(*filtro)
+            .update(valores, synchronize_session=False)
+        )
+        libre = nuevo_estado == TimeslotEstado.DISPONIBLE
+        self.mapa_repo.actualizar((cancha_id, inicio, libre) for cancha_id, inicio in turnos)
+        return actualizados
+
+    def get_por_cancha_keyset(self, cancha_id: int, desde: datetime, hasta: datetime = None,
+                              estado: TimeslotEstado = None, despues_de: tuple = None, limite: int = 100):
+        """
+        Obtiene una página de timeslots de una cancha ordenados por (inicio, id),
+        usando el índice (cancha_id, inicio).
+
+        Args:
+            despues_de (tuple, optional): (inicio, id) del último timeslot de la página anterior
+            limite (int): Cantidad máxima de timeslots a devolver
+        """
+        query = self.db.session.query(Timeslot).filter(
+            Timeslot.cancha_id == cancha_id,
+            Timeslot.inicio >= desde
+        )
+        if hasta is not None:
+            query = query.filter(Timeslot.inicio < hasta)
+        if estado is not None:
+            query = query.filter(Timeslot.estado == estado)
+        if despues_de is not None:
+            query = query.filter(db.tuple_(Timeslot.inicio, Timeslot.id) > despues_de)
+        return query.order_by(Timeslot.inicio, Timeslot.id).limit(limite).all()
+
+    def get_libres_ordenados_por_cancha(self, club_id: int, desde: datetime, hasta: datetime,
+                                        cancha_ids=None, deporte=None, techado=None, iluminacion=None):
+        """
+        Obtiene (id, cancha_id, inicio, fin, precio) de los timeslots DISPONIBLE
+        de las canchas activas del club en [desde, hasta), ordenados por
+        (cancha_id, inicio): el orden del índice, listo para buscar turnos consecutivos.
+        """
+        query = (
+            self.db.session.query(Timeslot.id, Timeslot.cancha_id, Timeslot.inicio, Timeslot.fin,
+                                  db.func.coalesce(Timeslot.precio, Cancha.precio_hora))
+            .join(Cancha, Cancha.id == Timeslot.cancha_id)
+            .filter(
+                Cancha.club_id == club_id,
+                Cancha.activa.is_(True),
+                Timeslot.estado == TimeslotEstado.DISPONIBLE,
+                Timeslot.inicio >= desde,
+                Timeslot.inicio < hasta
+            )
+        )
+        if cancha_ids:
+            query = query.filter(Timeslot.cancha_id.in_(cancha_ids))
+        if deporte:
+            query = query.filter(Cancha.deporte == deporte)
+        if techado is not None:
+            query = query.filter(Cancha.techado.is_(techado))
+        if iluminacion is not None:
+            query = query.filter(Cancha.iluminacion.is_(iluminacion))
+        return query.order_by(Timeslot.cancha_id, Timeslot.inicio).all()
+
+    def get_turnos_de_club(self, club_id: int, desde: datetime, hasta: datetime):
+        """
+        Obtiene (id, cancha_id, inicio, fin, estado, fuera_de_horario) de los
+        timeslots de todas las canchas del club con inicio en [desde, hasta),
+        en una sola consulta.
+        """
+        return (
+            self.db.session.query(Timeslot.id, Timeslot.cancha_id, Timeslot.inicio, Timeslot.fin, Timeslot.estado,
+                                  Timeslot.fuera_de_horario)
+            .join(Cancha, Cancha.id == Timeslot.cancha_id)
+            .filter(
+                Cancha.club_id == club_id,
+                Timeslot.inicio >= desde,
+                Timeslot.inicio < hasta
+            )
+            .all()
+        )
+
+    def get_ultimo_inicio_de_club(self, club_id: int):
+        """Devuelve el inicio del último timeslot generado para el club (o None)."""
+        return (
+            self.db.session.query(db.func.max(Timeslot.inicio))
+            .join(Cancha, Cancha.id == Timeslot.cancha_id)
+            .filter(Cancha.club_id == club_id)
+            .scalar()
+        )
+
+    def eliminar_libres_bulk(self, timeslot_ids: list) -> int:
+        """
+        Elimina en un solo DELETE los timeslots que sigan DISPONIBLE y que no
+        estén referenciados por una reserva, un partido o la lista de espera
+        (esos quedan como estaban), y apaga sus bits de disponibilidad.
+
+        Returns:
+            int: Cantidad de timeslots eliminados
+        """
+        if not timeslot_ids:
+            return 0
+        filtro = (
+            Timeslot.id.in_(timeslot_ids),
+            Timeslot.estado == TimeslotEstado.DISPONIBLE,
+            ~db.session.query(ReservaTimeslot.id).filter(ReservaTimeslot.timeslot_id == Timeslot.id).exists(),
+            ~db.session.query(Partido.id).filter(Partido.timeslot_id == Timeslot.id).exists(),
+            ~db.session.query(EsperaTurno.id).filter(EsperaTurno.timeslot_id == Timeslot.id).exists(),
+        )
+        turnos = self.db.session.query(Timeslot.cancha_id, Timeslot.inicio).filter(*filtro).all()
+        eliminados = self.db.session.query(Timeslot).filter(*filtro).delete(synchronize_session=False)
+        self.mapa_repo.actualizar((cancha_id, inicio, False) for cancha_id, inicio in turnos)
+        return eliminados
+
+    def get_reservas_de_timeslots(self, timeslot_ids: list) -> dict:
+        """Devuelve {timeslot_id: reserva_id} de los timeslots que tienen una reserva."""
+        if not timeslot_ids:
+            return {}
+        return dict(
+            self.db.session.query(ReservaTimeslot.timeslot_id, ReservaTimeslot.reserva_id)
+            .filter(ReservaTimeslot.timeslot_id.in_(timeslot_ids))
+            .all()
+        )
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from app.models.token_revocado import TokenRevocado
+from app import db
+
+
+class TokenRevocadoRepository:
+    def __init__(self):
+        pass
+
+    def revocar(self, jti, tipo, user_id, expira_en):
+        """
+        Registra un token como revocado. Revocar dos veces el mismo jti no es un error.
+
+        Returns:
+            bool: True si se agregó, False si ya estaba revocado
+        """
+        try:
+            with db.session.begin_nested():
+                db.session.add(TokenRevocado(jti=jti, tipo=tipo, user_id=user_id, expira_en=expira_en))
+            return True
+        except IntegrityError:
+            return False
+
+    def get_vigentes(self, ahora=None):
+        """
+        Devuelve (jti, expira_en) de los tokens revocados que todavía no vencieron.
+        Usa el índice por expira_en y no carga los modelos.
+        """
+        ahora = ahora or datetime.utcnow()
+        return db.session.query(TokenRevocado.jti, TokenRevocado.expira_en)\
+            .filter(TokenRevocado.expira_en > ahora).all()
+
+    def purgar_lote_vencidos(self, ahora, lote):
+        """
+        Borra hasta 'lote' tokens revocados ya vencidos. No hace commit: la
+        purga confirma cada lote para no tomar un lock largo sobre la tabla.
+
+        Returns:
+            int: Cantidad de filas borradas
+        """
+        ids = db.session.query(TokenRevocado.id)\
+            .filter(TokenRevocado.expira_en <= ahora)\
+            .limit(lote).scalar_subquery()
+        return db.session.query(TokenRevocado)\
+            .filter(TokenRevocado.id.in_(ids))\
+            .delete(synchronize_session=False)
@@ -1,23 +1,72 @@
 from app.models.equipo import Equipo
+from app.models.partido import Partido
 from app import db
 from datetime import datetime
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import selectinload, with_expression
+
+
+def _contar_partidos(columna):
+    """Subconsulta correlacionada con la cantidad de partidos donde 'columna' es el equipo"""
+    return select(func.count(Partido.id)).where(columna == Equipo.id).scalar_subquery()
+
 
 class EquipoRepository:
     """
     Repositorio para manejar operaciones de base de datos para equipos
     """
+
+    def _query_con_totales(self):
+        """
+        Consulta de equipos con las cantidades de partidos calculadas en la
+        misma consulta y el torneo cargado en lote (selectinload), en lugar de
+        cargar las listas de partidos de cada equipo.
+        """
+        return Equipo.query.options(
+            with_expression(Equipo.total_partidos_local, _contar_partidos(Partido.equipo1_id)),
+            with_expression(Equipo.total_partidos_visitante, _contar_partidos(Partido.equipo2_id)),
+            with_expression(Equipo.total_partidos_ganador, _contar_partidos(Partido.ganador_id)),
+            selectinload(Equipo.torneo)
+        )
     
     def get_all(self):
         """Obtiene todos los equipos"""
-        return Equipo.query.all()
+        return self._query_con_totales().all()
     
     def get_by_id(self, equipo_id):
         """Obtiene un equipo por su ID"""
-        return Equipo.query.get(equipo_id)
+        return self._query_con_totales().filter(Equipo.id == equipo_id).first()
     
     def get_by_torneo(self, torneo_id):
         """Obtiene todos los equipos de un torneo específico"""
-        return Equipo.query.filter_by(torneo_id=torneo_id).all()
+        return self._query_con_totales().filter(Equipo.torneo_id == torneo_id).all()
+
+    def get_partidos_paginados(self, equipo_id, page, per_page):
+        """
+        Obtiene una página del historial de partidos de un equipo (local o visitante).
+
+        Returns:
+            tuple[list[Partido], int]: Partidos de la página y total de partidos del equipo
+        """
+        query = Partido.query.filter(or_(Partido.equipo1_id == equipo_id, Partido.equipo2_id == equipo_id))
+        total = query.order_by(None).count()
+        partidos = query.options(
+            selectinload(Partido.equipo1),
+            selectinload(Partido.equipo2),
+            selectinload(Partido.ganador),
+            selectinload(Partido.timeslot)
+        ).order_by(Partido.ronda, Partido.id)\
+         .offset((page - 1) * per_page).limit(per_page).all()
+        return partidos, total
+    
+    def get_timeslot_ids_de_partidos(self, equipo_id):
+        """IDs de los turnos asignados a los partidos del equipo (local o visitante)"""
+        return [
+            timeslot_id for (timeslot_id,) in db.session.query(Partido.timeslot_id).filter(
+                or_(Partido.equipo1_id == equipo_id, Partido.equipo2_id == equipo_id),
+                Partido.timeslot_id.isnot(None)
+            )
+        ]
     
     def create(self, equipo):
         """Crea un nuevo equipo"""
@@ -1,5 +1,7 @@
 from app.models.partido import Partido
 from app import db
+from app.models.timeslot import Timeslot
+from sqlalchemy import func, bindparam
 from datetime import datetime
 
 class PartidoRepository:
@@ -15,10 +17,92 @@ class PartidoRepository:
         """Obtiene un partido por su ID"""
         return Partido.query.get(partido_id)
     
+    def get_by_ids(self, partido_ids):
+        """Obtiene varios partidos por sus IDs en una sola consulta"""
+        return Partido.query.filter(Partido.id.in_(partido_ids)).order_by(Partido.id).all()
+
     def get_by_torneo(self, torneo_id):
         """Obtiene todos los partidos de un torneo específico"""
         return Partido.query.filter_by(torneo_id=torneo_id).all()
     
+    def get_by_torneo_y_ronda(self, torneo_id, ronda):
+        """Obtiene los partidos de una ronda del fixture, en orden de creación"""
+        return Partido.query.filter_by(torneo_id=torneo_id, ronda=ronda)\
+                            .order_by(Partido.id).all()
+
+    def get_ultima_ronda(self, torneo_id):
+        """Devuelve el número de la última ronda generada (None si no hay fixture)"""
+        return db.session.query(func.max(Partido.ronda))\
+                         .filter(Partido.torneo_id == torneo_id).scalar()
+
+    def get_sin_programar(self, torneo_id):
+        """Obtiene los partidos sin turno ni resultado, en orden de ronda"""
+        return Partido.query.filter(
+            Partido.torneo_id == torneo_id,
+            Partido.timeslot_id.is_(None),
+            Partido.goles_equipo1.is_(None)
+        ).order_by(Partido.ronda, Partido.id).all()
+
+    def get_fechas_programadas(self, torneo_id):
+        """
+        Devuelve las fechas en que cada equipo ya tiene un partido programado.
+
+        Returns:
+            dict[int, set[date]]: equipo_id -> fechas
+        """
+        filas = db.session.query(Partido.equipo1_id, Partido.equipo2_id, Timeslot.inicio)\
+                          .join(Timeslot, Timeslot.id == Partido.timeslot_id)\
+                          .filter(Partido.torneo_id == torneo_id).all()
+        fechas = {}
+        for equipo1_id, equipo2_id, inicio in filas:
+            fechas.setdefault(equipo1_id, set()).add(inicio.date())
+            fechas.setdefault(equipo2_id, set()).add(inicio.date())
+        return fechas
+
+    def asignar_timeslots_bulk(self, asignaciones):
+        """
+        Guarda el turno de varios partidos en un solo executemany.
+
+        Args:
+            asignaciones (dict[int, int]): partido_id -> timeslot_id
+        """
+        if not asignaciones:
+            return
+        tabla = Partido.__table__
+        db.session.execute(
+            tabla.update()
+                 .where(tabla.c.id == bindparam("b_partido_id"))
+                 .values(timeslot_id=bindparam("b_timeslot_id"), updated_at=datetime.utcnow()),
+            [{"b_partido_id": p, "b_timeslot_id": t} for p, t in asignaciones.items()]
+        )
+
+    def actualizar_resultados_bulk(self, filas):
+        """
+        Guarda goles y ganador de varios partidos en un solo executemany.
+
+        Args:
+            filas (list[dict]): Dicts con b_id, goles_equipo1, goles_equipo2 y ganador_id
+        """
+        if not filas:
+            return
+        tabla = Partido.__table__
+        db.session.execute(
+            tabla.update()
+                 .where(tabla.c.id == bindparam("b_id"))
+                 .values(
+                     goles_equipo1=bindparam("goles_equipo1"),
+                     goles_equipo2=bindparam("goles_equipo2"),
+                     ganador_id=bindparam("ganador_id"),
+                     updated_at=datetime.utcnow()
+                 ),
+            filas
+        )
+
+    def guardar_bulk(self, filas):
+        """Inserta partidos (lista de dicts) en un solo executemany"""
+        if filas:
+            db.session.execute(Partido.__table__.insert(), filas)
+
     def create(self, partido):
         """Crea un nuevo partido"""
         db.session.add(partido)
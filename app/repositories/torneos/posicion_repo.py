@@ -0,0 +1,138 @@
+from app.models.posicion import Posicion
+from app.models.equipo import Equipo
+from app.models.partido import Partido
+from app import db
+from sqlalchemy import func, case, select, union_all
+from sqlalchemy.exc import IntegrityError
+
+
+class PosicionRepository:
+    """
+    Repositorio para la tabla de posiciones persistida
+    """
+
+    def get_tabla(self, torneo_id):
+        """
+        Obtiene la tabla de posiciones de un torneo en una sola consulta.
+
+        Incluye a los equipos que todavía no jugaron (con todo en cero) y
+        ordena por puntos, diferencia de gol y goles a favor.
+
+        Returns:
+            list[Row]: Filas con id, nombre, pj, pg, pe, pp, gf, gc, puntos
+        """
+        pj = func.coalesce(Posicion.pj, 0)
+        pg = func.coalesce(Posicion.pg, 0)
+        pe = func.coalesce(Posicion.pe, 0)
+        pp = func.coalesce(Posicion.pp, 0)
+        gf = func.coalesce(Posicion.gf, 0)
+        gc = func.coalesce(Posicion.gc, 0)
+        puntos = func.coalesce(Posicion.puntos, 0)
+
+        return db.session.query(
+            Equipo.id.label("id"),
+            Equipo.nombre.label("nombre"),
+            pj.label("pj"),
+            pg.label("pg"),
+            pe.label("pe"),
+            pp.label("pp"),
+            gf.label("gf"),
+            gc.label("gc"),
+            puntos.label("puntos")
+        ).outerjoin(Posicion, Posicion.equipo_id == Equipo.id)\
+         .filter(Equipo.torneo_id == torneo_id)\
+         .order_by(puntos.desc(), (gf - gc).desc(), gf.desc(), Equipo.nombre)\
+         .all()
+
+    def get_tabla_agregada(self, torneo_id, puntos_victoria, puntos_empate):
+        """
+        Calcula la tabla de posiciones directamente desde 'partido' en una
+        sola consulta: UNION ALL de la perspectiva local y visitante de cada
+        partido con resultado, agrupado por equipo.
+
+        Args:
+            torneo_id (int): ID del torneo
+            puntos_victoria (int): Puntos que otorga un partido ganado
+            puntos_empate (int): Puntos que otorga un partido empatado
+
+        Returns:
+            list[Row]: Filas con id, nombre, pj, pg, pe, pp, gf, gc, puntos
+        """
+        con_resultado = (
+            Partido.torneo_id == torneo_id,
+            Partido.goles_equipo1.isnot(None),
+            Partido.goles_equipo2.isnot(None)
+        )
+        resultados = union_all(
+            select(
+                Partido.equipo1_id.label("equipo_id"),
+                Partido.goles_equipo1.label("gf"),
+                Partido.goles_equipo2.label("gc")
+            ).where(*con_resultado),
+            select(
+                Partido.equipo2_id.label("equipo_id"),
+                Partido.goles_equipo2.label("gf"),
+                Partido.goles_equipo1.label("gc")
+            ).where(*con_resultado)
+        ).subquery("resultados")
+
+        gano = resultados.c.gf > resultados.c.gc
+        empato = resultados.c.gf == resultados.c.gc
+        perdio = resultados.c.gf < resultados.c.gc
+
+        stats = select(
+            resultados.c.equipo_id,
+            func.count().label("pj"),
+            func.sum(case((gano, 1), else_=0)).label("pg"),
+            func.sum(case((empato, 1), else_=0)).label("pe"),
+            func.sum(case((perdio, 1), else_=0)).label("pp"),
+            func.sum(resultados.c.gf).label("gf"),
+            func.sum(resultados.c.gc).label("gc"),
+            func.sum(case((gano, puntos_victoria), (empato, puntos_empate), else_=0)).label("puntos")
+        ).group_by(resultados.c.equipo_id).subquery("stats")
+
+        columnas = {c: func.coalesce(stats.c[c], 0) for c in ("pj", "pg", "pe", "pp", "gf", "gc", "puntos")}
+
+        return db.session.query(
+            Equipo.id.label("id"),
+            Equipo.nombre.label("nombre"),
+            *(col.label(nombre) for nombre, col in columnas.items())
+        ).outerjoin(stats, stats.c.equipo_id == Equipo.id)\
+         .filter(Equipo.torneo_id == torneo_id)\
+         .order_by(
+             columnas["puntos"].desc(),
+             (columnas["gf"] - columnas["gc"]).desc(),
+             columnas["gf"].desc(),
+             Equipo.nombre
+         ).all()
+
+    def incrementar(self, torneo_id, equipo_id, deltas):
+        """
+        Suma los deltas a la fila del equipo con un UPDATE atómico,
+        creando la fila si todavía no existe. El alta va en un savepoint: si
+        otra transacción creó la fila al mismo tiempo, se suma sobre ella.
+
+        Args:
+            torneo_id (int): ID del torneo
+            equipo_id (int): ID del equipo
+            deltas (dict): Incrementos por columna (pj, pg, pe, pp, gf, gc, puntos)
+        """
+        valores = {getattr(Posicion, k): getattr(Posicion, k) + v for k, v in deltas.items()}
+        actualizadas = Posicion.query.filter_by(equipo_id=equipo_id)\
+                                     .update(valores, synchronize_session=False)
+        if not actualizadas:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(Posicion(torneo_id=torneo_id, equipo_id=equipo_id, **deltas))
+            except IntegrityError:
+                Posicion.query.filter_by(equipo_id=equipo_id)\
+                              .update(valores, synchronize_session=False)
+
+    def delete_by_torneo(self, torneo_id):
+        """Elimina todas las filas de posiciones de un torneo"""
+        Posicion.query.filter_by(torneo_id=torneo_id).delete(synchronize_session=False)
+
+    def guardar_bulk(self, filas):
+        """Inserta filas de posiciones (lista de dicts) en un solo executemany"""
+        if filas:
+            db.session.execute(Posicion.__table__.insert(), filas)
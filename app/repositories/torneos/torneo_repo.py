@@ -2,21 +2,44 @@ from app.models.torneo import Torneo
 from app import db
 from datetime import datetime
 from app.models.equipo import Equipo
+from app.models.posicion import Posicion
+from app.models.club import Club
+from sqlalchemy.orm import joinedload, selectinload, load_only
+
+
+def _opciones_expand(expand):
+    """
+    Estrategias de carga para las relaciones pedidas con 'expand', de modo
+    que listar torneos cueste una consulta más una por relación expandida.
+    """
+    expand = set(expand or ())
+    opciones = []
+    if "club" in expand:
+        opciones.append(joinedload(Torneo.club).load_only(Club.id, Club.nombre))
+    if "equipos" in expand:
+        opciones.append(selectinload(Torneo.equipos).load_only(Equipo.id, Equipo.nombre, Equipo.torneo_id))
+    if "partidos" in expand:
+        opciones.append(selectinload(Torneo.partidos))
+    return opciones
+
 
 class TorneoRepository:
-    def get_all(self):
-        """Obtiene todos los torneos."""
-        return Torneo.query.all()
+    def get_all(self, expand=None):
+        """Obtiene todos los torneos, cargando solo las relaciones de 'expand'."""
+        return Torneo.query.options(*_opciones_expand(expand)).all()
     
-    def get_by_id(self, torneo_id):
+    def get_by_id(self, torneo_id, expand=None):
         """Obtiene un torneo por su ID.
         
         Args:
             torneo_id (int): ID del torneo a buscar
+            expand (iterable[str], optional): Relaciones a cargar junto con el torneo
             
         Returns:
             Torneo: El torneo encontrado o None si no existe
         """
+        if expand:
+            return Torneo.query.options(*_opciones_expand(expand)).filter_by(id=torneo_id).first()
         return Torneo.query.get(torneo_id)
     
     def get_equipos_torneo(self, torneo_id):
@@ -78,6 +101,7 @@ class TorneoRepository:
         """
         # solución temporal, debería eliminarse recursivamente desde el modelo
         # equipos = db.relationship("Equipo", backref="torneo", cascade="all, delete-orphan")
+        Posicion.query.filter_by(torneo_id=torneo.id).delete()
         Equipo.query.filter_by(torneo_id=torneo.id).delete()
         db.session.delete(torneo)
     
@@ -96,15 +120,15 @@ class TorneoRepository:
         db.session.add(torneo)
         return torneo
     
-    def get_torneos_activos(self):
+    def get_torneos_activos(self, expand=None):
         """Obtiene todos los torneos activos.
         
         Returns:
             list[Torneo]: Lista de torneos activos
         """
-        return Torneo.query.filter_by(estado='ACTIVO').all()
+        return Torneo.query.options(*_opciones_expand(expand)).filter_by(estado='ACTIVO').all()
     
-    def get_torneos_por_fecha(self, fecha_inicio, fecha_fin=None):
+    def get_torneos_por_fecha(self, fecha_inicio, fecha_fin=None, expand=None):
         """Obtiene torneos por rango de fechas.
         
         Args:
@@ -115,14 +139,15 @@ class TorneoRepository:
         Returns:
             list[Torneo]: Lista de torneos en el rango de fechas
         """
-        query = Torneo.query.filter(Torneo.fecha_inicio >= fecha_inicio)
+        query = Torneo.query.options(*_opciones_expand(expand))\
+                            .filter(Torneo.fecha_inicio >= fecha_inicio)
         
         if fecha_fin:
             query = query.filter(Torneo.fecha_inicio <= fecha_fin)
             
         return query.order_by(Torneo.fecha_inicio).all()
     
-    def get_by_club(self, club_id):
+    def get_by_club(self, club_id, expand=None):
         """Obtiene todos los torneos de un club.
         
         Args:
@@ -131,4 +156,5 @@ class TorneoRepository:
         Returns:
             list[Torneo]: Lista de torneos del club
         """
-        return Torneo.query.filter_by(club_id=club_id).order_by(Torneo.fecha_inicio.desc()).all()
\ No newline at end of file
+        return Torneo.query.options(*_opciones_expand(expand))\
+                           .filter_by(club_id=club_id).order_by(Torneo.fecha_inicio.desc()).all()
\ No newline at end of file
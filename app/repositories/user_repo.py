@@ -1,4 +1,5 @@
 from app.models.user import User
+from app.models.rol import Rol
 from app import db
 
 class UserRepository:
@@ -17,6 +18,16 @@ class UserRepository:
     def get_by_club(self, club_id):
         return User.query.filter_by(club_id=club_id).all()
     
+    def get_datos_autorizacion(self, user_id):
+        """
+        Lee en una sola consulta los datos que van en los claims del JWT,
+        sin cargar el modelo ni sus relaciones.
+        """
+        return db.session.query(
+            User.id, User.nombre, User.email, User.activo, User.club_id,
+            Rol.nombre.label("rol")
+        ).join(Rol, Rol.id == User.rol_id).filter(User.id == user_id).first()
+    
     def create(self, user):
         db.session.add(user)
         return user
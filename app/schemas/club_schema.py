@@ -10,7 +10,8 @@ class ClubSchema(ma.SQLAlchemyAutoSchema):
 
     class Meta:
         model = Club
-        fields = ("id", "nombre", "cuit", "telefono", "direccion", "horarios", "torneos")
+        fields = ("id", "nombre", "cuit", "telefono", "direccion", "horarios", "torneos",
+                  "retencion_libres_dias", "retencion_reservas_dias")
         load_instance = True 
         include_relationships = True 
 
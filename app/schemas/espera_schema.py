@@ -0,0 +1,30 @@
+from app import ma
+from app.models.espera_turno import EsperaTurno
+
+
+class EsperaSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = EsperaTurno
+        fields = (
+            "id",
+            "club_id",
+            "cancha_id",
+            "desde",
+            "hasta",
+            "cliente_nombre",
+            "cliente_email",
+            "cliente_telefono",
+            "fuente",
+            "auto_reservar",
+            "estado",
+            "timeslot_id",
+            "reserva_id",
+            "atendida_en",
+            "created_at")
+        load_instance = True
+        include_fk = True
+
+espera_schema = EsperaSchema()
+esperas_schema = EsperaSchema(many=True)
+# Vista pública (consulta por ID, sin datos de contacto)
+espera_publica_schema = EsperaSchema(exclude=("cliente_nombre", "cliente_email", "cliente_telefono"))
@@ -0,0 +1,13 @@
+from app import ma
+from app.models.regla_precio import ReglaPrecio
+
+
+class ReglaPrecioSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = ReglaPrecio
+        exclude = ("created_at", "updated_at")
+        load_instance = True
+        include_fk = True
+
+regla_precio_schema = ReglaPrecioSchema()
+reglas_precio_schema = ReglaPrecioSchema(many=True)
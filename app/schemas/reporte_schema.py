@@ -11,6 +11,7 @@ class CanchaReporteSchema(Schema):
 
 class ReservasPorClienteSchema(Schema):
     """Schema para el reporte de reservas agrupadas por cliente"""
+    cliente_id = fields.Int()
     cliente_email = fields.Str()
     cliente_nombre = fields.Str()
     cliente_telefono = fields.Str()
@@ -1,5 +1,6 @@
 from app import ma
 from app.models.reserva import Reserva
+from app.models.reserva_archivada import ReservaArchivada
 from app.schemas.cancha_schema import CanchaSchema
 
 class ReservaSchema(ma.SQLAlchemyAutoSchema):
@@ -24,3 +25,16 @@ class ReservaSchema(ma.SQLAlchemyAutoSchema):
 
 reserva_schema = ReservaSchema()
 reservas_schema = ReservaSchema(many=True)
+
+
+class ReservaArchivadaSchema(ma.SQLAlchemyAutoSchema):
+    """Reserva archivada con la misma forma que ReservaSchema ('id' es el que tenía en 'reserva')."""
+    class Meta:
+        model = ReservaArchivada
+        fields = ReservaSchema.Meta.fields
+        include_relationships = True
+
+    id = ma.Integer(attribute="reserva_id")
+    cancha = ma.Nested("CanchaSchema", exclude=("reservas",))
+
+reserva_archivada_schema = ReservaArchivadaSchema()
@@ -0,0 +1,27 @@
+from app import ma
+from app.models.serie_reserva import SerieReserva
+
+
+class SerieReservaSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = SerieReserva
+        fields = (
+            "id",
+            "cancha_id",
+            "cliente_nombre",
+            "cliente_telefono",
+            "cliente_email",
+            "fuente",
+            "servicios",
+            "dia",
+            "hora_inicio",
+            "horas",
+            "fecha_desde",
+            "fecha_hasta",
+            "estado",
+            "created_at",
+            "updated_at")
+        load_instance = True
+        include_fk = True
+
+serie_reserva_schema = SerieReservaSchema()
@@ -20,4 +20,6 @@ class TimeslotSchema(ma.SQLAlchemyAutoSchema):
     
 timeslot_schema = TimeslotSchema()
 timeslots_schema = TimeslotSchema(many=True)
+# Para listados de una sola cancha, que la devuelven una vez aparte
+timeslots_sin_cancha_schema = TimeslotSchema(many=True, exclude=("cancha",))
 
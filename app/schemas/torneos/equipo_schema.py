@@ -1,5 +1,7 @@
 from app.models.equipo import Equipo
 from app import ma
+from marshmallow import fields
+from app.schemas.torneos.torneo_schema import EXPANSIONES_TORNEO
 
 class EquipoSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
@@ -13,17 +15,19 @@ class EquipoSchema(ma.SQLAlchemyAutoSchema):
             "telefono", 
             "email", 
             "torneo",
-            "partidos_local",
-            "partidos_visitante",
-            "partidos_ganador",
+            "total_partidos_local",
+            "total_partidos_visitante",
+            "total_partidos_ganador",
             "created_at", 
             "updated_at"
         )
     
-    torneo = ma.Nested('TorneoSchema', exclude=('equipos', 'partidos'))
-    partidos_local = ma.Nested('PartidoSchema', exclude=('equipo1', 'equipo2', 'torneo', 'ganador'), many=True)
-    partidos_visitante = ma.Nested('PartidoSchema', exclude=('equipo1', 'equipo2', 'torneo', 'ganador'), many=True)
-    partidos_ganador = ma.Nested('PartidoSchema', exclude=('equipo1', 'equipo2', 'torneo', 'ganador'), many=True)
+    torneo = ma.Nested('TorneoResumenSchema', exclude=EXPANSIONES_TORNEO)
+    # Cantidades calculadas en la consulta (ver EquipoRepository); el detalle
+    # de partidos se obtiene paginado en /api/v1/equipos/<id>/partidos
+    total_partidos_local = fields.Int(dump_only=True)
+    total_partidos_visitante = fields.Int(dump_only=True)
+    total_partidos_ganador = fields.Int(dump_only=True)
 
 equipo_schema = EquipoSchema()
 equipos_schema = EquipoSchema(many=True)
\ No newline at end of file
@@ -1,5 +1,9 @@
 from app.models.partido import Partido
 from app import ma
+from app.schemas.torneos.torneo_schema import EXPANSIONES_TORNEO
+
+# El equipo anidado en un partido se muestra sin su torneo ni sus totales
+EXCLUIR_EN_PARTIDO = ('torneo', 'total_partidos_local', 'total_partidos_visitante', 'total_partidos_ganador')
 
 class PartidoSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
@@ -14,14 +18,17 @@ class PartidoSchema(ma.SQLAlchemyAutoSchema):
             "goles_equipo1",
             "goles_equipo2",
             "ganador",
+            "ronda",
+            "timeslot",
             "created_at",
             "updated_at"
         )
     
-    torneo = ma.Nested('TorneoSchema', exclude=('partidos', 'equipos'))
-    equipo1 = ma.Nested('EquipoSchema', exclude=('partidos_local', 'partidos_visitante', 'partidos_ganador', 'torneo'))
-    equipo2 = ma.Nested('EquipoSchema', exclude=('partidos_local', 'partidos_visitante', 'partidos_ganador', 'torneo'))
-    ganador = ma.Nested('EquipoSchema', exclude=('partidos_local', 'partidos_visitante', 'partidos_ganador', 'torneo'))
+    torneo = ma.Nested('TorneoResumenSchema', exclude=EXPANSIONES_TORNEO)
+    equipo1 = ma.Nested('EquipoSchema', exclude=EXCLUIR_EN_PARTIDO)
+    equipo2 = ma.Nested('EquipoSchema', exclude=EXCLUIR_EN_PARTIDO)
+    ganador = ma.Nested('EquipoSchema', exclude=EXCLUIR_EN_PARTIDO)
+    timeslot = ma.Nested('TimeslotSchema', only=('id', 'inicio', 'fin', 'cancha.id', 'cancha.nombre'))
 
 partido_schema = PartidoSchema()
 partidos_schema = PartidoSchema(many=True)
\ No newline at end of file
@@ -1,29 +1,88 @@
 from app.models.torneo import Torneo
+from app.models.club import Club
+from app.models.equipo import Equipo
+from app.models.partido import Partido
 from app import ma
 
-class TorneoSchema(ma.SQLAlchemyAutoSchema):
+# Relaciones que se pueden pedir con ?expand=club,equipos,partidos
+EXPANSIONES_TORNEO = ("club", "equipos", "partidos")
+
+
+class ClubResumenSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = Club
+        fields = ("id", "nombre")
+
+
+class EquipoResumenSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = Equipo
+        fields = ("id", "nombre")
+
+
+class PartidoResumenSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = Partido
+        include_fk = True
+        fields = (
+            "id",
+            "ronda",
+            "equipo1_id",
+            "equipo2_id",
+            "goles_equipo1",
+            "goles_equipo2",
+            "ganador_id",
+            "timeslot_id"
+        )
+
+
+class TorneoResumenSchema(ma.SQLAlchemyAutoSchema):
+    """
+    Vista liviana de un torneo: solo sus columnas propias.
+    Las relaciones se incluyen únicamente si se piden (ver torneo_schema_para).
+    """
     class Meta:
         model = Torneo
-        include_relationships = True
+        include_fk = True
         load_instance = True
         fields = (
             "id",
-            "club",
+            "club_id",
             "nombre",
             "categoria",
             "estado",
+            "formato",
             "fecha_inicio",
-            "fecha_fin",
-            "reglamento",
-            "equipos",
-            "partidos",
-            "created_at",
-            "updated_at"
-        )
-    
-    club = ma.Nested('ClubSchema', exclude=('torneos',))
-    equipos = ma.Nested('EquipoSchema', exclude=('torneo',), many=True)
-    partidos = ma.Nested('PartidoSchema', exclude=('torneo',), many=True)
+            "fecha_fin"
+        ) + EXPANSIONES_TORNEO
+
+    club = ma.Nested(ClubResumenSchema)
+    equipos = ma.Nested(EquipoResumenSchema, many=True)
+    partidos = ma.Nested(PartidoResumenSchema, many=True)
+
+
+class TorneoDetalleSchema(TorneoResumenSchema):
+    """Vista de detalle: agrega el reglamento y las fechas de auditoría."""
+    class Meta(TorneoResumenSchema.Meta):
+        fields = TorneoResumenSchema.Meta.fields + ("reglamento", "created_at", "updated_at")
+
+
+def torneo_schema_para(expand=(), detalle=False, many=False):
+    """
+    Arma el schema de torneo con solo las relaciones pedidas en 'expand'.
+
+    Args:
+        expand (iterable[str]): Subconjunto de EXPANSIONES_TORNEO
+        detalle (bool): Usar la vista de detalle en lugar del resumen
+        many (bool): Serializar una lista
+
+    Returns:
+        TorneoResumenSchema | TorneoDetalleSchema
+    """
+    schema_cls = TorneoDetalleSchema if detalle else TorneoResumenSchema
+    excluir = tuple(e for e in EXPANSIONES_TORNEO if e not in set(expand or ()))
+    return schema_cls(many=many, exclude=excluir)
+
 
-torneo_schema = TorneoSchema()
-torneos_schema = TorneoSchema(many=True)
\ No newline at end of file
+torneo_schema = torneo_schema_para(detalle=True)
+torneos_schema = torneo_schema_para(many=True)
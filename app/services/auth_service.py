@@ -1,9 +1,34 @@
-from werkzeug.security import check_password_hash
+from app.auth.blocklist import token_blocklist
+from app.auth.passwords import password_hasher, hash_password, verify_password, needs_rehash
+from app.cache import TTLCache
+from app.config import Config
 from app.repositories.user_repo import UserRepository
-from flask_jwt_extended import create_access_token, create_refresh_token
+from app import db
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
 from datetime import timedelta
 
 
+# Datos de autorización por id de usuario (o None si no existe). Evita ir a la
+# base en cada refresh o /me; UserService y RolService la invalidan al cambiar
+# algo, y el TTL acota cuánto tarda en verse cualquier otro cambio.
+claims_cache = TTLCache(
+    max_entries=Config.AUTH_CLAIMS_CACHE_MAX_ENTRIES,
+    ttl=Config.AUTH_CLAIMS_CACHE_TTL
+)
+
+
+def invalidar_claims_usuario(user_id=None):
+    """
+    Descarta los datos de autorización cacheados de un usuario (de todos si es None).
+    
+    Returns:
+        int: Cantidad de entradas invalidadas
+    """
+    if user_id is None:
+        return claims_cache.invalidate()
+    return int(claims_cache.delete(user_id))
+
+
 class AuthService:
     def __init__(self):
         """Inicializa el servicio de autenticación con un repositorio de usuarios."""
@@ -25,21 +50,28 @@ class AuthService:
                 
         Raises:
             ValueError: Si las credenciales son inválidas o el usuario está inactivo
+            ServiceUnavailableError: Si el pool de hashing está saturado
         """
         # Buscar usuario por email
         user = self.user_repo.get_by_email(email)
         
         if not user:
+            # Mismo costo que una verificación real, para no revelar qué emails existen
+            password_hasher.verify_dummy(password)
             raise ValueError("Credenciales inválidas")
         
         # Verificar que el usuario esté activo
         if not user.activo:
             raise ValueError("Usuario inactivo")
         
-        # Verificar contraseña
-        if not check_password_hash(user.hash_password, password):
+        # Verificar contraseña (en el pool de hashing, ver app/auth/passwords.py)
+        if not verify_password(user.hash_password, password):
             raise ValueError("Credenciales inválidas")
         
+        # Si cambiaron los parámetros de hash, actualizar el guardado
+        if needs_rehash(user.hash_password):
+            self._rehash(user, password)
+        
         # Crear payload del JWT con información del usuario
         additional_claims = {
             "rol": user.rol.nombre,  # Nombre del rol (admin, encargado, etc.)
@@ -76,6 +108,33 @@ class AuthService:
             }
         }
     
+    def _rehash(self, user, password):
+        """
+        Regenera el hash de la contraseña con los parámetros actuales.
+        Un error acá no impide el login: se reintenta en el próximo.
+        """
+        try:
+            user.hash_password = hash_password(password)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+    
+    def get_datos_autorizacion(self, user_id):
+        """
+        Devuelve rol, club, estado y datos de contacto del usuario, desde la caché si es posible.
+        
+        Args:
+            user_id (int): ID del usuario
+            
+        Returns:
+            dict | None: Datos del usuario, o None si no existe
+        """
+        def _leer():
+            fila = self.user_repo.get_datos_autorizacion(user_id)
+            return dict(fila._mapping) if fila else None
+        
+        return claims_cache.get_or_set(user_id, _leer, tag=user_id)
+    
     def refresh_access_token(self, current_user_id):
         """
         Genera un nuevo access token usando el refresh token.
@@ -91,23 +150,52 @@ class AuthService:
         Raises:
             ValueError: Si el usuario no existe o está inactivo
         """
-        # Convertir string a int para buscar en BD
-        user = self.user_repo.get_by_id(int(current_user_id))
+        # Convertir string a int para buscar en la caché / BD
+        user = self.get_datos_autorizacion(int(current_user_id))
         
-        if not user or not user.activo:
+        if not user or not user["activo"]:
             raise ValueError("Usuario no encontrado o inactivo")
         
         additional_claims = {
-            "rol": user.rol.nombre,
-            "club_id": user.club_id,
-            "nombre": user.nombre,
-            "email": user.email
+            "rol": user["rol"],
+            "club_id": user["club_id"],
+            "nombre": user["nombre"],
+            "email": user["email"]
         }
         
         access_token = create_access_token(
-            identity=str(user.id),  # Convertir a string
+            identity=str(user["id"]),  # Convertir a string
             additional_claims=additional_claims,
             expires_delta=timedelta(hours=1)
         )
         
         return {"access_token": access_token}
+    
+    def logout(self, access_payload, refresh_token=None):
+        """
+        Revoca el access token actual y, si se envía, también el refresh token.
+        
+        Args:
+            access_payload (dict): Claims del access token (get_jwt())
+            refresh_token (str, optional): Refresh token a revocar junto con la sesión
+            
+        Raises:
+            ValueError: Si el refresh token es inválido o pertenece a otro usuario
+        """
+        payloads = [access_payload]
+        if refresh_token:
+            try:
+                refresh_payload = decode_token(refresh_token, allow_expired=True)
+            except Exception:
+                raise ValueError("Refresh token inválido")
+            if refresh_payload.get("type") != "refresh" or refresh_payload.get("sub") != access_payload.get("sub"):
+                raise ValueError("Refresh token inválido")
+            payloads.append(refresh_payload)
+        
+        try:
+            for payload in payloads:
+                token_blocklist.revocar(payload)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
@@ -1,10 +1,46 @@
 from app.repositories.cancha_repo import CanchaRepository
 from app.repositories.club_repo import ClubRepository
+from app.repositories.timeslot_repo import TimeslotRepository
 from app.models.cancha import Cancha
-from datetime import date, time, timedelta
+from app.models.enums import TimeslotEstado
+from app.services.disponibilidad_service import modo_virtual
+from app.services.precio_service import PrecioService
+from datetime import date, datetime, time, timedelta
+from sqlalchemy.exc import IntegrityError
+import base64
+import json
 
 from app.errors import ConflictError, ValidationError, AppError, NotFoundError
 
+def _parse_momento(valor, campo, fin_de_dia=False):
+    """
+    Convierte 'YYYY-MM-DD' o 'YYYY-MM-DDTHH:MM[:SS]' en datetime.
+    Con 'fin_de_dia', una fecha sola se toma hasta el final de ese día (excluido el día siguiente).
+    """
+    try:
+        if len(valor) == 10:
+            dia = datetime.strptime(valor, '%Y-%m-%d')
+            return dia + timedelta(days=1) if fin_de_dia else dia
+        return datetime.fromisoformat(valor)
+    except ValueError:
+        raise ValidationError(f"Formato inválido para '{campo}'. Usar YYYY-MM-DD o YYYY-MM-DDTHH:MM.")
+
+
+def _codificar_cursor(timeslot):
+    """Cursor opaco con (inicio, id) del último timeslot de la página."""
+    crudo = json.dumps([timeslot.inicio.isoformat(), timeslot.id])
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def _decodificar_cursor(cursor):
+    try:
+        crudo = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        inicio, timeslot_id = json.loads(crudo)
+        return datetime.fromisoformat(inicio), int(timeslot_id)
+    except (ValueError, TypeError):
+        raise ValidationError("Cursor inválido")
+
+
 class CanchaService:
     def __init__(self, db):
         """
@@ -16,6 +52,8 @@ class CanchaService:
         self.db = db
         self.cancha_repo = CanchaRepository()
         self.club_repo = ClubRepository()
+        self.timeslot_repo = TimeslotRepository(db)
+        self.precio_service = PrecioService(db)
 
     def get_all(self):
         """
@@ -55,6 +93,57 @@ class CanchaService:
             raise NotFoundError("Cancha no encontrada")
         return cancha
 
+    def get_timeslots(self, cancha_id, desde=None, hasta=None, estado=None, cursor=None, limite=None):
+        """
+        Lista los timeslots de una cancha en un rango, paginando por cursor.
+        
+        El cursor codifica (inicio, id) del último timeslot devuelto, así cada
+        página es una búsqueda por índice sin importar cuántas haya antes.
+        
+        Args:
+            cancha_id (int): ID de la cancha
+            desde (str, optional): YYYY-MM-DD o YYYY-MM-DDTHH:MM (por defecto, hoy)
+            hasta (str, optional): YYYY-MM-DD (día incluido) o YYYY-MM-DDTHH:MM (excluido)
+            estado (str, optional): Estado del timeslot (ej: DISPONIBLE)
+            cursor (str, optional): 'next_cursor' de la página anterior
+            limite (int, optional): Timeslots por página (por defecto 100, máximo 500)
+            
+        Returns:
+            dict: { "cancha": Cancha, "data": [Timeslot...], "limit": 100, "next_cursor": str | None }
+            
+        Raises:
+            NotFoundError: Si la cancha no existe
+            ValidationError: Si algún filtro o el cursor son inválidos
+        """
+        cancha = self.get_by_id(cancha_id)
+        limite = min(max(limite or 100, 1), 500)
+        
+        inicio = _parse_momento(desde, "desde") if desde else datetime.combine(date.today(), time.min)
+        fin = _parse_momento(hasta, "hasta", fin_de_dia=True) if hasta else None
+        if fin is not None and fin <= inicio:
+            raise ValidationError("'hasta' debe ser posterior a 'desde'")
+        
+        estado_enum = None
+        if estado:
+            try:
+                estado_enum = TimeslotEstado(estado.upper())
+            except ValueError:
+                validos = ", ".join(e.value for e in TimeslotEstado)
+                raise ValidationError(f"Estado inválido: '{estado}'. Valores válidos: {validos}")
+        
+        # Se pide uno de más para saber si hay otra página
+        timeslots = self.timeslot_repo.get_por_cancha_keyset(
+            cancha_id, inicio, fin, estado_enum,
+            despues_de=_decodificar_cursor(cursor) if cursor else None,
+            limite=limite + 1
+        )
+        siguiente = None
+        if len(timeslots) > limite:
+            timeslots = timeslots[:limite]
+            siguiente = _codificar_cursor(timeslots[-1])
+        
+        return {"cancha": cancha, "data": timeslots, "limit": limite, "next_cursor": siguiente}
+
     def create(self, data):
         """
         Crea una nueva cancha.
@@ -112,7 +201,9 @@ class CanchaService:
             self.db.session.flush()  # Para obtener el ID de la cancha antes del commit
             
             # Generar timeslots automáticamente para los próximos 3 meses
-            self._generar_timeslots_automaticos(nueva_cancha, club)
+            # (con disponibilidad virtual los turnos se derivan de los horarios del club)
+            if not modo_virtual():
+                self._generar_timeslots_automaticos(nueva_cancha, club)
             
             self.db.session.commit()
             return nueva_cancha
@@ -180,6 +271,8 @@ class CanchaService:
             ValueError: Si la cancha no existe o tiene reservas activas
             Exception: Si ocurre un error durante la eliminación
         """
+        from app.models.reserva import Reserva
+        from app.models.reserva_archivada import ReservaArchivada
         from app.models.reserva_timeslot import ReservaTimeslot
         from app.models.timeslot import Timeslot
         
@@ -199,13 +292,24 @@ class CanchaService:
             if reservas_activas:
                 raise ConflictError("No se puede eliminar la cancha porque tiene reservas activas")
             
-            # Si no hay reservas, proceder con la eliminación
-            # SQLAlchemy eliminará automáticamente los timeslots asociados si está configurado cascade
+            # Las reservas pasadas, canceladas o archivadas son historial: la
+            # base no las borra (RESTRICT), así que tampoco se borra la cancha
+            historial = self.db.session.query(Reserva.id).filter(Reserva.cancha_id == cancha_id).first() or \
+                self.db.session.query(ReservaArchivada.id).filter(ReservaArchivada.cancha_id == cancha_id).first()
+            if historial:
+                raise ConflictError("No se puede eliminar la cancha porque tiene historial de reservas; se puede desactivar")
+            
+            # Si no hay reservas, proceder con la eliminación: la base borra en
+            # cascada timeslots, bloqueos, máscaras, reglas y series
+            # (ON DELETE CASCADE + passive_deletes, sin cargar las filas)
             self.cancha_repo.delete(cancha)
             self.db.session.commit()
             return True
             
-        except NotFoundError as e:
+        except IntegrityError:
+            self.db.session.rollback()
+            raise ConflictError("No se puede eliminar la cancha porque tiene historial de reservas; se puede desactivar")
+        except (NotFoundError, ConflictError) as e:
             self.db.session.rollback()
             raise e
         except Exception as e:
@@ -250,6 +354,7 @@ class CanchaService:
                 cancha.techado = data['techado']
             if 'iluminacion' in data:
                 cancha.iluminacion = data['iluminacion']
+            cambio_precio = 'precio_hora' in data and data['precio_hora'] != cancha.precio_hora
             if 'precio_hora' in data:
                 cancha.precio_hora = data['precio_hora']
             if 'activa' in data:
@@ -258,6 +363,10 @@ class CanchaService:
                 cancha.club_id = data['club_id']
             
             self.cancha_repo.update(cancha, data)
+            if cambio_precio:
+                # Llevar el nuevo precio a los turnos libres futuros (respetando las reglas de precio)
+                self.db.session.flush()
+                self.precio_service.repreciar(cancha.club_id, [cancha.id], auto_commit=False)
             self.db.session.commit()
             return cancha
             
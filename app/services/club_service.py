@@ -9,9 +9,13 @@ from app.models.user import User
 from app.models.torneo import Torneo
 from app.models.timeslot import Timeslot
 from app.models.cancha import Cancha
+from app.models.reserva import Reserva
+from app.models.reserva_archivada import ReservaArchivada
 from app.models.enums import DiaSemana, TorneoEstado, TimeslotEstado
-from werkzeug.security import generate_password_hash
+from app.auth.passwords import hash_password as generar_hash_password
+from app.services.reconciliacion_service import ReconciliacionService
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 from app import db
 
 from app.errors import AppError, ConflictError, NotFoundError, ValidationError
@@ -51,6 +55,37 @@ class ClubService:
         self.club_horario_repo = ClubHorarioRepository()
         self.user_repo = UserRepository()
         self.rol_repo = RolRepository()
+        self.reconciliacion_service = ReconciliacionService(db)
+
+    def _parse_horario(self, horario_data):
+        """
+        Valida un horario {'dia', 'abre', 'cierra'} y lo convierte a (DiaSemana, time, time).
+        
+        Raises:
+            ValidationError: Si faltan campos, el día o las horas son inválidos
+        """
+        # Validar campos requeridos
+        if not isinstance(horario_data, dict) or 'dia' not in horario_data or 'abre' not in horario_data or 'cierra' not in horario_data:
+            raise ValidationError("Cada horario debe tener 'dia', 'abre' y 'cierra'")
+        
+        # Convertir el día de español a enum
+        dia_str = str(horario_data['dia']).lower()
+        dia_enum = self.DIA_MAPPING.get(dia_str)
+        if not dia_enum:
+            raise ValidationError(f"Día inválido: {horario_data['dia']}. Debe ser uno de: {', '.join(self.DIA_MAPPING.keys())}")
+        
+        # Convertir strings de hora a objetos time
+        try:
+            abre = datetime.strptime(horario_data['abre'], '%H:%M').time()
+            cierra = datetime.strptime(horario_data['cierra'], '%H:%M').time()
+        except (TypeError, ValueError):
+            raise ValidationError(f"Formato de hora inválido. Use HH:MM (ej: 09:00)")
+        
+        # Validar que abre sea antes que cierra
+        if abre >= cierra:
+            raise ValidationError(f"La hora de apertura debe ser anterior a la de cierre para {horario_data['dia']}")
+        
+        return dia_enum, abre, cierra
 
     def get_all(self):
         """
@@ -144,26 +179,7 @@ class ClubService:
             # PASO 3: Crear los horarios del club (si se proporcionan)
             if 'horarios' in data and data['horarios']:
                 for horario_data in data['horarios']:
-                    # Validar campos requeridos
-                    if 'dia' not in horario_data or 'abre' not in horario_data or 'cierra' not in horario_data:
-                        raise ValidationError("Cada horario debe tener 'dia', 'abre' y 'cierra'")
-                    
-                    # Convertir el día de español a enum
-                    dia_str = horario_data['dia'].lower()
-                    dia_enum = self.DIA_MAPPING.get(dia_str)
-                    if not dia_enum:
-                        raise ValidationError(f"Día inválido: {horario_data['dia']}. Debe ser uno de: {', '.join(self.DIA_MAPPING.keys())}")
-                    
-                    # Convertir strings de hora a objetos time
-                    try:
-                        abre = datetime.strptime(horario_data['abre'], '%H:%M').time()
-                        cierra = datetime.strptime(horario_data['cierra'], '%H:%M').time()
-                    except ValueError as e:
-                        raise ValidationError(f"Formato de hora inválido. Use HH:MM (ej: 09:00)")
-                    
-                    # Validar que abre sea antes que cierra
-                    if abre >= cierra:
-                        raise ValidationError(f"La hora de apertura debe ser anterior a la de cierre para {horario_data['dia']}")
+                    dia_enum, abre, cierra = self._parse_horario(horario_data)
                     
                     # Crear el horario
                     nuevo_horario = ClubHorario(
@@ -184,7 +200,7 @@ class ClubService:
                 raise ValidationError(f"El rol '{usuario_data['rol']}' no existe en el sistema")
             
             # Hash de la contraseña
-            hash_password = generate_password_hash(usuario_data['password'])
+            hash_password = generar_hash_password(usuario_data['password'])
             
             # Crear el usuario
             nuevo_usuario = User(
@@ -222,6 +238,9 @@ class ClubService:
                 - cuit (str, opcional): Nuevo CUIT
                 - telefono (str, opcional): Nuevo teléfono
                 - direccion (dict, opcional): Nueva dirección
+                - retencion_libres_dias, retencion_reservas_dias (int o None, opcionales):
+                  Días que se conservan los turnos libres y las reservas pasados
+                  (None vuelve a los valores de la config)
                 
         Returns:
             Club: El club actualizado
@@ -235,6 +254,11 @@ class ClubService:
         if not club:
             raise NotFoundError("Club no encontrado")
         
+        for campo in ('retencion_libres_dias', 'retencion_reservas_dias'):
+            valor = data.get(campo)
+            if valor is not None and (isinstance(valor, bool) or not isinstance(valor, int) or valor < 1):
+                raise ValidationError(f"'{campo}' debe ser un número entero de días mayor a 0")
+
         # Manejar la actualización de dirección si se proporciona
         try:
             if 'direccion' in data:
@@ -256,6 +280,72 @@ class ClubService:
             self.db.session.rollback()
             raise AppError(f"Error al actualizar: {e}")
 
+    def actualizar_horarios(self, club_id, horarios, excedentes='eliminar', dry_run=False):
+        """
+        Reemplaza el horario semanal del club y reconcilia los timeslots ya generados.
+        
+        Los días que no figuran en 'horarios' quedan cerrados (su horario se
+        desactiva). Los timeslots futuros se alinean con el nuevo horario en
+        la misma transacción (ver ReconciliacionService.reconciliar).
+        
+        Args:
+            club_id (int): ID del club
+            horarios (list[dict]): Horarios {'dia', 'abre', 'cierra'}, uno por día como máximo
+            excedentes (str): 'eliminar' o 'bloquear' los turnos libres que quedan fuera del horario
+            dry_run (bool): Si es True, solo informa qué cambiaría, sin guardar nada
+            
+        Returns:
+            dict: Resultado de la reconciliación, con el horario aplicado en 'horarios'
+            
+        Raises:
+            NotFoundError: Si el club no existe
+            ValidationError: Si algún horario es inválido o hay días repetidos
+        """
+        club = self.get_by_id(club_id)
+        if not isinstance(horarios, list):
+            raise ValidationError("'horarios' debe ser una lista")
+        
+        nuevos = {}
+        for horario_data in horarios:
+            dia_enum, abre, cierra = self._parse_horario(horario_data)
+            if dia_enum in nuevos:
+                raise ValidationError(f"El día {horario_data['dia']} está repetido")
+            nuevos[dia_enum] = (abre, cierra)
+        
+        try:
+            existentes = {h.dia: h for h in self.club_horario_repo.get_by_club_id(club_id)}
+            for dia, horario in existentes.items():
+                if dia not in nuevos:
+                    horario.activo = False
+            for dia, (abre, cierra) in nuevos.items():
+                horario = existentes.get(dia)
+                if horario is None:
+                    self.club_horario_repo.create(ClubHorario(club_id=club.id, dia=dia, abre=abre, cierra=cierra))
+                else:
+                    horario.abre, horario.cierra, horario.activo = abre, cierra, True
+            self.db.session.flush()
+            
+            resultado = self.reconciliacion_service.reconciliar(
+                club_id, excedentes=excedentes, dry_run=dry_run, auto_commit=False
+            )
+            resultado["horarios"] = [
+                {"dia": dia.value, "abre": abre.strftime('%H:%M'), "cierra": cierra.strftime('%H:%M')}
+                for dia, (abre, cierra) in sorted(nuevos.items(), key=lambda item: list(DiaSemana).index(item[0]))
+            ]
+            
+            if dry_run:
+                self.db.session.rollback()
+            else:
+                self.db.session.commit()
+            return resultado
+        
+        except AppError as e:
+            self.db.session.rollback()
+            raise e
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al actualizar los horarios: {str(e)}")
+
     def delete(self, club_id):
         club = self.get_by_id(club_id)
         
@@ -280,11 +370,23 @@ class ClubService:
             if reservas_futuras:
                 raise ConflictError("No se puede eliminar el club. Tiene reservas futuras activas.")
 
-            # Ejecutar el borrado
+            # Las reservas pasadas (vigentes o archivadas) son el historial de
+            # ingresos: la base no las borra en cascada (RESTRICT)
+            canchas = db.session.query(Cancha.id).filter(Cancha.club_id == club_id)
+            historial = db.session.query(Reserva.id).filter(Reserva.cancha_id.in_(canchas)).first() or \
+                db.session.query(ReservaArchivada.id).filter(ReservaArchivada.cancha_id.in_(canchas)).first()
+            if historial:
+                raise ConflictError("No se puede eliminar el club. Tiene historial de reservas.")
+
+            # Ejecutar el borrado: canchas, timeslots, torneos, horarios y
+            # usuarios se borran en cascada en la base, sin cargarlos en la sesión
             self.club_repo.delete(club)            
             self.db.session.commit()
             return club 
             
+        except IntegrityError:
+            self.db.session.rollback()
+            raise ConflictError("No se puede eliminar el club. Tiene historial de reservas.")
         except (NotFoundError, ConflictError) as e:
             self.db.session.rollback()
             raise e
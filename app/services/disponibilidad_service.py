@@ -0,0 +1,538 @@
+"""
+Disponibilidad virtual: los turnos libres se calculan a partir de las reglas
+del club (horario por día de la semana, cierres u horarios especiales y
+bloqueos de cancha) en lugar de leerse de filas de timeslot pre-generadas.
+
+Solo se guardan los turnos reservados, retenidos o bloqueados: la fila se crea
+("materializa") recién al reservar. Se activa con DISPONIBILIDAD_MODO=virtual.
+"""
+import heapq
+from collections import defaultdict, deque, namedtuple
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy.exc import IntegrityError
+
+from app.config import Config
+from app.errors import ValidationError, ConflictError, NotFoundError
+from app.models.enums import DiaSemana, TimeslotEstado
+from app.models.timeslot import Timeslot
+from app.repositories.club_repo import ClubRepository
+from app.repositories.disponibilidad_repo import DisponibilidadRepository
+from app.repositories.timeslot_repo import TimeslotRepository
+from app.services.timeslot_service import DURACION_TIMESLOT_MINUTOS, PASO_TIMESLOT_MINUTOS
+from app.services.precio_service import PrecioService, precio_turno
+
+# date.weekday() -> DiaSemana
+DIAS_SEMANA = [DiaSemana.LUN, DiaSemana.MAR, DiaSemana.MIE, DiaSemana.JUE,
+               DiaSemana.VIE, DiaSemana.SAB, DiaSemana.DOM]
+
+MAX_DIAS_BUSQUEDA_BLOQUES = 31
+MAX_HORAS_BLOQUE = 12
+MAX_BLOQUES = 200
+
+# Turno libre reservable; timeslot_id es None si todavía no tiene fila (modo virtual)
+Turno = namedtuple('Turno', ['cancha_id', 'inicio', 'fin', 'timeslot_id', 'precio'])
+
+
+def modo_virtual():
+    """Indica si la disponibilidad se deriva de reglas en lugar de filas de timeslot."""
+    return Config.DISPONIBILIDAD_MODO == 'virtual'
+
+
+def horario_del_dia(dia, horarios_por_dia, cierre=None):
+    """
+    Devuelve (abre, cierra) del club para una fecha, o None si no abre.
+
+    Un cierre con 'cerrado' anula el día; uno con abre/cierra reemplaza el
+    horario habitual de ese día.
+    """
+    horario = horarios_por_dia.get(DIAS_SEMANA[dia.weekday()])
+    if cierre is not None:
+        if cierre.cerrado:
+            return None
+        abre = cierre.abre or (horario.abre if horario else None)
+        cierra = cierre.cierra or (horario.cierra if horario else None)
+        return (abre, cierra) if abre and cierra else None
+    return (horario.abre, horario.cierra) if horario else None
+
+
+def turnos_del_dia(dia, abre, cierra):
+    """
+    Lista (inicio, fin) de los turnos de un día, con las mismas reglas que la
+    generación de timeslots (TimeslotService._calcular_timeslots_para_dia).
+    """
+    duracion = timedelta(minutes=DURACION_TIMESLOT_MINUTOS)
+    paso = timedelta(minutes=PASO_TIMESLOT_MINUTOS)
+    inicio = datetime.combine(dia, abre)
+    fin_jornada = datetime.combine(dia, cierra)
+    turnos = []
+    while inicio + duracion <= fin_jornada:
+        turnos.append((inicio, inicio + duracion))
+        inicio += paso
+    return turnos
+
+
+def parse_slots(slots):
+    """
+    Convierte [{"cancha_id": 1, "inicio": "YYYY-MM-DDTHH:MM"}, ...] en claves (cancha_id, inicio).
+
+    Raises:
+        ValidationError: Si la lista o algún elemento son inválidos
+    """
+    if not isinstance(slots, list) or not slots:
+        raise ValidationError("'slots' debe ser una lista con al menos un turno")
+    claves = []
+    for slot in slots:
+        try:
+            claves.append((int(slot["cancha_id"]), datetime.fromisoformat(slot["inicio"])))
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError("Cada turno de 'slots' debe tener 'cancha_id' e 'inicio' (YYYY-MM-DDTHH:MM)")
+    if len(set(claves)) != len(claves):
+        raise ValidationError("Hay turnos repetidos en 'slots'")
+    return claves
+
+
+def bloques_consecutivos(turnos, cantidad):
+    """
+    Recorre una sola vez turnos ordenados por (cancha_id, inicio) con una
+    ventana deslizante y devuelve cada tramo de 'cantidad' turnos seguidos de
+    la misma cancha (el fin de uno es el inicio del siguiente).
+
+    Args:
+        turnos (Iterable[Turno]): Turnos libres ordenados por (cancha_id, inicio)
+        cantidad (int): Cantidad de turnos del bloque
+
+    Yields:
+        tuple[Turno, ...]: Turnos del bloque, en orden
+    """
+    ventana = deque(maxlen=cantidad)
+    for turno in turnos:
+        if ventana and (ventana[-1].cancha_id != turno.cancha_id or ventana[-1].fin != turno.inicio):
+            ventana.clear()
+        ventana.append(turno)
+        if len(ventana) == cantidad:
+            yield tuple(ventana)
+
+
+def _parse_bool(valor, campo):
+    if valor is None or valor == '':
+        return None
+    if isinstance(valor, bool):
+        return valor
+    texto = str(valor).strip().lower()
+    if texto in ('true', '1', 'si', 'sí'):
+        return True
+    if texto in ('false', '0', 'no'):
+        return False
+    raise ValidationError(f"'{campo}' debe ser true o false")
+
+
+def _parse_hora(valor, campo):
+    if not valor:
+        return None
+    try:
+        return datetime.strptime(valor, '%H:%M').time()
+    except (TypeError, ValueError):
+        raise ValidationError(f"'{campo}' debe tener formato HH:MM")
+
+
+def parse_busqueda_bloques(params):
+    """
+    Valida los criterios de búsqueda de bloques, vengan de la query string o
+    de un body JSON, y los devuelve como argumentos de DisponibilidadService.buscar_bloques.
+
+    Args:
+        params (Mapping): club_id, fecha_desde, horas (requeridos); fecha_hasta,
+            hora_desde, hora_hasta, deporte, techado, iluminacion, cancha_id y limit (opcionales)
+
+    Raises:
+        ValidationError: Si falta un criterio requerido o alguno es inválido
+    """
+    try:
+        club_id = int(params['club_id'])
+        fecha_desde = date.fromisoformat(params['fecha_desde'])
+        fecha_hasta = date.fromisoformat(params.get('fecha_hasta') or params['fecha_desde'])
+        horas = int(params['horas'])
+    except (KeyError, TypeError, ValueError):
+        raise ValidationError("Parámetros requeridos: club_id, fecha_desde (YYYY-MM-DD) y horas; "
+                              "fecha_hasta (YYYY-MM-DD) es opcional")
+    if fecha_hasta < fecha_desde:
+        raise ValidationError("'fecha_hasta' no puede ser anterior a 'fecha_desde'")
+    if (fecha_hasta - fecha_desde).days >= MAX_DIAS_BUSQUEDA_BLOQUES:
+        raise ValidationError(f"El rango de fechas no puede superar {MAX_DIAS_BUSQUEDA_BLOQUES} días")
+    if not 1 <= horas <= MAX_HORAS_BLOQUE:
+        raise ValidationError(f"'horas' debe estar entre 1 y {MAX_HORAS_BLOQUE}")
+
+    cancha_ids = params.get('cancha_id') or params.get('cancha_ids')
+    if cancha_ids:
+        if isinstance(cancha_ids, str):
+            cancha_ids = cancha_ids.split(',')
+        elif not isinstance(cancha_ids, list):
+            cancha_ids = [cancha_ids]
+        try:
+            cancha_ids = [int(c) for c in cancha_ids if str(c).strip()]
+        except (TypeError, ValueError):
+            raise ValidationError("'cancha_id' debe ser un ID o una lista de IDs separados por coma")
+
+    try:
+        limite = min(int(params.get('limit') or 20), MAX_BLOQUES)
+    except (TypeError, ValueError):
+        raise ValidationError("'limit' debe ser un número entero")
+    if limite < 1:
+        raise ValidationError("'limit' debe ser mayor a 0")
+
+    return {
+        "club_id": club_id,
+        "fecha_desde": fecha_desde,
+        "fecha_hasta": fecha_hasta,
+        "horas": horas,
+        "cancha_ids": cancha_ids or None,
+        "deporte": params.get('deporte') or None,
+        "techado": _parse_bool(params.get('techado'), 'techado'),
+        "iluminacion": _parse_bool(params.get('iluminacion'), 'iluminacion'),
+        "hora_desde": _parse_hora(params.get('hora_desde'), 'hora_desde'),
+        "hora_hasta": _parse_hora(params.get('hora_hasta'), 'hora_hasta'),
+        "limite": limite
+    }
+
+
+class DisponibilidadService:
+    def __init__(self, db):
+        self.db = db
+        self.repo = DisponibilidadRepository()
+        self.club_repo = ClubRepository()
+        self.precio_service = PrecioService(db)
+
+    def _turnos_por_regla(self, club_id, canchas, fecha_desde, fecha_hasta):
+        """
+        Turnos que las reglas habilitan para las canchas entre dos fechas (inclusive).
+
+        Returns:
+            dict[tuple[int, datetime], tuple[datetime, bool]]: (cancha_id, inicio) -> (fin, bloqueado)
+        """
+        horarios = {h.dia: h for h in self.repo.get_horarios_activos(club_id)}
+        cierres = {c.fecha: c for c in self.repo.get_cierres(club_id, fecha_desde, fecha_hasta)}
+        bloqueos = defaultdict(list)
+        for b in self.repo.get_bloqueos(
+            [c.id for c in canchas],
+            datetime.combine(fecha_desde, datetime.min.time()),
+            datetime.combine(fecha_hasta + timedelta(days=1), datetime.min.time())
+        ):
+            bloqueos[b.cancha_id].append(b)
+
+        turnos = {}
+        dia = fecha_desde
+        while dia <= fecha_hasta:
+            horario = horario_del_dia(dia, horarios, cierres.get(dia))
+            if horario:
+                for inicio, fin in turnos_del_dia(dia, *horario):
+                    for cancha in canchas:
+                        bloqueado = any(b.inicio < fin and b.fin > inicio for b in bloqueos[cancha.id])
+                        turnos[(cancha.id, inicio)] = (fin, bloqueado)
+            dia += timedelta(days=1)
+        return turnos
+
+    def calcular_turnos(self, club_id, fecha_desde, fecha_hasta, cancha_ids=None, solo_activas=False):
+        """
+        Combina las reglas con los timeslots guardados (reservados, bloqueados
+        o liberados) y devuelve todos los turnos del rango.
+
+        Un turno está libre si las reglas lo habilitan, no cae en un bloqueo y
+        no tiene una fila guardada en un estado distinto de DISPONIBLE. Las
+        filas guardadas fuera de las reglas se incluyen como no libres.
+
+        Returns:
+            list[dict]: cancha, inicio, fin, timeslot (o None) y libre; ordenados por inicio y cancha
+        """
+        canchas = self.repo.get_canchas(club_id, cancha_ids, solo_activas)
+        reglas = self._turnos_por_regla(club_id, canchas, fecha_desde, fecha_hasta)
+        persistidos = {
+            (ts.cancha_id, ts.inicio): ts
+            for ts in self.repo.get_timeslots_persistidos(
+                [c.id for c in canchas],
+                datetime.combine(fecha_desde, datetime.min.time()),
+                datetime.combine(fecha_hasta + timedelta(days=1), datetime.min.time())
+            )
+        }
+        por_id = {c.id: c for c in canchas}
+
+        turnos = []
+        for clave in reglas.keys() | persistidos.keys():
+            cancha_id, inicio = clave
+            ts = persistidos.get(clave)
+            regla = reglas.get(clave)
+            libre = regla is not None and not regla[1] and (ts is None or ts.estado == TimeslotEstado.DISPONIBLE)
+            turnos.append({
+                "cancha": por_id[cancha_id],
+                "inicio": inicio,
+                "fin": ts.fin if ts else regla[0],
+                "timeslot": ts,
+                "libre": libre
+            })
+        turnos.sort(key=lambda t: (t["inicio"], t["cancha"].id))
+        return turnos
+
+    def get_disponibilidad_virtual(self, club_id, fecha):
+        """
+        Misma respuesta que TimeslotService.get_disponibilidad_materializada,
+        calculada desde las reglas. 'timeslot_id' es None para los turnos que
+        todavía no tienen fila; se reservan por (cancha_id, inicio).
+
+        Raises:
+            ValueError: Si el club no existe o no tiene turnos en la fecha
+        """
+        if not self.club_repo.get_by_id(club_id):
+            raise ValueError("Club no encontrado")
+
+        turnos = self.calcular_turnos(club_id, fecha, fecha)
+        if not turnos:
+            raise ValueError("No hay turnos para esta fecha: el club está cerrado o no tiene horario ese día.")
+
+        reglas_precio = self.precio_service.reglas_de_club(club_id)
+        por_hora = defaultdict(list)
+        for turno in turnos:
+            por_hora[turno["inicio"].strftime('%H:%M')].append(turno)
+
+        horarios = []
+        for hora in sorted(por_hora.keys()):
+            canchas_disponibles = []
+            for turno in por_hora[hora]:
+                if not turno["libre"]:
+                    continue
+                cancha, ts = turno["cancha"], turno["timeslot"]
+                canchas_disponibles.append({
+                    "timeslot_id": ts.id if ts else None,
+                    "cancha_id": cancha.id,
+                    "nombre": cancha.nombre,
+                    "deporte": cancha.deporte,
+                    "techado": cancha.techado,
+                    "iluminacion": cancha.iluminacion,
+                    "superficie": float(cancha.superficie),
+                    "precio": float(ts.precio) if ts and ts.precio else float(precio_turno(reglas_precio, cancha, turno["inicio"])),
+                    "hora_inicio": turno["inicio"].strftime('%H:%M'),
+                    "hora_fin": turno["fin"].strftime('%H:%M')
+                })
+            horarios.append({
+                "hora": hora,
+                "canchas_disponibles": canchas_disponibles,
+                "total_disponibles": len(canchas_disponibles)
+            })
+
+        return {
+            "club_id": club_id,
+            "fecha": fecha.isoformat(),
+            "total_horarios": len(horarios),
+            "horarios": horarios
+        }
+
+    def slots_libres(self, club_id, desde, hasta, cancha_ids=None):
+        """
+        Turnos libres de las canchas activas del club con inicio en [desde, hasta),
+        en el formato de get_disponibles_por_club: ((cancha_id, inicio), inicio).
+        """
+        turnos = self.calcular_turnos(club_id, desde.date(), (hasta - timedelta(microseconds=1)).date(),
+                                      cancha_ids, solo_activas=True)
+        return [
+            ((t["cancha"].id, t["inicio"]), t["inicio"])
+            for t in turnos
+            if t["libre"] and desde <= t["inicio"] < hasta
+        ]
+
+    def resolver_turnos(self, cancha, claves):
+        """
+        Estado de muchos turnos de una cancha resuelto en conjunto: una sola
+        consulta trae (y bloquea) las filas guardadas; en modo virtual se
+        cruzan además con las reglas del club.
+
+        Args:
+            cancha (Cancha): Cancha de todos los turnos
+            claves (list[tuple[int, datetime]]): (cancha_id, inicio) de cada turno
+
+        Returns:
+            dict[tuple[int, datetime], tuple[Timeslot | None, bool]]: clave -> (fila guardada, libre)
+        """
+        existentes = self.repo.get_timeslots_para_reservar(claves)
+        if not modo_virtual():
+            return {
+                clave: (existentes.get(clave),
+                        clave in existentes and existentes[clave].estado == TimeslotEstado.DISPONIBLE)
+                for clave in claves
+            }
+
+        fechas = [inicio.date() for _, inicio in claves]
+        reglas = self._turnos_por_regla(cancha.club_id, [cancha], min(fechas), max(fechas)) if claves else {}
+        resultado = {}
+        for clave in claves:
+            ts, regla = existentes.get(clave), reglas.get(clave)
+            libre = regla is not None and not regla[1] and (ts is None or ts.estado == TimeslotEstado.DISPONIBLE)
+            resultado[clave] = (ts, libre)
+        return resultado
+
+    def materializar(self, claves):
+        """
+        Devuelve las filas de timeslot de los turnos pedidos, creando las que
+        falten. Las existentes se bloquean para actualizar. No hace commit y no
+        cambia estados: eso queda a cargo de quien reserva.
+
+        Args:
+            claves (list[tuple[int, datetime]]): (cancha_id, inicio) de cada turno
+
+        Returns:
+            list[Timeslot]: En el mismo orden que 'claves'
+
+        Raises:
+            ValidationError: Si un turno no existe según las reglas o está bloqueado
+            ConflictError: Si otra operación creó el mismo turno al mismo tiempo
+        """
+        existentes = self.repo.get_timeslots_para_reservar(claves)
+
+        canchas = {c.id: c for c in self.repo.get_canchas_por_ids({cid for cid, _ in claves})}
+        por_club = defaultdict(list)
+        for cancha_id, inicio in claves:
+            cancha = canchas.get(cancha_id)
+            if cancha is None:
+                raise ValidationError(f"La cancha {cancha_id} no existe.")
+            por_club[cancha.club_id].append((cancha_id, inicio))
+
+        nuevos = []
+        for club_id, claves_club in por_club.items():
+            fechas = [inicio.date() for _, inicio in claves_club]
+            canchas_club = [canchas[cid] for cid in {cid for cid, _ in claves_club}]
+            reglas = self._turnos_por_regla(club_id, canchas_club, min(fechas), max(fechas))
+            for clave in claves_club:
+                regla = reglas.get(clave)
+                if regla is None and clave not in existentes:
+                    raise ValidationError(f"La cancha {clave[0]} no tiene un turno que empiece {clave[1]}.")
+                if regla is not None and regla[1]:
+                    raise ValidationError(f"El turno de la cancha {clave[0]} de {clave[1]} está bloqueado.")
+                if clave not in existentes:
+                    nuevos.append(Timeslot(
+                        cancha_id=clave[0],
+                        inicio=clave[1],
+                        fin=regla[0],
+                        estado=TimeslotEstado.DISPONIBLE
+                    ))
+
+        if nuevos:
+            self.precio_service.asignar_precios(nuevos, canchas)
+            try:
+                with self.db.session.begin_nested():
+                    self.db.session.add_all(nuevos)
+            except IntegrityError:
+                raise ConflictError("Uno o más turnos fueron reservados por otra operación; reintentar.")
+            existentes.update({(ts.cancha_id, ts.inicio): ts for ts in nuevos})
+
+        return [existentes[clave] for clave in claves]
+
+    def _turnos_libres_por_cancha(self, club_id, fecha_desde, fecha_hasta, cancha_ids=None,
+                                  deporte=None, techado=None, iluminacion=None):
+        """
+        Turnos libres de las canchas activas del club que cumplen los filtros,
+        ordenados por (cancha_id, inicio).
+
+        En modo materializado sale de una sola consulta sobre el índice
+        (cancha_id, inicio); en modo virtual, de las reglas del club.
+        """
+        if not modo_virtual():
+            filas = TimeslotRepository(self.db).get_libres_ordenados_por_cancha(
+                club_id,
+                datetime.combine(fecha_desde, datetime.min.time()),
+                datetime.combine(fecha_hasta + timedelta(days=1), datetime.min.time()),
+                cancha_ids, deporte, techado, iluminacion
+            )
+            return [Turno(cancha_id, inicio, fin, ts_id, Decimal(str(precio)))
+                    for ts_id, cancha_id, inicio, fin, precio in filas]
+
+        reglas_precio = self.precio_service.reglas_de_club(club_id)
+        turnos = []
+        for t in self.calcular_turnos(club_id, fecha_desde, fecha_hasta, cancha_ids, solo_activas=True):
+            cancha, ts = t["cancha"], t["timeslot"]
+            if not t["libre"]:
+                continue
+            if (deporte and cancha.deporte != deporte
+                    or techado is not None and cancha.techado != techado
+                    or iluminacion is not None and cancha.iluminacion != iluminacion):
+                continue
+            precio = ts.precio if ts and ts.precio else precio_turno(reglas_precio, cancha, t["inicio"])
+            turnos.append(Turno(cancha.id, t["inicio"], t["fin"], ts.id if ts else None, precio))
+        turnos.sort(key=lambda t: (t.cancha_id, t.inicio))
+        return turnos
+
+    def buscar_bloques(self, club_id, fecha_desde, fecha_hasta, horas, cancha_ids=None, deporte=None,
+                       techado=None, iluminacion=None, hora_desde=None, hora_hasta=None, limite=20):
+        """
+        Busca bloques de turnos libres consecutivos en una misma cancha.
+
+        Los turnos se leen ordenados por (cancha_id, inicio) y se recorren una
+        sola vez con una ventana deslizante; de los bloques encontrados se
+        conservan los 'limite' mejores con un heap.
+
+        Args:
+            horas (int): Duración del bloque en horas
+            hora_desde (time, optional): El bloque no empieza antes de esta hora
+            hora_hasta (time, optional): El bloque termina a esta hora o antes (00:00 = fin del día)
+
+        Returns:
+            list[tuple[Turno, ...]]: Bloques ordenados por inicio, precio total y cancha
+
+        Raises:
+            NotFoundError: Si el club no existe
+        """
+        if not self.club_repo.get_by_id(club_id):
+            raise NotFoundError("Club no encontrado")
+
+        turnos = self._turnos_libres_por_cancha(club_id, fecha_desde, fecha_hasta, cancha_ids,
+                                                deporte, techado, iluminacion)
+        if hora_desde or hora_hasta:
+            # 'hasta 00:00' es el final del día, como en mascara_ventana
+            dias_hasta = timedelta(days=1) if hora_hasta == time.min else timedelta(0)
+            turnos = (
+                t for t in turnos
+                if (hora_desde is None or t.inicio.time() >= hora_desde)
+                and (hora_hasta is None or t.fin <= datetime.combine(t.inicio.date() + dias_hasta, hora_hasta))
+            )
+
+        cantidad = horas * 60 // DURACION_TIMESLOT_MINUTOS
+        return heapq.nsmallest(
+            limite,
+            bloques_consecutivos(turnos, cantidad),
+            key=lambda b: (b[0].inicio, sum(t.precio for t in b), b[0].cancha_id)
+        )
+
+    def bloques_libres(self, params):
+        """
+        Respuesta del endpoint de búsqueda de bloques a partir de sus parámetros.
+
+        Raises:
+            ValidationError: Si los parámetros son inválidos
+            NotFoundError: Si el club no existe
+        """
+        criterios = parse_busqueda_bloques(params)
+        bloques = self.buscar_bloques(**criterios)
+        canchas = {c.id: c for c in self.repo.get_canchas_por_ids({b[0].cancha_id for b in bloques})}
+        return {
+            "club_id": criterios["club_id"],
+            "fecha_desde": criterios["fecha_desde"].isoformat(),
+            "fecha_hasta": criterios["fecha_hasta"].isoformat(),
+            "horas": criterios["horas"],
+            "total": len(bloques),
+            "bloques": [
+                {
+                    "cancha_id": bloque[0].cancha_id,
+                    "nombre": canchas[bloque[0].cancha_id].nombre,
+                    "inicio": bloque[0].inicio.isoformat(timespec='minutes'),
+                    "fin": bloque[-1].fin.isoformat(timespec='minutes'),
+                    "precio_total": float(sum(t.precio for t in bloque)),
+                    "slots": [
+                        {
+                            "cancha_id": t.cancha_id,
+                            "inicio": t.inicio.isoformat(timespec='minutes'),
+                            "timeslot_id": t.timeslot_id
+                        }
+                        for t in bloque
+                    ]
+                }
+                for bloque in bloques
+            ]
+        }
@@ -0,0 +1,142 @@
+"""
+Lista de espera para turnos ocupados.
+
+Quien no encontró turno se anota con una ventana horaria; al liberarse un
+turno que entra en ella (ReservaService.atender_lista_de_espera) se le reserva
+o se le avisa por SSE, en lugar de que consulte la disponibilidad una y otra vez.
+"""
+from datetime import datetime, timedelta
+
+from app.config import Config
+from app.errors import AppError, NotFoundError, ValidationError
+from app.models.enums import EsperaEstado, FuenteReserva
+from app.models.espera_turno import EsperaTurno, MAX_VENTANA_ESPERA_HORAS
+from app.pubsub import Broker
+from app.repositories.cancha_repo import CanchaRepository
+from app.repositories.cliente_repo import ClienteRepository, normalizar_email
+from app.repositories.club_repo import ClubRepository
+from app.repositories.espera_repo import EsperaRepository
+from app.services.timeslot_service import DURACION_TIMESLOT_MINUTOS
+
+# Broker en memoria para avisar a quien espera (un canal por espera)
+esperas_broker = Broker(max_pendientes=Config.SSE_MAX_PENDIENTES)
+
+
+def canal_espera(espera_id):
+    """Nombre del canal de eventos de una espera"""
+    return f"espera:{espera_id}"
+
+
+def evento_espera(espera):
+    """Datos del evento que se publica cuando la espera cambia de estado."""
+    return {
+        "espera_id": espera.id,
+        "estado": espera.estado.value,
+        "timeslot_id": espera.timeslot_id,
+        "cancha_id": espera.timeslot.cancha_id if espera.timeslot else None,
+        "inicio": espera.timeslot.inicio.isoformat(timespec='minutes') if espera.timeslot else None,
+        "reserva_id": espera.reserva_id
+    }
+
+
+class EsperaService:
+    def __init__(self, db):
+        self.db = db
+        self.repo = EsperaRepository()
+        self.club_repo = ClubRepository()
+        self.cancha_repo = CanchaRepository()
+        self.cliente_repo = ClienteRepository()
+
+    def get_by_id(self, espera_id):
+        espera = self.repo.get_by_id(espera_id)
+        if not espera:
+            raise NotFoundError("Espera no encontrada")
+        return espera
+
+    def get_pendientes_por_club(self, club_id):
+        return self.repo.get_pendientes_por_club(club_id, datetime.now())
+
+    def create(self, data):
+        """
+        Anota a un cliente en la lista de espera.
+
+        Campos requeridos: club_id, desde y hasta (YYYY-MM-DDTHH:MM), cliente_nombre,
+        cliente_email, fuente. Opcionales: cancha_id (por defecto, cualquier cancha
+        del club), cliente_telefono y auto_reservar (reservar sin preguntar).
+
+        Raises:
+            ValidationError: Si faltan datos o la ventana es inválida
+            NotFoundError: Si el club o la cancha no existen
+        """
+        for field in ['club_id', 'desde', 'hasta', 'cliente_nombre', 'cliente_email', 'fuente']:
+            if field not in data or not data[field]:
+                raise ValidationError(f"El campo '{field}' es requerido")
+        try:
+            club_id = int(data['club_id'])
+            cancha_id = int(data['cancha_id']) if data.get('cancha_id') else None
+            desde = datetime.fromisoformat(data['desde'])
+            hasta = datetime.fromisoformat(data['hasta'])
+            fuente = FuenteReserva(data['fuente'])
+        except (TypeError, ValueError):
+            raise ValidationError("Datos inválidos: 'desde' y 'hasta' son YYYY-MM-DDTHH:MM y "
+                                  "'fuente' WEB, PRESENCIAL o TELEFONICA")
+
+        if hasta - desde < timedelta(minutes=DURACION_TIMESLOT_MINUTOS):
+            raise ValidationError("La ventana debe alcanzar para al menos un turno")
+        if hasta - desde > timedelta(hours=MAX_VENTANA_ESPERA_HORAS):
+            raise ValidationError(f"La ventana no puede superar {MAX_VENTANA_ESPERA_HORAS} horas")
+        if hasta <= datetime.now():
+            raise ValidationError("La ventana ya pasó")
+
+        if not self.club_repo.get_by_id(club_id):
+            raise NotFoundError("Club no encontrado")
+        if cancha_id is not None:
+            cancha = self.cancha_repo.get_by_id(cancha_id)
+            if not cancha or cancha.club_id != club_id:
+                raise NotFoundError("Cancha no encontrada en el club")
+
+        try:
+            cliente = self.cliente_repo.find_or_create_cliente(
+                email=data['cliente_email'],
+                nombre=data['cliente_nombre'],
+                telefono=data.get('cliente_telefono')
+            )
+            espera = self.repo.create(EsperaTurno(
+                club_id=club_id,
+                cancha_id=cancha_id,
+                desde=desde,
+                hasta=hasta,
+                cliente=cliente,
+                cliente_nombre=data['cliente_nombre'],
+                cliente_telefono=data.get('cliente_telefono'),
+                cliente_email=data['cliente_email'],
+                fuente=fuente,
+                auto_reservar=bool(data.get('auto_reservar', False))
+            ))
+            self.db.session.commit()
+            return espera
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al anotar en la lista de espera: {str(e)}")
+
+    def cancelar(self, espera_id, email):
+        """
+        Saca a un cliente de la lista de espera. Se identifica con el email
+        con el que se anotó.
+
+        Raises:
+            NotFoundError: Si la espera no existe o el email no coincide
+            ValidationError: Si la espera ya fue atendida o cancelada
+        """
+        espera = self.repo.get_by_id(espera_id)
+        if not espera or normalizar_email(espera.cliente_email) != normalizar_email(email):
+            raise NotFoundError("Espera no encontrada")
+        if espera.estado != EsperaEstado.PENDIENTE:
+            raise ValidationError(f"La espera ya está {espera.estado.value}")
+        try:
+            espera.estado = EsperaEstado.CANCELADA
+            self.db.session.commit()
+            return espera
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al cancelar la espera: {str(e)}")
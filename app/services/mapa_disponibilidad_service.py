@@ -0,0 +1,134 @@
+"""
+Consultas de disponibilidad sobre máscaras de bits por (cancha, día).
+
+Cada cancha tiene por día un entero cuyo bit i indica si el turno que empieza
+a los i * GRANULARIDAD_MINUTOS minutos está DISPONIBLE (tabla
+'disponibilidad_dia'). Preguntas como "¿qué canchas están libres de 18 a 22?"
+se resuelven con AND/OR y conteo de bits, sin recorrer filas de timeslot.
+"""
+from datetime import datetime, time, timedelta
+
+from app.errors import ValidationError
+from app.models.disponibilidad_dia import GRANULARIDAD_MINUTOS, bit_turno
+from app.repositories.disponibilidad_dia_repo import DisponibilidadDiaRepository
+from app.services.disponibilidad_service import DisponibilidadService, modo_virtual
+from app.services.timeslot_service import DURACION_TIMESLOT_MINUTOS, PASO_TIMESLOT_MINUTOS
+
+
+def mascara_ventana(fecha, desde, hasta):
+    """
+    Bits de los turnos que entran completos en [desde, hasta), con el
+    mismo paso y duración que la generación de timeslots.
+    """
+    mascara = 0
+    inicio = datetime.combine(fecha, desde)
+    fin = datetime.combine(fecha, hasta) if hasta != time.min else datetime.combine(fecha + timedelta(days=1), time.min)
+    while inicio + timedelta(minutes=DURACION_TIMESLOT_MINUTOS) <= fin:
+        mascara |= bit_turno(inicio)
+        inicio += timedelta(minutes=PASO_TIMESLOT_MINUTOS)
+    return mascara
+
+
+def horas_de_mascara(mascara):
+    """Lista 'HH:MM' de los turnos cuyos bits están en la máscara."""
+    horas = []
+    while mascara:
+        bit = mascara & -mascara
+        minutos = (bit.bit_length() - 1) * GRANULARIDAD_MINUTOS
+        horas.append(f"{minutos // 60:02d}:{minutos % 60:02d}")
+        mascara ^= bit
+    return horas
+
+
+class MapaDisponibilidadService:
+    def __init__(self, db):
+        self.db = db
+        self.mapa_repo = DisponibilidadDiaRepository()
+        self.disponibilidad_service = DisponibilidadService(db)
+
+    def get_mascaras(self, club_ids, fecha):
+        """
+        Devuelve {cancha_id: (club_id, máscara)} de las canchas activas de los clubes.
+        Con disponibilidad virtual las máscaras se arman desde las reglas.
+        """
+        if not modo_virtual():
+            return self.mapa_repo.get_mascaras(fecha, club_ids=club_ids)
+
+        mascaras = {}
+        for club_id in club_ids:
+            for turno in self.disponibilidad_service.calcular_turnos(club_id, fecha, fecha, solo_activas=True):
+                cancha = turno["cancha"]
+                _club, mascara = mascaras.get(cancha.id, (club_id, 0))
+                if turno["libre"]:
+                    mascara |= bit_turno(turno["inicio"])
+                mascaras[cancha.id] = (club_id, mascara)
+        return mascaras
+
+    def canchas_libres(self, club_ids, fecha, desde, hasta):
+        """
+        Canchas con turnos libres en una franja horaria, para uno o varios clubes.
+
+        Args:
+            club_ids (list[int]): Clubes a consultar
+            fecha (date): Día a consultar
+            desde (time): Inicio de la franja
+            hasta (time): Fin de la franja (00:00 = fin del día)
+
+        Returns:
+            dict: Para cada cancha con algún turno libre, sus turnos libres y si
+            está libre toda la franja; y para cada turno, cuántas canchas lo tienen libre.
+
+        Raises:
+            ValidationError: Si la franja no contiene ningún turno
+        """
+        ventana = mascara_ventana(fecha, desde, hasta)
+        if not ventana:
+            raise ValidationError("La franja horaria no contiene ningún turno completo")
+
+        canchas = []
+        alguna = 0
+        libres_por_bit = {}
+        for cancha_id, (club_id, mascara) in self.get_mascaras(club_ids, fecha).items():
+            libres = mascara & ventana
+            if not libres:
+                continue
+            alguna |= libres
+            resto = libres
+            while resto:
+                bit = resto & -resto
+                libres_por_bit[bit] = libres_por_bit.get(bit, 0) + 1
+                resto ^= bit
+            canchas.append((libres.bit_count(), {
+                "cancha_id": cancha_id,
+                "club_id": club_id,
+                "turnos_libres": horas_de_mascara(libres),
+                "libre_toda_la_franja": libres == ventana
+            }))
+
+        # Primero las canchas con más turnos libres en la franja
+        canchas = [c for _n, c in sorted(canchas, key=lambda par: (-par[0], par[1]["cancha_id"]))]
+        return {
+            "fecha": fecha.isoformat(),
+            "desde": desde.strftime('%H:%M'),
+            "hasta": hasta.strftime('%H:%M'),
+            "turnos_en_franja": horas_de_mascara(ventana),
+            "turnos_con_alguna_cancha_libre": horas_de_mascara(alguna),
+            "libres_por_turno": {horas_de_mascara(bit)[0]: n for bit, n in sorted(libres_por_bit.items())},
+            "total_libres_toda_la_franja": sum(1 for c in canchas if c["libre_toda_la_franja"]),
+            "canchas": canchas
+        }
+
+    def reconstruir(self, fecha_desde=None):
+        """
+        Recalcula las máscaras desde los timeslots guardados y hace commit.
+
+        Returns:
+            int: Cantidad de filas (cancha, día) escritas
+        """
+        try:
+            filas = self.mapa_repo.reconstruir(fecha_desde)
+            self.db.session.commit()
+            return filas
+        except Exception:
+            self.db.session.rollback()
+            raise
@@ -0,0 +1,186 @@
+"""
+Reglas de precio por franja horaria.
+
+El precio de un turno sale de la regla aplicable de mayor prioridad (ver
+ReglaPrecio) o, si no hay ninguna, del precio por hora de la cancha. Se
+asigna al generar o materializar timeslots; para los ya generados,
+repreciar() actualiza los DISPONIBLE futuros con un UPDATE por regla.
+"""
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from app.errors import AppError, NotFoundError, ValidationError
+from app.models.enums import DiaSemana
+from app.models.regla_precio import ReglaPrecio
+from app.repositories.cancha_repo import CanchaRepository
+from app.repositories.club_repo import ClubRepository
+from app.repositories.regla_precio_repo import ReglaPrecioRepository
+
+# date.weekday() -> DiaSemana
+_DIAS = [DiaSemana.LUN, DiaSemana.MAR, DiaSemana.MIE, DiaSemana.JUE,
+         DiaSemana.VIE, DiaSemana.SAB, DiaSemana.DOM]
+
+
+def orden_regla(regla):
+    """Clave de precedencia: prioridad, luego regla de cancha sobre la del club, luego la más nueva."""
+    return (regla.prioridad, regla.cancha_id is not None, regla.id)
+
+
+def regla_aplica(regla, cancha_id, inicio):
+    """Indica si la regla cubre el turno de la cancha que empieza en 'inicio'."""
+    if regla.cancha_id is not None and regla.cancha_id != cancha_id:
+        return False
+    if regla.dia is not None and regla.dia != _DIAS[inicio.weekday()]:
+        return False
+    hora = inicio.time()
+    if hora < regla.hora_desde or (regla.hora_hasta is not None and hora >= regla.hora_hasta):
+        return False
+    if regla.fecha_desde is not None and inicio.date() < regla.fecha_desde:
+        return False
+    if regla.fecha_hasta is not None and inicio.date() > regla.fecha_hasta:
+        return False
+    return True
+
+
+def precio_turno(reglas, cancha, inicio):
+    """
+    Precio del turno de 'cancha' que empieza en 'inicio'.
+
+    Args:
+        reglas (list[ReglaPrecio]): Reglas del club, ordenadas de mayor a menor precedencia
+    """
+    for regla in reglas:
+        if regla_aplica(regla, cancha.id, inicio):
+            return Decimal(regla.precio)
+    return Decimal(str(cancha.precio_hora))
+
+
+class PrecioService:
+    def __init__(self, db):
+        self.db = db
+        self.repo = ReglaPrecioRepository()
+        self.club_repo = ClubRepository()
+        self.cancha_repo = CanchaRepository()
+
+    def reglas_de_club(self, club_id):
+        """Reglas del club ordenadas de mayor a menor precedencia (listas para precio_turno)."""
+        return sorted(self.repo.get_by_club(club_id), key=orden_regla, reverse=True)
+
+    def asignar_precios(self, timeslots, canchas_por_id):
+        """
+        Asigna a timeslots nuevos (sin guardar) el precio que les corresponde,
+        con una consulta de reglas para todos los clubes involucrados.
+        """
+        club_ids = {canchas_por_id[ts.cancha_id].club_id for ts in timeslots}
+        reglas = {club_id: [] for club_id in club_ids}
+        for regla in sorted(self.repo.get_by_clubes(club_ids), key=orden_regla, reverse=True):
+            reglas[regla.club_id].append(regla)
+        for ts in timeslots:
+            cancha = canchas_por_id[ts.cancha_id]
+            ts.precio = precio_turno(reglas[cancha.club_id], cancha, ts.inicio)
+        return timeslots
+
+    def get_reglas(self, club_id):
+        if not self.club_repo.get_by_id(club_id):
+            raise NotFoundError("Club no encontrado")
+        return self.repo.get_by_club(club_id)
+
+    def create_regla(self, club_id, data):
+        """
+        Crea una regla de precio para el club.
+
+        Campos requeridos: hora_desde (HH:MM), precio.
+        Opcionales: cancha_id, dia (LUN..DOM), hora_hasta (HH:MM, por defecto fin del día),
+        fecha_desde y fecha_hasta (YYYY-MM-DD), prioridad (entero, por defecto 0).
+
+        No cambia los timeslots ya generados: para eso está repreciar().
+
+        Raises:
+            ValidationError: Si los datos son inválidos
+            NotFoundError: Si el club o la cancha no existen
+        """
+        if not self.club_repo.get_by_id(club_id):
+            raise NotFoundError("Club no encontrado")
+        for field in ['hora_desde', 'precio']:
+            if field not in data or data[field] in (None, ''):
+                raise ValidationError(f"El campo '{field}' es requerido")
+        try:
+            regla = ReglaPrecio(
+                club_id=club_id,
+                cancha_id=int(data['cancha_id']) if data.get('cancha_id') else None,
+                dia=DiaSemana(data['dia']) if data.get('dia') else None,
+                hora_desde=datetime.strptime(data['hora_desde'], '%H:%M').time(),
+                hora_hasta=datetime.strptime(data['hora_hasta'], '%H:%M').time() if data.get('hora_hasta') else None,
+                fecha_desde=date.fromisoformat(data['fecha_desde']) if data.get('fecha_desde') else None,
+                fecha_hasta=date.fromisoformat(data['fecha_hasta']) if data.get('fecha_hasta') else None,
+                precio=Decimal(str(data['precio'])),
+                prioridad=int(data.get('prioridad') or 0)
+            )
+        except (TypeError, ValueError, InvalidOperation):
+            raise ValidationError("Datos inválidos: las horas son HH:MM, las fechas YYYY-MM-DD, "
+                                  "'dia' LUN..DOM y 'precio' un número")
+        if regla.precio <= 0:
+            raise ValidationError("El precio debe ser mayor a 0")
+        if regla.hora_hasta is not None and regla.hora_hasta <= regla.hora_desde:
+            raise ValidationError("'hora_hasta' debe ser posterior a 'hora_desde'")
+        if regla.fecha_desde and regla.fecha_hasta and regla.fecha_hasta < regla.fecha_desde:
+            raise ValidationError("'fecha_hasta' no puede ser anterior a 'fecha_desde'")
+        if regla.cancha_id is not None:
+            cancha = self.cancha_repo.get_by_id(regla.cancha_id)
+            if not cancha or cancha.club_id != club_id:
+                raise NotFoundError("Cancha no encontrada en el club")
+
+        try:
+            self.repo.create(regla)
+            self.db.session.commit()
+            return regla
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al crear la regla de precio: {str(e)}")
+
+    def delete_regla(self, club_id, regla_id):
+        regla = self.repo.get_by_id(regla_id)
+        if not regla or regla.club_id != club_id:
+            raise NotFoundError("Regla de precio no encontrada")
+        try:
+            self.repo.delete(regla)
+            self.db.session.commit()
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al eliminar la regla de precio: {str(e)}")
+
+    def repreciar(self, club_id, cancha_ids=None, desde=None, auto_commit=True):
+        """
+        Recalcula el precio de los timeslots DISPONIBLE futuros del club (o de
+        algunas canchas) según el precio por hora y las reglas vigentes.
+
+        Se hace un UPDATE que vuelve todos al precio de su cancha y luego uno
+        por regla, de menor a mayor precedencia, así cada turno queda con el
+        precio de la regla que le gana. Los turnos reservados no se tocan.
+
+        Args:
+            desde (datetime, optional): Solo turnos que empiezan desde este momento (por defecto, ahora)
+            auto_commit (bool): False cuando se llama dentro de otra transacción
+
+        Returns:
+            dict: Timeslots afectados en total y por regla
+        """
+        desde = desde or datetime.now()
+        try:
+            total = self.repo.reprecio_base(club_id, desde, cancha_ids)
+            por_regla = [
+                {"regla_id": regla.id, "actualizados": self.repo.reprecio_regla(regla, desde, cancha_ids)}
+                for regla in sorted(self.repo.get_by_club(club_id), key=orden_regla)
+            ]
+            if auto_commit:
+                self.db.session.commit()
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al recalcular los precios: {str(e)}")
+
+        return {
+            "club_id": club_id,
+            "desde": desde.isoformat(timespec='minutes'),
+            "timeslots_afectados": total,
+            "reglas": por_regla
+        }
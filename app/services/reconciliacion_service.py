@@ -0,0 +1,246 @@
+"""
+Reconciliación de los timeslots generados con el horario del club.
+
+Cambiar un ClubHorario (o cargar un cierre) no modifica los timeslots ya
+generados, y la generación saltea los días que ya tienen turnos. La
+reconciliación calcula, por cancha y día, la diferencia entre los turnos
+que el horario habilita y los timeslots futuros guardados: inserta los que
+faltan, elimina (o bloquea) los DISPONIBLE que sobran, vuelve a liberar los
+que una corrida anterior bloqueó si el horario los habilita otra vez y
+reporta los reservados que quedaron fuera de horario, que no se tocan. Lee
+los timeslots con una consulta y escribe con operaciones en bloque.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from app.errors import AppError, ConflictError, NotFoundError, ValidationError
+from app.models.enums import TimeslotEstado
+from app.models.timeslot import Timeslot
+from app.repositories.club_repo import ClubRepository
+from app.repositories.disponibilidad_repo import DisponibilidadRepository
+from app.repositories.timeslot_repo import TimeslotRepository
+from app.services.disponibilidad_service import horario_del_dia, modo_virtual, turnos_del_dia
+from app.services.precio_service import PrecioService
+from app.services.reporte_service import invalidar_cache_reportes
+
+MAX_DIAS_RECONCILIACION = 366
+
+# Qué hacer con los turnos DISPONIBLE que quedan fuera del horario
+EXCEDENTES = ('eliminar', 'bloquear')
+
+# Estados de los turnos fuera de horario que se reportan como conflicto
+ESTADOS_RESERVADOS = (TimeslotEstado.RESERVADO, TimeslotEstado.PAGADO)
+
+
+def diferencia_turnos(deseados, existentes):
+    """
+    Compara los turnos que el horario habilita con los timeslots guardados.
+
+    Args:
+        deseados (dict[tuple[int, datetime], datetime]): (cancha_id, inicio) -> fin
+        existentes (list[tuple]): (id, cancha_id, inicio, fin, estado, fuera_de_horario) de cada timeslot
+
+    Returns:
+        tuple: (faltantes, sobrantes, liberados, conflictos, omitidos, sin_cambios)
+            - faltantes: (cancha_id, inicio, fin) a insertar
+            - sobrantes: ids de los timeslots DISPONIBLE fuera del horario
+            - liberados: ids de los timeslots que la reconciliación bloqueó y
+              que el horario vuelve a habilitar
+            - conflictos: filas de 'existentes' reservadas o pagadas fuera del horario
+            - omitidos: (cancha_id, inicio, fin) que no se insertan porque se
+              solapan con un timeslot no DISPONIBLE de la misma cancha
+            - sin_cambios: cantidad de timeslots que se conservan como están
+    """
+    sobrantes, liberados, conflictos = [], [], []
+    ocupados = defaultdict(list)  # (cancha_id, fecha) -> [(inicio, fin)] de los no DISPONIBLE fuera de horario
+    guardados = set()
+    for fila in existentes:
+        _id, cancha_id, inicio, fin, estado, fuera_de_horario = fila
+        clave = (cancha_id, inicio)
+        guardados.add(clave)
+        if clave in deseados:
+            if fuera_de_horario and estado == TimeslotEstado.BLOQUEADO:
+                liberados.append(_id)
+            continue
+        if estado == TimeslotEstado.DISPONIBLE:
+            sobrantes.append(_id)
+            continue
+        # Los bloqueados fuera de horario se conservan, pero ocupan la cancha igual que una reserva
+        ocupados[(cancha_id, inicio.date())].append((inicio, fin))
+        if estado in ESTADOS_RESERVADOS:
+            conflictos.append(fila)
+
+    faltantes, omitidos = [], []
+    for (cancha_id, inicio), fin in deseados.items():
+        if (cancha_id, inicio) in guardados:
+            continue
+        turno = (cancha_id, inicio, fin)
+        if any(o_inicio < fin and o_fin > inicio for o_inicio, o_fin in ocupados[(cancha_id, inicio.date())]):
+            omitidos.append(turno)
+        else:
+            faltantes.append(turno)
+
+    faltantes.sort(key=lambda t: (t[0], t[1]))
+    sin_cambios = len(existentes) - len(sobrantes) - len(liberados) - len(conflictos)
+    return faltantes, sobrantes, liberados, conflictos, omitidos, sin_cambios
+
+
+class ReconciliacionService:
+    def __init__(self, db):
+        self.db = db
+        self.repo = DisponibilidadRepository()
+        self.club_repo = ClubRepository()
+        self.timeslot_repo = TimeslotRepository(db)
+        self.precio_service = PrecioService(db)
+
+    def turnos_deseados(self, club_id, canchas, fecha_desde, fecha_hasta):
+        """
+        Turnos que el horario del club y sus cierres habilitan para las canchas
+        entre dos fechas (inclusive). A diferencia de la disponibilidad
+        virtual no considera los bloqueos de cancha: un bloqueo cambia el
+        estado de un turno, no su existencia.
+
+        Returns:
+            dict[tuple[int, datetime], datetime]: (cancha_id, inicio) -> fin
+        """
+        horarios = {h.dia: h for h in self.repo.get_horarios_activos(club_id)}
+        cierres = {c.fecha: c for c in self.repo.get_cierres(club_id, fecha_desde, fecha_hasta)}
+        deseados = {}
+        dia = fecha_desde
+        while dia <= fecha_hasta:
+            horario = horario_del_dia(dia, horarios, cierres.get(dia))
+            if horario:
+                for inicio, fin in turnos_del_dia(dia, *horario):
+                    for cancha in canchas:
+                        deseados[(cancha.id, inicio)] = fin
+            dia += timedelta(days=1)
+        return deseados
+
+    def reconciliar(self, club_id, desde: datetime = None, hasta: date = None, excedentes='eliminar',
+                    dry_run=False, auto_commit=True):
+        """
+        Alinea los timeslots futuros del club con su horario actual.
+
+        Args:
+            club_id (int): ID del club
+            desde (datetime, optional): Solo turnos que empiezan desde este momento (por defecto, ahora)
+            hasta (date, optional): Último día a reconciliar (por defecto, el del último timeslot generado)
+            excedentes (str): 'eliminar' borra los turnos DISPONIBLE fuera del horario
+                (los referenciados por un partido o la lista de espera se bloquean);
+                'bloquear' los pasa a BLOQUEADO. En los dos casos los bloqueados quedan
+                marcados y vuelven a DISPONIBLE si el horario se amplía
+            dry_run (bool): Solo calcula la diferencia, sin escribir
+            auto_commit (bool): False cuando se llama dentro de otra transacción
+
+        Returns:
+            dict: Cantidades insertadas, eliminadas, bloqueadas, desbloqueadas,
+                sin cambios y omitidas, y los turnos reservados que quedaron fuera del horario
+
+        Raises:
+            NotFoundError: Si el club no existe
+            ValidationError: Si el rango o 'excedentes' son inválidos
+            ConflictError: Si otra operación creó uno de los turnos al mismo tiempo
+        """
+        if excedentes not in EXCEDENTES:
+            raise ValidationError(f"'excedentes' debe ser uno de: {', '.join(EXCEDENTES)}")
+        if not self.club_repo.get_by_id(club_id):
+            raise NotFoundError("Club no encontrado")
+
+        desde = desde or datetime.now()
+        if hasta is None:
+            ultimo = self.timeslot_repo.get_ultimo_inicio_de_club(club_id)
+            hasta = ultimo.date() if ultimo else desde.date() - timedelta(days=1)
+        elif hasta < desde.date():
+            raise ValidationError("La fecha hasta debe ser posterior a desde")
+        if (hasta - desde.date()).days >= MAX_DIAS_RECONCILIACION:
+            raise ValidationError(f"El rango a reconciliar no puede superar {MAX_DIAS_RECONCILIACION} días")
+
+        resultado = {
+            "club_id": club_id,
+            "desde": desde.isoformat(timespec='minutes'),
+            "hasta": hasta.isoformat(),
+            "excedentes": excedentes,
+            "dry_run": dry_run,
+            "insertados": 0,
+            "eliminados": 0,
+            "bloqueados": 0,
+            "desbloqueados": 0,
+            "sin_cambios": 0,
+            "omitidos": 0,
+            "conflictos": []
+        }
+        if hasta < desde.date():
+            return resultado  # El club no tiene timeslots futuros
+
+        canchas = self.repo.get_canchas(club_id)
+        deseados = {
+            clave: fin
+            for clave, fin in self.turnos_deseados(club_id, canchas, desde.date(), hasta).items()
+            if clave[1] >= desde
+        }
+        existentes = self.timeslot_repo.get_turnos_de_club(
+            club_id, desde, datetime.combine(hasta + timedelta(days=1), datetime.min.time())
+        )
+        faltantes, sobrantes, liberados, conflictos, omitidos, sin_cambios = diferencia_turnos(deseados, existentes)
+        if modo_virtual():
+            # Los turnos libres no se guardan: solo se limpian los que sobran
+            faltantes, omitidos = [], []
+
+        reservas = self.timeslot_repo.get_reservas_de_timeslots([fila[0] for fila in conflictos])
+        resultado.update({
+            "sin_cambios": sin_cambios,
+            "omitidos": len(omitidos),
+            "conflictos": [
+                {
+                    "timeslot_id": _id,
+                    "cancha_id": cancha_id,
+                    "inicio": inicio.isoformat(timespec='minutes'),
+                    "fin": fin.isoformat(timespec='minutes'),
+                    "estado": estado.value,
+                    "reserva_id": reservas.get(_id)
+                }
+                for _id, cancha_id, inicio, fin, estado, _marca in sorted(conflictos, key=lambda f: (f[2], f[1]))
+            ]
+        })
+
+        if dry_run:
+            resultado["insertados"] = len(faltantes)
+            resultado["eliminados" if excedentes == 'eliminar' else "bloqueados"] = len(sobrantes)
+            resultado["desbloqueados"] = len(liberados)
+            return resultado
+
+        try:
+            if faltantes:
+                nuevos = [Timeslot(cancha_id=cancha_id, inicio=inicio, fin=fin) for cancha_id, inicio, fin in faltantes]
+                self.precio_service.asignar_precios(nuevos, {c.id: c for c in canchas})
+                with self.db.session.begin_nested():
+                    resultado["insertados"] = self.timeslot_repo.insertar_bulk([
+                        {"cancha_id": ts.cancha_id, "inicio": ts.inicio, "fin": ts.fin, "precio": ts.precio}
+                        for ts in nuevos
+                    ])
+
+            if excedentes == 'eliminar':
+                resultado["eliminados"] = self.timeslot_repo.eliminar_libres_bulk(sobrantes)
+            # Con 'eliminar', solo quedan DISPONIBLE los que no se pudieron borrar
+            resultado["bloqueados"] = self.timeslot_repo.cambiar_estado_bulk(
+                sobrantes, TimeslotEstado.DISPONIBLE, TimeslotEstado.BLOQUEADO, fuera_de_horario=True
+            )
+            # Solo se liberan los que siguen bloqueados por una reconciliación anterior
+            resultado["desbloqueados"] = self.timeslot_repo.cambiar_estado_bulk(
+                liberados, TimeslotEstado.BLOQUEADO, TimeslotEstado.DISPONIBLE, fuera_de_horario=False
+            )
+
+            if auto_commit:
+                self.db.session.commit()
+        except IntegrityError:
+            self.db.session.rollback()
+            raise ConflictError("Otra operación creó turnos del club al mismo tiempo; reintentar.")
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al reconciliar los timeslots: {str(e)}")
+
+        if faltantes or sobrantes or liberados:
+            invalidar_cache_reportes(desde.date(), hasta)
+        return resultado
@@ -3,18 +3,77 @@ from datetime import datetime, date
 from typing import Optional, List
 from calendar import monthrange
 
+from app.cache import TTLCache
+from app.config import Config
 from app.repositories.reporte_repo import ReporteRepository
-from app.schemas.reserva_schema import reservas_schema
+from app.models.reserva_archivada import ReservaArchivada
+from app.schemas.reserva_schema import reserva_schema, reservas_schema, reserva_archivada_schema
+
+
+# Caché compartida por todas las instancias del servicio. Cada entrada se
+# etiqueta con el rango de fechas (desde, hasta) que cubre; None = sin límite.
+reporte_cache = TTLCache(
+    max_entries=Config.REPORTES_CACHE_MAX_ENTRIES,
+    ttl=Config.REPORTES_CACHE_TTL
+)
+
+
+def invalidar_cache_reportes(fecha_desde: Optional[date] = None, fecha_hasta: Optional[date] = None) -> int:
+    """
+    Invalida los reportes cacheados cuyo período se solapa con [fecha_desde, fecha_hasta].
+    
+    Se llama cada vez que se crean, modifican o cancelan reservas. Si no se
+    indican fechas se invalida toda la caché.
+    
+    Args:
+        fecha_desde: Primer día afectado por el cambio
+        fecha_hasta: Último día afectado por el cambio
+        
+    Returns:
+        Cantidad de entradas invalidadas
+    """
+    if fecha_desde is None and fecha_hasta is None:
+        return reporte_cache.invalidate()
+    
+    fecha_desde = fecha_desde or fecha_hasta
+    fecha_hasta = fecha_hasta or fecha_desde
+    
+    def _se_solapa(rango):
+        inicio, fin = rango if rango else (None, None)
+        return (inicio is None or inicio <= fecha_hasta) and (fin is None or fin >= fecha_desde)
+    
+    return reporte_cache.invalidate(_se_solapa)
 
 
 class ReporteService:
     """
     Servicio para generar reportes de reservas y canchas.
     Contiene la lógica de negocio para procesar y formatear datos de reportes.
+    
+    Los resultados se cachean por (endpoint, parámetros normalizados) en
+    'reporte_cache'; ver invalidar_cache_reportes().
     """
     
     def __init__(self):
         self.reporte_repo = ReporteRepository()
+        self.cache = reporte_cache
+    
+    def _cacheado(self, endpoint: str, params: dict, rango: tuple, calcular):
+        """
+        Devuelve el resultado cacheado del reporte o lo calcula y lo guarda.
+        
+        Args:
+            endpoint: Nombre del reporte
+            params: Parámetros ya normalizados (los None se descartan)
+            rango: Tupla (desde, hasta) de fechas que cubre el reporte
+            calcular: Función sin argumentos que genera el reporte
+        """
+        key = (endpoint, tuple(sorted((k, v) for k, v in params.items() if v is not None)))
+        return self.cache.get_or_set(key, calcular, tag=rango)
+    
+    def get_cache_stats(self) -> dict:
+        """Devuelve las estadísticas de la caché de reportes."""
+        return self.cache.stats()
     
     def _parse_date(self, s: Optional[str]) -> Optional[datetime]:
         """
@@ -76,19 +135,24 @@ class ReporteService:
     def get_reservas_por_cliente(
         self,
         q: Optional[str] = None,
-        cliente_email: Optional[str] = None
-    ) -> List[dict]:
+        cliente_email: Optional[str] = None,
+        page: Optional[int] = None,
+        per_page: Optional[int] = None
+    ):
         """
         Construye un listado de reservas agrupadas por cliente.
         
         Args:
-            q: Búsqueda libre que compara con nombre o email del cliente (opcional)
+            q: Búsqueda libre por prefijo de nombre o email, sin distinguir acentos (opcional)
             cliente_email: Búsqueda exacta por email del cliente (opcional)
+            page: Página de clientes a devolver, desde 1 (opcional)
+            per_page: Clientes por página (opcional, máximo 200)
         
         Returns:
-            Lista de objetos con la forma:
+            Sin paginación, lista de objetos con la forma:
             [
               {
+                "cliente_id": 1,
                 "cliente_email": "...",
                 "cliente_nombre": "...",
                 "cliente_telefono": "...",
@@ -96,32 +160,107 @@ class ReporteService:
               },
               ...
             ]
+            Con 'page' o 'per_page':
+            { "data": [ ...misma lista... ], "page": 1, "per_page": 50, "total": 120 }
+        """
+        q = q.strip() if q else None
+        cliente_email = cliente_email.strip() if cliente_email else None
+
+        if page is None and per_page is None:
+            return self._cacheado(
+                "reservas-por-cliente",
+                {"q": q, "cliente_email": cliente_email},
+                (None, None),
+                lambda: self._calcular_reservas_por_cliente(q, cliente_email)
+            )
+
+        page = max(page or 1, 1)
+        per_page = min(max(per_page or 50, 1), 200)
+
+        return self._cacheado(
+            "reservas-por-cliente",
+            {"q": q, "cliente_email": cliente_email, "page": page, "per_page": per_page},
+            (None, None),
+            lambda: self._calcular_reservas_por_cliente_paginado(q, cliente_email, page, per_page)
+        )
+
+    def _calcular_reservas_por_cliente_paginado(
+        self,
+        q: Optional[str],
+        cliente_email: Optional[str],
+        page: int,
+        per_page: int
+    ) -> dict:
         """
-        reservas = self.reporte_repo.get_reservas_filtradas(
+        Genera una página del reporte por cliente: primero pagina los clientes
+        distintos y luego trae solo las reservas de esos clientes.
+        """
+        clientes, total = self.reporte_repo.get_clientes_paginados(
             cliente_email=cliente_email,
-            q=q
+            q=q,
+            page=page,
+            per_page=per_page
+        )
+        cliente_ids = [c.id for c in clientes]
+        reservas = sorted(
+            self.reporte_repo.get_reservas_archivadas_de_clientes(cliente_ids)
+            + self.reporte_repo.get_reservas_de_clientes(cliente_ids),
+            key=lambda r: (r.cliente_id, r.created_at)
+        )
+
+        return {
+            "data": self._agrupar_por_cliente(reservas, clientes),
+            "page": page,
+            "per_page": per_page,
+            "total": total
+        }
+
+    def _calcular_reservas_por_cliente(self, q: Optional[str], cliente_email: Optional[str]) -> List[dict]:
+        """Genera el reporte de reservas por cliente sin pasar por la caché."""
+        reservas = sorted(
+            self.reporte_repo.get_reservas_archivadas_filtradas(cliente_email=cliente_email, q=q)
+            + self.reporte_repo.get_reservas_filtradas(cliente_email=cliente_email, q=q),
+            key=lambda r: (r.cliente.email, r.created_at)
         )
+        return self._agrupar_por_cliente(reservas)
+
+    def _agrupar_por_cliente(self, reservas, clientes=None) -> List[dict]:
+        """
+        Agrupa reservas por 'cliente_id'.
         
+        Args:
+            reservas: Reservas con su cliente asociado
+            clientes: Orden en que se deben devolver los grupos (opcional; por
+                      defecto, el orden de aparición en 'reservas')
+        """
         grupos = defaultdict(list)
-        info_cliente = {}
-        
         for r in reservas:
-            key = (r.cliente_email or "", r.cliente_nombre or "")
-            grupos[key].append(r)
-            # Guardar telefono (último valor disponible)
-            info_cliente[key] = r.cliente_telefono
+            grupos[r.cliente_id].append(r)
+        
+        if clientes is None:
+            clientes = [lista[0].cliente for lista in grupos.values()]
         
         resultado = []
-        for (email, nombre), lista in grupos.items():
+        for cliente in clientes:
             resultado.append({
-                "cliente_email": email,
-                "cliente_nombre": nombre,
-                "cliente_telefono": info_cliente.get((email, nombre)),
-                "reservas": reservas_schema.dump(lista)
+                "cliente_id": cliente.id,
+                "cliente_email": cliente.email,
+                "cliente_nombre": cliente.nombre,
+                "cliente_telefono": cliente.telefono,
+                "reservas": self._dump_reservas(grupos.get(cliente.id, []))
             })
         
         return resultado
-    
+
+    def _dump_reservas(self, reservas) -> List[dict]:
+        """Serializa reservas vigentes y archivadas (con la misma forma) conservando el orden."""
+        if not any(isinstance(r, ReservaArchivada) for r in reservas):
+            return reservas_schema.dump(reservas)
+        return [
+            (reserva_archivada_schema if isinstance(r, ReservaArchivada) else reserva_schema).dump(r)
+            for r in reservas
+        ]
+
     def get_reservas_por_cancha(
         self,
         cancha_id: Optional[int] = None,
@@ -150,11 +289,33 @@ class ReporteService:
         if end_dt:
             # Incluir todo el día final
             end_dt = end_dt.replace(hour=23, minute=59, second=59)
-        
-        reservas = self.reporte_repo.get_reservas_por_cancha(
-            cancha_id=cancha_id,
-            start_dt=start_dt,
-            end_dt=end_dt
+
+        return self._cacheado(
+            "reservas-por-cancha",
+            {"cancha_id": cancha_id, "start_dt": start_dt, "end_dt": end_dt},
+            (start_dt.date() if start_dt else None, end_dt.date() if end_dt else None),
+            lambda: self._calcular_reservas_por_cancha(cancha_id, start_dt, end_dt)
+        )
+
+    def _calcular_reservas_por_cancha(
+        self,
+        cancha_id: Optional[int],
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime]
+    ) -> List[dict]:
+        """Genera el reporte de reservas por cancha sin pasar por la caché."""
+        # Las archivadas son anteriores a las vigentes: van primero dentro de cada cancha
+        reservas = sorted(
+            self.reporte_repo.get_reservas_archivadas_por_cancha(
+                cancha_id=cancha_id,
+                start_dt=start_dt,
+                end_dt=end_dt
+            ) + self.reporte_repo.get_reservas_por_cancha(
+                cancha_id=cancha_id,
+                start_dt=start_dt,
+                end_dt=end_dt
+            ),
+            key=lambda r: r.cancha_id
         )
         
         grupos = defaultdict(list)
@@ -180,7 +341,7 @@ class ReporteService:
                 },
                 "total_reservas": len(lista),
                 "total_ingresos": f"{total:.2f}",
-                "reservas": reservas_schema.dump(lista)
+                "reservas": self._dump_reservas(lista)
             })
         
         return resultado
@@ -213,7 +374,21 @@ class ReporteService:
         end_dt = self._parse_date(fecha_fin)
         if end_dt:
             end_dt = end_dt.replace(hour=23, minute=59, second=59)
-        
+
+        return self._cacheado(
+            "canchas-mas-utilizadas",
+            {"limit": limit, "start_dt": start_dt, "end_dt": end_dt},
+            (start_dt.date() if start_dt else None, end_dt.date() if end_dt else None),
+            lambda: self._calcular_canchas_mas_utilizadas(limit, start_dt, end_dt)
+        )
+
+    def _calcular_canchas_mas_utilizadas(
+        self,
+        limit: int,
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime]
+    ) -> List[dict]:
+        """Genera el ranking de canchas más utilizadas sin pasar por la caché."""
         # Obtener datos agregados
         rows = self.reporte_repo.get_canchas_mas_utilizadas_query(
             start_dt=start_dt,
@@ -278,7 +453,21 @@ class ReporteService:
         """
         start_date = self._parse_date_as_date(fecha_inicio)
         end_date = self._parse_date_as_date(fecha_fin)
-        
+
+        return self._cacheado(
+            "utilizacion-mensual",
+            {"cancha_id": cancha_id, "start_date": start_date, "end_date": end_date},
+            (start_date, end_date),
+            lambda: self._calcular_utilizacion_mensual(cancha_id, start_date, end_date)
+        )
+
+    def _calcular_utilizacion_mensual(
+        self,
+        cancha_id: Optional[int],
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> dict:
+        """Genera los datos de utilización mensual sin pasar por la caché."""
         # Obtener datos agregados
         rows = self.reporte_repo.get_utilizacion_mensual_query(
             cancha_id=cancha_id,
@@ -1,16 +1,35 @@
 from app.repositories.reserva_repo import ReservaRepository
+from app.repositories.cliente_repo import ClienteRepository
+from app.repositories.disponibilidad_dia_repo import DisponibilidadDiaRepository
+from app.repositories.timeslot_repo import TimeslotRepository
+from app.repositories.espera_repo import EsperaRepository
 from app.models.reserva import Reserva
 from app.models.timeslot import Timeslot, TimeslotEstado
 from app.models.reserva_timeslot import ReservaTimeslot
+from app.services.reporte_service import invalidar_cache_reportes
+from app.services.espera_service import esperas_broker, canal_espera, evento_espera
+from app.models.enums import EsperaEstado
+from flask import current_app
+from app.services.disponibilidad_service import DisponibilidadService, parse_slots, parse_busqueda_bloques
 from app import db
 from datetime import datetime
 
-from app.errors import ValidationError, NotFoundError, AppError
+from app.errors import ValidationError, NotFoundError, AppError, ConflictError
+
+# Candidatos que se intentan reservar antes de rendirse en reservar_mejor_bloque
+MAX_INTENTOS_BLOQUE = 5
+
+CAMPOS_CLIENTE = ['cliente_nombre', 'cliente_email', 'fuente']
 
 class ReservaService:
     def __init__(self):
         self.db = db
         self.reserva_repo = ReservaRepository()
+        self.cliente_repo = ClienteRepository()
+        self.disponibilidad_service = DisponibilidadService(db)
+        self.mapa_repo = DisponibilidadDiaRepository()
+        self.timeslot_repo = TimeslotRepository(db)
+        self.espera_repo = EsperaRepository()
 
     def get_all(self):
         return self.reserva_repo.get_all()
@@ -27,12 +46,25 @@ class ReservaService:
         """
         return self.reserva_repo.get_by_club_id(club_id)
 
+    def _invalidar_reportes(self, timeslots):
+        """
+        Invalida los reportes cacheados que cubren las fechas de los timeslots afectados.
+        Si no hay timeslots se invalida toda la caché.
+        """
+        fechas = [ts.inicio.date() for ts in timeslots]
+        if fechas:
+            invalidar_cache_reportes(min(fechas), max(fechas))
+        else:
+            invalidar_cache_reportes()
+
     def create(self, data):
         """
         Crea una reserva bloqueando uno o más timeslots.
         
         Campos requeridos:
-        - timeslot_ids: lista de IDs de timeslots a reservar
+        - timeslot_ids: lista de IDs de timeslots a reservar, o bien
+        - slots: lista de turnos [{"cancha_id": 1, "inicio": "YYYY-MM-DDTHH:MM"}]; los que
+          todavía no tienen fila (disponibilidad virtual) se crean en esta transacción
         - cliente_nombre: nombre del cliente
         - cliente_telefono: teléfono del cliente  
         - cliente_email: email del cliente (OBLIGATORIO)
@@ -40,63 +72,156 @@ class ReservaService:
         - servicios: lista de servicios adicionales separados por coma (opcional)
         """
         # Validar campos requeridos
-        required_fields = ['timeslot_ids', 'cliente_nombre', 'cliente_email', 'fuente']
+        required_fields = list(CAMPOS_CLIENTE)
+        if 'slots' not in data:
+            required_fields.insert(0, 'timeslot_ids')
         for field in required_fields:
             if field not in data or not data[field]:
                 raise ValidationError(f"El campo '{field}' es requerido")
         
-        timeslot_ids = data.get('timeslot_ids')
-        if not isinstance(timeslot_ids, list) or len(timeslot_ids) == 0:
-            raise ValidationError("'timeslot_ids' debe ser una lista con al menos un ID")
+        claves = None
+        if 'slots' in data:
+            claves = parse_slots(data['slots'])
+        else:
+            timeslot_ids = data.get('timeslot_ids')
+            if not isinstance(timeslot_ids, list) or len(timeslot_ids) == 0:
+                raise ValidationError("'timeslot_ids' debe ser una lista con al menos un ID")
 
         try:
-            # Bloquear timeslots
-            timeslots = Timeslot.query.filter(Timeslot.id.in_(timeslot_ids))\
-                                     .with_for_update()\
-                                     .all()
+            if claves is not None:
+                # Buscar (y bloquear) o crear las filas de los turnos pedidos
+                timeslots = self.disponibilidad_service.materializar(claves)
+            else:
+                # Bloquear timeslots
+                timeslots = Timeslot.query.filter(Timeslot.id.in_(timeslot_ids))\
+                                         .with_for_update()\
+                                         .all()
 
-            if len(timeslots) != len(timeslot_ids):
-                raise ValidationError("Uno o más timeslots no existen.")
+                if len(timeslots) != len(timeslot_ids):
+                    raise ValidationError("Uno o más timeslots no existen.")
 
-            precio_total = 0
-            
             # Validar disponibilidad
             for ts in timeslots:
                 if ts.estado != TimeslotEstado.DISPONIBLE:
                     raise ValidationError(f"El timeslot {ts.id} (de {ts.inicio}) ya no está disponible.")
-                precio_total += ts.precio
-
-            # Crear reserva
-            nueva_reserva = Reserva(
-                cancha_id=timeslots[0].cancha_id,  # Todas deben ser de la misma cancha
-                cliente_nombre=data['cliente_nombre'],
-                cliente_telefono=data.get('cliente_telefono'),
-                cliente_email=data['cliente_email'],
-                fuente=data['fuente'],
-                servicios=data.get('servicios', ''),  # Lista separada por comas
-                precio_total=precio_total
-            )
-            self.db.session.add(nueva_reserva)
-            self.db.session.flush()
-
-            # Vincular y actualizar timeslots
+
+            nueva_reserva = self._registrar_reserva(timeslots, data)
+
+            # Actualizar timeslots
             for ts in timeslots:
                 ts.estado = TimeslotEstado.RESERVADO
-                
-                link = ReservaTimeslot(
-                    reserva_id=nueva_reserva.id,
-                    timeslot_id=ts.id
-                )
-                self.db.session.add(link)
+            self.mapa_repo.actualizar_timeslots(timeslots)
 
             # Confirmar transacción
             self.db.session.commit()
+            self._invalidar_reportes(timeslots)
             return nueva_reserva
 
         except Exception as e:
             self.db.session.rollback()
             raise AppError(f"Error al crear la reserva: {str(e)}")
 
+    def _registrar_reserva(self, timeslots, data):
+        """
+        Crea la reserva para los timeslots ya tomados y la vincula a ellos.
+        No cambia estados ni hace commit.
+        """
+        # Buscar o registrar al cliente (identificado por email normalizado)
+        cliente = self.cliente_repo.find_or_create_cliente(
+            email=data['cliente_email'],
+            nombre=data['cliente_nombre'],
+            telefono=data.get('cliente_telefono')
+        )
+
+        nueva_reserva = Reserva(
+            cancha_id=timeslots[0].cancha_id,  # Todas deben ser de la misma cancha
+            cliente=cliente,
+            cliente_nombre=data['cliente_nombre'],
+            cliente_telefono=data.get('cliente_telefono'),
+            cliente_email=data['cliente_email'],
+            fuente=data['fuente'],
+            servicios=data.get('servicios', ''),  # Lista separada por comas
+            precio_total=sum(ts.precio for ts in timeslots)
+        )
+        self.db.session.add(nueva_reserva)
+        self.db.session.flush()
+
+        for ts in timeslots:
+            self.db.session.add(ReservaTimeslot(reserva_id=nueva_reserva.id, timeslot_id=ts.id))
+        return nueva_reserva
+
+    def _tomar_bloque(self, bloque):
+        """
+        Pasa a RESERVADO los turnos de un bloque con un único UPDATE condicional
+        (solo los que siguen DISPONIBLE), creando antes las filas que falten.
+
+        Returns:
+            list[Timeslot] | None: Los timeslots tomados, o None si otra operación
+            reservó alguno primero
+        """
+        if any(t.timeslot_id is None for t in bloque):
+            timeslots = self.disponibilidad_service.materializar([(t.cancha_id, t.inicio) for t in bloque])
+        else:
+            timeslots = Timeslot.query.filter(Timeslot.id.in_([t.timeslot_id for t in bloque]))\
+                                     .order_by(Timeslot.inicio)\
+                                     .all()
+
+        ids = [ts.id for ts in timeslots]
+        if self.timeslot_repo.cambiar_estado_bulk(ids, TimeslotEstado.DISPONIBLE, TimeslotEstado.RESERVADO) != len(bloque):
+            return None
+        for ts in timeslots:
+            self.db.session.expire(ts, ['estado', 'updated_at'])
+        return timeslots
+
+    def reservar_mejor_bloque(self, data):
+        """
+        Busca bloques de turnos consecutivos en una misma cancha y reserva el
+        mejor: el que empieza antes y, a igual hora, el más barato.
+
+        Si otra operación toma un turno del bloque entre la búsqueda y la
+        reserva, se deshace el intento y se prueba el siguiente candidato.
+
+        Campos requeridos:
+        - cliente_nombre, cliente_email, fuente (y opcionales cliente_telefono, servicios), como en create
+        - club_id, fecha_desde, horas
+        Campos opcionales: fecha_hasta, hora_desde, hora_hasta, deporte, techado, iluminacion, cancha_ids
+
+        Raises:
+            ValidationError: Si faltan datos o los criterios son inválidos
+            ConflictError: Si no hay bloques libres o todos los candidatos fueron tomados
+        """
+        for field in CAMPOS_CLIENTE:
+            if field not in data or not data[field]:
+                raise ValidationError(f"El campo '{field}' es requerido")
+        criterios = parse_busqueda_bloques(data)
+        criterios["limite"] = MAX_INTENTOS_BLOQUE
+
+        candidatos = self.disponibilidad_service.buscar_bloques(**criterios)
+        if not candidatos:
+            raise ConflictError("No hay bloques libres que cumplan los criterios.")
+
+        for bloque in candidatos:
+            try:
+                timeslots = self._tomar_bloque(bloque)
+            except (ConflictError, ValidationError):
+                # Turno creado o bloqueado por otra operación
+                timeslots = None
+            if timeslots is None:
+                self.db.session.rollback()
+                continue
+
+            try:
+                nueva_reserva = self._registrar_reserva(timeslots, data)
+                self.db.session.commit()
+            except Exception as e:
+                self.db.session.rollback()
+                raise AppError(f"Error al crear la reserva: {str(e)}")
+
+            self._invalidar_reportes(timeslots)
+            return nueva_reserva
+
+        raise ConflictError("Los bloques encontrados fueron reservados por otra operación; reintentar.")
+
 
     # ESTO ES PELIGROSO: cuando borro una reserva quiero que se liberen los timeslots asociados.
     # def delete(self, reserva_id):
@@ -127,6 +252,7 @@ class ReservaService:
 
             links = ReservaTimeslot.query.filter_by(reserva_id=reserva_id).all()
             timeslot_ids = [link.timeslot_id for link in links]
+            timeslots = []
 
             # Liberar timeslots
             if timeslot_ids:
@@ -137,6 +263,7 @@ class ReservaService:
                 
                 for ts in timeslots:
                     ts.estado = TimeslotEstado.DISPONIBLE
+                self.mapa_repo.actualizar_timeslots(timeslots)
             
             # borrar links
             for link in links:
@@ -146,12 +273,68 @@ class ReservaService:
             reserva.estado = ReservaEstado.CANCELADA
 
             self.db.session.commit()
-            return {"mensaje": "Reserva cancelada y timeslots liberados."}
+            self._invalidar_reportes(timeslots)
 
         except Exception as e:
             self.db.session.rollback()
             raise AppError(f"Error al cancelar la reserva: {str(e)}")
 
+        self.atender_lista_de_espera(timeslots)
+        return {"mensaje": "Reserva cancelada y timeslots liberados."}
+
+    def atender_lista_de_espera(self, timeslots):
+        """
+        Ofrece cada turno liberado a la espera más antigua que lo admite: si
+        pidió reserva automática se le reserva, si no se le avisa.
+
+        Cada turno se resuelve en su propia transacción, después de la que lo
+        liberó: un error acá no deshace la cancelación, solo se registra.
+
+        Returns:
+            int: Cantidad de esperas atendidas
+        """
+        atendidas = 0
+        ahora = datetime.now()
+        for ts in timeslots:
+            if ts.inicio <= ahora:
+                continue
+            try:
+                espera = self.espera_repo.get_primera_para_turno(ts.cancha.club_id, ts.cancha_id, ts.inicio, ts.fin)
+                if espera is None:
+                    continue
+
+                if espera.auto_reservar:
+                    # Solo si el turno sigue libre (otra reserva pudo ganarlo)
+                    if self.timeslot_repo.cambiar_estado_bulk([ts.id], TimeslotEstado.DISPONIBLE, TimeslotEstado.RESERVADO) != 1:
+                        self.db.session.rollback()
+                        continue
+                    self.db.session.expire(ts, ['estado', 'updated_at'])
+                    espera.reserva = self._registrar_reserva([ts], {
+                        'cliente_nombre': espera.cliente_nombre,
+                        'cliente_telefono': espera.cliente_telefono,
+                        'cliente_email': espera.cliente_email,
+                        'fuente': espera.fuente
+                    })
+                    espera.estado = EsperaEstado.ASIGNADA
+                else:
+                    espera.estado = EsperaEstado.NOTIFICADA
+                espera.timeslot = ts
+                espera.atendida_en = datetime.utcnow()
+                self.db.session.flush()
+                evento = evento_espera(espera)
+                self.db.session.commit()
+            except Exception as e:
+                self.db.session.rollback()
+                current_app.logger.warning(f"No se pudo atender la lista de espera del timeslot {ts.id}: {e}")
+                continue
+
+            atendidas += 1
+            if evento["reserva_id"]:
+                self._invalidar_reportes([ts])
+            # El stream arma su primer evento desde la base: no hace falta guardar el frame
+            esperas_broker.publicar(canal_espera(evento["espera_id"]), "espera", evento, recordar=False)
+        return atendidas
+
     def marcar_reserva_pagada(self, reserva_id):
         """
         Marca una reserva como pagada (cambia el estado a PAGADO).
@@ -164,6 +347,7 @@ class ReservaService:
             from app.models.enums import ReservaEstado
             reserva.estado = ReservaEstado.PAGADO
             self.db.session.commit()
+            self._invalidar_reportes([link.timeslot for link in reserva.timeslots])
             return reserva
         except Exception as e:
             self.db.session.rollback()
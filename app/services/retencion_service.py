@@ -0,0 +1,179 @@
+"""
+Retención de turnos y reservas pasados.
+
+Los timeslots se generan todos los días y nada los borraba: la tabla crece
+con canchas × turnos por día y con ella cada consulta. La poda, pensada para
+correr una vez por día (flask podar-historial), hace dos cosas por club:
+
+- Borra los timeslots pasados que nunca se reservaron (libres o bloqueados,
+  sin reserva ni partido) después de 'retencion_libres_dias'.
+- Mueve las reservas pasadas y sus timeslots a 'reserva_archivada' y
+  'timeslot_archivado' después de 'retencion_reservas_dias'; los reportes
+  leen también esas tablas, así que sus resultados no cambian.
+
+Trabaja de a lotes de 'lote' filas, cada uno en su propia transacción y con
+una pausa entre lotes, para no retener locks largos. Si se corta, la
+siguiente corrida sigue desde donde quedó.
+"""
+import time as reloj
+from datetime import date, datetime, time, timedelta
+
+from app.config import Config
+from app.errors import AppError, NotFoundError, ValidationError
+from app.models.club import Club
+from app.repositories.club_repo import ClubRepository
+from app.repositories.disponibilidad_dia_repo import DisponibilidadDiaRepository
+from app.repositories.retencion_repo import RetencionRepository
+
+
+def politica_retencion(club):
+    """
+    Días de retención del club: los propios o, si no los tiene, los de la config.
+
+    Returns:
+        tuple[int, int]: (días de turnos libres, días de reservas)
+    """
+    libres = club.retencion_libres_dias
+    reservas = club.retencion_reservas_dias
+    return (
+        libres if libres is not None else Config.RETENCION_LIBRES_DIAS,
+        reservas if reservas is not None else Config.RETENCION_RESERVAS_DIAS,
+    )
+
+
+class RetencionService:
+    def __init__(self, db):
+        self.db = db
+        self.repo = RetencionRepository()
+        self.club_repo = ClubRepository()
+        self.mapa_repo = DisponibilidadDiaRepository()
+
+    def podar(self, club_id=None, lote=None, pausa=None, dry_run=False, hoy: date = None):
+        """
+        Borra los turnos libres pasados y archiva las reservas pasadas de los
+        clubes según su retención.
+
+        Args:
+            club_id (int, optional): Solo este club (por defecto, todos)
+            lote (int, optional): Filas por transacción (por defecto RETENCION_LOTE)
+            pausa (float, optional): Segundos de espera entre lotes (por defecto RETENCION_PAUSA)
+            dry_run (bool): Solo cuenta lo que se borraría y archivaría
+            hoy (date, optional): Fecha desde la que se cuentan los días (por defecto, hoy)
+
+        Returns:
+            list[dict]: Por club, las fechas de corte y las cantidades borradas y archivadas
+
+        Raises:
+            NotFoundError: Si el club no existe
+            ValidationError: Si el lote o la pausa son inválidos
+        """
+        lote = Config.RETENCION_LOTE if lote is None else lote
+        pausa = Config.RETENCION_PAUSA if pausa is None else pausa
+        if lote < 1:
+            raise ValidationError("El lote debe ser de al menos 1 fila")
+        if pausa < 0:
+            raise ValidationError("La pausa no puede ser negativa")
+
+        if club_id is not None:
+            club = self.club_repo.get_by_id(club_id)
+            if not club:
+                raise NotFoundError("Club no encontrado")
+            clubes = [club]
+        else:
+            clubes = Club.query.order_by(Club.id).all()
+
+        hoy = hoy or date.today()
+        return [self._podar_club(club, hoy, lote, pausa, dry_run) for club in clubes]
+
+    def _podar_club(self, club, hoy, lote, pausa, dry_run):
+        """Aplica la retención a un club (ver podar)."""
+        libres_dias, reservas_dias = politica_retencion(club)
+        libres_antes = datetime.combine(hoy - timedelta(days=libres_dias), time.min)
+        reservas_antes = datetime.combine(hoy - timedelta(days=reservas_dias), time.min)
+        cancha_ids = self.repo.get_cancha_ids(club.id)
+        resultado = {
+            "club_id": club.id,
+            "libres_antes": libres_antes.date().isoformat(),
+            "reservas_antes": reservas_antes.date().isoformat(),
+            "dry_run": dry_run,
+        }
+
+        if dry_run:
+            resultado.update({
+                "timeslots_eliminados": self.repo.contar_timeslots_podables(cancha_ids, libres_antes),
+                "reservas_archivadas": self.repo.contar_reservas_archivables(cancha_ids, reservas_antes),
+                "lotes": 0,
+            })
+            return resultado
+
+        # Primero se archivan las reservas: así los turnos que liberan ya no cuentan como podables
+        reservas, timeslots, lotes_archivo = self._archivar_reservas(cancha_ids, reservas_antes, lote, pausa)
+        eliminados, lotes_poda = self._eliminar_libres(cancha_ids, libres_antes, lote, pausa)
+        resultado.update({
+            "timeslots_eliminados": eliminados,
+            "reservas_archivadas": reservas,
+            "timeslots_archivados": timeslots,
+            "lotes": lotes_archivo + lotes_poda,
+        })
+        return resultado
+
+    def _en_lote(self, operacion):
+        """Ejecuta una operación de escritura y la confirma en su propia transacción."""
+        try:
+            resultado = operacion()
+            self.db.session.commit()
+            return resultado
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al podar el historial: {str(e)}")
+
+    def _archivar_reservas(self, cancha_ids, antes, lote, pausa):
+        """
+        Archiva de a 'lote' reservas recorriéndolas por id.
+
+        Returns:
+            tuple[int, int, int]: (reservas archivadas, timeslots archivados, lotes)
+        """
+        reservas = timeslots = lotes = 0
+        ultimo_id = 0
+        while True:
+            ids = self.repo.get_reservas_archivables(cancha_ids, antes, ultimo_id, lote)
+            if not ids:
+                break
+            if lotes:
+                reloj.sleep(pausa)
+            archivadas, turnos = self._en_lote(lambda: self.repo.archivar_reservas(ids))
+            reservas += archivadas
+            timeslots += turnos
+            lotes += 1
+            ultimo_id = ids[-1]
+            if len(ids) < lote:
+                break
+        return reservas, timeslots, lotes
+
+    def _eliminar_libres(self, cancha_ids, antes, lote, pausa):
+        """
+        Borra de a 'lote' los turnos podables de cada cancha, recorriendo el
+        índice (cancha_id, inicio), y después las máscaras de esos días.
+
+        Returns:
+            tuple[int, int]: (timeslots borrados, lotes)
+        """
+        eliminados = lotes = 0
+        for cancha_id in cancha_ids:
+            despues_de = None
+            while True:
+                turnos = self.repo.get_timeslots_podables(cancha_id, antes, despues_de, lote)
+                if not turnos:
+                    break
+                if lotes:
+                    reloj.sleep(pausa)
+                eliminados += self._en_lote(
+                    lambda: self.repo.eliminar_timeslots([_id for _id, _inicio in turnos], antes)
+                )
+                lotes += 1
+                despues_de = turnos[-1][1]
+                if len(turnos) < lote:
+                    break
+        self._en_lote(lambda: self.mapa_repo.eliminar_anteriores(cancha_ids, antes.date()))
+        return eliminados, lotes
@@ -1,6 +1,7 @@
 from app.repositories.rol_repo import RolRepository
 from app.models.rol import Rol
 from app import db
+from app.services.auth_service import invalidar_claims_usuario
 
 from app.errors import ValidationError, NotFoundError, AppError, ConflictError
 
@@ -54,6 +55,7 @@ class RolService:
         try:
             rol_actualizado = self.rol_repo.update(rol)
             self.db.session.commit()
+            invalidar_claims_usuario()  # el nombre del rol va en los claims de todos sus usuarios
             return rol_actualizado
         except Exception as e:
             self.db.session.rollback()
@@ -68,6 +70,7 @@ class RolService:
         try:
             rol_actualizado = self.rol_repo.delete(rol)
             self.db.session.commit()
+            invalidar_claims_usuario()
             return rol_actualizado
         except Exception as e:
             self.db.session.rollback()
@@ -0,0 +1,312 @@
+"""
+Reservas recurrentes: una serie reserva la misma cancha, el mismo día de la
+semana y horario entre dos fechas, con una Reserva común por ocurrencia.
+
+Los turnos de todas las ocurrencias se resuelven juntos (una consulta), los
+conflictos se detectan sobre el conjunto y los turnos libres se toman con un
+único UPDATE condicional.
+"""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.errors import AppError, ConflictError, NotFoundError, ValidationError
+from app.models.enums import DiaSemana, FuenteReserva, ReservaEstado, SerieEstado, TimeslotEstado
+from app.models.reserva import Reserva
+from app.models.reserva_timeslot import ReservaTimeslot
+from app.models.serie_reserva import SerieReserva
+from app.models.timeslot import Timeslot
+from app.repositories.cancha_repo import CanchaRepository
+from app.repositories.cliente_repo import ClienteRepository
+from app.repositories.serie_reserva_repo import SerieReservaRepository
+from app.repositories.timeslot_repo import TimeslotRepository
+from app.services.disponibilidad_service import DIAS_SEMANA, DisponibilidadService, modo_virtual
+from app.services.reporte_service import invalidar_cache_reportes
+from app.services.reserva_service import ReservaService
+from app.services.timeslot_service import DURACION_TIMESLOT_MINUTOS
+
+MAX_DIAS_SERIE = 366
+MAX_HORAS_SERIE = 6
+
+# Ocurrencias que se pueden cancelar en bloque; las pagadas se conservan
+ESTADOS_CANCELABLES = (ReservaEstado.PENDIENTE, ReservaEstado.CONFIRMADA)
+
+
+def fechas_de_serie(dia, fecha_desde, fecha_hasta):
+    """Fechas entre fecha_desde y fecha_hasta (inclusive) que caen en el día de la semana 'dia'."""
+    fecha = fecha_desde + timedelta(days=(DIAS_SEMANA.index(dia) - fecha_desde.weekday()) % 7)
+    fechas = []
+    while fecha <= fecha_hasta:
+        fechas.append(fecha)
+        fecha += timedelta(days=7)
+    return fechas
+
+
+class SerieReservaService:
+    def __init__(self, db):
+        self.db = db
+        self.repo = SerieReservaRepository()
+        self.cancha_repo = CanchaRepository()
+        self.cliente_repo = ClienteRepository()
+        self.timeslot_repo = TimeslotRepository(db)
+        self.disponibilidad_service = DisponibilidadService(db)
+        self.reserva_service = ReservaService()
+
+    def get_by_id(self, serie_id):
+        serie = self.repo.get_by_id(serie_id)
+        if not serie:
+            raise NotFoundError("Serie de reservas no encontrada")
+        return serie
+
+    def _validar(self, data):
+        for field in ['cancha_id', 'dia', 'hora_inicio', 'fecha_desde', 'fecha_hasta',
+                      'cliente_nombre', 'cliente_email', 'fuente']:
+            if field not in data or not data[field]:
+                raise ValidationError(f"El campo '{field}' es requerido")
+        try:
+            datos = {
+                "cancha_id": int(data['cancha_id']),
+                "dia": DiaSemana(data['dia']),
+                "hora_inicio": datetime.strptime(data['hora_inicio'], '%H:%M').time(),
+                "horas": int(data.get('horas') or 1),
+                "fecha_desde": date.fromisoformat(data['fecha_desde']),
+                "fecha_hasta": date.fromisoformat(data['fecha_hasta']),
+                "fuente": FuenteReserva(data['fuente']),
+            }
+        except (TypeError, ValueError):
+            raise ValidationError("Datos inválidos: 'dia' es LUN..DOM, 'hora_inicio' HH:MM, las fechas "
+                                  "YYYY-MM-DD, 'horas' un entero y 'fuente' WEB, PRESENCIAL o TELEFONICA")
+        if datos["fecha_hasta"] < datos["fecha_desde"]:
+            raise ValidationError("'fecha_hasta' no puede ser anterior a 'fecha_desde'")
+        if (datos["fecha_hasta"] - datos["fecha_desde"]).days >= MAX_DIAS_SERIE:
+            raise ValidationError(f"Una serie no puede abarcar más de {MAX_DIAS_SERIE} días")
+        if not 1 <= datos["horas"] <= MAX_HORAS_SERIE:
+            raise ValidationError(f"'horas' debe estar entre 1 y {MAX_HORAS_SERIE}")
+        return datos
+
+    def create(self, data):
+        """
+        Crea una serie semanal y reserva todas sus ocurrencias en una transacción.
+
+        Campos requeridos: cancha_id, dia (LUN..DOM), hora_inicio (HH:MM), fecha_desde,
+        fecha_hasta, cliente_nombre, cliente_email, fuente.
+        Opcionales: horas (turnos seguidos por ocurrencia, por defecto 1), cliente_telefono,
+        servicios y omitir_conflictos.
+
+        Si alguna ocurrencia tiene un turno ocupado o fuera del horario del club,
+        se rechaza toda la serie con el detalle de los conflictos, salvo que
+        'omitir_conflictos' sea true: en ese caso se reservan las demás.
+
+        Returns:
+            dict: serie, ocurrencias reservadas y conflictos omitidos
+
+        Raises:
+            ValidationError: Si los datos son inválidos
+            NotFoundError: Si la cancha no existe
+            ConflictError: Si hay conflictos (con su detalle) o una reserva concurrente ganó algún turno
+        """
+        datos = self._validar(data)
+        cancha = self.cancha_repo.get_by_id(datos["cancha_id"])
+        if not cancha:
+            raise NotFoundError("Cancha no encontrada")
+
+        duracion = timedelta(minutes=DURACION_TIMESLOT_MINUTOS)
+        cantidad = datos["horas"] * 60 // DURACION_TIMESLOT_MINUTOS
+        ocurrencias = {
+            fecha: [(cancha.id, datetime.combine(fecha, datos["hora_inicio"]) + k * duracion)
+                    for k in range(cantidad)]
+            for fecha in fechas_de_serie(datos["dia"], datos["fecha_desde"], datos["fecha_hasta"])
+        }
+        if not ocurrencias:
+            raise ValidationError(f"El rango de fechas no incluye ningún {datos['dia'].value}")
+
+        try:
+            # Todos los turnos de la serie, en una consulta
+            estados = self.disponibilidad_service.resolver_turnos(
+                cancha, [clave for claves in ocurrencias.values() for clave in claves]
+            )
+
+            libres, conflictos = {}, []
+            for fecha, claves in ocurrencias.items():
+                ocupados = [inicio for cancha_id, inicio in claves if not estados[(cancha_id, inicio)][1]]
+                if ocupados:
+                    conflictos.append({"fecha": fecha.isoformat(),
+                                       "turnos": [inicio.strftime('%H:%M') for inicio in ocupados]})
+                else:
+                    libres[fecha] = claves
+
+            if conflictos and not data.get('omitir_conflictos'):
+                raise ConflictError(
+                    f"{len(conflictos)} de {len(ocurrencias)} ocurrencias tienen turnos ocupados "
+                    "o fuera del horario del club.",
+                    detalle={"conflictos": conflictos}
+                )
+            if not libres:
+                raise ConflictError("Ninguna ocurrencia de la serie tiene sus turnos libres.",
+                                    detalle={"conflictos": conflictos})
+
+            # Tomar todos los turnos libres con un único UPDATE condicional
+            claves_libres = [clave for claves in libres.values() for clave in claves]
+            if modo_virtual():
+                timeslots = self.disponibilidad_service.materializar(claves_libres)
+            else:
+                timeslots = [estados[clave][0] for clave in claves_libres]
+            ids = [ts.id for ts in timeslots]
+            if self.timeslot_repo.cambiar_estado_bulk(ids, TimeslotEstado.DISPONIBLE, TimeslotEstado.RESERVADO) != len(ids):
+                raise ConflictError("Uno o más turnos fueron reservados por otra operación; reintentar.")
+            for ts in timeslots:
+                self.db.session.expire(ts, ['estado', 'updated_at'])
+            por_clave = {(ts.cancha_id, ts.inicio): ts for ts in timeslots}
+
+            cliente = self.cliente_repo.find_or_create_cliente(
+                email=data['cliente_email'],
+                nombre=data['cliente_nombre'],
+                telefono=data.get('cliente_telefono')
+            )
+            serie = self.repo.create(SerieReserva(
+                cancha_id=cancha.id,
+                cliente=cliente,
+                cliente_nombre=data['cliente_nombre'],
+                cliente_telefono=data.get('cliente_telefono'),
+                cliente_email=data['cliente_email'],
+                fuente=datos["fuente"],
+                servicios=data.get('servicios', ''),
+                dia=datos["dia"],
+                hora_inicio=datos["hora_inicio"],
+                horas=datos["horas"],
+                fecha_desde=datos["fecha_desde"],
+                fecha_hasta=datos["fecha_hasta"]
+            ))
+
+            reservas = {
+                fecha: Reserva(
+                    cancha_id=cancha.id,
+                    cliente=cliente,
+                    serie=serie,
+                    cliente_nombre=data['cliente_nombre'],
+                    cliente_telefono=data.get('cliente_telefono'),
+                    cliente_email=data['cliente_email'],
+                    fuente=datos["fuente"],
+                    servicios=data.get('servicios', ''),
+                    precio_total=sum(por_clave[clave].precio for clave in claves)
+                )
+                for fecha, claves in libres.items()
+            }
+            self.db.session.add_all(reservas.values())
+            self.db.session.flush()
+            self.db.session.execute(insert(ReservaTimeslot), [
+                {"reserva_id": reservas[fecha].id, "timeslot_id": por_clave[clave].id}
+                for fecha, claves in libres.items()
+                for clave in claves
+            ])
+            ocurrencias_reservadas = [
+                {
+                    "reserva_id": reservas[fecha].id,
+                    "fecha": fecha.isoformat(),
+                    "inicio": claves[0][1].isoformat(timespec='minutes'),
+                    "fin": por_clave[claves[-1]].fin.isoformat(timespec='minutes'),
+                    "estado": ReservaEstado.PENDIENTE.value,
+                    "precio_total": float(reservas[fecha].precio_total)
+                }
+                for fecha, claves in libres.items()
+            ]
+
+            self.db.session.commit()
+        except AppError:
+            self.db.session.rollback()
+            raise
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al crear la serie de reservas: {str(e)}")
+
+        invalidar_cache_reportes(min(libres), max(libres))
+        return {"serie": serie, "ocurrencias": ocurrencias_reservadas, "conflictos": conflictos}
+
+    def _ocurrencias(self, serie_id):
+        """Ocurrencias con turnos vinculados: reserva_id -> {estado, precio, timeslot_ids, inicio, fin}."""
+        ocurrencias = {}
+        for reserva_id, estado, precio, timeslot_id, inicio, fin in self.repo.get_turnos_de_ocurrencias(serie_id):
+            ocurrencia = ocurrencias.setdefault(reserva_id, {
+                "estado": estado, "precio_total": precio, "timeslot_ids": [], "inicio": inicio, "fin": fin
+            })
+            ocurrencia["timeslot_ids"].append(timeslot_id)
+            ocurrencia["fin"] = max(ocurrencia["fin"], fin)
+        return ocurrencias
+
+    def get_detalle(self, serie_id):
+        """
+        Serie con sus ocurrencias vigentes (las canceladas solo se cuentan).
+
+        Raises:
+            NotFoundError: Si la serie no existe
+        """
+        serie = self.get_by_id(serie_id)
+        ocurrencias = self._ocurrencias(serie_id)
+        return {
+            "serie": serie,
+            "ocurrencias": [
+                {
+                    "reserva_id": reserva_id,
+                    "fecha": o["inicio"].date().isoformat(),
+                    "inicio": o["inicio"].isoformat(timespec='minutes'),
+                    "fin": o["fin"].isoformat(timespec='minutes'),
+                    "estado": o["estado"].value,
+                    "precio_total": float(o["precio_total"]) if o["precio_total"] is not None else None
+                }
+                for reserva_id, o in ocurrencias.items()
+            ],
+            "canceladas": self.repo.contar_canceladas(serie_id)
+        }
+
+    def cancelar(self, serie_id, desde=None):
+        """
+        Cancela de una vez las ocurrencias restantes de la serie (las que
+        empiezan desde 'desde', por defecto ahora) y libera sus turnos.
+        Las ocurrencias pagadas se conservan.
+
+        Returns:
+            dict: Cantidad de reservas canceladas, turnos liberados y pagadas conservadas
+
+        Raises:
+            NotFoundError: Si la serie no existe
+            ValidationError: Si la serie ya estaba cancelada
+        """
+        serie = self.get_by_id(serie_id)
+        if serie.estado == SerieEstado.CANCELADA:
+            raise ValidationError("La serie ya está cancelada")
+        desde = desde or datetime.now()
+
+        try:
+            restantes = {rid: o for rid, o in self._ocurrencias(serie_id).items() if o["inicio"] >= desde}
+            a_cancelar = {rid: o for rid, o in restantes.items() if o["estado"] in ESTADOS_CANCELABLES}
+            reserva_ids = list(a_cancelar)
+            timeslot_ids = [ts_id for o in a_cancelar.values() for ts_id in o["timeslot_ids"]]
+
+            liberados = self.timeslot_repo.cambiar_estado_bulk(
+                timeslot_ids, TimeslotEstado.RESERVADO, TimeslotEstado.DISPONIBLE
+            )
+            if reserva_ids:
+                ReservaTimeslot.query.filter(ReservaTimeslot.reserva_id.in_(reserva_ids))\
+                                     .delete(synchronize_session=False)
+                Reserva.query.filter(Reserva.id.in_(reserva_ids))\
+                             .update({Reserva.estado: ReservaEstado.CANCELADA, Reserva.updated_at: datetime.utcnow()},
+                                     synchronize_session=False)
+            serie.estado = SerieEstado.CANCELADA
+
+            self.db.session.commit()
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al cancelar la serie de reservas: {str(e)}")
+
+        if a_cancelar:
+            inicios = [o["inicio"].date() for o in a_cancelar.values()]
+            invalidar_cache_reportes(min(inicios), max(inicios))
+            self.reserva_service.atender_lista_de_espera(
+                Timeslot.query.filter(Timeslot.id.in_(timeslot_ids)).order_by(Timeslot.inicio).all()
+            )
+        return {
+            "serie_id": serie_id,
+            "reservas_canceladas": len(reserva_ids),
+            "timeslots_liberados": liberados,
+            "pagadas_conservadas": len(restantes) - len(a_cancelar)
+        }
@@ -2,6 +2,7 @@ from app.repositories.timeslot_repo import TimeslotRepository
 from app.models.timeslot import Timeslot, TimeslotEstado
 from app import db
 from app.repositories.club_repo import ClubRepository
+from app.services.precio_service import PrecioService
 from datetime import datetime, timedelta, date, time
 from collections import defaultdict
 
@@ -14,6 +15,7 @@ class TimeslotService:
         self.db = db
         self.timeslot_repo = TimeslotRepository(db)
         self.club_repo = ClubRepository()
+        self.precio_service = PrecioService(db)
 
     def get_all(self):
         """Retorna todos los timeslots."""
@@ -25,7 +27,18 @@ class TimeslotService:
     
     def get_disponibilidad_por_club_y_fecha(self, club_id: int, fecha: date):
         """
-        Obtiene la disponibilidad de canchas agrupada por horario para un club y fecha.
+        Obtiene la disponibilidad de canchas agrupada por horario para un club y fecha,
+        según DISPONIBILIDAD_MODO (timeslots guardados o calculada desde las reglas).
+        """
+        from app.services.disponibilidad_service import DisponibilidadService, modo_virtual
+        
+        if modo_virtual():
+            return DisponibilidadService(self.db).get_disponibilidad_virtual(club_id, fecha)
+        return self.get_disponibilidad_materializada(club_id, fecha)
+    
+    def get_disponibilidad_materializada(self, club_id: int, fecha: date):
+        """
+        Obtiene la disponibilidad de canchas agrupada por horario a partir de los timeslots guardados.
         
         Returns:
             dict: {
@@ -131,6 +144,7 @@ class TimeslotService:
                 nuevos_timeslots.extend(timeslots_dia)
         
         if nuevos_timeslots:
+            self.precio_service.asignar_precios(nuevos_timeslots, {cancha.id: cancha})
             self.timeslot_repo.guardar_bulk(nuevos_timeslots)
             if auto_commit:
                 db.session.commit()
@@ -196,6 +210,7 @@ class TimeslotService:
         if not nuevos_timeslots_totales:
             raise ValueError("No se generaron nuevos timeslots (probablemente ya existían).")
 
+        self.precio_service.asignar_precios(nuevos_timeslots_totales, {c.id: c for c in canchas})
         self.timeslot_repo.guardar_bulk(nuevos_timeslots_totales)
         db.session.commit()
         return {"mensaje": f"Se generaron y guardaron {len(nuevos_timeslots_totales)} nuevos timeslots."}
@@ -272,7 +287,7 @@ class TimeslotService:
                     cancha_id=cancha.id,
                     inicio=hora_actual,
                     fin=hora_fin_timeslot,
-                    precio=cancha.precio_hora  # Usar el precio de la cancha por defecto
+                    precio=cancha.precio_hora  # Precio por defecto; las reglas de precio se aplican al guardar
                 )
                 timeslots_del_dia.append(ts)
             else:
@@ -1,9 +1,12 @@
 from app.repositories.torneos.equipo_repo import EquipoRepository
+from app.repositories.timeslot_repo import TimeslotRepository
+from app.services.torneos.posicion_service import PosicionService
 from app.models.equipo import Equipo
 from app import db
 from datetime import datetime
 
 from app.errors import NotFoundError, ValidationError, AppError, ConflictError
+from app.models.enums import TimeslotEstado
 
 class EquipoService:
     """
@@ -16,6 +19,8 @@ class EquipoService:
         """
         self.db = db_session
         self.equipo_repo = EquipoRepository()
+        self.timeslot_repo = TimeslotRepository(db_session)
+        self.posicion_service = PosicionService(db_session)
     
     def get_all(self):
         """
@@ -56,6 +61,24 @@ class EquipoService:
             raise NotFoundError("No se encontraron equipos para este torneo")
         return equipos
     
+    def get_partidos(self, equipo_id, page=None, per_page=None):
+        """
+        Obtiene el historial de partidos de un equipo, paginado
+        
+        Args:
+            equipo_id (int): ID del equipo
+            page (int, optional): Página, desde 1
+            per_page (int, optional): Partidos por página (por defecto 20, máximo 100)
+            
+        Returns:
+            dict: { "data": [Partido...], "page": 1, "per_page": 20, "total": 38 }
+        """
+        self.get_by_id(equipo_id)
+        page = max(page or 1, 1)
+        per_page = min(max(per_page or 20, 1), 100)
+        partidos, total = self.equipo_repo.get_partidos_paginados(equipo_id, page, per_page)
+        return {"data": partidos, "page": page, "per_page": per_page, "total": total}
+    
     def create(self, equipo_data):
         """
         Crea un nuevo equipo
@@ -92,11 +115,15 @@ class EquipoService:
             # Guardar el equipo en la base de datos
             equipo = self.equipo_repo.create(equipo)
             self.db.session.commit()
-            return equipo
             
         except Exception as e:
             self.db.session.rollback()
             raise AppError(f"Error al crear el equipo: {str(e)}")
+        
+        # La tabla en vivo incluye al equipo nuevo
+        self.posicion_service.publicar_cambios([equipo.torneo_id])
+        # Releer con los totales de partidos calculados
+        return self.equipo_repo.get_by_id(equipo.id)
     
     def update(self, equipo_id, equipo_data):
         """
@@ -137,17 +164,22 @@ class EquipoService:
         
         try:
             # Actualizar el equipo
-            equipo_actualizado = self.equipo_repo.update(equipo, equipo_data)
+            self.equipo_repo.update(equipo, equipo_data)
             self.db.session.commit()
-            return equipo_actualizado
             
         except Exception as e:
             self.db.session.rollback()
             raise AppError(f"Error al actualizar el equipo: {str(e)}")
+        
+        # La tabla en vivo muestra el nombre del equipo
+        self.posicion_service.publicar_cambios([equipo.torneo_id])
+        return self.equipo_repo.get_by_id(equipo_id)
     
     def delete(self, equipo_id):
         """
-        Elimina un equipo
+        Elimina un equipo. La base elimina también sus partidos, así que sus
+        turnos se liberan y la tabla de posiciones del torneo se recalcula en
+        la misma transacción.
         
         Args:
             equipo_id (int): ID del equipo a eliminar
@@ -159,10 +191,20 @@ class EquipoService:
         if not equipo:
             raise NotFoundError("Equipo no encontrado")
         
+        torneo_id = equipo.torneo_id
         try:
+            # Liberar los turnos reservados para los partidos que se borran con el equipo
+            self.timeslot_repo.cambiar_estado_bulk(
+                self.equipo_repo.get_timeslot_ids_de_partidos(equipo_id),
+                TimeslotEstado.RESERVADO, TimeslotEstado.DISPONIBLE
+            )
             self.equipo_repo.delete(equipo)
+            self.db.session.flush()
+            self.posicion_service.recalcular(torneo_id, auto_commit=False)
             self.db.session.commit()
             
         except Exception as e:
             self.db.session.rollback()
             raise AppError(f"Error al eliminar el equipo: {str(e)}")
+        
+        self.posicion_service.publicar_cambios([torneo_id])
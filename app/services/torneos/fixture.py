@@ -0,0 +1,72 @@
+"""
+Generación de fixtures (emparejamientos por ronda) sin acceso a base de datos.
+"""
+
+
+def generar_todos_contra_todos(equipo_ids, ida_y_vuelta=False):
+    """
+    Genera un fixture de todos contra todos con el método del círculo.
+
+    Se fija el primer equipo y el resto rota una posición por ronda; con una
+    cantidad impar de equipos se agrega un "libre" (None) y quien le toca
+    descansa esa ronda. La localía del equipo fijo se alterna por ronda.
+
+    Args:
+        equipo_ids (list[int]): IDs de los equipos participantes
+        ida_y_vuelta (bool): Si es True agrega la segunda vuelta con la localía invertida
+
+    Returns:
+        list[tuple[int, int, int]]: Tuplas (ronda, equipo_local_id, equipo_visitante_id),
+        con rondas numeradas desde 1
+    """
+    equipos = list(equipo_ids)
+    if len(equipos) % 2:
+        equipos.append(None)
+
+    n = len(equipos)
+    mitad = n // 2
+    partidos = []
+
+    for ronda in range(1, n):
+        for i in range(mitad):
+            local, visitante = equipos[i], equipos[n - 1 - i]
+            if local is None or visitante is None:
+                continue
+            if i == 0 and ronda % 2 == 0:
+                local, visitante = visitante, local
+            partidos.append((ronda, local, visitante))
+        # Rotación: el primero queda fijo, el último pasa a la segunda posición
+        equipos = [equipos[0], equipos[-1]] + equipos[1:-1]
+
+    if ida_y_vuelta:
+        rondas_ida = n - 1
+        partidos += [(ronda + rondas_ida, visitante, local) for ronda, local, visitante in partidos]
+
+    return partidos
+
+
+def emparejar_eliminacion(equipo_ids):
+    """
+    Arma una ronda de eliminación directa.
+
+    Si la cantidad de equipos no es potencia de 2, los primeros de la lista
+    pasan directo a la siguiente ronda (byes) hasta completar el cuadro.
+    El resto se empareja primero contra último.
+
+    Args:
+        equipo_ids (list[int]): IDs de los equipos en orden de siembra
+
+    Returns:
+        tuple[list[tuple[int, int]], list[int]]: Partidos (local, visitante)
+        y equipos que pasan de ronda sin jugar
+    """
+    equipos = list(equipo_ids)
+    cuadro = 1
+    while cuadro < len(equipos):
+        cuadro *= 2
+
+    byes = cuadro - len(equipos)
+    libres, juegan = equipos[:byes], equipos[byes:]
+    mitad = len(juegan) // 2
+    partidos = [(juegan[i], juegan[len(juegan) - 1 - i]) for i in range(mitad)]
+    return partidos, libres
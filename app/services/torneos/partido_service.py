@@ -1,10 +1,31 @@
 from app.repositories.torneos.partido_repo import PartidoRepository
+from app.repositories.disponibilidad_dia_repo import DisponibilidadDiaRepository
+from app.services.torneos.posicion_service import PosicionService
 from app.models.partido import Partido
+from app.models.enums import TimeslotEstado
 from app import db
 from datetime import datetime
 
 from app.errors import ValidationError, NotFoundError, AppError
 
+def _validar_goles(goles_equipo1, goles_equipo2):
+    """Valida que los goles sean enteros no negativos"""
+    if not isinstance(goles_equipo1, int) or not isinstance(goles_equipo2, int):
+        raise ValidationError("Los goles deben ser números enteros")
+
+    if goles_equipo1 < 0 or goles_equipo2 < 0:
+        raise ValidationError("Los goles no pueden ser negativos")
+
+
+def _ganador(partido, goles_equipo1, goles_equipo2):
+    """Devuelve el ID del equipo ganador o None si es empate"""
+    if goles_equipo1 > goles_equipo2:
+        return partido.equipo1_id
+    if goles_equipo2 > goles_equipo1:
+        return partido.equipo2_id
+    return None
+
+
 class PartidoService:
     """
     Servicio para la gestión de partidos en torneos
@@ -16,6 +37,8 @@ class PartidoService:
         """
         self.db = db
         self.partido_repo = PartidoRepository()
+        self.mapa_repo = DisponibilidadDiaRepository()
+        self.posicion_service = PosicionService(db)
     
     def get_all(self):
         """
@@ -84,8 +107,23 @@ class PartidoService:
                 raise ValidationError("Un equipo no puede jugar contra sí mismo")
         
         try:
+            # Si cambian equipos o goles, sacar el resultado anterior de la tabla y volver a sumarlo
+            afecta_tabla = any(k in partido_data for k in ('torneo_id', 'equipo1_id', 'equipo2_id', 'goles_equipo1', 'goles_equipo2'))
+            if afecta_tabla:
+                self.posicion_service.revertir_resultado(partido)
+
             partido_actualizado = self.partido_repo.update(partido, partido_data)
+
+            if afecta_tabla:
+                self.db.session.flush()
+                self.posicion_service.aplicar_resultado(
+                    partido_actualizado,
+                    partido_actualizado.goles_equipo1,
+                    partido_actualizado.goles_equipo2
+                )
             self.db.session.commit()
+            if afecta_tabla:
+                self.posicion_service.publicar_cambios([partido_actualizado.torneo_id], [partido_actualizado])
             return partido_actualizado
             
         except Exception as e:
@@ -94,7 +132,9 @@ class PartidoService:
     
     def registrar_resultado(self, partido_id, data):
         """
-        Registra o actualiza el resultado de un partido
+        Registra o actualiza el resultado de un partido.
+        La tabla de posiciones se actualiza en la misma transacción aplicando
+        la diferencia entre el resultado anterior (si lo había) y el nuevo.
         """
         partido = self.partido_repo.get_by_id(partido_id)
 
@@ -106,31 +146,86 @@ class PartidoService:
 
         goles_equipo1 = data['goles_equipo1']
         goles_equipo2 = data['goles_equipo2']
-        
-        if not isinstance(goles_equipo1, int) or not isinstance(goles_equipo2, int):
-            raise ValidationError("Los goles deben ser números enteros")
-        
-        if goles_equipo1 < 0 or goles_equipo2 < 0:
-            raise ValidationError("Los goles no pueden ser negativos")
+        _validar_goles(goles_equipo1, goles_equipo2)
         
         try:
+            self.posicion_service.revertir_resultado(partido)
+
             partido.goles_equipo1 = goles_equipo1
             partido.goles_equipo2 = goles_equipo2
-        
-            if goles_equipo1 > goles_equipo2:
-                partido.ganador_id = partido.equipo1_id
-            elif goles_equipo2 > goles_equipo1:
-                partido.ganador_id = partido.equipo2_id
-            else:
-                partido.ganador_id = None
+            partido.ganador_id = _ganador(partido, goles_equipo1, goles_equipo2)
+
+            self.posicion_service.aplicar_resultado(partido, goles_equipo1, goles_equipo2)
             
             self.db.session.commit()
+            self.posicion_service.publicar_cambios([partido.torneo_id], [partido])
             return partido
             
         except Exception as e:
             self.db.session.rollback()
             raise AppError(f"Error al registrar el resultado: {str(e)}")
     
+    def registrar_resultados(self, data):
+        """
+        Registra varios resultados en una sola transacción (por ejemplo, una
+        fecha completa del torneo).
+
+        Valida todos los resultados antes de tocar la base, los guarda con un
+        único executemany y recalcula la tabla de posiciones una sola vez por
+        torneo afectado al final.
+
+        Args:
+            data (dict): {"resultados": [{"partido_id": 1, "goles_equipo1": 2, "goles_equipo2": 1}, ...]}
+
+        Returns:
+            list[Partido]: Partidos actualizados
+        """
+        resultados = (data or {}).get('resultados')
+        if not isinstance(resultados, list) or not resultados:
+            raise ValidationError("'resultados' debe ser una lista con al menos un resultado")
+
+        por_partido = {}
+        for i, resultado in enumerate(resultados):
+            if not isinstance(resultado, dict) or not resultado.get('partido_id'):
+                raise ValidationError(f"El resultado #{i + 1} no tiene 'partido_id'")
+            if 'goles_equipo1' not in resultado or 'goles_equipo2' not in resultado:
+                raise ValidationError(f"Se requieren los goles de ambos equipos (partido {resultado['partido_id']})")
+            _validar_goles(resultado['goles_equipo1'], resultado['goles_equipo2'])
+            if resultado['partido_id'] in por_partido:
+                raise ValidationError(f"El partido {resultado['partido_id']} está repetido")
+            por_partido[resultado['partido_id']] = resultado
+
+        partidos = self.partido_repo.get_by_ids(list(por_partido))
+        faltantes = set(por_partido) - {p.id for p in partidos}
+        if faltantes:
+            raise NotFoundError(f"Partidos no encontrados: {', '.join(str(i) for i in sorted(faltantes))}")
+
+        try:
+            filas = []
+            for partido in partidos:
+                resultado = por_partido[partido.id]
+                g1, g2 = resultado['goles_equipo1'], resultado['goles_equipo2']
+                filas.append({
+                    "b_id": partido.id,
+                    "goles_equipo1": g1,
+                    "goles_equipo2": g2,
+                    "ganador_id": _ganador(partido, g1, g2)
+                })
+
+            self.partido_repo.actualizar_resultados_bulk(filas)
+            for torneo_id in {p.torneo_id for p in partidos}:
+                self.posicion_service.recalcular(torneo_id, auto_commit=False)
+            self.db.session.commit()
+
+            # Releer en una sola consulta (el commit expira las instancias)
+            partidos = self.partido_repo.get_by_ids(list(por_partido))
+            self.posicion_service.publicar_cambios([p.torneo_id for p in partidos], partidos)
+            return partidos
+
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al registrar los resultados: {str(e)}")
+
     def delete(self, partido_id):
         """
         Elimina un partido
@@ -140,8 +235,15 @@ class PartidoService:
             raise NotFoundError("Partido no encontrado")
         
         try:
+            self.posicion_service.revertir_resultado(partido)
+            if partido.timeslot:
+                # Liberar el turno que se había reservado para el partido
+                partido.timeslot.estado = TimeslotEstado.DISPONIBLE
+                self.mapa_repo.actualizar_timeslots([partido.timeslot])
+            torneo_id = partido.torneo_id
             self.partido_repo.delete(partido)
             self.db.session.commit()
+            self.posicion_service.publicar_cambios([torneo_id])
             return {"message": "Partido eliminado exitosamente"}
             
         except Exception as e:
@@ -0,0 +1,185 @@
+from flask import current_app
+from app.repositories.torneos.posicion_repo import PosicionRepository
+from app.pubsub import Broker
+from app.config import Config
+
+from app.errors import AppError
+
+PUNTOS_VICTORIA = 3
+PUNTOS_EMPATE = 1
+
+# Broker en memoria para la tabla en vivo (un canal por torneo)
+posiciones_broker = Broker(max_pendientes=Config.SSE_MAX_PENDIENTES)
+
+
+def canal_torneo(torneo_id):
+    """Nombre del canal de eventos de un torneo"""
+    return f"torneo:{torneo_id}"
+
+
+def _deltas_equipo(goles_favor, goles_contra):
+    """Calcula la contribución de un partido a la fila de un equipo."""
+    gano = goles_favor > goles_contra
+    empato = goles_favor == goles_contra
+    return {
+        "pj": 1,
+        "pg": 1 if gano else 0,
+        "pe": 1 if empato else 0,
+        "pp": 0 if gano or empato else 1,
+        "gf": goles_favor,
+        "gc": goles_contra,
+        "puntos": PUNTOS_VICTORIA if gano else (PUNTOS_EMPATE if empato else 0)
+    }
+
+
+def _fila_a_dict(fila):
+    """Convierte una fila de posiciones al formato de TablaPosicionesSchema."""
+    return {
+        "id": fila.id,
+        "nombre": fila.nombre,
+        "PJ": fila.pj,
+        "PG": fila.pg,
+        "PE": fila.pe,
+        "PP": fila.pp,
+        "GF": fila.gf,
+        "GC": fila.gc,
+        "Puntos": fila.puntos
+    }
+
+
+class PosicionService:
+    """
+    Servicio para mantener la tabla de posiciones persistida de los torneos
+    """
+
+    def __init__(self, db):
+        """
+        Inicializa el servicio con la sesión de base de datos
+        """
+        self.db = db
+        self.posicion_repo = PosicionRepository()
+
+    def aplicar_resultado(self, partido, goles_equipo1, goles_equipo2, signo=1):
+        """
+        Suma (signo=1) o resta (signo=-1) el resultado de un partido a la tabla.
+        No hace commit: se ejecuta dentro de la transacción de quien lo llama.
+
+        Si el partido no tiene resultado (goles en None) no hace nada.
+        """
+        if goles_equipo1 is None or goles_equipo2 is None:
+            return
+
+        for equipo_id, favor, contra in (
+            (partido.equipo1_id, goles_equipo1, goles_equipo2),
+            (partido.equipo2_id, goles_equipo2, goles_equipo1),
+        ):
+            deltas = {k: v * signo for k, v in _deltas_equipo(favor, contra).items()}
+            self.posicion_repo.incrementar(partido.torneo_id, equipo_id, deltas)
+
+    def revertir_resultado(self, partido):
+        """Descuenta de la tabla el resultado actualmente guardado en el partido."""
+        self.aplicar_resultado(partido, partido.goles_equipo1, partido.goles_equipo2, signo=-1)
+
+    def get_tabla(self, torneo_id):
+        """
+        Obtiene la tabla de posiciones persistida de un torneo
+
+        Returns:
+            list[dict]: Filas con id, nombre, PJ, PG, PE, PP, GF, GC y Puntos
+        """
+        return [_fila_a_dict(fila) for fila in self.posicion_repo.get_tabla(torneo_id)]
+
+    def get_tabla_vigente(self, torneo_id):
+        """
+        Devuelve la tabla según TABLA_POSICIONES_MODO: la persistida
+        ('persistida', por defecto) o la calculada desde los partidos ('agregada').
+        """
+        if Config.TABLA_POSICIONES_MODO == 'agregada':
+            return self.calcular_tabla(torneo_id)
+        return self.get_tabla(torneo_id)
+
+    def frame_posiciones(self, torneo_id):
+        """
+        Devuelve el último evento SSE 'posiciones' del torneo; si no hay uno
+        guardado, o tiene más de SSE_FRAME_TTL segundos, calcula la tabla una
+        vez y lo deja guardado para los demás. El vencimiento acota cuánto puede
+        servir un worker una tabla que cambió en otro.
+        """
+        canal = canal_torneo(torneo_id)
+        frame = posiciones_broker.ultimo(canal, "posiciones", max_edad=Config.SSE_FRAME_TTL)
+        if frame is None:
+            frame = posiciones_broker.recordar(canal, "posiciones", self.get_tabla_vigente(torneo_id))
+        return frame
+
+    def publicar_cambios(self, torneo_ids, partidos=()):
+        """
+        Publica los resultados y la tabla actualizada de cada torneo afectado.
+        Se llama después del commit; la tabla se calcula una vez por torneo
+        y solo si hay espectadores conectados.
+
+        Un error al publicar no afecta a la operación ya confirmada.
+        """
+        for torneo_id in set(torneo_ids):
+            canal = canal_torneo(torneo_id)
+            try:
+                if not posiciones_broker.suscriptores(canal):
+                    # Nadie escuchando: descartar lo guardado para no servir una tabla vieja
+                    posiciones_broker.olvidar(canal)
+                    continue
+                for partido in partidos:
+                    if partido.torneo_id == torneo_id:
+                        posiciones_broker.publicar(canal, "resultado", {
+                            "partido_id": partido.id,
+                            "equipo1_id": partido.equipo1_id,
+                            "equipo2_id": partido.equipo2_id,
+                            "goles_equipo1": partido.goles_equipo1,
+                            "goles_equipo2": partido.goles_equipo2,
+                            "ganador_id": partido.ganador_id
+                        })
+                posiciones_broker.publicar(canal, "posiciones", self.get_tabla_vigente(torneo_id))
+            except Exception as e:
+                posiciones_broker.olvidar(canal)
+                current_app.logger.warning(f"No se pudo publicar la tabla del torneo {torneo_id}: {e}")
+
+    def calcular_tabla(self, torneo_id):
+        """
+        Calcula la tabla de posiciones desde los partidos con una única
+        consulta agregada, sin usar la tabla persistida.
+
+        Returns:
+            list[dict]: Filas con id, nombre, PJ, PG, PE, PP, GF, GC y Puntos
+        """
+        filas = self.posicion_repo.get_tabla_agregada(torneo_id, PUNTOS_VICTORIA, PUNTOS_EMPATE)
+        return [_fila_a_dict(fila) for fila in filas]
+
+    def recalcular(self, torneo_id, auto_commit=True):
+        """
+        Reconstruye desde cero la tabla persistida de un torneo a partir de
+        la consulta agregada sobre sus partidos.
+
+        Returns:
+            int: Cantidad de filas de posiciones generadas
+        """
+        try:
+            filas = [
+                fila for fila in self.posicion_repo.get_tabla_agregada(torneo_id, PUNTOS_VICTORIA, PUNTOS_EMPATE)
+                if fila.pj
+            ]
+
+            self.posicion_repo.delete_by_torneo(torneo_id)
+            self.posicion_repo.guardar_bulk([
+                {
+                    "torneo_id": torneo_id,
+                    "equipo_id": fila.id,
+                    **{k: getattr(fila, k) for k in ("pj", "pg", "pe", "pp", "gf", "gc", "puntos")}
+                }
+                for fila in filas
+            ])
+
+            if auto_commit:
+                self.db.session.commit()
+            return len(filas)
+
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al recalcular la tabla de posiciones: {str(e)}")
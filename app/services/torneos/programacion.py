@@ -0,0 +1,80 @@
+"""
+Asignación de partidos a timeslots (algoritmo goloso) sin acceso a base de datos.
+"""
+from bisect import bisect_left
+from datetime import timedelta
+
+
+class _SiguienteLibre:
+    """
+    Conjunto disjunto "siguiente índice libre": find(i) devuelve el menor
+    índice >= i que todavía no fue usado, en tiempo casi constante.
+    """
+
+    def __init__(self, n):
+        self.padre = list(range(n + 1))  # n es el centinela "no hay más"
+
+    def find(self, i):
+        raiz = i
+        while self.padre[raiz] != raiz:
+            raiz = self.padre[raiz]
+        while self.padre[i] != raiz:
+            self.padre[i], i = raiz, self.padre[i]
+        return raiz
+
+    def usar(self, i):
+        self.padre[i] = i + 1
+
+
+def asignar_timeslots(partidos, timeslots, dias_descanso=0, fechas_ocupadas=None):
+    """
+    Asigna a cada partido el primer timeslot libre que respete las restricciones.
+
+    Los partidos se procesan en el orden recibido (por ronda) y cada equipo
+    avanza cronológicamente: un partido nunca queda antes que uno anterior
+    de cualquiera de sus equipos.
+
+    Restricciones:
+    - Cada timeslot se usa una sola vez.
+    - Un equipo juega como máximo un partido por día y, entre dos partidos,
+      descansa al menos 'dias_descanso' días completos.
+
+    Args:
+        partidos (list[tuple[int, int, int]]): (partido_id, equipo1_id, equipo2_id) en orden de ronda
+        timeslots (list[tuple[int, datetime]]): (timeslot_id, inicio) ordenados por inicio
+        dias_descanso (int): Días libres mínimos entre partidos de un mismo equipo
+        fechas_ocupadas (dict[int, set[date]]): Fechas en que cada equipo ya tiene partido programado
+
+    Returns:
+        tuple[dict[int, int], list[int]]: Asignación partido_id -> timeslot_id
+        y partidos que no pudieron ubicarse
+    """
+    fechas_ocupadas = {e: set(f) for e, f in (fechas_ocupadas or {}).items()}
+    fechas = [inicio.date() for _id, inicio in timeslots]
+    libres = _SiguienteLibre(len(timeslots))
+    separacion = timedelta(days=dias_descanso + 1)
+    ultima_fecha = {}
+    asignados, sin_asignar = {}, []
+
+    def choca(equipo_id, fecha):
+        return any(abs((fecha - otra).days) <= dias_descanso for otra in fechas_ocupadas.get(equipo_id, ()))
+
+    for partido_id, equipo1_id, equipo2_id in partidos:
+        anteriores = [ultima_fecha[e] + separacion for e in (equipo1_id, equipo2_id) if e in ultima_fecha]
+        desde = bisect_left(fechas, max(anteriores)) if anteriores else 0
+
+        i = libres.find(desde)
+        while i < len(timeslots) and (choca(equipo1_id, fechas[i]) or choca(equipo2_id, fechas[i])):
+            i = libres.find(i + 1)
+
+        if i >= len(timeslots):
+            sin_asignar.append(partido_id)
+            continue
+
+        libres.usar(i)
+        asignados[partido_id] = timeslots[i][0]
+        for equipo_id in (equipo1_id, equipo2_id):
+            ultima_fecha[equipo_id] = fechas[i]
+            fechas_ocupadas.setdefault(equipo_id, set()).add(fechas[i])
+
+    return asignados, sin_asignar
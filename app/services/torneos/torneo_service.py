@@ -1,10 +1,18 @@
 from app.repositories.torneos.torneo_repo import TorneoRepository
+from app.repositories.torneos.partido_repo import PartidoRepository
+from app.services.torneos.posicion_service import PosicionService, posiciones_broker, canal_torneo
+from app.services.torneos.fixture import generar_todos_contra_todos, emparejar_eliminacion
+from app.services.torneos.programacion import asignar_timeslots
+from app.repositories.timeslot_repo import TimeslotRepository
+from app.services.disponibilidad_service import DisponibilidadService, modo_virtual
 from app.models.torneo import Torneo
+from app.schemas.torneos.torneo_schema import EXPANSIONES_TORNEO
 from app import db
-from datetime import datetime, date
-from app.models.enums import TorneoEstado
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, date, timedelta
+from app.models.enums import TorneoEstado, FormatoFixture, TimeslotEstado
 
-from app.errors import ValidationError, NotFoundError, AppError
+from app.errors import ValidationError, NotFoundError, ConflictError, AppError
 
 def _parse_date(date_string, field_name):
     """Helper interno para convertir string YYYY-MM-DD a objeto date."""
@@ -15,16 +23,34 @@ def _parse_date(date_string, field_name):
     except ValueError:
         raise ValidationError(f"Formato de fecha inválido para '{field_name}'. Usar YYYY-MM-DD.")
 
+def parse_expand(expand_str):
+    """
+    Convierte el parámetro 'expand' (ej: "club,equipos") en una tupla de relaciones válidas.
+    """
+    if not expand_str:
+        return ()
+    expand = tuple(dict.fromkeys(e.strip().lower() for e in expand_str.split(',') if e.strip()))
+    invalidas = [e for e in expand if e not in EXPANSIONES_TORNEO]
+    if invalidas:
+        raise ValidationError(
+            f"Valor de 'expand' inválido: {', '.join(invalidas)}. Opciones: {', '.join(EXPANSIONES_TORNEO)}"
+        )
+    return expand
+
 class TorneoService:
     def __init__(self, db):
         self.db = db
         self.torneo_repo = TorneoRepository()
+        self.partido_repo = PartidoRepository()
+        self.timeslot_repo = TimeslotRepository(db)
+        self.disponibilidad_service = DisponibilidadService(db)
+        self.posicion_service = PosicionService(db)
     
-    def get_all(self):
-        return self.torneo_repo.get_all()
+    def get_all(self, expand=None):
+        return self.torneo_repo.get_all(expand)
     
-    def get_by_id(self, torneo_id):
-        torneo = self.torneo_repo.get_by_id(torneo_id)
+    def get_by_id(self, torneo_id, expand=None):
+        torneo = self.torneo_repo.get_by_id(torneo_id, expand)
         if not torneo:
             raise NotFoundError("Torneo no encontrado")
         return torneo
@@ -35,30 +61,30 @@ class TorneoService:
             raise NotFoundError("No se encontraron equipos para el torneo")
         return equipos
 
-    def get_torneos_activos(self):
-        torneos_activos = self.torneo_repo.get_torneos_activos()
+    def get_torneos_activos(self, expand=None):
+        torneos_activos = self.torneo_repo.get_torneos_activos(expand)
         if not torneos_activos:
             raise NotFoundError("No se encontraron torneos activos")
         return torneos_activos
 
-    def get_torneos_por_fecha(self, fecha_inicio_str, fecha_fin_str=None):
+    def get_torneos_por_fecha(self, fecha_inicio_str, fecha_fin_str=None, expand=None):
         fecha_inicio = _parse_date(fecha_inicio_str, "fecha_inicio")
         fecha_fin = _parse_date(fecha_fin_str, "fecha_fin")
 
         if not fecha_inicio:
             raise ValidationError("El parámetro 'fecha_inicio' es requerido.")
 
-        torneo_por_fecha = self.torneo_repo.get_torneos_por_fecha(fecha_inicio, fecha_fin)
+        torneo_por_fecha = self.torneo_repo.get_torneos_por_fecha(fecha_inicio, fecha_fin, expand)
         if not torneo_por_fecha:
             raise NotFoundError("No se encontraron torneos para esta(s) fecha(s)")
         return torneo_por_fecha
     
-    def get_by_club(self, club_id):
+    def get_by_club(self, club_id, expand=None):
         """Obtiene todos los torneos de un club específico."""
         if not club_id:
             raise ValidationError("El parámetro 'club_id' es requerido")
         
-        torneos = self.torneo_repo.get_by_club(club_id)
+        torneos = self.torneo_repo.get_by_club(club_id, expand)
         return torneos
     
     def create(self, torneo_data):
@@ -143,8 +169,14 @@ class TorneoService:
         torneo = self.get_by_id(torneo_id)
         
         try:
+            # Liberar los turnos reservados para los partidos del torneo
+            self.timeslot_repo.cambiar_estado_bulk(
+                [p.timeslot_id for p in torneo.partidos if p.timeslot_id],
+                TimeslotEstado.RESERVADO, TimeslotEstado.DISPONIBLE
+            )
             self.torneo_repo.delete(torneo)
             self.db.session.commit()
+            posiciones_broker.olvidar(canal_torneo(torneo_id))
             return True
         except Exception as e:
             self.db.session.rollback()
@@ -191,48 +223,222 @@ class TorneoService:
 
     def get_tabla_posiciones(self, torneo_id):
         """
-        Calcula la tabla de posiciones para un torneo en tiempo real.
-        Utiliza las relaciones de 'partidos_local', 'partidos_visitante'
-        y la nueva 'partidos_ganador' para eficiencia.
+        Devuelve la tabla de posiciones de un torneo.
+
+        Con TABLA_POSICIONES_MODO='persistida' (por defecto) lee la tabla que
+        PartidoService mantiene al día; con 'agregada' la calcula desde los
+        partidos en una única consulta UNION ALL + GROUP BY.
+        """
+        self.get_by_id(torneo_id)
+        return self.posicion_service.get_tabla_vigente(torneo_id)
+
+    def get_frame_posiciones(self, torneo_id):
+        """
+        Devuelve el evento SSE inicial con la tabla de posiciones del torneo
+        (compartido entre espectadores mientras no cambie).
+        """
+        self.get_by_id(torneo_id)
+        return self.posicion_service.frame_posiciones(torneo_id)
+
+    def recalcular_tabla_posiciones(self, torneo_id):
+        """
+        Reconstruye la tabla de posiciones de un torneo a partir de sus partidos.
+
+        Returns:
+            int: Cantidad de equipos con posiciones generadas
+        """
+        self.get_by_id(torneo_id)
+        equipos = self.posicion_service.recalcular(torneo_id)
+        self.posicion_service.publicar_cambios([torneo_id])
+        return equipos
+
+    def generar_fixture(self, torneo_id, data):
+        """
+        Genera los partidos del torneo según el formato pedido y los inserta
+        en bloque dentro de una única transacción.
+
+        - TODOS_CONTRA_TODOS / IDA_Y_VUELTA: genera todas las rondas de una vez
+          (método del círculo).
+        - ELIMINACION: genera la primera ronda; las siguientes se generan
+          volviendo a llamar cuando la ronda anterior tiene todos sus ganadores.
+
+        Es idempotente: si el fixture (o la ronda actual) ya existe no se
+        crean partidos nuevos y se devuelven los existentes.
+
+        Args:
+            torneo_id (int): ID del torneo
+            data (dict): {"formato": "TODOS_CONTRA_TODOS" | "IDA_Y_VUELTA" | "ELIMINACION"}
+
+        Returns:
+            dict: formato, ronda (última generada), partidos_creados y partidos
         """
-        torneo = self.get_by_id(torneo_id) 
-        tabla_calculada = []
-        for equipo in torneo.equipos:
-            stats = {
-                "id": equipo.id,
-                "nombre": equipo.nombre,
-                "PJ": 0, # Partidos Jugados
-                "PG": 0, # Partidos Ganados
-                "PE": 0, # Partidos Empatados
-                "PP": 0, # Partidos Perdidos
-                "GF": 0, # Goles a Favor
-                "GC": 0, # Goles en Contra
-                "Puntos": 0
+        torneo = self.get_by_id(torneo_id)
+
+        formato_str = (data or {}).get('formato') or FormatoFixture.TODOS_CONTRA_TODOS.value
+        try:
+            formato = FormatoFixture(formato_str.upper())
+        except (ValueError, AttributeError):
+            raise ValidationError(f"Formato inválido. Debe ser uno de: {', '.join([f.value for f in FormatoFixture])}")
+
+        if torneo.formato and torneo.formato != formato:
+            raise ConflictError(f"El torneo ya tiene un fixture con formato {torneo.formato.value}")
+
+        equipo_ids = [e.id for e in sorted(self.torneo_repo.get_equipos_torneo(torneo_id), key=lambda e: e.id)]
+        if len(equipo_ids) < 2:
+            raise ValidationError("Se necesitan al menos 2 equipos para generar el fixture")
+
+        ultima_ronda = self.partido_repo.get_ultima_ronda(torneo_id)
+
+        if formato == FormatoFixture.ELIMINACION:
+            ronda, emparejamientos = self._siguiente_ronda_eliminacion(torneo_id, equipo_ids, ultima_ronda)
+            filas = [
+                {"torneo_id": torneo_id, "ronda": ronda, "equipo1_id": local, "equipo2_id": visitante}
+                for local, visitante in emparejamientos
+            ]
+        elif ultima_ronda is None:
+            ida_y_vuelta = formato == FormatoFixture.IDA_Y_VUELTA
+            filas = [
+                {"torneo_id": torneo_id, "ronda": ronda, "equipo1_id": local, "equipo2_id": visitante}
+                for ronda, local, visitante in generar_todos_contra_todos(equipo_ids, ida_y_vuelta)
+            ]
+            ronda = max(f["ronda"] for f in filas)
+        else:
+            ronda, filas = ultima_ronda, []
+
+        try:
+            if filas:
+                torneo.formato = formato
+                self.partido_repo.guardar_bulk(filas)
+                self.db.session.commit()
+
+            return {
+                "formato": formato.value,
+                "ronda": ronda,
+                "partidos_creados": len(filas),
+                "partidos": self.partido_repo.get_by_torneo(torneo_id)
             }
 
-            partidos_local = equipo.partidos_local
-            partidos_visitante = equipo.partidos_visitante
-            
-            stats["PJ"] = len(partidos_local) + len(partidos_visitante)
-            stats["PG"] = len(equipo.partidos_ganador)
-
-            for p in partidos_local:
-                stats["GF"] += p.goles_equipo1
-                stats["GC"] += p.goles_equipo2
-                if p.goles_equipo1 == p.goles_equipo2:
-                    stats["PE"] += 1
-
-            for p in partidos_visitante:
-                stats["GF"] += p.goles_equipo2
-                stats["GC"] += p.goles_equipo1
-                if p.goles_equipo1 == p.goles_equipo2:
-                    stats["PE"] += 1
-
-            stats["PP"] = stats["PJ"] - stats["PG"] - stats["PE"]
-            stats["Puntos"] = (stats["PG"] * 3) + (stats["PE"] * 1)
-            
-            tabla_calculada.append(stats)
+        except IntegrityError:
+            self.db.session.rollback()
+            raise ConflictError("El fixture ya fue generado por otra solicitud")
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al generar el fixture: {str(e)}")
 
-        tabla_ordenada = sorted(tabla_calculada, key=lambda x: x["Puntos"], reverse=True)
-        
-        return tabla_ordenada
+    def _siguiente_ronda_eliminacion(self, torneo_id, equipo_ids, ultima_ronda):
+        """
+        Determina qué ronda de eliminación corresponde generar.
+
+        Returns:
+            tuple[int, list[tuple[int, int]]]: Número de ronda y emparejamientos
+            (lista vacía si no hay nada nuevo que generar)
+        """
+        if ultima_ronda is None:
+            emparejamientos, _libres = emparejar_eliminacion(equipo_ids)
+            return 1, emparejamientos
+
+        partidos = self.partido_repo.get_by_torneo_y_ronda(torneo_id, ultima_ronda)
+        if any(p.ganador_id is None for p in partidos):
+            if any(p.goles_equipo1 is not None and p.goles_equipo1 == p.goles_equipo2 for p in partidos):
+                raise ValidationError("Hay partidos empatados: en eliminación directa se debe registrar un ganador")
+            return ultima_ronda, []
+
+        clasificados = [p.ganador_id for p in partidos]
+        if ultima_ronda == 1:
+            # Los equipos que no jugaron la primera ronda pasaron directo (byes)
+            jugaron = {p.equipo1_id for p in partidos} | {p.equipo2_id for p in partidos}
+            clasificados = [e for e in equipo_ids if e not in jugaron] + clasificados
+
+        if len(clasificados) < 2:
+            return ultima_ronda, []
+
+        emparejamientos, _libres = emparejar_eliminacion(clasificados)
+        return ultima_ronda + 1, emparejamientos
+
+    def programar_partidos(self, torneo_id, data):
+        """
+        Asigna los partidos sin programar del torneo a timeslots DISPONIBLE de
+        las canchas del club y reserva esos timeslots en bloque.
+
+        Los partidos se ubican por ronda, cada uno en el primer turno libre en
+        que ninguno de sus equipos juegue el mismo día ni dentro del descanso
+        pedido. Los que no entran en el rango quedan sin programar.
+
+        Args:
+            torneo_id (int): ID del torneo
+            data (dict):
+                - desde (str, opcional): YYYY-MM-DD, por defecto hoy o la fecha de inicio del torneo
+                - hasta (str, opcional): YYYY-MM-DD inclusive, por defecto la fecha de fin del torneo
+                - dias_descanso (int, opcional): días libres entre partidos de un equipo (por defecto 0)
+                - cancha_ids (list[int], opcional): limitar a estas canchas
+
+        Returns:
+            dict: partidos_programados, sin_programar (IDs) y partidos del torneo
+        """
+        torneo = self.get_by_id(torneo_id)
+        data = data or {}
+
+        desde = _parse_date(data.get('desde'), 'desde') or max(date.today(), torneo.fecha_inicio or date.today())
+        hasta = _parse_date(data.get('hasta'), 'hasta') or torneo.fecha_fin
+        if not hasta:
+            raise ValidationError("El campo 'hasta' es requerido si el torneo no tiene fecha de fin")
+        if hasta < desde:
+            raise ValidationError("La fecha 'hasta' no puede ser anterior a 'desde'")
+
+        dias_descanso = data.get('dias_descanso', 0)
+        if not isinstance(dias_descanso, int) or dias_descanso < 0:
+            raise ValidationError("'dias_descanso' debe ser un entero mayor o igual a 0")
+
+        cancha_ids = data.get('cancha_ids')
+        if cancha_ids is not None and not isinstance(cancha_ids, list):
+            raise ValidationError("'cancha_ids' debe ser una lista de IDs")
+
+        try:
+            pendientes = self.partido_repo.get_sin_programar(torneo_id)
+            rango = (
+                max(datetime.combine(desde, datetime.min.time()), datetime.now()),
+                datetime.combine(hasta + timedelta(days=1), datetime.min.time())
+            )
+            if modo_virtual():
+                # Turnos calculados desde las reglas, identificados por (cancha_id, inicio)
+                timeslots = self.disponibilidad_service.slots_libres(torneo.club_id, *rango, cancha_ids)
+            else:
+                timeslots = self.timeslot_repo.get_disponibles_por_club(torneo.club_id, *rango, cancha_ids)
+
+            asignados, sin_asignar = asignar_timeslots(
+                [(p.id, p.equipo1_id, p.equipo2_id) for p in pendientes],
+                timeslots,
+                dias_descanso=dias_descanso,
+                fechas_ocupadas=self.partido_repo.get_fechas_programadas(torneo_id)
+            )
+
+            if asignados and modo_virtual():
+                # Solo se guardan los turnos que quedaron asignados
+                filas = self.disponibilidad_service.materializar(list(asignados.values()))
+                self.db.session.flush()
+                asignados = {
+                    partido_id: ts.id
+                    for partido_id, ts in zip(asignados.keys(), filas)
+                }
+
+            if asignados:
+                reservados = self.timeslot_repo.cambiar_estado_bulk(
+                    list(asignados.values()), TimeslotEstado.DISPONIBLE, TimeslotEstado.RESERVADO
+                )
+                if reservados != len(asignados):
+                    raise ConflictError("Algunos turnos fueron reservados por otra operación; reintentar")
+                self.partido_repo.asignar_timeslots_bulk(asignados)
+                self.db.session.commit()
+
+            return {
+                "partidos_programados": len(asignados),
+                "sin_programar": sin_asignar,
+                "partidos": self.partido_repo.get_by_torneo(torneo_id)
+            }
+
+        except ConflictError:
+            self.db.session.rollback()
+            raise
+        except Exception as e:
+            self.db.session.rollback()
+            raise AppError(f"Error al programar los partidos: {str(e)}")
@@ -2,7 +2,8 @@ from app.repositories.user_repo import UserRepository
 from app.repositories.rol_repo import RolRepository
 from app.models.user import User
 from app import db
-from werkzeug.security import generate_password_hash
+from app.auth.passwords import hash_password as generar_hash_password
+from app.services.auth_service import invalidar_claims_usuario
 
 from app.errors import AppError, NotFoundError, ValidationError, ConflictError
 
@@ -49,7 +50,7 @@ class UserService:
             raise ValidationError(f"El rol_id '{rol_id_recibido}' no es válido o no existe.")
 
         password_plano = data['password']
-        hash_pass = generate_password_hash(password_plano)
+        hash_pass = generar_hash_password(password_plano)
         
         try:
             nuevo_usuario = User(
@@ -62,6 +63,7 @@ class UserService:
             )
             self.user_repo.create(nuevo_usuario)
             self.db.session.commit()
+            invalidar_claims_usuario(nuevo_usuario.id)  # por si se cacheó como inexistente
             return nuevo_usuario
         except Exception as e:
             self.db.session.rollback()
@@ -99,7 +101,7 @@ class UserService:
 
             if 'password' in data:
                 password_plano = data.pop('password')
-                usuario.hash_password = generate_password_hash(password_plano)
+                usuario.hash_password = generar_hash_password(password_plano)
             
             for key, value in data.items():
                 if hasattr(usuario, key) and key != 'id':
@@ -107,6 +109,7 @@ class UserService:
             
             self.user_repo.update(usuario, data)
             self.db.session.commit()
+            invalidar_claims_usuario(usuario.id)
             return usuario
         except Exception as e:
             self.db.session.rollback()
@@ -120,6 +123,7 @@ class UserService:
         try:
             self.user_repo.delete(usuario)
             self.db.session.commit()
+            invalidar_claims_usuario(user_id)
             return usuario
         except Exception as e:
             self.db.session.rollback()
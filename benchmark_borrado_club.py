@@ -0,0 +1,133 @@
+"""
+Benchmark: borrar un club grande con las cascadas de la base (ON DELETE
+CASCADE + passive_deletes, como hace ClubService.delete) contra la cascada
+del ORM, que carga cada cancha, timeslot y máscara en la sesión y los borra
+uno por uno.
+
+Usa una base SQLite temporal (no necesita el servidor corriendo): crea dos
+clubes idénticos con sus canchas y timeslots, borra uno con cada método y
+mide tiempo, sentencias SQL y memoria. Verifica que no queden filas
+huérfanas. Los clubes no tienen reservas: las reservas son historial y la
+base no deja borrar un club que las tenga.
+
+Ejecutar desde la raíz del proyecto:
+    python benchmark_borrado_club.py
+    python benchmark_borrado_club.py --canchas 20 --dias 90
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, time as hora, timedelta
+
+_db_file = os.path.join(tempfile.mkdtemp(), "benchmark_borrado_club.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + _db_file
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.models.cancha import Cancha  # noqa: E402
+from app.models.club import Club  # noqa: E402
+from app.models.club_horario import ClubHorario  # noqa: E402
+from app.models.direccion import Direccion  # noqa: E402
+from app.models.disponibilidad_dia import DisponibilidadDia  # noqa: E402
+from app.models.enums import DiaSemana  # noqa: E402
+from app.models.rol import Rol  # noqa: E402,F401 (registra el modelo antes de los schemas)
+from app.models.timeslot import Timeslot  # noqa: E402
+from app.models.user import User  # noqa: E402,F401
+from app.repositories.timeslot_repo import TimeslotRepository  # noqa: E402
+from app.services.club_service import ClubService  # noqa: E402
+
+ABRE, CIERRA = 8, 23
+
+
+def crear_club(n_canchas, dias):
+    """Crea un club con sus canchas y sus timeslots desde dias/2 atrás."""
+    club = Club(nombre="Club", cuit="20-00000000-0", telefono="0",
+                direccion=Direccion(calle="a", numero="1", ciudad="c", provincia="p"))
+    for dia in DiaSemana:
+        club.horarios.append(ClubHorario(dia=dia, abre=hora(ABRE), cierra=hora(CIERRA), activo=True))
+    for i in range(n_canchas):
+        club.canchas.append(Cancha(nombre=f"C{i}", deporte="padel", superficie=200, techado=False,
+                                   iluminacion=True, precio_hora=1000, activa=True))
+    db.session.add(club)
+    db.session.commit()
+
+    primer_dia = date.today() - timedelta(days=dias // 2)
+    TimeslotRepository(db).insertar_bulk([
+        {"cancha_id": cancha.id, "inicio": inicio, "fin": inicio + timedelta(hours=1), "precio": 1000}
+        for cancha in club.canchas
+        for d in range(dias)
+        for h in range(ABRE, CIERRA)
+        for inicio in [datetime.combine(primer_dia + timedelta(days=d), hora(h))]
+    ])
+    db.session.commit()
+    return club.id
+
+
+def borrar_con_orm(club_id):
+    """La cascada anterior: cargar todo el árbol en la sesión y borrar fila por fila."""
+    club = db.session.get(Club, club_id, options=[
+        selectinload(Club.canchas).selectinload(Cancha.timeslots),
+        selectinload(Club.canchas).selectinload(Cancha.disponibilidad_dias),
+        selectinload(Club.horarios),
+    ])
+    db.session.delete(club)
+    db.session.commit()
+
+
+def borrar_con_cascada(club_id):
+    ClubService(db).delete(club_id)
+
+
+def medir(funcion, club_id):
+    sentencias = []
+    contar = lambda *args: sentencias.append(1)  # noqa: E731
+    event.listen(db.engine, "before_cursor_execute", contar)
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcion(club_id)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    event.remove(db.engine, "before_cursor_execute", contar)
+    db.session.remove()
+    return segundos, len(sentencias), pico / 1024 / 1024
+
+
+def filas_restantes(club_id):
+    canchas = db.session.query(Cancha.id).filter(Cancha.club_id == club_id)
+    return sum([
+        db.session.query(Cancha).filter(Cancha.club_id == club_id).count(),
+        db.session.query(Timeslot).filter(Timeslot.cancha_id.in_(canchas)).count(),
+        db.session.query(DisponibilidadDia).filter(DisponibilidadDia.cancha_id.in_(canchas)).count(),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--canchas", type=int, default=10, help="canchas por club")
+    parser.add_argument("--dias", type=int, default=60, help="días de timeslots (la mitad en el pasado)")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        club_orm = crear_club(args.canchas, args.dias)
+        club_cascada = crear_club(args.canchas, args.dias)
+        timeslots = db.session.query(Timeslot).join(Cancha).filter(Cancha.club_id == club_orm).count()
+        print(f"Cada club: {args.canchas} canchas, {timeslots} timeslots\n")
+
+        print(f"{'método':<22}{'tiempo (s)':>12}{'sentencias':>12}{'memoria (MB)':>15}")
+        for nombre, funcion, club_id in (("cascada del ORM", borrar_con_orm, club_orm),
+                                         ("ON DELETE CASCADE", borrar_con_cascada, club_cascada)):
+            segundos, sentencias, memoria = medir(funcion, club_id)
+            assert filas_restantes(club_id) == 0, f"Quedaron filas del club borrado con {nombre}"
+            print(f"{nombre:<22}{segundos:>12.2f}{sentencias:>12}{memoria:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
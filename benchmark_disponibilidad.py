@@ -0,0 +1,124 @@
+"""
+Benchmark: "¿qué canchas están libres entre 18:00 y 22:00?" con máscaras de
+bits por (cancha, día) contra la disponibilidad que recorre los timeslots
+(TimeslotService.get_disponibilidad_materializada).
+
+Usa una base SQLite temporal (no necesita el servidor corriendo): genera
+timeslots para varios clubes, reserva una parte al azar, verifica que ambos
+métodos den la misma respuesta y mide el tiempo por consulta.
+
+Ejecutar desde la raíz del proyecto:
+    python benchmark_disponibilidad.py
+    python benchmark_disponibilidad.py --clubes 10 --canchas 20 --repeticiones 50
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, time as hora, timedelta
+
+_db_file = os.path.join(tempfile.mkdtemp(), "benchmark_disponibilidad.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + _db_file
+
+from app import create_app, db  # noqa: E402
+from app.models.cancha import Cancha  # noqa: E402
+from app.models.club import Club  # noqa: E402
+from app.models.club_horario import ClubHorario  # noqa: E402
+from app.models.direccion import Direccion  # noqa: E402
+from app.models.enums import DiaSemana, TimeslotEstado  # noqa: E402
+from app.models.rol import Rol  # noqa: E402,F401 (registra el modelo antes de los schemas)
+from app.models.timeslot import Timeslot  # noqa: E402
+from app.models.user import User  # noqa: E402,F401
+from app.repositories.timeslot_repo import TimeslotRepository  # noqa: E402
+from app.services.mapa_disponibilidad_service import MapaDisponibilidadService  # noqa: E402
+from app.services.timeslot_service import TimeslotService  # noqa: E402
+
+DESDE, HASTA = hora(18), hora(22)
+
+
+def preparar(n_clubes, n_canchas, dias, ocupacion):
+    """Crea los clubes con sus canchas y timeslots, y reserva una fracción al azar."""
+    timeslot_service = TimeslotService(db)
+    hoy = date.today()
+    club_ids = []
+    for c in range(n_clubes):
+        club = Club(nombre=f"Club {c}", cuit="20-00000000-0", telefono="0",
+                    direccion=Direccion(calle="a", numero="1", ciudad="c", provincia="p"))
+        for dia in DiaSemana:
+            club.horarios.append(ClubHorario(dia=dia, abre=hora(8), cierra=hora(23), activo=True))
+        for i in range(n_canchas):
+            club.canchas.append(Cancha(nombre=f"C{i}", deporte="padel", superficie=200, techado=False,
+                                       iluminacion=True, precio_hora=1000, activa=True))
+        db.session.add(club)
+        db.session.commit()
+        timeslot_service.generar_timeslots_para_club(club.id, hoy, hoy + timedelta(days=dias - 1))
+        club_ids.append(club.id)
+
+    random.seed(1)
+    ids = [i for (i,) in db.session.query(Timeslot.id).all()]
+    TimeslotRepository(db).cambiar_estado_bulk(
+        random.sample(ids, int(len(ids) * ocupacion)), TimeslotEstado.DISPONIBLE, TimeslotEstado.RESERVADO
+    )
+    db.session.commit()
+    return club_ids, len(ids)
+
+
+def libres_recorriendo_timeslots(timeslot_service, club_ids, fecha):
+    """{cancha_id: [HH:MM libres en la franja]} a partir de la disponibilidad por horario."""
+    resultado = {}
+    for club_id in club_ids:
+        disponibilidad = timeslot_service.get_disponibilidad_materializada(club_id, fecha)
+        for horario in disponibilidad["horarios"]:
+            for cancha in horario["canchas_disponibles"]:
+                if DESDE.strftime('%H:%M') <= cancha["hora_inicio"] and cancha["hora_fin"] <= HASTA.strftime('%H:%M'):
+                    resultado.setdefault(cancha["cancha_id"], []).append(cancha["hora_inicio"])
+    return resultado
+
+
+def libres_con_bits(mapa_service, club_ids, fecha):
+    respuesta = mapa_service.canchas_libres(club_ids, fecha, DESDE, HASTA)
+    return {c["cancha_id"]: c["turnos_libres"] for c in respuesta["canchas"]}
+
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+        db.session.remove()  # sin caché de identidad entre consultas
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clubes", type=int, default=5)
+    parser.add_argument("--canchas", type=int, default=12, help="canchas por club")
+    parser.add_argument("--dias", type=int, default=7)
+    parser.add_argument("--ocupacion", type=float, default=0.4, help="fracción de turnos reservados")
+    parser.add_argument("--repeticiones", type=int, default=30)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        club_ids, total = preparar(args.clubes, args.canchas, args.dias, args.ocupacion)
+        fecha = date.today() + timedelta(days=1)
+        timeslot_service = TimeslotService(db)
+        mapa_service = MapaDisponibilidadService(db)
+
+        esperado = libres_recorriendo_timeslots(timeslot_service, club_ids, fecha)
+        obtenido = libres_con_bits(mapa_service, club_ids, fecha)
+        assert esperado == obtenido, "Los dos métodos no coinciden"
+
+        print(f"{args.clubes} clubes x {args.canchas} canchas, {total} timeslots, "
+              f"{len(obtenido)} canchas con algún turno libre de {DESDE:%H:%M} a {HASTA:%H:%M}\n")
+        print(f"{'consulta':<22}{'timeslots (ms)':>16}{'bits (ms)':>12}{'aceleración':>14}")
+        for nombre, clubes in (("un club", club_ids[:1]), (f"{len(club_ids)} clubes", club_ids)):
+            t_filas = medir(lambda: libres_recorriendo_timeslots(timeslot_service, clubes, fecha), args.repeticiones)
+            t_bits = medir(lambda: libres_con_bits(mapa_service, clubes, fecha), args.repeticiones)
+            print(f"{nombre:<22}{t_filas:>16.2f}{t_bits:>12.2f}{t_filas / t_bits:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
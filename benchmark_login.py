@@ -0,0 +1,108 @@
+"""
+Benchmark de logins por segundo según el método/costo de hash de contraseñas.
+
+Usa una base SQLite temporal y el cliente de pruebas de Flask (no necesita
+el servidor corriendo). Para cada método crea un usuario, hace N logins con
+C hilos concurrentes y reporta logins/seg totales y por núcleo.
+
+Ejecutar desde la raíz del proyecto:
+    python benchmark_login.py
+    python benchmark_login.py --logins 100 --concurrencia 16 --metodos scrypt:16384:8:1 scrypt:32768:8:1
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_db_file = os.path.join(tempfile.mkdtemp(), "benchmark_login.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + _db_file
+
+from app import create_app, db  # noqa: E402
+from app.auth.passwords import password_hasher, hash_password  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.models.club import Club  # noqa: E402
+from app.models.direccion import Direccion  # noqa: E402
+from app.models.rol import Rol  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+PASSWORD = "password123"
+
+
+def preparar(app):
+    """Crea las tablas, un rol y un club para los usuarios del benchmark."""
+    with app.app_context():
+        db.create_all()
+        rol = Rol(nombre="admin")
+        club = Club(nombre="Club Benchmark", cuit="20-00000000-0", telefono="0",
+                    direccion=Direccion(calle="a", numero="1", ciudad="c", provincia="p"))
+        db.session.add_all([rol, club])
+        db.session.commit()
+        return rol.id, club.id
+
+
+def crear_usuario(app, email, rol_id, club_id):
+    """Crea un usuario con el método de hash configurado en este momento."""
+    with app.app_context():
+        db.session.add(User(nombre="bench", email=email, hash_password=hash_password(PASSWORD),
+                            rol_id=rol_id, club_id=club_id))
+        db.session.commit()
+
+
+def medir(app, email, logins, concurrencia):
+    """Hace 'logins' inicios de sesión con 'concurrencia' hilos y devuelve (segundos, fallidos)."""
+    def login(_):
+        with app.test_client() as client:
+            r = client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+            return r.status_code
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        codigos = list(pool.map(login, range(logins)))
+    return time.perf_counter() - inicio, sum(1 for c in codigos if c != 200)
+
+
+def verificar_rehash(app, rol_id, club_id, metodo_viejo, metodo_nuevo):
+    """Comprueba que un hash con parámetros viejos se actualiza en el login."""
+    password_hasher.reconfigurar(metodo_viejo)
+    crear_usuario(app, "rehash@bench.com", rol_id, club_id)
+    password_hasher.reconfigurar(metodo_nuevo)
+    with app.test_client() as client:
+        client.post("/api/v1/auth/login", json={"email": "rehash@bench.com", "password": PASSWORD})
+    with app.app_context():
+        guardado = User.query.filter_by(email="rehash@bench.com").first().hash_password
+    return guardado.split("$", 1)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metodos", nargs="+",
+                        default=[Config.PASSWORD_HASH_METHOD, "scrypt:16384:8:1", "pbkdf2:sha256:600000"])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrencia", type=int, default=8)
+    args = parser.parse_args()
+
+    app = create_app()
+    rol_id, club_id = preparar(app)
+    nucleos = min(Config.PASSWORD_HASH_WORKERS, os.cpu_count() or 1)
+
+    print(f"Workers de hashing: {Config.PASSWORD_HASH_WORKERS} | núcleos: {os.cpu_count()} | "
+          f"logins: {args.logins} | concurrencia: {args.concurrencia}")
+    print(f"{'método':<28}{'seg':>8}{'logins/s':>12}{'logins/s/núcleo':>18}{'fallidos':>10}")
+
+    for i, metodo in enumerate(args.metodos):
+        password_hasher.reconfigurar(metodo)
+        email = f"bench{i}@bench.com"
+        crear_usuario(app, email, rol_id, club_id)
+        segundos, fallidos = medir(app, email, args.logins, args.concurrencia)
+        por_seg = (args.logins - fallidos) / segundos
+        print(f"{metodo:<28}{segundos:>8.2f}{por_seg:>12.1f}{por_seg / nucleos:>18.1f}{fallidos:>10}")
+
+    prefijo = verificar_rehash(app, rol_id, club_id, "pbkdf2:sha256:1000", args.metodos[0])
+    print(f"\nRehash en login: pbkdf2:sha256:1000 -> {prefijo} "
+          f"({'✅ ok' if prefijo == args.metodos[0] else '❌ no se actualizó'})")
+
+
+if __name__ == "__main__":
+    main()
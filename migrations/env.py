@@ -45,6 +45,23 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# Objetos que crean las migraciones (y los eventos DDL de los modelos) con SQL
+# propio y no figuran en la metadata: sin este filtro, autogenerate propondría
+# borrarlos. 'reserva_busqueda' es la tabla FTS5 de SQLite y sus tablas internas
+# (_data, _idx, _config, _docsize); 'ix_reserva_cliente_trgm', el índice
+# trigram de PostgreSQL.
+PREFIJOS_SOLO_DDL = ('reserva_busqueda',)
+INDICES_SOLO_DDL = ('ix_reserva_cliente_trgm',)
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == 'table' and name.startswith(PREFIJOS_SOLO_DDL):
+        return False
+    if type_ == 'index' and name in INDICES_SOLO_DDL:
+        return False
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -65,7 +82,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,10 +111,20 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        sqlite = connection.dialect.name == 'sqlite'
+        if sqlite:
+            # Las migraciones de SQLite recrean tablas (batch): con las foreign
+            # keys activas, el DROP de la tabla vieja borraría en cascada las
+            # filas que la referencian. El PRAGMA no tiene efecto dentro de
+            # una transacción, por eso se ejecuta antes.
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -106,6 +134,10 @@ def run_migrations_online():
         with context.begin_transaction():
             context.run_migrations()
 
+        if sqlite:
+            connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+            connection.commit()
+
 
 if context.is_offline_mode():
     run_migrations_offline()
@@ -0,0 +1,78 @@
+"""indice de busqueda de clientes en reserva
+
+Revision ID: 3a7c1e9b5d20
+Revises: fc69ee2062e5
+Create Date: 2026-10-19 10:12:31.502114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a7c1e9b5d20'
+down_revision = 'fc69ee2062e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialecto = op.get_bind().dialect.name
+
+    if dialecto == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS reserva_busqueda USING fts5(
+                cliente_nombre, cliente_email,
+                content='reserva', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS reserva_busqueda_ai AFTER INSERT ON reserva BEGIN
+                INSERT INTO reserva_busqueda(rowid, cliente_nombre, cliente_email)
+                VALUES (new.id, new.cliente_nombre, new.cliente_email);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS reserva_busqueda_ad AFTER DELETE ON reserva BEGIN
+                INSERT INTO reserva_busqueda(reserva_busqueda, rowid, cliente_nombre, cliente_email)
+                VALUES ('delete', old.id, old.cliente_nombre, old.cliente_email);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS reserva_busqueda_au AFTER UPDATE OF cliente_nombre, cliente_email ON reserva BEGIN
+                INSERT INTO reserva_busqueda(reserva_busqueda, rowid, cliente_nombre, cliente_email)
+                VALUES ('delete', old.id, old.cliente_nombre, old.cliente_email);
+                INSERT INTO reserva_busqueda(rowid, cliente_nombre, cliente_email)
+                VALUES (new.id, new.cliente_nombre, new.cliente_email);
+            END
+        """)
+        # Indexar las reservas existentes
+        op.execute("INSERT INTO reserva_busqueda(reserva_busqueda) VALUES ('rebuild')")
+
+    elif dialecto == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+        op.execute("""
+            CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+            LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+            AS $$ SELECT public.unaccent('public.unaccent', $1) $$
+        """)
+        op.execute("""
+            CREATE INDEX IF NOT EXISTS ix_reserva_cliente_trgm ON reserva
+            USING gin (f_unaccent(lower(cliente_nombre || ' ' || cliente_email)) gin_trgm_ops)
+        """)
+
+
+def downgrade():
+    dialecto = op.get_bind().dialect.name
+
+    if dialecto == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS reserva_busqueda_au")
+        op.execute("DROP TRIGGER IF EXISTS reserva_busqueda_ad")
+        op.execute("DROP TRIGGER IF EXISTS reserva_busqueda_ai")
+        op.execute("DROP TABLE IF EXISTS reserva_busqueda")
+
+    elif dialecto == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_reserva_cliente_trgm")
+        op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
@@ -0,0 +1,30 @@
+"""índices de equipos en partido
+
+Revision ID: 4d8a1f6e2b95
+Revises: 7b3e9d2c4a18
+Create Date: 2026-10-19 17:02:51.630417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d8a1f6e2b95'
+down_revision = '7b3e9d2c4a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('partido', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_partido_equipo1_id'), ['equipo1_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_partido_equipo2_id'), ['equipo2_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_partido_ganador_id'), ['ganador_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('partido', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_partido_ganador_id'))
+        batch_op.drop_index(batch_op.f('ix_partido_equipo2_id'))
+        batch_op.drop_index(batch_op.f('ix_partido_equipo1_id'))
@@ -0,0 +1,30 @@
+"""turno asignado a cada partido
+
+Revision ID: 7b3e9d2c4a18
+Revises: e1f4b6a09c37
+Create Date: 2026-10-19 15:40:27.114902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3e9d2c4a18'
+down_revision = 'e1f4b6a09c37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('partido', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('timeslot_id', sa.Integer(), nullable=True))
+        batch_op.create_unique_constraint('uq_partido_timeslot_id', ['timeslot_id'])
+        batch_op.create_foreign_key('fk_partido_timeslot_id', 'timeslot', ['timeslot_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('partido', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_partido_timeslot_id', type_='foreignkey')
+        batch_op.drop_constraint('uq_partido_timeslot_id', type_='unique')
+        batch_op.drop_column('timeslot_id')
@@ -0,0 +1,90 @@
+"""crear tabla cliente y vincular reservas
+
+Revision ID: 8e41b07c2f93
+Revises: 3a7c1e9b5d20
+Create Date: 2026-10-19 11:40:05.118230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e41b07c2f93'
+down_revision = '3a7c1e9b5d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cliente',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('nombre', sa.String(length=120), nullable=False),
+    sa.Column('telefono', sa.String(length=30), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # ADD COLUMN directo (sin batch) para no recrear 'reserva' y conservar
+        # los triggers del índice de búsqueda.
+        op.execute("ALTER TABLE reserva ADD COLUMN cliente_id INTEGER REFERENCES cliente (id)")
+    else:
+        op.add_column('reserva', sa.Column('cliente_id', sa.Integer(), nullable=True))
+        op.create_foreign_key('fk_reserva_cliente_id', 'reserva', 'cliente', ['cliente_id'], ['id'])
+    op.create_index(op.f('ix_reserva_cliente_id'), 'reserva', ['cliente_id'], unique=False)
+
+    # Backfill: un cliente por email normalizado, con el nombre y teléfono de
+    # su reserva más reciente.
+    op.execute("""
+        INSERT INTO cliente (email, nombre, telefono, created_at, updated_at)
+        SELECT lower(trim(r.cliente_email)), r.cliente_nombre, r.cliente_telefono,
+               ultimas.primera_reserva, r.created_at
+        FROM reserva r
+        JOIN (
+            SELECT max(id) AS ultima_id, min(created_at) AS primera_reserva
+            FROM reserva
+            GROUP BY lower(trim(cliente_email))
+        ) ultimas ON r.id = ultimas.ultima_id
+    """)
+    op.execute("""
+        UPDATE reserva SET cliente_id = (
+            SELECT c.id FROM cliente c WHERE c.email = lower(trim(reserva.cliente_email))
+        )
+    """)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_reserva_cliente_id'), table_name='reserva')
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('reserva', schema=None) as batch_op:
+            batch_op.drop_column('cliente_id')
+        # El batch recrea la tabla y se pierden sus triggers: volver a crearlos
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS reserva_busqueda_ai AFTER INSERT ON reserva BEGIN
+                INSERT INTO reserva_busqueda(rowid, cliente_nombre, cliente_email)
+                VALUES (new.id, new.cliente_nombre, new.cliente_email);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS reserva_busqueda_ad AFTER DELETE ON reserva BEGIN
+                INSERT INTO reserva_busqueda(reserva_busqueda, rowid, cliente_nombre, cliente_email)
+                VALUES ('delete', old.id, old.cliente_nombre, old.cliente_email);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS reserva_busqueda_au AFTER UPDATE OF cliente_nombre, cliente_email ON reserva BEGIN
+                INSERT INTO reserva_busqueda(reserva_busqueda, rowid, cliente_nombre, cliente_email)
+                VALUES ('delete', old.id, old.cliente_nombre, old.cliente_email);
+                INSERT INTO reserva_busqueda(rowid, cliente_nombre, cliente_email)
+                VALUES (new.id, new.cliente_nombre, new.cliente_email);
+            END
+        """)
+    else:
+        op.drop_constraint('fk_reserva_cliente_id', 'reserva', type_='foreignkey')
+        op.drop_column('reserva', 'cliente_id')
+
+    op.drop_table('cliente')
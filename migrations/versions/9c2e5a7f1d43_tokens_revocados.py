@@ -0,0 +1,38 @@
+"""tabla de tokens revocados
+
+Revision ID: 9c2e5a7f1d43
+Revises: 4d8a1f6e2b95
+Create Date: 2026-10-19 18:20:07.415926
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c2e5a7f1d43'
+down_revision = '4d8a1f6e2b95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('token_revocado',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('jti', sa.String(length=36), nullable=False),
+    sa.Column('tipo', sa.String(length=10), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('expira_en', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('jti')
+    )
+    with op.batch_alter_table('token_revocado', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_token_revocado_expira_en'), ['expira_en'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('token_revocado', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_token_revocado_expira_en'))
+
+    op.drop_table('token_revocado')
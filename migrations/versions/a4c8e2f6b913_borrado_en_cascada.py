@@ -0,0 +1,104 @@
+"""borrado en cascada a nivel base de datos (ON DELETE CASCADE / SET NULL)
+
+Revision ID: a4c8e2f6b913
+Revises: f2a6d9c4b817
+Create Date: 2026-10-19 23:05:41.372915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e2f6b913'
+down_revision = 'f2a6d9c4b817'
+branch_labels = None
+depends_on = None
+
+# Nombre para las foreign keys sin nombre (las de create_table en SQLite)
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+# tabla -> [(columna, tabla referida, ondelete)]. Las reservas no se borran con
+# la cancha (RESTRICT): son el historial de ingresos que usan los reportes.
+FOREIGN_KEYS = {
+    'cancha': [('club_id', 'club', 'CASCADE')],
+    'torneo': [('club_id', 'club', 'CASCADE')],
+    'club_horario': [('club_id', 'club', 'CASCADE')],
+    'club_cierre': [('club_id', 'club', 'CASCADE')],
+    'user': [('club_id', 'club', 'CASCADE')],
+    'regla_precio': [('club_id', 'club', 'CASCADE'), ('cancha_id', 'cancha', 'CASCADE')],
+    'espera_turno': [('club_id', 'club', 'CASCADE'), ('cancha_id', 'cancha', 'CASCADE'),
+                     ('timeslot_id', 'timeslot', 'SET NULL'), ('reserva_id', 'reserva', 'SET NULL')],
+    'timeslot': [('cancha_id', 'cancha', 'CASCADE')],
+    'cancha_bloqueo': [('cancha_id', 'cancha', 'CASCADE')],
+    'disponibilidad_dia': [('cancha_id', 'cancha', 'CASCADE')],
+    'serie_reserva': [('cancha_id', 'cancha', 'CASCADE')],
+    'reserva': [('cancha_id', 'cancha', 'RESTRICT'), ('serie_id', 'serie_reserva', 'SET NULL')],
+    'reserva_timeslot': [('reserva_id', 'reserva', 'CASCADE'), ('timeslot_id', 'timeslot', 'CASCADE')],
+    'partido': [('torneo_id', 'torneo', 'CASCADE'), ('equipo1_id', 'equipo', 'CASCADE'),
+                ('equipo2_id', 'equipo', 'CASCADE'), ('ganador_id', 'equipo', 'SET NULL'),
+                ('timeslot_id', 'timeslot', 'SET NULL')],
+    'equipo': [('torneo_id', 'torneo', 'CASCADE')],
+    'posicion': [('torneo_id', 'torneo', 'CASCADE'), ('equipo_id', 'equipo', 'CASCADE')],
+}
+
+TRIGGERS_BUSQUEDA_SQLITE = [
+    """
+    CREATE TRIGGER IF NOT EXISTS reserva_busqueda_ai AFTER INSERT ON reserva BEGIN
+        INSERT INTO reserva_busqueda(rowid, cliente_nombre, cliente_email)
+        VALUES (new.id, new.cliente_nombre, new.cliente_email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reserva_busqueda_ad AFTER DELETE ON reserva BEGIN
+        INSERT INTO reserva_busqueda(reserva_busqueda, rowid, cliente_nombre, cliente_email)
+        VALUES ('delete', old.id, old.cliente_nombre, old.cliente_email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reserva_busqueda_au AFTER UPDATE OF cliente_nombre, cliente_email ON reserva BEGIN
+        INSERT INTO reserva_busqueda(reserva_busqueda, rowid, cliente_nombre, cliente_email)
+        VALUES ('delete', old.id, old.cliente_nombre, old.cliente_email);
+        INSERT INTO reserva_busqueda(rowid, cliente_nombre, cliente_email)
+        VALUES (new.id, new.cliente_nombre, new.cliente_email);
+    END
+    """,
+]
+
+
+def _reemplazar_foreign_keys(con_ondelete):
+    """
+    Vuelve a crear cada foreign key de FOREIGN_KEYS con (o sin) su ON DELETE,
+    conservando el nombre que tenga. En PostgreSQL es un ALTER por constraint;
+    en SQLite el batch recrea cada tabla una vez, así que migrations/env.py
+    desactiva las foreign keys mientras corre (si no, el DROP de la tabla
+    vieja borraría en cascada).
+    """
+    bind = op.get_bind()
+    sqlite = bind.dialect.name == 'sqlite'
+    inspector = sa.inspect(bind)
+    for tabla, foreign_keys in FOREIGN_KEYS.items():
+        nombres = {
+            tuple(fk['constrained_columns']): fk['name']
+            for fk in inspector.get_foreign_keys(tabla)
+        }
+        with op.batch_alter_table(tabla, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+            for columna, referida, ondelete in foreign_keys:
+                nombre = nombres.get((columna,)) or NAMING_CONVENTION['fk'] % {
+                    'table_name': tabla, 'column_0_name': columna, 'referred_table_name': referida
+                }
+                batch_op.drop_constraint(nombre, type_='foreignkey')
+                batch_op.create_foreign_key(nombre, referida, [columna], ['id'],
+                                            ondelete=ondelete if con_ondelete else None)
+        if sqlite and tabla == 'reserva':
+            # El batch recrea la tabla y se pierden sus triggers: volver a crearlos
+            for sql in TRIGGERS_BUSQUEDA_SQLITE:
+                op.execute(sql)
+
+
+def upgrade():
+    _reemplazar_foreign_keys(con_ondelete=True)
+
+
+def downgrade():
+    _reemplazar_foreign_keys(con_ondelete=False)
@@ -0,0 +1,26 @@
+"""índice de timeslot por cancha e inicio
+
+Revision ID: a6f3d8b2c915
+Revises: 9c2e5a7f1d43
+Create Date: 2026-10-19 18:51:33.208114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6f3d8b2c915'
+down_revision = '9c2e5a7f1d43'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('timeslot', schema=None) as batch_op:
+        batch_op.create_index('ix_timeslot_cancha_id_inicio', ['cancha_id', 'inicio'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('timeslot', schema=None) as batch_op:
+        batch_op.drop_index('ix_timeslot_cancha_id_inicio')
@@ -0,0 +1,81 @@
+"""retención por club y tablas de archivo de reservas y timeslots
+
+Revision ID: b7e3c9a1d524
+Revises: a4c8e2f6b913
+Create Date: 2026-10-19 23:41:17.508236
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e3c9a1d524'
+down_revision = 'a4c8e2f6b913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('club', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('retencion_libres_dias', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('retencion_reservas_dias', sa.Integer(), nullable=True))
+
+    op.create_table('reserva_archivada',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('reserva_id', sa.Integer(), nullable=False),
+    sa.Column('cancha_id', sa.Integer(), nullable=False),
+    sa.Column('cliente_id', sa.Integer(), nullable=True),
+    sa.Column('serie_id', sa.Integer(), nullable=True),
+    sa.Column('cliente_nombre', sa.String(length=120), nullable=False),
+    sa.Column('cliente_telefono', sa.String(length=30), nullable=True),
+    sa.Column('cliente_email', sa.String(length=120), nullable=False),
+    sa.Column('estado', sa.Enum('PENDIENTE', 'CONFIRMADA', 'CANCELADA', 'NO_ASISTIO', 'PAGADO', name='reserva_estado', native_enum=False), nullable=False),
+    sa.Column('fuente', sa.Enum('WEB', 'PRESENCIAL', 'TELEFONICA', name='fuente_reserva', native_enum=False), nullable=False),
+    sa.Column('servicios', sa.String(length=255), nullable=True),
+    sa.Column('precio_total', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('archivada_en', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['cancha_id'], ['cancha.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['cliente_id'], ['cliente.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('reserva_archivada', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_reserva_archivada_reserva_id'), ['reserva_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reserva_archivada_cancha_id'), ['cancha_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reserva_archivada_cliente_id'), ['cliente_id'], unique=False)
+
+    op.create_table('timeslot_archivado',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('timeslot_id', sa.Integer(), nullable=False),
+    sa.Column('reserva_archivada_id', sa.Integer(), nullable=False),
+    sa.Column('cancha_id', sa.Integer(), nullable=False),
+    sa.Column('inicio', sa.DateTime(), nullable=False),
+    sa.Column('fin', sa.DateTime(), nullable=False),
+    sa.Column('estado', sa.Enum('DISPONIBLE', 'RESERVADO', 'BLOQUEADO', 'NO_GENERADO', 'PAGADO', name='timeslot_estado', native_enum=False), nullable=False),
+    sa.Column('precio', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.ForeignKeyConstraint(['reserva_archivada_id'], ['reserva_archivada.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['cancha_id'], ['cancha.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('timeslot_archivado', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_timeslot_archivado_reserva_archivada_id'), ['reserva_archivada_id'], unique=False)
+        batch_op.create_index('ix_timeslot_archivado_cancha_id_inicio', ['cancha_id', 'inicio'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('timeslot_archivado', schema=None) as batch_op:
+        batch_op.drop_index('ix_timeslot_archivado_cancha_id_inicio')
+        batch_op.drop_index(batch_op.f('ix_timeslot_archivado_reserva_archivada_id'))
+
+    op.drop_table('timeslot_archivado')
+    with op.batch_alter_table('reserva_archivada', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reserva_archivada_cliente_id'))
+        batch_op.drop_index(batch_op.f('ix_reserva_archivada_cancha_id'))
+        batch_op.drop_index(batch_op.f('ix_reserva_archivada_reserva_id'))
+
+    op.drop_table('reserva_archivada')
+    with op.batch_alter_table('club', schema=None) as batch_op:
+        batch_op.drop_column('retencion_reservas_dias')
+        batch_op.drop_column('retencion_libres_dias')
@@ -0,0 +1,64 @@
+"""cierres de club, bloqueos de cancha y timeslot único por cancha e inicio
+
+Revision ID: b8d4e1f7a362
+Revises: a6f3d8b2c915
+Create Date: 2026-10-19 19:34:12.774051
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d4e1f7a362'
+down_revision = 'a6f3d8b2c915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('club_cierre',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('club_id', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('abre', sa.Time(), nullable=True),
+    sa.Column('cierra', sa.Time(), nullable=True),
+    sa.Column('cerrado', sa.Boolean(), nullable=True),
+    sa.Column('motivo', sa.String(length=160), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['club.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('club_id', 'fecha', name='uq_club_cierre_fecha')
+    )
+    op.create_table('cancha_bloqueo',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('cancha_id', sa.Integer(), nullable=False),
+    sa.Column('inicio', sa.DateTime(), nullable=False),
+    sa.Column('fin', sa.DateTime(), nullable=False),
+    sa.Column('motivo', sa.String(length=160), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['cancha_id'], ['cancha.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('cancha_bloqueo', schema=None) as batch_op:
+        batch_op.create_index('ix_cancha_bloqueo_cancha_id_inicio', ['cancha_id', 'inicio'], unique=False)
+
+    # Con disponibilidad virtual el turno se crea al reservar: el índice único
+    # evita que dos reservas simultáneas creen el mismo
+    with op.batch_alter_table('timeslot', schema=None) as batch_op:
+        batch_op.drop_index('ix_timeslot_cancha_id_inicio')
+        batch_op.create_index('ix_timeslot_cancha_id_inicio', ['cancha_id', 'inicio'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('timeslot', schema=None) as batch_op:
+        batch_op.drop_index('ix_timeslot_cancha_id_inicio')
+        batch_op.create_index('ix_timeslot_cancha_id_inicio', ['cancha_id', 'inicio'], unique=False)
+
+    with op.batch_alter_table('cancha_bloqueo', schema=None) as batch_op:
+        batch_op.drop_index('ix_cancha_bloqueo_cancha_id_inicio')
+
+    op.drop_table('cancha_bloqueo')
+    op.drop_table('club_cierre')
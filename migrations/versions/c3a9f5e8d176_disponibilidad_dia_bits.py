@@ -0,0 +1,59 @@
+"""máscaras de bits de disponibilidad por cancha y día
+
+Revision ID: c3a9f5e8d176
+Revises: b8d4e1f7a362
+Create Date: 2026-10-19 20:41:58.902337
+
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a9f5e8d176'
+down_revision = 'b8d4e1f7a362'
+branch_labels = None
+depends_on = None
+
+GRANULARIDAD_MINUTOS = 30  # app/models/disponibilidad_dia.py
+
+
+def upgrade():
+    disponibilidad_dia = op.create_table('disponibilidad_dia',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('cancha_id', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('libres', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['cancha_id'], ['cancha.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cancha_id', 'fecha', name='uq_disponibilidad_dia_cancha_fecha')
+    )
+    with op.batch_alter_table('disponibilidad_dia', schema=None) as batch_op:
+        batch_op.create_index('ix_disponibilidad_dia_fecha', ['fecha'], unique=False)
+
+    # Cargar las máscaras desde los timeslots existentes (un bit por turno DISPONIBLE)
+    timeslot = sa.table('timeslot', sa.column('cancha_id', sa.Integer), sa.column('inicio', sa.DateTime),
+                        sa.column('estado', sa.String))
+    mascaras = defaultdict(int)
+    for cancha_id, inicio, estado in op.get_bind().execute(
+        sa.select(timeslot.c.cancha_id, timeslot.c.inicio, timeslot.c.estado)
+    ):
+        if isinstance(inicio, str):
+            inicio = datetime.fromisoformat(inicio)
+        bit = 1 << ((inicio.hour * 60 + inicio.minute) // GRANULARIDAD_MINUTOS)
+        mascaras[(cancha_id, inicio.date())] |= bit if estado == 'DISPONIBLE' else 0
+    if mascaras:
+        op.bulk_insert(disponibilidad_dia, [
+            {'cancha_id': cancha_id, 'fecha': fecha, 'libres': libres}
+            for (cancha_id, fecha), libres in mascaras.items()
+        ])
+
+
+def downgrade():
+    with op.batch_alter_table('disponibilidad_dia', schema=None) as batch_op:
+        batch_op.drop_index('ix_disponibilidad_dia_fecha')
+
+    op.drop_table('disponibilidad_dia')
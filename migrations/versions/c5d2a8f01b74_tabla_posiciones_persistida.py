@@ -0,0 +1,87 @@
+"""tabla de posiciones persistida
+
+Revision ID: c5d2a8f01b74
+Revises: 8e41b07c2f93
+Create Date: 2026-10-19 13:05:48.730661
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d2a8f01b74'
+down_revision = '8e41b07c2f93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Los partidos sin resultado pasan a tener goles en NULL (antes 0-0 por defecto)
+    with op.batch_alter_table('partido', schema=None) as batch_op:
+        batch_op.alter_column('goles_equipo1', existing_type=sa.Integer(), nullable=True)
+        batch_op.alter_column('goles_equipo2', existing_type=sa.Integer(), nullable=True)
+
+    # Los 0-0 existentes se conservan como jugados: no se puede distinguir un
+    # empate real del valor por defecto. Para anular los que no se jugaron:
+    # flask anular-empates-sin-jugar (con --dry-run para revisar antes).
+
+    with op.batch_alter_table('equipo', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_equipo_torneo_id'), ['torneo_id'], unique=False)
+
+    op.create_table('posicion',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('torneo_id', sa.Integer(), nullable=False),
+    sa.Column('equipo_id', sa.Integer(), nullable=False),
+    sa.Column('pj', sa.Integer(), nullable=False),
+    sa.Column('pg', sa.Integer(), nullable=False),
+    sa.Column('pe', sa.Integer(), nullable=False),
+    sa.Column('pp', sa.Integer(), nullable=False),
+    sa.Column('gf', sa.Integer(), nullable=False),
+    sa.Column('gc', sa.Integer(), nullable=False),
+    sa.Column('puntos', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['equipo_id'], ['equipo.id'], ),
+    sa.ForeignKeyConstraint(['torneo_id'], ['torneo.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('equipo_id')
+    )
+    with op.batch_alter_table('posicion', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_posicion_torneo_id'), ['torneo_id'], unique=False)
+
+    # Carga inicial desde los partidos con resultado (local y visitante)
+    op.execute("""
+        INSERT INTO posicion (torneo_id, equipo_id, pj, pg, pe, pp, gf, gc, puntos, updated_at)
+        SELECT torneo_id, equipo_id,
+               count(*),
+               sum(CASE WHEN gf > gc THEN 1 ELSE 0 END),
+               sum(CASE WHEN gf = gc THEN 1 ELSE 0 END),
+               sum(CASE WHEN gf < gc THEN 1 ELSE 0 END),
+               sum(gf), sum(gc),
+               sum(CASE WHEN gf > gc THEN 3 WHEN gf = gc THEN 1 ELSE 0 END),
+               CURRENT_TIMESTAMP
+        FROM (
+            SELECT torneo_id, equipo1_id AS equipo_id, goles_equipo1 AS gf, goles_equipo2 AS gc
+            FROM partido WHERE goles_equipo1 IS NOT NULL AND goles_equipo2 IS NOT NULL
+            UNION ALL
+            SELECT torneo_id, equipo2_id AS equipo_id, goles_equipo2 AS gf, goles_equipo1 AS gc
+            FROM partido WHERE goles_equipo1 IS NOT NULL AND goles_equipo2 IS NOT NULL
+        ) resultados
+        GROUP BY torneo_id, equipo_id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('posicion', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_posicion_torneo_id'))
+
+    op.drop_table('posicion')
+
+    with op.batch_alter_table('equipo', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_equipo_torneo_id'))
+
+    op.execute("UPDATE partido SET goles_equipo1 = 0 WHERE goles_equipo1 IS NULL")
+    op.execute("UPDATE partido SET goles_equipo2 = 0 WHERE goles_equipo2 IS NULL")
+    with op.batch_alter_table('partido', schema=None) as batch_op:
+        batch_op.alter_column('goles_equipo1', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('goles_equipo2', existing_type=sa.Integer(), nullable=False)
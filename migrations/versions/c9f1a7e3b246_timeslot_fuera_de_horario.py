@@ -0,0 +1,31 @@
+"""marca de los timeslots bloqueados por la reconciliación de horarios
+
+Revision ID: c9f1a7e3b246
+Revises: b7e3c9a1d524
+Create Date: 2026-10-20 10:12:44.301582
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f1a7e3b246'
+down_revision = 'b7e3c9a1d524'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('timeslot', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('fuera_de_horario', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    # Hasta ahora la reconciliación era lo único que bloqueaba turnos: los
+    # BLOQUEADO existentes quedan marcados para poder liberarlos si el horario se amplía
+    timeslot = sa.table('timeslot', sa.column('estado', sa.String), sa.column('fuera_de_horario', sa.Boolean))
+    op.execute(timeslot.update().where(timeslot.c.estado == 'BLOQUEADO').values(fuera_de_horario=True))
+
+
+def downgrade():
+    with op.batch_alter_table('timeslot', schema=None) as batch_op:
+        batch_op.drop_column('fuera_de_horario')
@@ -0,0 +1,89 @@
+"""reservas recurrentes (series semanales)
+
+Revision ID: d7e2b4f9a581
+Revises: c3a9f5e8d176
+Create Date: 2026-10-19 21:32:14.506182
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7e2b4f9a581'
+down_revision = 'c3a9f5e8d176'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('serie_reserva',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('cancha_id', sa.Integer(), nullable=False),
+    sa.Column('cliente_id', sa.Integer(), nullable=True),
+    sa.Column('cliente_nombre', sa.String(length=120), nullable=False),
+    sa.Column('cliente_telefono', sa.String(length=30), nullable=True),
+    sa.Column('cliente_email', sa.String(length=120), nullable=False),
+    sa.Column('fuente', sa.Enum('WEB', 'PRESENCIAL', 'TELEFONICA', name='fuente_reserva', native_enum=False), nullable=False),
+    sa.Column('servicios', sa.String(length=255), nullable=True),
+    sa.Column('dia', sa.Enum('LUN', 'MAR', 'MIE', 'JUE', 'VIE', 'SAB', 'DOM', name='dia_semana', native_enum=False), nullable=False),
+    sa.Column('hora_inicio', sa.Time(), nullable=False),
+    sa.Column('horas', sa.Integer(), nullable=False),
+    sa.Column('fecha_desde', sa.Date(), nullable=False),
+    sa.Column('fecha_hasta', sa.Date(), nullable=False),
+    sa.Column('estado', sa.Enum('ACTIVA', 'CANCELADA', name='serie_estado', native_enum=False), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['cancha_id'], ['cancha.id'], ),
+    sa.ForeignKeyConstraint(['cliente_id'], ['cliente.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('serie_reserva', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_serie_reserva_cancha_id'), ['cancha_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_serie_reserva_cliente_id'), ['cliente_id'], unique=False)
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # ADD COLUMN directo (sin batch) para no recrear 'reserva' y conservar
+        # los triggers del índice de búsqueda.
+        op.execute("ALTER TABLE reserva ADD COLUMN serie_id INTEGER REFERENCES serie_reserva (id)")
+    else:
+        op.add_column('reserva', sa.Column('serie_id', sa.Integer(), nullable=True))
+        op.create_foreign_key('fk_reserva_serie_id', 'reserva', 'serie_reserva', ['serie_id'], ['id'])
+    op.create_index(op.f('ix_reserva_serie_id'), 'reserva', ['serie_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_reserva_serie_id'), table_name='reserva')
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('reserva', schema=None) as batch_op:
+            batch_op.drop_column('serie_id')
+        # El batch recrea la tabla y se pierden sus triggers: volver a crearlos
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS reserva_busqueda_ai AFTER INSERT ON reserva BEGIN
+                INSERT INTO reserva_busqueda(rowid, cliente_nombre, cliente_email)
+                VALUES (new.id, new.cliente_nombre, new.cliente_email);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS reserva_busqueda_ad AFTER DELETE ON reserva BEGIN
+                INSERT INTO reserva_busqueda(reserva_busqueda, rowid, cliente_nombre, cliente_email)
+                VALUES ('delete', old.id, old.cliente_nombre, old.cliente_email);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS reserva_busqueda_au AFTER UPDATE OF cliente_nombre, cliente_email ON reserva BEGIN
+                INSERT INTO reserva_busqueda(reserva_busqueda, rowid, cliente_nombre, cliente_email)
+                VALUES ('delete', old.id, old.cliente_nombre, old.cliente_email);
+                INSERT INTO reserva_busqueda(rowid, cliente_nombre, cliente_email)
+                VALUES (new.id, new.cliente_nombre, new.cliente_email);
+            END
+        """)
+    else:
+        op.drop_constraint('fk_reserva_serie_id', 'reserva', type_='foreignkey')
+        op.drop_column('reserva', 'serie_id')
+
+    with op.batch_alter_table('serie_reserva', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_serie_reserva_cliente_id'))
+        batch_op.drop_index(batch_op.f('ix_serie_reserva_cancha_id'))
+
+    op.drop_table('serie_reserva')
@@ -0,0 +1,34 @@
+"""fixture: ronda en partido y formato en torneo
+
+Revision ID: e1f4b6a09c37
+Revises: c5d2a8f01b74
+Create Date: 2026-10-19 14:22:10.518392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f4b6a09c37'
+down_revision = 'c5d2a8f01b74'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('torneo', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('formato', sa.Enum('TODOS_CONTRA_TODOS', 'IDA_Y_VUELTA', 'ELIMINACION', name='formato_fixture', native_enum=False), nullable=True))
+
+    with op.batch_alter_table('partido', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('ronda', sa.Integer(), nullable=True))
+        batch_op.create_unique_constraint('uq_partido_fixture', ['torneo_id', 'ronda', 'equipo1_id', 'equipo2_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('partido', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_partido_fixture', type_='unique')
+        batch_op.drop_column('ronda')
+
+    with op.batch_alter_table('torneo', schema=None) as batch_op:
+        batch_op.drop_column('formato')
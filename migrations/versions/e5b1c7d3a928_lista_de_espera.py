@@ -0,0 +1,55 @@
+"""lista de espera de turnos
+
+Revision ID: e5b1c7d3a928
+Revises: d7e2b4f9a581
+Create Date: 2026-10-19 22:15:40.731905
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b1c7d3a928'
+down_revision = 'd7e2b4f9a581'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('espera_turno',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('club_id', sa.Integer(), nullable=False),
+    sa.Column('cancha_id', sa.Integer(), nullable=True),
+    sa.Column('desde', sa.DateTime(), nullable=False),
+    sa.Column('hasta', sa.DateTime(), nullable=False),
+    sa.Column('cliente_id', sa.Integer(), nullable=True),
+    sa.Column('cliente_nombre', sa.String(length=120), nullable=False),
+    sa.Column('cliente_telefono', sa.String(length=30), nullable=True),
+    sa.Column('cliente_email', sa.String(length=120), nullable=False),
+    sa.Column('fuente', sa.Enum('WEB', 'PRESENCIAL', 'TELEFONICA', name='fuente_reserva', native_enum=False), nullable=False),
+    sa.Column('auto_reservar', sa.Boolean(), nullable=False),
+    sa.Column('estado', sa.Enum('PENDIENTE', 'NOTIFICADA', 'ASIGNADA', 'CANCELADA', name='espera_estado', native_enum=False), nullable=False),
+    sa.Column('timeslot_id', sa.Integer(), nullable=True),
+    sa.Column('reserva_id', sa.Integer(), nullable=True),
+    sa.Column('atendida_en', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['club.id'], ),
+    sa.ForeignKeyConstraint(['cancha_id'], ['cancha.id'], ),
+    sa.ForeignKeyConstraint(['cliente_id'], ['cliente.id'], ),
+    sa.ForeignKeyConstraint(['timeslot_id'], ['timeslot.id'], ),
+    sa.ForeignKeyConstraint(['reserva_id'], ['reserva.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('espera_turno', schema=None) as batch_op:
+        batch_op.create_index('ix_espera_turno_club_estado_desde', ['club_id', 'estado', 'desde'], unique=False)
+        batch_op.create_index(batch_op.f('ix_espera_turno_cliente_id'), ['cliente_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('espera_turno', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_espera_turno_cliente_id'))
+        batch_op.drop_index('ix_espera_turno_club_estado_desde')
+
+    op.drop_table('espera_turno')
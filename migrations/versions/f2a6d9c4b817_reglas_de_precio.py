@@ -0,0 +1,45 @@
+"""reglas de precio por franja horaria
+
+Revision ID: f2a6d9c4b817
+Revises: e5b1c7d3a928
+Create Date: 2026-10-19 22:58:03.214470
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6d9c4b817'
+down_revision = 'e5b1c7d3a928'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('regla_precio',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('club_id', sa.Integer(), nullable=False),
+    sa.Column('cancha_id', sa.Integer(), nullable=True),
+    sa.Column('dia', sa.Enum('LUN', 'MAR', 'MIE', 'JUE', 'VIE', 'SAB', 'DOM', name='dia_semana', native_enum=False), nullable=True),
+    sa.Column('hora_desde', sa.Time(), nullable=False),
+    sa.Column('hora_hasta', sa.Time(), nullable=True),
+    sa.Column('fecha_desde', sa.Date(), nullable=True),
+    sa.Column('fecha_hasta', sa.Date(), nullable=True),
+    sa.Column('precio', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('prioridad', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['club.id'], ),
+    sa.ForeignKeyConstraint(['cancha_id'], ['cancha.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('regla_precio', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_regla_precio_club_id'), ['club_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('regla_precio', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_regla_precio_club_id'))
+
+    op.drop_table('regla_precio')
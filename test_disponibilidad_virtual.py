@@ -0,0 +1,176 @@
+"""
+Prueba de equivalencia entre la disponibilidad materializada y la virtual.
+
+Usa una base SQLite temporal (no necesita el servidor corriendo):
+1. Genera timeslots de 3 canchas para dos semanas, con horarios distintos por
+   día y un día sin horario, y reserva/bloquea turnos al azar.
+2. Compara, fecha por fecha, la respuesta de la disponibilidad materializada
+   con la calculada desde las reglas (deben ser idénticas).
+3. Con disponibilidad virtual: reserva por (cancha_id, inicio) sin timeslots
+   generados, y verifica doble reserva, bloqueos, cierres y la cantidad de filas.
+
+Ejecutar desde la raíz del proyecto:
+    python test_disponibilidad_virtual.py
+"""
+
+import os
+import random
+import tempfile
+from datetime import date, datetime, time, timedelta
+
+_db_file = os.path.join(tempfile.mkdtemp(), "test_disponibilidad.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + _db_file
+
+from app import create_app, db  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.errors import AppError  # noqa: E402
+from app.models.cancha import Cancha  # noqa: E402
+from app.models.cancha_bloqueo import CanchaBloqueo  # noqa: E402
+from app.models.club import Club  # noqa: E402
+from app.models.club_cierre import ClubCierre  # noqa: E402
+from app.models.club_horario import ClubHorario  # noqa: E402
+from app.models.direccion import Direccion  # noqa: E402
+from app.models.enums import DiaSemana, TimeslotEstado  # noqa: E402
+from app.models.rol import Rol  # noqa: E402,F401 (registra el modelo antes de los schemas)
+from app.models.timeslot import Timeslot  # noqa: E402
+from app.models.user import User  # noqa: E402,F401
+from app.services.disponibilidad_service import DisponibilidadService  # noqa: E402
+from app.services.reserva_service import ReservaService  # noqa: E402
+from app.services.timeslot_service import TimeslotService  # noqa: E402
+
+HORARIOS = {
+    DiaSemana.LUN: (time(8), time(22)),
+    DiaSemana.MAR: (time(8), time(22)),
+    DiaSemana.MIE: (time(10), time(20)),
+    DiaSemana.JUE: (time(8), time(22)),
+    DiaSemana.VIE: (time(8), time(23, 30)),  # el último turno no entra completo
+    DiaSemana.SAB: (time(9), time(14)),
+    # DOM: cerrado
+}
+DIAS = 14
+
+
+def crear_club(nombre):
+    """Crea un club con HORARIOS y tres canchas."""
+    club = Club(nombre=nombre, cuit="20-00000000-0", telefono="0",
+                direccion=Direccion(calle="a", numero="1", ciudad="c", provincia="p"))
+    for dia, (abre, cierra) in HORARIOS.items():
+        club.horarios.append(ClubHorario(dia=dia, abre=abre, cierra=cierra, activo=True))
+    for i in range(3):
+        club.canchas.append(Cancha(nombre=f"Cancha {i + 1}", deporte="padel", superficie=200,
+                                   techado=bool(i % 2), iluminacion=True, precio_hora=1000 + 500 * i,
+                                   activa=True))
+    db.session.add(club)
+    db.session.commit()
+    return club
+
+
+def reservar(servicio, **campos):
+    data = {"cliente_nombre": "Ana", "cliente_email": "ana@test.com", "fuente": "WEB", **campos}
+    return servicio.create(data)
+
+
+def disponibilidad_o_error(funcion, club_id, fecha):
+    try:
+        return funcion(club_id, fecha)
+    except ValueError:
+        return "sin turnos"
+
+
+def probar_equivalencia(hoy):
+    timeslot_service = TimeslotService(db)
+    disponibilidad_service = DisponibilidadService(db)
+    reserva_service = ReservaService()
+    club = crear_club("Club Materializado")
+
+    timeslot_service.generar_timeslots_para_club(club.id, hoy, hoy + timedelta(days=DIAS - 1))
+    timeslots = Timeslot.query.join(Cancha).filter(Cancha.club_id == club.id).all()
+
+    random.seed(7)
+    for ts in random.sample(timeslots, 40):
+        reservar(reserva_service, timeslot_ids=[ts.id])
+    libres = [ts for ts in timeslots if ts.estado == TimeslotEstado.DISPONIBLE]
+    for ts in random.sample(libres, 10):
+        ts.estado = TimeslotEstado.BLOQUEADO
+    db.session.commit()
+
+    diferencias = 0
+    # Solo el horizonte generado: más allá, la virtual sigue ofreciendo turnos y la materializada no
+    for d in range(DIAS):
+        fecha = hoy + timedelta(days=d)
+        materializada = disponibilidad_o_error(timeslot_service.get_disponibilidad_materializada, club.id, fecha)
+        virtual = disponibilidad_o_error(disponibilidad_service.get_disponibilidad_virtual, club.id, fecha)
+        if isinstance(materializada, dict):
+            for horario in materializada["horarios"]:
+                horario["canchas_disponibles"].sort(key=lambda c: c["cancha_id"])
+        if materializada != virtual:
+            diferencias += 1
+            print(f"❌ {fecha}: la disponibilidad virtual no coincide con la materializada")
+
+    assert diferencias == 0, f"{diferencias} fechas con diferencias"
+    print(f"✅ Equivalencia: {DIAS} fechas idénticas ({len(timeslots)} timeslots generados)")
+    return len(timeslots)
+
+
+def probar_modo_virtual(hoy, filas_materializadas):
+    Config.DISPONIBILIDAD_MODO = "virtual"
+    timeslot_service = TimeslotService(db)
+    reserva_service = ReservaService()
+    club = crear_club("Club Virtual")
+    cancha = club.canchas[0]
+
+    lunes = hoy + timedelta(days=(7 - hoy.weekday()) % 7 or 7)
+    disponibilidad = timeslot_service.get_disponibilidad_por_club_y_fecha(club.id, lunes)
+    assert disponibilidad["total_horarios"] == 14
+    assert all(c["timeslot_id"] is None for h in disponibilidad["horarios"] for c in h["canchas_disponibles"])
+
+    # Reservar dos turnos por (cancha_id, inicio): se crean solo esas filas
+    inicio = datetime.combine(lunes, time(18))
+    slots = [{"cancha_id": cancha.id, "inicio": inicio.isoformat()},
+             {"cancha_id": cancha.id, "inicio": (inicio + timedelta(hours=1)).isoformat()}]
+    reserva = reservar(reserva_service, slots=slots)
+    assert float(reserva.precio_total) == 2 * cancha.precio_hora
+    hora_18 = next(h for h in timeslot_service.get_disponibilidad_por_club_y_fecha(club.id, lunes)["horarios"]
+                   if h["hora"] == "18:00")
+    assert cancha.id not in [c["cancha_id"] for c in hora_18["canchas_disponibles"]]
+    print("✅ Reserva por (cancha_id, inicio) materializa solo los turnos reservados")
+
+    casos = {
+        "doble reserva": [slots[0]],
+        "turno fuera de horario": [{"cancha_id": cancha.id, "inicio": datetime.combine(lunes, time(7)).isoformat()}],
+        "turno desfasado": [{"cancha_id": cancha.id, "inicio": datetime.combine(lunes, time(9, 30)).isoformat()}],
+    }
+    db.session.add(CanchaBloqueo(cancha_id=cancha.id, inicio=datetime.combine(lunes, time(10)),
+                                 fin=datetime.combine(lunes, time(12)), motivo="mantenimiento"))
+    db.session.add(ClubCierre(club_id=club.id, fecha=lunes + timedelta(days=1), cerrado=True, motivo="feriado"))
+    db.session.commit()
+    casos["turno bloqueado"] = [{"cancha_id": cancha.id, "inicio": datetime.combine(lunes, time(11)).isoformat()}]
+    casos["día cerrado"] = [{"cancha_id": cancha.id,
+                             "inicio": datetime.combine(lunes + timedelta(days=1), time(18)).isoformat()}]
+    for nombre, pedido in casos.items():
+        try:
+            reservar(reserva_service, slots=pedido)
+        except AppError:
+            continue
+        raise AssertionError(f"Se permitió reservar: {nombre}")
+    print(f"✅ Rechazados: {', '.join(casos)}")
+
+    # Cancelar libera el turno, que vuelve a ofrecerse con su timeslot_id
+    reserva_service.cancelar_reserva(reserva.id)
+    hora_18 = next(h for h in timeslot_service.get_disponibilidad_por_club_y_fecha(club.id, lunes)["horarios"]
+                   if h["hora"] == "18:00")
+    assert any(c["cancha_id"] == cancha.id and c["timeslot_id"] for c in hora_18["canchas_disponibles"])
+    print("✅ Cancelar libera el turno")
+
+    filas = Timeslot.query.join(Cancha).filter(Cancha.club_id == club.id).count()
+    print(f"✅ Filas de timeslot: {filas} (virtual) contra {filas_materializadas} (materializada, {DIAS} días)")
+    Config.DISPONIBILIDAD_MODO = "materializada"
+
+
+if __name__ == "__main__":
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        hoy = date.today()
+        filas = probar_equivalencia(hoy)
+        probar_modo_virtual(hoy, filas)